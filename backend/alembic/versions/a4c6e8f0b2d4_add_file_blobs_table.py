@@ -0,0 +1,58 @@
+"""add_file_blobs_table
+
+Revision ID: a4c6e8f0b2d4
+Revises: f3b8d1e5a7c2
+Create Date: 2025-11-23 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c6e8f0b2d4'
+down_revision: Union[str, None] = 'f3b8d1e5a7c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'file_blobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('sha256_hash', sa.String(length=64), nullable=False),
+        sa.Column('s3_key', sa.String(length=500), nullable=False),
+        sa.Column('file_size', sa.BigInteger(), nullable=False),
+        sa.Column('content_type', sa.String(length=100), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('virus_status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('virus_scan_result', sa.Text(), nullable=True),
+        sa.Column('scanned_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('sha256_hash'),
+    )
+    op.create_index(op.f('ix_file_blobs_id'), 'file_blobs', ['id'], unique=False)
+
+    # Attachments now share objects, so their keys are no longer unique.
+    # Existing attachments keep their own objects and have no blob.
+    op.drop_index('ix_attachments_s3_key', table_name='attachments')
+    op.create_index('ix_attachments_s3_key', 'attachments', ['s3_key'], unique=False)
+    op.add_column('attachments', sa.Column('blob_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'fk_attachments_blob_id', 'attachments', 'file_blobs', ['blob_id'], ['id'], ondelete='SET NULL'
+    )
+    op.create_index(op.f('ix_attachments_blob_id'), 'attachments', ['blob_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_attachments_blob_id'), table_name='attachments')
+    op.drop_constraint('fk_attachments_blob_id', 'attachments', type_='foreignkey')
+    op.drop_column('attachments', 'blob_id')
+    op.drop_index('ix_attachments_s3_key', table_name='attachments')
+    op.create_index('ix_attachments_s3_key', 'attachments', ['s3_key'], unique=True)
+    op.drop_index(op.f('ix_file_blobs_id'), table_name='file_blobs')
+    op.drop_table('file_blobs')
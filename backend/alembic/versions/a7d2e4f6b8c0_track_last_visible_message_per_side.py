@@ -0,0 +1,84 @@
+"""track_last_visible_message_per_side
+
+Revision ID: a7d2e4f6b8c0
+Revises: c6e8a0b2d4f7
+Create Date: 2025-11-27 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d2e4f6b8c0'
+down_revision: Union[str, None] = 'c6e8a0b2d4f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The latest message differs per side once one of them hides a message
+    op.add_column('conversation_summaries', sa.Column('last_message_id_low', sa.Integer(), nullable=True))
+    op.add_column('conversation_summaries', sa.Column('last_message_id_high', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'fk_conversation_last_message_low', 'conversation_summaries', 'messages',
+        ['last_message_id_low'], ['id'], ondelete='SET NULL',
+    )
+    op.create_foreign_key(
+        'fk_conversation_last_message_high', 'conversation_summaries', 'messages',
+        ['last_message_id_high'], ['id'], ondelete='SET NULL',
+    )
+
+    # Backfill from existing messages; activity is the latest message's own time
+    op.execute(
+        """
+        UPDATE conversation_summaries cs
+        JOIN (
+            SELECT
+                LEAST(sender_id, recipient_id) AS user_low_id,
+                GREATEST(sender_id, recipient_id) AS user_high_id,
+                MAX(CASE WHEN (sender_id = LEAST(sender_id, recipient_id)
+                               AND is_deleted_by_sender = 0)
+                           OR (recipient_id = LEAST(sender_id, recipient_id)
+                               AND is_deleted_by_recipient = 0)
+                         THEN id END) AS last_low,
+                MAX(CASE WHEN (sender_id = GREATEST(sender_id, recipient_id)
+                               AND is_deleted_by_sender = 0)
+                           OR (recipient_id = GREATEST(sender_id, recipient_id)
+                               AND is_deleted_by_recipient = 0)
+                         THEN id END) AS last_high,
+                MAX(created_at) AS last_activity
+            FROM messages
+            GROUP BY LEAST(sender_id, recipient_id), GREATEST(sender_id, recipient_id)
+        ) m ON m.user_low_id = cs.user_low_id AND m.user_high_id = cs.user_high_id
+        SET cs.last_message_id_low = m.last_low,
+            cs.last_message_id_high = m.last_high,
+            cs.last_activity_at = m.last_activity
+        """
+    )
+
+    # Unnamed in c4e8a1f2b9d3, so MySQL numbered it after the two user keys
+    op.drop_constraint('conversation_summaries_ibfk_3', 'conversation_summaries', type_='foreignkey')
+    op.drop_column('conversation_summaries', 'last_message_id')
+
+
+def downgrade() -> None:
+    op.add_column('conversation_summaries', sa.Column('last_message_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        None, 'conversation_summaries', 'messages',
+        ['last_message_id'], ['id'], ondelete='SET NULL',
+    )
+    op.execute(
+        """
+        UPDATE conversation_summaries
+        SET last_message_id = NULLIF(GREATEST(
+            COALESCE(last_message_id_low, 0), COALESCE(last_message_id_high, 0)
+        ), 0)
+        """
+    )
+    op.drop_constraint('fk_conversation_last_message_high', 'conversation_summaries', type_='foreignkey')
+    op.drop_constraint('fk_conversation_last_message_low', 'conversation_summaries', type_='foreignkey')
+    op.drop_column('conversation_summaries', 'last_message_id_high')
+    op.drop_column('conversation_summaries', 'last_message_id_low')
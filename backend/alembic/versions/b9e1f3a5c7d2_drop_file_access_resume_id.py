@@ -0,0 +1,33 @@
+"""drop_file_access_resume_id
+
+Revision ID: b9e1f3a5c7d2
+Revises: a7d2e4f6b8c0
+Create Date: 2025-11-28 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9e1f3a5c7d2'
+down_revision: Union[str, None] = 'a7d2e4f6b8c0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # No grant was ever written with a resume; resume files are not served
+    # through the file download endpoint
+    op.drop_constraint('file_access_entries_ibfk_4', 'file_access_entries', type_='foreignkey')
+    op.drop_column('file_access_entries', 'resume_id')
+
+
+def downgrade() -> None:
+    op.add_column('file_access_entries', sa.Column('resume_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'file_access_entries_ibfk_4', 'file_access_entries', 'resumes',
+        ['resume_id'], ['id'], ondelete='CASCADE',
+    )
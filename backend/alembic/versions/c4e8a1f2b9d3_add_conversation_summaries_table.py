@@ -0,0 +1,72 @@
+"""add_conversation_summaries_table
+
+Revision ID: c4e8a1f2b9d3
+Revises: ca8a5ea17c8d
+Create Date: 2025-11-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a1f2b9d3'
+down_revision: Union[str, None] = 'ca8a5ea17c8d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Denormalized per-pair summary of direct messages
+    op.create_table(
+        'conversation_summaries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_low_id', sa.Integer(), nullable=False),
+        sa.Column('user_high_id', sa.Integer(), nullable=False),
+        sa.Column('last_message_id', sa.Integer(), nullable=True),
+        sa.Column('last_activity_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('unread_count_low', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('unread_count_high', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_low_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_high_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['last_message_id'], ['messages.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_low_id', 'user_high_id', name='uq_conversation_pair'),
+    )
+    op.create_index(op.f('ix_conversation_summaries_id'), 'conversation_summaries', ['id'], unique=False)
+    op.create_index('idx_conversation_low_activity', 'conversation_summaries', ['user_low_id', 'last_activity_at'], unique=False)
+    op.create_index('idx_conversation_high_activity', 'conversation_summaries', ['user_high_id', 'last_activity_at'], unique=False)
+
+    # Backfill from existing messages
+    op.execute(
+        """
+        INSERT INTO conversation_summaries
+            (user_low_id, user_high_id, last_message_id, last_activity_at,
+             unread_count_low, unread_count_high)
+        SELECT
+            LEAST(sender_id, recipient_id),
+            GREATEST(sender_id, recipient_id),
+            MAX(id),
+            MAX(created_at),
+            SUM(CASE WHEN is_read = 0 AND is_deleted_by_recipient = 0
+                      AND recipient_id = LEAST(sender_id, recipient_id)
+                     THEN 1 ELSE 0 END),
+            SUM(CASE WHEN is_read = 0 AND is_deleted_by_recipient = 0
+                      AND recipient_id = GREATEST(sender_id, recipient_id)
+                      AND sender_id != recipient_id
+                     THEN 1 ELSE 0 END)
+        FROM messages
+        GROUP BY LEAST(sender_id, recipient_id), GREATEST(sender_id, recipient_id)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_conversation_high_activity', table_name='conversation_summaries')
+    op.drop_index('idx_conversation_low_activity', table_name='conversation_summaries')
+    op.drop_index(op.f('ix_conversation_summaries_id'), table_name='conversation_summaries')
+    op.drop_table('conversation_summaries')
@@ -0,0 +1,99 @@
+"""add_workflow_events_table
+
+Revision ID: c6e8a0b2d4f7
+Revises: b5d7f9a1c3e6
+Create Date: 2025-11-26 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6e8a0b2d4f7'
+down_revision: Union[str, None] = 'b5d7f9a1c3e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Rebuild the log from existing processes and executions, oldest first so that
+# event ids follow time. Transitions between nodes were never recorded, so no
+# "advanced" events are backfilled.
+BACKFILL_EVENTS = """
+INSERT INTO workflow_events (
+    candidate_workflow_id, workflow_id, event_type, node_id, execution_id,
+    actor_id, result, score, data, occurred_at
+)
+SELECT candidate_workflow_id, workflow_id, event_type, node_id, execution_id,
+       actor_id, result, score, data, occurred_at
+FROM (
+    SELECT cw.id AS candidate_workflow_id, cw.workflow_id,
+           'process_started' AS event_type, NULL AS node_id,
+           NULL AS execution_id, NULL AS actor_id, NULL AS result,
+           NULL AS score, NULL AS data, cw.started_at AS occurred_at,
+           0 AS tiebreak
+    FROM candidate_workflows cw
+    WHERE cw.started_at IS NOT NULL
+    UNION ALL
+    SELECT e.candidate_workflow_id, n.workflow_id, 'node_started', e.node_id,
+           e.id, NULL, NULL, NULL,
+           JSON_OBJECT('node_title', n.title, 'node_type', n.node_type),
+           COALESCE(e.started_at, e.created_at), 1
+    FROM workflow_node_executions e
+    JOIN workflow_nodes n ON n.id = e.node_id
+    UNION ALL
+    SELECT e.candidate_workflow_id, n.workflow_id, 'node_completed', e.node_id,
+           e.id, e.completed_by, e.result, e.score,
+           JSON_OBJECT('node_title', n.title, 'node_type', n.node_type,
+                       'feedback', e.feedback),
+           e.completed_at, 2
+    FROM workflow_node_executions e
+    JOIN workflow_nodes n ON n.id = e.node_id
+    WHERE e.completed_at IS NOT NULL
+    UNION ALL
+    SELECT cw.id, cw.workflow_id, 'process_completed', NULL, NULL, NULL,
+           cw.final_result, cw.overall_score, NULL, cw.completed_at, 3
+    FROM candidate_workflows cw
+    WHERE cw.completed_at IS NOT NULL
+) AS history
+ORDER BY occurred_at, tiebreak, execution_id
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        'workflow_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('candidate_workflow_id', sa.Integer(), nullable=False),
+        sa.Column('workflow_id', sa.Integer(), nullable=False),
+        sa.Column('event_type', sa.String(length=50), nullable=False),
+        sa.Column('node_id', sa.Integer(), nullable=True),
+        sa.Column('execution_id', sa.Integer(), nullable=True),
+        sa.Column('actor_id', sa.Integer(), nullable=True),
+        sa.Column('result', sa.String(length=50), nullable=True),
+        sa.Column('score', sa.DECIMAL(precision=5, scale=2), nullable=True),
+        sa.Column('data', sa.JSON(), nullable=True),
+        sa.Column('occurred_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['candidate_workflow_id'], ['candidate_workflows.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['workflow_id'], ['workflows.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['node_id'], ['workflow_nodes.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['execution_id'], ['workflow_node_executions.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['actor_id'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_workflow_events_id'), 'workflow_events', ['id'], unique=False)
+    op.create_index('idx_workflow_event_candidate', 'workflow_events', ['candidate_workflow_id', 'id'], unique=False)
+    op.create_index('idx_workflow_event_workflow_time', 'workflow_events', ['workflow_id', 'occurred_at'], unique=False)
+
+    op.execute(BACKFILL_EVENTS)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_workflow_event_workflow_time', table_name='workflow_events')
+    op.drop_index('idx_workflow_event_candidate', table_name='workflow_events')
+    op.drop_index(op.f('ix_workflow_events_id'), table_name='workflow_events')
+    op.drop_table('workflow_events')
@@ -0,0 +1,28 @@
+"""add_fulltext_index_to_messages
+
+Revision ID: d7f3b2a9c1e4
+Revises: c4e8a1f2b9d3
+Create Date: 2025-11-20 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7f3b2a9c1e4'
+down_revision: Union[str, None] = 'c4e8a1f2b9d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ngram parser so Japanese text (no word separators) is searchable
+    op.execute(
+        "CREATE FULLTEXT INDEX ft_messages_content ON messages (content) WITH PARSER ngram"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ft_messages_content', table_name='messages')
@@ -0,0 +1,52 @@
+"""add_resume_export_jobs_table
+
+Revision ID: e2a9c7d4f6b1
+Revises: d7f3b2a9c1e4
+Create Date: 2025-11-21 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a9c7d4f6b1'
+down_revision: Union[str, None] = 'd7f3b2a9c1e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'resume_export_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=30), nullable=False),
+        sa.Column('celery_task_id', sa.String(length=255), nullable=True),
+        sa.Column('resume_ids', sa.JSON(), nullable=False),
+        sa.Column('format', sa.String(length=10), nullable=False),
+        sa.Column('include_contact_info', sa.Boolean(), nullable=False),
+        sa.Column('watermark', sa.String(length=100), nullable=True),
+        sa.Column('total_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('completed_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('failed_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('results', sa.JSON(), nullable=True),
+        sa.Column('errors', sa.JSON(), nullable=True),
+        sa.Column('error_message', sa.String(length=500), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_resume_export_jobs_id'), 'resume_export_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_resume_export_jobs_user_id'), 'resume_export_jobs', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_resume_export_jobs_user_id'), table_name='resume_export_jobs')
+    op.drop_index(op.f('ix_resume_export_jobs_id'), table_name='resume_export_jobs')
+    op.drop_table('resume_export_jobs')
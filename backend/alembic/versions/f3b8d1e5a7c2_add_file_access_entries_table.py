@@ -0,0 +1,99 @@
+"""add_file_access_entries_table
+
+Revision ID: f3b8d1e5a7c2
+Revises: e2a9c7d4f6b1
+Create Date: 2025-11-22 09:00:00.000000
+
+"""
+from pathlib import PurePosixPath
+from typing import Sequence, Union
+from urllib.parse import unquote, urlsplit
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d1e5a7c2'
+down_revision: Union[str, None] = 'e2a9c7d4f6b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DOWNLOAD_URL_PREFIX = '/api/files/download/'
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _normalize_file_key(value):
+    # Mirrors app.services.file_access_service.normalize_file_key at this revision
+    if not value:
+        return None
+    path = value.strip()
+    if '://' in path:
+        path = urlsplit(path).path
+    prefix_at = path.find(DOWNLOAD_URL_PREFIX)
+    if prefix_at != -1:
+        path = unquote(path[prefix_at + len(DOWNLOAD_URL_PREFIX):].split('?')[0])
+    path = path.replace('\\', '/').lstrip('/')
+    if not path:
+        return None
+    posix_path = PurePosixPath(path)
+    if '..' in posix_path.parts:
+        return None
+    key = str(posix_path)
+    return key if len(key) <= 500 else None
+
+
+def upgrade() -> None:
+    file_access_entries = op.create_table(
+        'file_access_entries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('storage_key', sa.String(length=500), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('message_id', sa.Integer(), nullable=True),
+        sa.Column('todo_id', sa.Integer(), nullable=True),
+        sa.Column('resume_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['message_id'], ['messages.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['todo_id'], ['todos.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_file_access_entries_id'), 'file_access_entries', ['id'], unique=False)
+    op.create_index('idx_file_access_key_user', 'file_access_entries', ['storage_key', 'user_id'], unique=False)
+    op.create_index('idx_file_access_message', 'file_access_entries', ['message_id'], unique=False)
+
+    # Backfill grants for both participants of every message with a file.
+    # file_url values are full download URLs, so keys are decoded in Python.
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.text(
+                'SELECT id, sender_id, recipient_id, file_url FROM messages '
+                'WHERE file_url IS NOT NULL AND id > :last_id ORDER BY id LIMIT :batch'
+            ),
+            {'last_id': last_id, 'batch': BACKFILL_BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        entries = []
+        for message_id, sender_id, recipient_id, file_url in rows:
+            storage_key = _normalize_file_key(file_url)
+            if storage_key is None:
+                continue
+            for user_id in dict.fromkeys((sender_id, recipient_id)):
+                entries.append(
+                    {'storage_key': storage_key, 'user_id': user_id, 'message_id': message_id}
+                )
+        if entries:
+            op.bulk_insert(file_access_entries, entries)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_file_access_message', table_name='file_access_entries')
+    op.drop_index('idx_file_access_key_user', table_name='file_access_entries')
+    op.drop_index(op.f('ix_file_access_entries_id'), table_name='file_access_entries')
+    op.drop_table('file_access_entries')
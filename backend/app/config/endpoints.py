@@ -512,7 +512,9 @@ class NotificationRoutes:
     BY_ID = "/{notification_id}"
     MARK_ALL_READ = "/mark-all-read"
     MARK_READ = "/mark-read"
+    STREAM = "/stream"
     UNREAD_COUNT = "/unread-count"
+    UPDATES = "/updates"
 
 
 class PositionRoutes:
@@ -681,6 +683,11 @@ class ResumeRoutes:
     EXPERIENCE_BY_ID = "/experiences/{exp_id}"
     EXPERIENCES = "/{resume_id}/experiences"
 
+    # Batch PDF export - Background job, progress and zip download
+    EXPORT_BY_ID = "/exports/{job_id}"
+    EXPORT_DOWNLOAD = "/exports/{job_id}/download"
+    EXPORTS = "/exports"
+
     GENERATE_PDF = "/{resume_id}/generate-pdf"
 
     # Resume sections - Language proficiency
@@ -884,6 +891,7 @@ class WebhookRoutes:
 class WebsocketVideoRoutes:
     """WebSocket video endpoints."""
 
+    METRICS = "/ws/video-metrics"
     WS_VIDEO = "/ws/video/{room_id}"
 
 
@@ -922,6 +930,7 @@ class WorkflowRoutes:
     CANDIDATE_TIMELINE = "/candidate-workflows/{candidate_workflow_id}/timeline"
     CANDIDATES = "/{workflow_id}/candidates"
     CANDIDATES_BULK = "/{workflow_id}/candidates/bulk"
+    CANDIDATES_IMPORT = "/{workflow_id}/candidates/import"
 
     CLONE = "/{workflow_id}/clone"
     COMPANY_STATS = "/company/{company_id}/statistics"
@@ -929,6 +938,7 @@ class WorkflowRoutes:
 
     # Node routes - Workflow node/stage management
     NODE_BY_ID = "/{workflow_id}/nodes/{node_id}"
+    NODE_GRAPH = "/{workflow_id}/nodes/graph"
     NODE_WITH_INTEGRATION = "/{workflow_id}/nodes/create-with-integration"
     NODES = "/{workflow_id}/nodes"
 
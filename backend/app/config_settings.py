@@ -23,6 +23,12 @@ class Settings(BaseSettings):
     # ClamAV
     clamav_host: str = "localhost"
     clamav_port: int = 3310
+    clamav_timeout_seconds: float = 30.0
+    # Pooled clamd sessions, INSTREAM frame size and parallel bulk scans
+    clamav_pool_size: int = 4
+    clamav_chunk_size: int = 256 * 1024
+    clamav_scan_concurrency: int = 4
+    clamav_bulk_scan_limit: int = 100
 
     # Email
     smtp_host: str = "localhost"
@@ -34,6 +40,18 @@ class Settings(BaseSettings):
     from_email: str = "noreply@miraiworks.com"
     from_name: str = "MiraiWorks"
     smtp_from: str = "noreply@miraiworks.com"  # Keep for backward compatibility
+    # Authenticated SMTP connections kept open and reused by the mail worker
+    smtp_pool_size: int = 4
+    smtp_timeout_seconds: float = 30.0
+    smtp_idle_timeout_seconds: float = 60.0
+    # Outbound queue: messages per worker batch, retries with exponential backoff
+    email_queue_batch_size: int = 100
+    email_max_attempts: int = 5
+    email_retry_base_seconds: int = 60
+    email_retry_max_seconds: int = 3600
+    # Messages per recipient domain per minute; overrides as {"gmail.com": 300}
+    email_domain_rate_limit_per_minute: int = 120
+    email_domain_rate_limits: dict[str, int] = Field(default_factory=dict)
 
     # JWT
     jwt_secret: str = Field(default="changeme")
@@ -72,9 +90,61 @@ class Settings(BaseSettings):
     # OpenAI (for transcription/AI features)
     openai_api_key: str | None = None
 
+    # Real-time pub/sub backplane: "redis" (multi-worker) or "memory"
+    pubsub_backend: str = Field(default="redis")
+    video_presence_ttl_seconds: int = Field(default=30)
+    # Per-socket outbound queue for video signaling: "drop_oldest" or "disconnect"
+    video_send_queue_size: int = Field(default=256)
+    video_backpressure_policy: str = Field(default="drop_oldest")
+    # Notification push (SSE): streams per user across workers, presence
+    # expiry, keepalive comments, per-stream queue and replay on resume.
+    # Clients fall back to polling every notification_poll_interval_seconds.
+    notification_stream_enabled: bool = Field(default=True)
+    notification_stream_max_connections_per_user: int = Field(default=5)
+    notification_presence_ttl_seconds: int = Field(default=45)
+    notification_stream_keepalive_seconds: float = Field(default=15.0)
+    notification_stream_queue_size: int = Field(default=100)
+    notification_replay_limit: int = Field(default=100)
+    notification_poll_interval_seconds: int = Field(default=30)
+    # Notification email debounce: "redis" (shared by workers) or "memory".
+    # Emails for a key inside the window are rolled into one digest per
+    # recipient, sent by the periodic flush (up to batch_size per run).
+    email_debounce_backend: str = Field(default="redis")
+    email_digest_window_seconds: int = Field(default=300)
+    email_digest_batch_size: int = Field(default=100)
+
+    # Message search backend: "fulltext" (MySQL ngram index), "memory" or "like"
+    message_search_backend: str = Field(default="fulltext")
+
+    # PDF rendering: "playwright" (pooled browser), "weasyprint" or "fake"
+    pdf_renderer: str = Field(default="playwright")
+    pdf_pool_size: int = Field(default=4)
+    pdf_page_recycle_after: int = Field(default=100)
+    pdf_render_timeout_seconds: float = Field(default=30.0)
+    # Cached PDFs older than this are evicted; extra variants per resume trimmed
+    pdf_cache_ttl_days: int = Field(default=30)
+    pdf_cache_max_variants_per_resume: int = Field(default=5)
+    # Background batch export: resumes rendered at once and per-job limit
+    resume_export_concurrency: int = Field(default=4)
+    resume_export_max_resumes: int = Field(default=500)
+    # Exported PDFs are kept for download this long, then purged
+    resume_export_retention_days: int = Field(default=7)
+
     # File Upload Settings
     upload_directory: str = Field(default="uploads")
     max_file_size: int = Field(default=25 * 1024 * 1024)  # 25MB in bytes
+    # Granted (user, file) download checks are cached this long per worker
+    file_access_cache_ttl_seconds: int = Field(default=60)
+    # Compiled plan entitlements per worker; edits invalidate them explicitly
+    entitlement_cache_ttl_seconds: int = Field(default=300)
+    # Authenticated user snapshots (roles, flags) per worker
+    principal_cache_ttl_seconds: int = Field(default=30)
+    principal_cache_max_entries: int = Field(default=10000)
+    # Compiled workflow graphs per worker; definition edits invalidate them
+    workflow_graph_cache_ttl_seconds: int = Field(default=600)
+    workflow_graph_cache_max_entries: int = Field(default=1000)
+    # Candidates written per transaction by bulk workflow assignment
+    workflow_bulk_assign_chunk_size: int = Field(default=250)
 
     model_config = {"env_file": ".env", "case_sensitive": False}
 
@@ -131,3 +201,6 @@ class Settings(BaseSettings):
 settings = Settings()
 if settings.environment.lower() == "test":
     settings.force_2fa_for_admins = False
+    settings.pubsub_backend = "memory"
+    settings.email_debounce_backend = "memory"
+    settings.pdf_renderer = "fake"
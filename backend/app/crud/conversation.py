@@ -0,0 +1,263 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Row, and_, case, delete, desc, func, insert, or_, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.crud.base import CRUDBase
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.models.user import User
+
+
+class CRUDConversation(CRUDBase[Conversation, Any, Any]):
+    """Conversation summary CRUD operations.
+
+    Writers (``record_message`` / ``mark_read`` / ``mark_all_read``) only
+    stage statements on the session; callers commit them together with the
+    message change they describe.
+    """
+
+    @staticmethod
+    def _partner_id(user_id: int):
+        return case(
+            (Conversation.user_low_id == user_id, Conversation.user_high_id),
+            else_=Conversation.user_low_id,
+        )
+
+    @staticmethod
+    def _unread_count(user_id: int):
+        return case(
+            (Conversation.user_low_id == user_id, Conversation.unread_count_low),
+            else_=Conversation.unread_count_high,
+        )
+
+    @staticmethod
+    def _involves(user_id: int):
+        return or_(
+            Conversation.user_low_id == user_id,
+            Conversation.user_high_id == user_id,
+        )
+
+    @staticmethod
+    def _last_message_id(user_id: int):
+        return case(
+            (Conversation.user_low_id == user_id, Conversation.last_message_id_low),
+            else_=Conversation.last_message_id_high,
+        )
+
+    async def record_message(self, db: AsyncSession, message: Message) -> None:
+        """Upsert the pair summary for a newly written (flushed) message.
+
+        A new message is visible to both sides, so it becomes the latest
+        message of each; last activity is the message's own timestamp.
+        """
+        low_id, high_id = Conversation.ordered_pair(
+            message.sender_id, message.recipient_id
+        )
+        unread_low = 1 if message.recipient_id == low_id else 0
+        # created_at is a server default, so read it back within the statement
+        created_at = (
+            select(Message.created_at).where(Message.id == message.id).scalar_subquery()
+        )
+        stmt = mysql_insert(Conversation).values(
+            user_low_id=low_id,
+            user_high_id=high_id,
+            last_message_id_low=message.id,
+            last_message_id_high=message.id,
+            last_activity_at=created_at,
+            unread_count_low=unread_low,
+            unread_count_high=1 - unread_low,
+        )
+        stmt = stmt.on_duplicate_key_update(
+            last_message_id_low=func.greatest(
+                func.coalesce(Conversation.last_message_id_low, 0),
+                stmt.inserted.last_message_id_low,
+            ),
+            last_message_id_high=func.greatest(
+                func.coalesce(Conversation.last_message_id_high, 0),
+                stmt.inserted.last_message_id_high,
+            ),
+            last_activity_at=func.greatest(
+                Conversation.last_activity_at, stmt.inserted.last_activity_at
+            ),
+            unread_count_low=Conversation.unread_count_low
+            + stmt.inserted.unread_count_low,
+            unread_count_high=Conversation.unread_count_high
+            + stmt.inserted.unread_count_high,
+        )
+        await db.execute(stmt)
+
+    async def mark_read(
+        self, db: AsyncSession, reader_id: int, read_counts: dict[int, int]
+    ) -> None:
+        """Decrement the reader's unread counters.
+
+        ``read_counts`` maps each sender id to the number of their messages the
+        reader has just marked as read.
+        """
+        for sender_id, count in read_counts.items():
+            if count <= 0:
+                continue
+            low_id, high_id = Conversation.ordered_pair(reader_id, sender_id)
+            column = "unread_count_low" if reader_id == low_id else "unread_count_high"
+            current = getattr(Conversation, column)
+            await db.execute(
+                update(Conversation)
+                .where(
+                    Conversation.user_low_id == low_id,
+                    Conversation.user_high_id == high_id,
+                )
+                .values({column: func.greatest(current - count, 0)})
+            )
+
+    async def mark_all_read(
+        self, db: AsyncSession, reader_id: int, other_user_id: int
+    ) -> None:
+        """Reset the reader's unread counter for one conversation."""
+        low_id, high_id = Conversation.ordered_pair(reader_id, other_user_id)
+        column = "unread_count_low" if reader_id == low_id else "unread_count_high"
+        await db.execute(
+            update(Conversation)
+            .where(
+                Conversation.user_low_id == low_id,
+                Conversation.user_high_id == high_id,
+            )
+            .values({column: 0})
+        )
+
+    async def get_inbox_page(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        *,
+        search_query: str | None = None,
+        limit: int | None = None,
+        before: tuple[datetime, int] | None = None,
+    ) -> list[Row]:
+        """Get one page of conversation partners from the summary table.
+
+        Each row carries the partner ``User`` (company eager-loaded), the last
+        activity timestamp, the id of the latest message visible to ``user_id``
+        and the unread count for ``user_id``. Rows are ordered by
+        ``(last_activity, partner id)`` descending; ``before`` is the keyset
+        position of the previous page.
+        """
+        partner_id = self._partner_id(user_id)
+        query = (
+            select(
+                User,
+                Conversation.last_activity_at.label("last_activity"),
+                self._last_message_id(user_id).label("last_message_id"),
+                self._unread_count(user_id).label("unread_count"),
+            )
+            .select_from(Conversation)
+            .join(User, User.id == partner_id)
+            .where(self._involves(user_id))
+            .options(selectinload(User.company))
+        )
+
+        if search_query:
+            search_term = f"%{search_query}%"
+            query = query.where(
+                or_(
+                    func.concat(User.first_name, " ", User.last_name).ilike(
+                        search_term
+                    ),
+                    User.email.ilike(search_term),
+                )
+            )
+
+        if before:
+            before_activity, before_partner_id = before
+            query = query.where(
+                or_(
+                    Conversation.last_activity_at < before_activity,
+                    and_(
+                        Conversation.last_activity_at == before_activity,
+                        partner_id < before_partner_id,
+                    ),
+                )
+            )
+
+        query = query.order_by(desc(Conversation.last_activity_at), desc(partner_id))
+        if limit is not None:
+            query = query.limit(limit)
+
+        result = await db.execute(query)
+        return list(result.all())
+
+    async def get_total_unread(self, db: AsyncSession, user_id: int) -> int:
+        """Get the total unread message count for a user across conversations."""
+        result = await db.execute(
+            select(func.coalesce(func.sum(self._unread_count(user_id)), 0)).where(
+                self._involves(user_id)
+            )
+        )
+        return int(result.scalar() or 0)
+
+    async def rebuild(self, db: AsyncSession) -> int:
+        """Rebuild every conversation summary from the ``messages`` table.
+
+        Used to backfill existing data; returns the number of summaries written.
+        """
+        user_low = func.least(Message.sender_id, Message.recipient_id)
+        user_high = func.greatest(Message.sender_id, Message.recipient_id)
+        unread = and_(~Message.is_read, ~Message.is_deleted_by_recipient)
+
+        def visible_to(side):
+            return or_(
+                and_(Message.sender_id == side, ~Message.is_deleted_by_sender),
+                and_(Message.recipient_id == side, ~Message.is_deleted_by_recipient),
+            )
+
+        source = select(
+            user_low.label("user_low_id"),
+            user_high.label("user_high_id"),
+            func.max(case((visible_to(user_low), Message.id))).label(
+                "last_message_id_low"
+            ),
+            func.max(case((visible_to(user_high), Message.id))).label(
+                "last_message_id_high"
+            ),
+            func.max(Message.created_at).label("last_activity_at"),
+            func.sum(
+                case((and_(unread, Message.recipient_id == user_low), 1), else_=0)
+            ).label("unread_count_low"),
+            func.sum(
+                case(
+                    (
+                        and_(
+                            unread,
+                            Message.recipient_id == user_high,
+                            Message.sender_id != Message.recipient_id,
+                        ),
+                        1,
+                    ),
+                    else_=0,
+                )
+            ).label("unread_count_high"),
+        ).group_by(user_low, user_high)
+
+        await db.execute(delete(Conversation))
+        result = await db.execute(
+            insert(Conversation).from_select(
+                [
+                    "user_low_id",
+                    "user_high_id",
+                    "last_message_id_low",
+                    "last_message_id_high",
+                    "last_activity_at",
+                    "unread_count_low",
+                    "unread_count_high",
+                ],
+                source,
+            )
+        )
+        await db.commit()
+        return result.rowcount
+
+
+conversation = CRUDConversation(Conversation)
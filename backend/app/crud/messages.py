@@ -5,6 +5,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.crud.base import CRUDBase
+from app.crud.conversation import conversation as conversation_crud
+from app.models.conversation import Conversation
 from app.models.message import Message
 from app.models.role import Role, UserRole
 from app.models.user import User
@@ -60,6 +62,8 @@ async def create_message(
         type=message_type,
     )
     db.add(message)
+    await db.flush()
+    await conversation_crud.record_message(db, message)
     await db.commit()
     await db.refresh(message)
     return message
@@ -90,10 +94,11 @@ async def mark_messages_as_read(
                 Message.read_at.is_(None),
             )
         )
-        .values(read_at=get_utc_now())
+        .values(is_read=True, read_at=get_utc_now())
     )
 
     result = await db.execute(query)
+    await conversation_crud.mark_read(db, recipient_id, {sender_id: result.rowcount})
     await db.commit()
     return result.rowcount
 
@@ -103,22 +108,14 @@ async def get_conversation_partners(
     user_id: int,
 ) -> list[dict]:
     """Get all users who have had conversations with the given user."""
-    # Subquery to get the latest message for each conversation
-    latest_message_subquery = (
-        select(
-            func.greatest(Message.sender_id, Message.recipient_id).label("user1"),
-            func.least(Message.sender_id, Message.recipient_id).label("user2"),
-            func.max(Message.created_at).label("latest_message_time"),
-        )
-        .where(or_(Message.sender_id == user_id, Message.recipient_id == user_id))
-        .group_by(
-            func.greatest(Message.sender_id, Message.recipient_id),
-            func.least(Message.sender_id, Message.recipient_id),
-        )
-        .subquery()
+    partner_id = case(
+        (Conversation.user_low_id == user_id, Conversation.user_high_id),
+        else_=Conversation.user_low_id,
+    )
+    last_message_id = case(
+        (Conversation.user_low_id == user_id, Conversation.last_message_id_low),
+        else_=Conversation.last_message_id_high,
     )
-
-    # Query to get conversation partners with latest message info
     query = (
         select(
             User.id,
@@ -128,53 +125,21 @@ async def get_conversation_partners(
             Message.content.label("last_message"),
             Message.created_at.label("last_message_time"),
             Message.sender_id.label("last_sender_id"),
-            func.count(
-                case(
-                    (
-                        Message.read_at.is_(None) & (Message.recipient_id == user_id),
-                        1,
-                    )
-                )
+            case(
+                (Conversation.user_low_id == user_id, Conversation.unread_count_low),
+                else_=Conversation.unread_count_high,
             ).label("unread_count"),
         )
-        .select_from(latest_message_subquery)
-        .join(
-            Message,
-            and_(
-                or_(
-                    and_(
-                        Message.sender_id == latest_message_subquery.c.user1,
-                        Message.recipient_id == latest_message_subquery.c.user2,
-                    ),
-                    and_(
-                        Message.sender_id == latest_message_subquery.c.user2,
-                        Message.recipient_id == latest_message_subquery.c.user1,
-                    ),
-                ),
-                Message.created_at == latest_message_subquery.c.latest_message_time,
-            ),
-        )
-        .join(
-            User,
-            User.id
-            == case(
-                (
-                    latest_message_subquery.c.user1 == user_id,
-                    latest_message_subquery.c.user2,
-                ),
-                else_=latest_message_subquery.c.user1,
-            ),
-        )
-        .group_by(
-            User.id,
-            User.first_name,
-            User.last_name,
-            User.email,
-            Message.content,
-            Message.created_at,
-            Message.sender_id,
+        .select_from(Conversation)
+        .join(User, User.id == partner_id)
+        .join(Message, Message.id == last_message_id)
+        .where(
+            or_(
+                Conversation.user_low_id == user_id,
+                Conversation.user_high_id == user_id,
+            )
         )
-        .order_by(desc(Message.created_at))
+        .order_by(desc(Conversation.last_activity_at))
     )
 
     result = await db.execute(query)
@@ -183,15 +148,7 @@ async def get_conversation_partners(
 
 async def get_unread_message_count(db: AsyncSession, user_id: int) -> int:
     """Get total unread message count for user."""
-    query = select(func.count(Message.id)).where(
-        and_(
-            Message.recipient_id == user_id,
-            Message.read_at.is_(None),
-        )
-    )
-
-    result = await db.execute(query)
-    return result.scalar() or 0
+    return await conversation_crud.get_total_unread(db, user_id)
 
 
 class CRUDMessage(CRUDBase[Message, Any, Any]):
@@ -286,6 +243,23 @@ class CRUDMessage(CRUDBase[Message, Any, Any]):
 
         return list(messages_result.scalars().all()), count_result.scalar() or 0
 
+    async def get_messages_by_ids(
+        self, db: AsyncSession, message_ids: list[int]
+    ) -> dict[int, Message]:
+        """Get messages with sender and recipient, keyed by message id."""
+        if not message_ids:
+            return {}
+
+        result = await db.execute(
+            select(Message)
+            .options(
+                selectinload(Message.sender),
+                selectinload(Message.recipient),
+            )
+            .where(Message.id.in_(message_ids))
+        )
+        return {msg.id: msg for msg in result.scalars().all()}
+
     async def get_message_participants(
         self,
         db: AsyncSession,
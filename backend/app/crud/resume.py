@@ -124,6 +124,30 @@ class CRUDResume(CRUDBase[Resume, ResumeCreate, ResumeUpdate]):
         result = await db.execute(query)
         return result.scalars().first()
 
+    async def get_many_with_details(
+        self, db: AsyncSession, *, ids: list[int], user_id: int
+    ) -> dict[int, Resume]:
+        """Get several resumes owned by a user, with related details, by id"""
+        if not ids:
+            return {}
+        query = (
+            select(Resume)
+            .options(
+                selectinload(Resume.sections),
+                selectinload(Resume.experiences),
+                selectinload(Resume.educations),
+                selectinload(Resume.skills),
+                selectinload(Resume.projects),
+                selectinload(Resume.certifications),
+                selectinload(Resume.languages),
+                selectinload(Resume.references),
+            )
+            .where(and_(Resume.id.in_(ids), Resume.user_id == user_id))
+        )
+
+        result = await db.execute(query)
+        return {resume.id: resume for resume in result.scalars().all()}
+
     async def get_public_by_slug(self, db: AsyncSession, *, slug: str) -> Resume | None:
         """Get public resume by slug"""
         query = (
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.crud.base import CRUDBase
 from app.models.todo_attachment import TodoAttachment
 from app.schemas.todo_attachment import TodoAttachmentCreate, TodoAttachmentUpdate
+from app.services.file_access_service import file_access_service, normalize_file_key
 from app.services.file_storage_service import file_storage_service
 
 
@@ -35,10 +36,21 @@ class CRUDTodoAttachment(
         )
 
         db.add(db_obj)
+        storage_key = normalize_file_key(db_obj.file_path)
+        if storage_key and db_obj.uploaded_by:
+            file_access_service.grant(
+                db, storage_key, [db_obj.uploaded_by], todo_id=db_obj.todo_id
+            )
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
 
+    @staticmethod
+    async def _revoke_file_access(db: AsyncSession, file_path: str) -> None:
+        storage_key = normalize_file_key(file_path)
+        if storage_key:
+            await file_access_service.revoke(db, storage_key)
+
     async def get_todo_attachments(
         self, db: AsyncSession, *, todo_id: int, skip: int = 0, limit: int = 100
     ) -> list[TodoAttachment]:
@@ -152,6 +164,7 @@ class CRUDTodoAttachment(
 
         # Delete from database
         await db.delete(attachment)
+        await self._revoke_file_access(db, file_path)
         await db.commit()
 
         # Delete physical file if requested
@@ -185,6 +198,7 @@ class CRUDTodoAttachment(
             try:
                 file_paths.append(attachment.file_path)
                 await db.delete(attachment)
+                await self._revoke_file_access(db, attachment.file_path)
                 deleted_count += 1
             except Exception as e:
                 failed_deletions.append(
@@ -339,6 +353,7 @@ class CRUDTodoAttachment(
         deleted_count = 0
         for attachment in orphaned_records:
             await db.delete(attachment)
+            await self._revoke_file_access(db, attachment.file_path)
             deleted_count += 1
 
         await db.commit()
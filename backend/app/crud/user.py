@@ -7,6 +7,7 @@ from app.models import User, UserRole
 from app.models.company import Company
 from app.models.role import Role
 from app.schemas.user import UserCreate, UserUpdate
+from app.services.principal_cache import principal_cache
 from app.utils.constants import UserRole as UserRoleEnum
 from app.utils.datetime_utils import get_utc_now
 
@@ -142,6 +143,20 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         result = await db.execute(admin_query)
         return result.scalar() or 0
 
+    async def get_names(self, db: AsyncSession, user_ids: list[int]) -> dict[int, str]:
+        """Full names of the users in ``user_ids`` that exist and are not deleted."""
+        if not user_ids:
+            return {}
+        result = await db.execute(
+            select(User.id, User.first_name, User.last_name).where(
+                and_(User.id.in_(user_ids), ~User.is_deleted)
+            )
+        )
+        return {
+            user_id: f"{first_name} {last_name}"
+            for user_id, first_name, last_name in result.all()
+        }
+
     async def bulk_delete(
         self, db: AsyncSession, user_ids: list[int], deleted_by: int
     ) -> tuple[int, list[str]]:
@@ -166,6 +181,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
                 errors.append(f"Error deleting user {user_id}: {str(e)}")
 
         await db.commit()
+        await principal_cache.invalidate_users(user_ids)
         return deleted_count, errors
 
     async def bulk_suspend(
@@ -192,6 +208,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
                 errors.append(f"Error suspending user {user_id}: {str(e)}")
 
         await db.commit()
+        await principal_cache.invalidate_users(user_ids)
         return suspended_count, errors
 
     async def bulk_unsuspend(
@@ -218,6 +235,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
                 errors.append(f"Error unsuspending user {user_id}: {str(e)}")
 
         await db.commit()
+        await principal_cache.invalidate_users(user_ids)
         return unsuspended_count, errors
 
     async def assign_roles(
@@ -240,6 +258,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
                 db.add(user_role)
 
         await db.commit()
+        await principal_cache.invalidate_user(user_id)
 
     async def soft_delete(self, db: AsyncSession, user_id: int, deleted_by: int):  # type: ignore[override]
         """Soft delete a user."""
@@ -250,6 +269,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             user.deleted_by = deleted_by
             user.is_active = False
             await db.commit()
+            await principal_cache.invalidate_user(user_id)
         return user
 
     async def suspend_user(self, db: AsyncSession, user_id: int, suspended_by: int):
@@ -260,6 +280,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             user.suspended_at = get_utc_now()
             user.suspended_by = suspended_by
             await db.commit()
+            await principal_cache.invalidate_user(user_id)
         return user
 
     async def unsuspend_user(self, db: AsyncSession, user_id: int):
@@ -270,6 +291,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             user.suspended_at = None
             user.suspended_by = None
             await db.commit()
+            await principal_cache.invalidate_user(user_id)
         return user
 
 
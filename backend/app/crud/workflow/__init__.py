@@ -5,6 +5,7 @@ from app.crud.workflow.candidate_workflow import (
     candidate_workflow,
 )
 from app.crud.workflow.workflow import CRUDWorkflow, workflow
+from app.crud.workflow.workflow_event import CRUDWorkflowEvent, workflow_event
 from app.crud.workflow.workflow_node import CRUDWorkflowNode, workflow_node
 from app.crud.workflow.workflow_node_connection import (
     CRUDWorkflowNodeConnection,
@@ -27,6 +28,8 @@ __all__ = [
     "candidate_workflow",
     "CRUDWorkflowNodeConnection",
     "workflow_node_connection",
+    "CRUDWorkflowEvent",
+    "workflow_event",
     "CRUDWorkflowNodeExecution",
     "workflow_node_execution",
 ]
@@ -1,6 +1,7 @@
+from datetime import datetime
 from typing import Any
 
-from sqlalchemy import and_, desc, func, select
+from sqlalchemy import and_, desc, func, insert, literal_column, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -130,7 +131,7 @@ class CRUDCandidateWorkflow(CRUDBase[CandidateWorkflow, Any, Any]):
             select(CandidateWorkflow)
             .options(
                 selectinload(CandidateWorkflow.candidate),
-                selectinload(CandidateWorkflow.process),  # type: ignore[attr-defined]
+                selectinload(CandidateWorkflow.workflow),
                 selectinload(CandidateWorkflow.current_node),
                 selectinload(CandidateWorkflow.assigned_recruiter),
                 selectinload(CandidateWorkflow.executions).selectinload(
@@ -141,6 +142,20 @@ class CRUDCandidateWorkflow(CRUDBase[CandidateWorkflow, Any, Any]):
         )
         return result.scalars().first()
 
+    async def get_with_workflow(
+        self, db: AsyncSession, *, id: int
+    ) -> CandidateWorkflow | None:
+        """Get candidate process with only its candidate and workflow loaded"""
+        result = await db.execute(
+            select(CandidateWorkflow)
+            .options(
+                selectinload(CandidateWorkflow.candidate),
+                selectinload(CandidateWorkflow.workflow),
+            )
+            .where(CandidateWorkflow.id == id)
+        )
+        return result.scalars().first()
+
     async def assign_recruiter(
         self,
         db: AsyncSession,
@@ -240,7 +255,43 @@ class CRUDCandidateWorkflow(CRUDBase[CandidateWorkflow, Any, Any]):
         await db.refresh(candidate_workflow)
         return candidate_workflow
 
-    async def bulk_assign_candidates(
+    async def get_assigned_candidate_ids(
+        self, db: AsyncSession, *, workflow_id: int, candidate_ids: list[int]
+    ) -> set[int]:
+        """Which of ``candidate_ids`` are already in the workflow (one query)"""
+        if not candidate_ids:
+            return set()
+        result = await db.execute(
+            select(CandidateWorkflow.candidate_id).where(
+                and_(
+                    CandidateWorkflow.workflow_id == workflow_id,
+                    CandidateWorkflow.candidate_id.in_(candidate_ids),
+                )
+            )
+        )
+        return set(result.scalars().all())
+
+    async def get_by_candidate_ids(
+        self, db: AsyncSession, *, workflow_id: int, candidate_ids: list[int]
+    ) -> list[CandidateWorkflow]:
+        """Candidate workflows of ``candidate_ids`` in the workflow, in id order"""
+        if not candidate_ids:
+            return []
+        result = await db.execute(
+            select(CandidateWorkflow)
+            .where(
+                and_(
+                    CandidateWorkflow.workflow_id == workflow_id,
+                    CandidateWorkflow.candidate_id.in_(candidate_ids),
+                )
+            )
+            .order_by(CandidateWorkflow.id)
+            # Bulk UPDATEs may have changed rows already in the session
+            .execution_options(populate_existing=True)
+        )
+        return list(result.scalars().all())
+
+    async def insert_many(
         self,
         db: AsyncSession,
         *,
@@ -248,126 +299,127 @@ class CRUDCandidateWorkflow(CRUDBase[CandidateWorkflow, Any, Any]):
         candidate_ids: list[int],
         assigned_recruiter_id: int | None = None,
     ) -> list[CandidateWorkflow]:
-        """Bulk assign candidates to a process"""
-        candidate_workflows = []
-
-        for candidate_id in candidate_ids:
-            # Check if already exists
-            existing = await self.get_by_candidate_and_workflow(
-                db, candidate_id=candidate_id, workflow_id=workflow_id
-            )
-
-            if not existing:
-                candidate_workflow_data = {
-                    "candidate_id": candidate_id,
-                    "workflow_id": workflow_id,
-                    "assigned_recruiter_id": assigned_recruiter_id,
-                    "assigned_at": get_utc_now() if assigned_recruiter_id else None,
-                }
+        """Assign candidates with one multi-row INSERT; the caller commits.
 
-                candidate_workflow = CandidateWorkflow(**candidate_workflow_data)
-                db.add(candidate_workflow)
-                candidate_workflows.append(candidate_workflow)
-
-        if candidate_workflows:
-            await db.commit()
-            for cp in candidate_workflows:
-                await db.refresh(cp)
-
-        return candidate_workflows
-
-    async def get_timeline(
-        self, db: AsyncSession, *, candidate_workflow_id: int
-    ) -> list[dict[str, Any]]:
-        """Get timeline for a candidate process"""
-        candidate_workflow = await self.get_with_details(db, id=candidate_workflow_id)
-        if not candidate_workflow:
+        MySQL has no RETURNING, so the new rows are read back through the
+        (candidate, workflow) unique key. Candidates that are already
+        assigned make the INSERT fail; filter them out first.
+        """
+        if not candidate_ids:
             return []
-
-        timeline = []
-
-        # Add process start event
-        if candidate_workflow.started_at:
-            timeline.append(
-                {
-                    "timestamp": candidate_workflow.started_at,
-                    "event_type": "process_started",
-                    "title": "Process Started",
-                    "description": f"Started workflow: {candidate_workflow.process.name}",  # type: ignore[attr-defined]
-                    "icon": "play",
-                }
-            )
-
-        # Add execution events
-        for execution in sorted(
-            candidate_workflow.executions, key=lambda x: x.created_at
-        ):
-            # Node started
-            if execution.started_at:
-                timeline.append(
+        assigned_at = get_utc_now() if assigned_recruiter_id else None
+        await db.execute(
+            insert(CandidateWorkflow).values(
+                [
                     {
-                        "timestamp": execution.started_at,
-                        "event_type": "node_started",
-                        "node_id": execution.node_id,
-                        "title": f"Started: {execution.node.title}",
-                        "description": f"Started {execution.node.node_type}: {execution.node.title}",
-                        "icon": "play-circle",
+                        "candidate_id": candidate_id,
+                        "workflow_id": workflow_id,
+                        "assigned_recruiter_id": assigned_recruiter_id,
+                        "assigned_at": assigned_at,
                     }
-                )
+                    for candidate_id in candidate_ids
+                ]
+            )
+        )
+        return await self.get_by_candidate_ids(
+            db, workflow_id=workflow_id, candidate_ids=candidate_ids
+        )
 
-            # Node completed
-            if execution.completed_at:
-                timeline.append(
-                    {
-                        "timestamp": execution.completed_at,
-                        "event_type": "node_completed",
-                        "node_id": execution.node_id,
-                        "title": f"Completed: {execution.node.title}",
-                        "description": f"Completed with result: {execution.result}",
-                        "result": execution.result,
-                        "score": execution.score,
-                        "feedback": execution.feedback,
-                        "icon": "check-circle"
-                        if execution.result in ["pass", "approved"]
-                        else "x-circle",
-                    }
+    async def start_many(
+        self,
+        db: AsyncSession,
+        *,
+        candidate_workflow_ids: list[int],
+        first_node_id: int,
+    ) -> int:
+        """Start not-started candidate workflows with one UPDATE; the caller
+        commits. Returns the number of workflows started."""
+        if not candidate_workflow_ids:
+            return 0
+        result = await db.execute(
+            update(CandidateWorkflow)
+            .where(
+                and_(
+                    CandidateWorkflow.id.in_(candidate_workflow_ids),
+                    CandidateWorkflow.status == "not_started",
                 )
-
-        # Add process completion event
-        if candidate_workflow.completed_at:
-            timeline.append(
-                {
-                    "timestamp": candidate_workflow.completed_at,
-                    "event_type": "process_completed",
-                    "title": "Process Completed",
-                    "description": f"Process completed with result: {candidate_workflow.final_result}",
-                    "result": candidate_workflow.final_result,
-                    "score": candidate_workflow.overall_score,
-                    "icon": "flag",
-                }
             )
+            .values(
+                status="in_progress",
+                current_node_id=first_node_id,
+                started_at=get_utc_now(),
+            )
+        )
+        return result.rowcount
 
-        # Sort by timestamp
-        return sorted(timeline, key=lambda x: x["timestamp"])
+    async def bulk_assign_candidates(
+        self,
+        db: AsyncSession,
+        *,
+        workflow_id: int,
+        candidate_ids: list[int],
+        assigned_recruiter_id: int | None = None,
+    ) -> list[CandidateWorkflow]:
+        """Bulk assign candidates to a process; skips ones already assigned"""
+        candidate_ids = list(dict.fromkeys(candidate_ids))
+        existing = await self.get_assigned_candidate_ids(
+            db, workflow_id=workflow_id, candidate_ids=candidate_ids
+        )
+        candidate_workflows = await self.insert_many(
+            db,
+            workflow_id=workflow_id,
+            candidate_ids=[c for c in candidate_ids if c not in existing],
+            assigned_recruiter_id=assigned_recruiter_id,
+        )
+        if candidate_workflows:
+            await db.commit()
+        return candidate_workflows
 
     async def get_statistics_by_workflow(
-        self, db: AsyncSession, *, workflow_id: int
+        self,
+        db: AsyncSession,
+        *,
+        workflow_id: int,
+        since: datetime | None = None,
+        until: datetime | None = None,
     ) -> dict[str, Any]:
-        """Get statistics for candidate workflows in a specific workflow"""
-        # Count candidates by status
-        status_counts = await db.execute(
+        """Get statistics for candidate workflows in a specific workflow.
+
+        One grouped query. ``since``/``until`` keep candidates assigned in
+        ``[since, until)``.
+        """
+        duration = func.timestampdiff(
+            literal_column("SECOND"),
+            CandidateWorkflow.started_at,
+            CandidateWorkflow.completed_at,
+        )
+        conditions = [CandidateWorkflow.workflow_id == workflow_id]
+        if since:
+            conditions.append(CandidateWorkflow.created_at >= since)
+        if until:
+            conditions.append(CandidateWorkflow.created_at < until)
+
+        result = await db.execute(
             select(
                 CandidateWorkflow.status,
-                func.count(CandidateWorkflow.id).label("count"),
+                func.count(CandidateWorkflow.id),
+                func.sum(duration),
+                func.count(duration),
             )
-            .where(CandidateWorkflow.workflow_id == workflow_id)
+            .where(and_(*conditions))
             .group_by(CandidateWorkflow.status)
         )
 
-        status_dict = {row[0]: row[1] for row in status_counts.all()}
+        status_dict = {}
+        completed_seconds = 0.0
+        completed_timed = 0
+        for status, count, seconds, timed in result.all():
+            status_dict[status] = count
+            if status == "completed":
+                completed_seconds = float(seconds or 0)
+                completed_timed = timed
 
-        # Calculate completion rate
-        total_candidates = sum(list(status_dict.values()))
+        total_candidates = sum(status_dict.values())
         completed_candidates = status_dict.get("completed", 0)
         completion_rate = (
             (completed_candidates / total_candidates * 100)
@@ -375,33 +427,13 @@ class CRUDCandidateWorkflow(CRUDBase[CandidateWorkflow, Any, Any]):
             else 0
         )
 
-        # Calculate average duration
-        avg_duration_result = await db.execute(
-            select(
-                func.avg(
-                    func.extract(
-                        "epoch",
-                        CandidateWorkflow.completed_at - CandidateWorkflow.started_at,
-                    )
-                    / 86400
-                )
-            ).where(
-                and_(
-                    CandidateWorkflow.workflow_id == workflow_id,
-                    CandidateWorkflow.status == "completed",
-                    CandidateWorkflow.started_at.isnot(None),
-                    CandidateWorkflow.completed_at.isnot(None),
-                )
-            )
-        )
-
-        avg_duration = avg_duration_result.scalar() or 0
-
         return {
             "total_candidates": total_candidates,
             "by_status": status_dict,
             "completion_rate": completion_rate,
-            "average_duration_days": avg_duration,
+            "average_duration_days": (
+                completed_seconds / completed_timed / 86400 if completed_timed else 0
+            ),
         }
 
     async def get_recruiter_workload(
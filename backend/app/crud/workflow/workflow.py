@@ -11,6 +11,7 @@ from app.models.todo import Todo
 from app.models.workflow import Workflow
 from app.models.workflow_node import WorkflowNode
 from app.models.workflow_viewer import WorkflowViewer
+from app.services.workflow.workflow_graph import workflow_graphs
 from app.utils.datetime_utils import get_utc_now
 
 
@@ -198,6 +199,7 @@ class CRUDWorkflow(CRUDBase[Workflow, Any, Any]):
         db_obj.activate(activated_by)
         await db.commit()
         await db.refresh(db_obj)
+        await workflow_graphs.invalidate(db_obj.id)
         return db_obj
 
     async def archive(
@@ -216,6 +218,7 @@ class CRUDWorkflow(CRUDBase[Workflow, Any, Any]):
         db_obj.deactivate(deactivated_by)
         await db.commit()
         await db.refresh(db_obj)
+        await workflow_graphs.invalidate(db_obj.id)
         return db_obj
 
     async def clone(
@@ -284,6 +287,7 @@ class CRUDWorkflow(CRUDBase[Workflow, Any, Any]):
 
         await db.commit()
         await db.refresh(cloned_process)
+        await workflow_graphs.invalidate(cloned_process.id)
         return cloned_process
 
     async def get_statistics(
@@ -0,0 +1,77 @@
+from typing import Any
+
+from sqlalchemy import and_, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models.workflow_event import WorkflowEvent
+
+
+class CRUDWorkflowEvent(CRUDBase[WorkflowEvent, Any, Any]):
+    async def record(
+        self,
+        db: AsyncSession,
+        *,
+        candidate_workflow_id: int,
+        workflow_id: int,
+        event_type: str,
+        node_id: int | None = None,
+        execution_id: int | None = None,
+        actor_id: int | None = None,
+        result: str | None = None,
+        score: float | None = None,
+        data: dict[str, Any] | None = None,
+    ) -> WorkflowEvent:
+        """Append an event to a candidate workflow's log"""
+        event = WorkflowEvent(
+            candidate_workflow_id=candidate_workflow_id,
+            workflow_id=workflow_id,
+            event_type=event_type,
+            node_id=node_id,
+            execution_id=execution_id,
+            actor_id=actor_id,
+            result=result,
+            score=score,
+            data=data,
+        )
+        db.add(event)
+        await db.commit()
+        return event
+
+    async def insert_many(
+        self, db: AsyncSession, *, rows: list[dict[str, Any]]
+    ) -> None:
+        """Append events with one multi-row INSERT; the caller commits.
+
+        Every row needs the same keys; ``occurred_at`` defaults to now.
+        """
+        if rows:
+            await db.execute(insert(WorkflowEvent).values(rows))
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        candidate_workflow_id: int,
+        after: int | None = None,
+        limit: int = 100,
+    ) -> list[WorkflowEvent]:
+        """Events of a candidate workflow in log order, after event ``after``.
+
+        Keyset pagination on the event id: pass the last id of a page to get
+        the next one, or the last id seen to poll for new events.
+        """
+        conditions = [WorkflowEvent.candidate_workflow_id == candidate_workflow_id]
+        if after is not None:
+            conditions.append(WorkflowEvent.id > after)
+
+        result = await db.execute(
+            select(WorkflowEvent)
+            .where(and_(*conditions))
+            .order_by(WorkflowEvent.id)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+
+workflow_event = CRUDWorkflowEvent(WorkflowEvent)
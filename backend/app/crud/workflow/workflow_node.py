@@ -8,6 +8,7 @@ from app.crud.base import CRUDBase
 from app.models.workflow_node import WorkflowNode
 from app.models.workflow_node_connection import WorkflowNodeConnection
 from app.models.workflow_node_execution import WorkflowNodeExecution
+from app.services.workflow.workflow_graph import workflow_graphs
 from app.utils.datetime_utils import get_utc_now
 
 
@@ -29,6 +30,7 @@ class CRUDWorkflowNode(CRUDBase[WorkflowNode, Any, Any]):
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
+        await workflow_graphs.invalidate(db_obj.workflow_id)
         return db_obj
 
     async def get_by_workflow_id(
@@ -152,7 +154,9 @@ class CRUDWorkflowNode(CRUDBase[WorkflowNode, Any, Any]):
         update_data["updated_by"] = updated_by
         update_data["updated_at"] = get_utc_now()
 
-        return await super().update(db, db_obj=db_obj, obj_in=update_data)
+        node = await super().update(db, db_obj=db_obj, obj_in=update_data)
+        await workflow_graphs.invalidate(node.workflow_id)
+        return node
 
     async def reorder_nodes(
         self,
@@ -188,6 +192,7 @@ class CRUDWorkflowNode(CRUDBase[WorkflowNode, Any, Any]):
             node.sequence_order = final_sequence
 
         await db.commit()
+        await workflow_graphs.invalidate(workflow_id)
 
         # Refresh all nodes
         result_nodes = []
@@ -204,6 +209,7 @@ class CRUDWorkflowNode(CRUDBase[WorkflowNode, Any, Any]):
         db_obj.activate(updated_by)
         await db.commit()
         await db.refresh(db_obj)
+        await workflow_graphs.invalidate(db_obj.workflow_id)
         return db_obj
 
     async def deactivate_node(
@@ -213,6 +219,7 @@ class CRUDWorkflowNode(CRUDBase[WorkflowNode, Any, Any]):
         db_obj.deactivate(updated_by)
         await db.commit()
         await db.refresh(db_obj)
+        await workflow_graphs.invalidate(db_obj.workflow_id)
         return db_obj
 
     async def get_node_statistics(
@@ -387,8 +394,10 @@ class CRUDWorkflowNode(CRUDBase[WorkflowNode, Any, Any]):
         # Delete the node
         node = await self.get(db, id=node_id)
         if node:
+            workflow_id = node.workflow_id
             await db.delete(node)
             await db.commit()
+            await workflow_graphs.invalidate(workflow_id)
 
         return True
 
@@ -428,6 +437,7 @@ class CRUDWorkflowNode(CRUDBase[WorkflowNode, Any, Any]):
         db.add(duplicate_node)
         await db.commit()
         await db.refresh(duplicate_node)
+        await workflow_graphs.invalidate(duplicate_node.workflow_id)
         return duplicate_node
 
 
@@ -5,7 +5,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.crud.base import CRUDBase
+from app.models.workflow_node import WorkflowNode
 from app.models.workflow_node_connection import WorkflowNodeConnection
+from app.services.workflow.graph_analysis import (
+    GraphAnalysis,
+    analyze_graph,
+    flow_validation_result,
+)
+from app.services.workflow.workflow_graph import workflow_graphs
 
 
 class CRUDWorkflowNodeConnection(CRUDBase[WorkflowNodeConnection, Any, Any]):
@@ -17,6 +24,7 @@ class CRUDWorkflowNodeConnection(CRUDBase[WorkflowNodeConnection, Any, Any]):
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
+        await workflow_graphs.invalidate(db_obj.workflow_id)
         return db_obj
 
     async def get_by_workflow_id(
@@ -130,14 +138,17 @@ class CRUDWorkflowNodeConnection(CRUDBase[WorkflowNodeConnection, Any, Any]):
 
         await db.commit()
         await db.refresh(connection)
+        await workflow_graphs.invalidate(connection.workflow_id)
         return connection
 
     async def delete_connection(
         self, db: AsyncSession, *, connection: WorkflowNodeConnection
     ) -> bool:
         """Delete a node connection"""
+        workflow_id = connection.workflow_id
         await db.delete(connection)
         await db.commit()
+        await workflow_graphs.invalidate(workflow_id)
         return True
 
     async def delete_connections_for_node(
@@ -155,10 +166,14 @@ class CRUDWorkflowNodeConnection(CRUDBase[WorkflowNodeConnection, Any, Any]):
         )
 
         # Delete them
+        workflow_ids = set()
         for connection in connections.scalars().all():
+            workflow_ids.add(connection.workflow_id)
             await db.delete(connection)
 
         await db.commit()
+        for workflow_id in workflow_ids:
+            await workflow_graphs.invalidate(workflow_id)
         return True
 
     async def bulk_create_connections(
@@ -192,112 +207,62 @@ class CRUDWorkflowNodeConnection(CRUDBase[WorkflowNodeConnection, Any, Any]):
             await db.commit()
             for connection in new_connections:
                 await db.refresh(connection)
+            await workflow_graphs.invalidate(workflow_id)
 
         return new_connections
 
-    async def validate_workflow_flow(
+    async def get_edges(
         self, db: AsyncSession, *, workflow_id: int
-    ) -> dict[str, Any]:
-        """Validate the flow of a workflow"""
-        # Get all connections and nodes for the workflow
-        connections = await self.get_by_workflow_id(db, workflow_id=workflow_id)
-
-        # Import here to avoid circular imports
-        from app.crud.workflow.workflow_node import workflow_node
-
-        nodes = await workflow_node.get_by_workflow_id(db, workflow_id=workflow_id)
-
-        issues = []
-        warnings = []
-
-        # Check for orphaned nodes (no incoming or outgoing connections)
-        node_ids = {node.id for node in nodes}
-        connected_nodes = set()
-
-        for conn in connections:
-            connected_nodes.add(conn.source_node_id)
-            connected_nodes.add(conn.target_node_id)
-
-        orphaned_nodes = node_ids - connected_nodes
-        if len(orphaned_nodes) > 1:  # Allow one orphaned node (could be start or end)
-            issues.append(
-                {
-                    "type": "orphaned_nodes",
-                    "message": f"Found {len(orphaned_nodes)} orphaned nodes",
-                    "node_ids": list(orphaned_nodes),
-                }
-            )
-
-        # Check for cycles
-        def has_cycle(node_id: int, visited: set, rec_stack: set) -> bool:
-            visited.add(node_id)
-            rec_stack.add(node_id)
-
-            # Get outgoing connections
-            outgoing = [c for c in connections if c.source_node_id == node_id]
-
-            for conn in outgoing:
-                target_id = conn.target_node_id
-                if target_id not in visited:
-                    if has_cycle(target_id, visited, rec_stack):
-                        return True
-                elif target_id in rec_stack:
-                    return True
-
-            rec_stack.remove(node_id)
-            return False
-
-        visited = set()
-        for node in nodes:
-            if node.id not in visited and has_cycle(node.id, visited, set()):
-                issues.append(
-                    {
-                        "type": "cycle_detected",
-                        "message": "Process contains cycles which may cause infinite loops",
-                    }
-                )
-                break
-
-        # Check for unreachable nodes
-        # Find start nodes (no incoming connections or sequence_order = 1)
-        start_nodes = [
-            n
-            for n in nodes
-            if n.sequence_order == 1
-            or not any(c.target_node_id == n.id for c in connections)
-        ]
-
-        if not start_nodes:
-            issues.append(
-                {"type": "no_start_node", "message": "Process has no clear start node"}
-            )
-        elif len(start_nodes) > 1:
-            warnings.append(
-                {
-                    "type": "multiple_start_nodes",
-                    "message": f"Process has {len(start_nodes)} potential start nodes",
-                }
-            )
-
-        # Check for unreachable end states
-        end_nodes = [
-            n for n in nodes if not any(c.source_node_id == n.id for c in connections)
-        ]
+    ) -> list[tuple[int, int]]:
+        """``(source_node_id, target_node_id)`` pairs of a workflow"""
+        result = await db.execute(
+            select(
+                WorkflowNodeConnection.source_node_id,
+                WorkflowNodeConnection.target_node_id,
+            ).where(WorkflowNodeConnection.workflow_id == workflow_id)
+        )
+        return list(result.tuples().all())
 
-        if not end_nodes:
-            warnings.append(
-                {"type": "no_end_node", "message": "Process has no clear end node"}
-            )
+    async def analyze_workflow(
+        self,
+        db: AsyncSession,
+        *,
+        workflow_id: int,
+        nodes: list[WorkflowNode] | None = None,
+    ) -> GraphAnalysis:
+        """Structural analysis of a workflow's active nodes and connections
+
+        Pass ``nodes`` when the caller has already loaded them.
+        """
+        if nodes is None:
+            # Import here to avoid circular imports
+            from app.crud.workflow.workflow_node import workflow_node
+
+            nodes = await workflow_node.get_by_workflow_id(db, workflow_id=workflow_id)
+
+        edges = await self.get_edges(db, workflow_id=workflow_id)
+        targets = {target for _, target in edges}
+        return analyze_graph(
+            [node.id for node in nodes],
+            edges,
+            # Start nodes: no incoming connections or sequence_order = 1
+            start_node_ids=[
+                node.id
+                for node in nodes
+                if node.sequence_order == 1 or node.id not in targets
+            ],
+        )
 
-        return {
-            "is_valid": len(issues) == 0,
-            "issues": issues,
-            "warnings": warnings,
-            "total_nodes": len(nodes),
-            "total_connections": len(connections),
-            "start_nodes": len(start_nodes),
-            "end_nodes": len(end_nodes),
-        }
+    async def validate_workflow_flow(
+        self,
+        db: AsyncSession,
+        *,
+        workflow_id: int,
+        nodes: list[WorkflowNode] | None = None,
+    ) -> dict[str, Any]:
+        """Validate the flow of a workflow"""
+        analysis = await self.analyze_workflow(db, workflow_id=workflow_id, nodes=nodes)
+        return flow_validation_result(analysis)
 
     async def get_workflow_paths(
         self, db: AsyncSession, *, workflow_id: int, start_node_id: int | None = None
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import and_, asc, desc, func, select
+from sqlalchemy import and_, asc, case, desc, func, insert, literal_column, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -10,6 +10,13 @@ from app.models.candidate_workflow import CandidateWorkflow
 from app.models.workflow_node_execution import WorkflowNodeExecution
 from app.utils.datetime_utils import get_utc_now
 
+# NULL until an execution has both started and completed
+_DURATION_SECONDS = func.timestampdiff(
+    literal_column("SECOND"),
+    WorkflowNodeExecution.started_at,
+    WorkflowNodeExecution.completed_at,
+)
+
 
 class CRUDWorkflowNodeExecution(CRUDBase[WorkflowNodeExecution, Any, Any]):
     async def create(
@@ -260,6 +267,58 @@ class CRUDWorkflowNodeExecution(CRUDBase[WorkflowNodeExecution, Any, Any]):
         await db.refresh(execution)
         return execution
 
+    async def insert_many(
+        self, db: AsyncSession, *, rows: list[dict[str, Any]]
+    ) -> None:
+        """Create executions with one multi-row INSERT; the caller commits"""
+        if rows:
+            await db.execute(insert(WorkflowNodeExecution).values(rows))
+
+    async def get_ids_for_node(
+        self, db: AsyncSession, *, node_id: int, candidate_workflow_ids: list[int]
+    ) -> dict[int, int]:
+        """candidate_workflow_id -> id of its execution of ``node_id``"""
+        if not candidate_workflow_ids:
+            return {}
+        result = await db.execute(
+            select(
+                WorkflowNodeExecution.candidate_workflow_id, WorkflowNodeExecution.id
+            ).where(
+                and_(
+                    WorkflowNodeExecution.node_id == node_id,
+                    WorkflowNodeExecution.candidate_workflow_id.in_(
+                        candidate_workflow_ids
+                    ),
+                )
+            )
+        )
+        return dict(result.all())
+
+    async def get_for_node(
+        self, db: AsyncSession, *, node_id: int, candidate_workflow_ids: list[int]
+    ) -> list[WorkflowNodeExecution]:
+        """Executions of one node for many candidate workflows"""
+        if not candidate_workflow_ids:
+            return []
+        result = await db.execute(
+            select(WorkflowNodeExecution)
+            .options(
+                selectinload(WorkflowNodeExecution.candidate_workflow).selectinload(
+                    CandidateWorkflow.workflow
+                )
+            )
+            .where(
+                and_(
+                    WorkflowNodeExecution.node_id == node_id,
+                    WorkflowNodeExecution.candidate_workflow_id.in_(
+                        candidate_workflow_ids
+                    ),
+                )
+            )
+            .order_by(WorkflowNodeExecution.candidate_workflow_id)
+        )
+        return list(result.scalars().all())
+
     async def bulk_update_status(
         self,
         db: AsyncSession,
@@ -428,31 +487,80 @@ class CRUDWorkflowNodeExecution(CRUDBase[WorkflowNodeExecution, Any, Any]):
             "average_score": avg_score_result.scalar(),
         }
 
+    def _window_conditions(
+        self, workflow_id: int | None, since: datetime | None, until: datetime | None
+    ) -> list[Any]:
+        conditions = []
+        if workflow_id:
+            conditions.append(CandidateWorkflow.workflow_id == workflow_id)
+        if since:
+            conditions.append(WorkflowNodeExecution.created_at >= since)
+        if until:
+            conditions.append(WorkflowNodeExecution.created_at < until)
+        return conditions
+
+    async def get_node_aggregates(
+        self,
+        db: AsyncSession,
+        *,
+        workflow_id: int,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> list[Any]:
+        """Execution counts and totals for every node of a workflow, one query.
+
+        Rows are grouped by (node_id, status, result) and carry
+        ``executions``, ``duration_seconds``/``timed`` and
+        ``score_total``/``scored``, so averages can be combined exactly.
+        ``since``/``until`` keep executions created in ``[since, until)``.
+        """
+        result = await db.execute(
+            select(
+                WorkflowNodeExecution.node_id,
+                WorkflowNodeExecution.status,
+                WorkflowNodeExecution.result,
+                func.count(WorkflowNodeExecution.id).label("executions"),
+                func.sum(_DURATION_SECONDS).label("duration_seconds"),
+                func.count(_DURATION_SECONDS).label("timed"),
+                func.sum(WorkflowNodeExecution.score).label("score_total"),
+                func.count(WorkflowNodeExecution.score).label("scored"),
+            )
+            .join(CandidateWorkflow)
+            .where(and_(*self._window_conditions(workflow_id, since, until)))
+            .group_by(
+                WorkflowNodeExecution.node_id,
+                WorkflowNodeExecution.status,
+                WorkflowNodeExecution.result,
+            )
+        )
+        return list(result.all())
+
     async def get_workload_by_assignee(
-        self, db: AsyncSession, *, workflow_id: int | None = None
+        self,
+        db: AsyncSession,
+        *,
+        workflow_id: int | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
     ) -> list[dict[str, Any]]:
         """Get workload distribution by assignee"""
-        conditions = [WorkflowNodeExecution.assigned_to.isnot(None)]
-
-        if workflow_id:
-            conditions.append(  # type: ignore[arg-type]
-                WorkflowNodeExecution.candidate_workflow.has(workflow_id=workflow_id)  # type: ignore[arg-type]
-            )
+        conditions = [
+            WorkflowNodeExecution.assigned_to.isnot(None),
+            *self._window_conditions(workflow_id, since, until),
+        ]
 
         result = await db.execute(
             select(
                 WorkflowNodeExecution.assigned_to,
                 func.count(WorkflowNodeExecution.id).label("total_assigned"),
                 func.sum(
-                    func.case((WorkflowNodeExecution.status == "pending", 1), else_=0)
+                    case((WorkflowNodeExecution.status == "pending", 1), else_=0)
                 ).label("pending"),
                 func.sum(
-                    func.case(
-                        (WorkflowNodeExecution.status == "in_progress", 1), else_=0
-                    )
+                    case((WorkflowNodeExecution.status == "in_progress", 1), else_=0)
                 ).label("in_progress"),
                 func.sum(
-                    func.case(
+                    case(
                         (
                             and_(
                                 WorkflowNodeExecution.due_date < get_utc_now(),
@@ -466,17 +574,11 @@ class CRUDWorkflowNodeExecution(CRUDBase[WorkflowNodeExecution, Any, Any]):
                     )
                 ).label("overdue"),
                 func.sum(
-                    func.case((WorkflowNodeExecution.status == "completed", 1), else_=0)
+                    case((WorkflowNodeExecution.status == "completed", 1), else_=0)
                 ).label("completed"),
-                func.avg(
-                    func.extract(
-                        "epoch",
-                        WorkflowNodeExecution.completed_at
-                        - WorkflowNodeExecution.started_at,
-                    )
-                    / 3600
-                ).label("avg_completion_hours"),
+                (func.avg(_DURATION_SECONDS) / 3600).label("avg_completion_hours"),
             )
+            .join(CandidateWorkflow)
             .where(and_(*conditions))
             .group_by(WorkflowNodeExecution.assigned_to)
             .order_by(desc("total_assigned"))
@@ -499,7 +601,7 @@ class CRUDWorkflowNodeExecution(CRUDBase[WorkflowNodeExecution, Any, Any]):
                     "overdue": row.overdue or 0,
                     "completed": row.completed or 0,
                     "completion_rate": completion_rate,
-                    "average_completion_hours": row.avg_completion_hours or 0,
+                    "average_completion_hours": float(row.avg_completion_hours or 0),
                     "workload_score": (row.pending or 0)
                     + (row.in_progress or 0) * 1.5
                     + (row.overdue or 0) * 2,
@@ -1,15 +1,19 @@
+from collections.abc import Callable
+
 import redis.asyncio as redis
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload
 
 from app.config import settings
 from app.database import get_db
 from app.models.role import UserRole as UserRoleModel
 from app.models.user import User
 from app.services.auth_service import auth_service
+from app.services.entitlement_service import Entitlements, entitlement_resolver
+from app.services.principal_cache import Principal, principal_cache
 from app.utils.constants import UserRole
 
 security = HTTPBearer(auto_error=False)
@@ -54,27 +58,24 @@ async def get_current_user(
     except (ValueError, TypeError) as e:
         raise credentials_exception from e
 
-    # Get user from database with explicit join
+    # User, company, settings and roles in one statement
+    generation = principal_cache.generation
     result = await db.execute(
         select(User)
-        .options(selectinload(User.company), selectinload(User.settings))
+        .options(
+            joinedload(User.company),
+            joinedload(User.settings),
+            joinedload(User.user_roles).joinedload(UserRoleModel.role),
+        )
         .where(User.id == user_id, User.is_active.is_(True))
     )
 
-    user = result.scalar_one_or_none()
+    user = result.unique().scalar_one_or_none()
     if user is None:
         raise credentials_exception
 
-    # Explicitly load user roles in a separate query to avoid greenlet issues
-    roles_result = await db.execute(
-        select(UserRoleModel)
-        .options(selectinload(UserRoleModel.role))
-        .where(UserRoleModel.user_id == user_id)
-    )
-    user_roles = roles_result.scalars().all()
-
-    # Manually set the user_roles to avoid lazy loading issues
-    user.user_roles = user_roles
+    # Role checks later in the request read this instead of querying again
+    await principal_cache.put(Principal.from_user(user), generation)
 
     return user
 
@@ -196,3 +197,64 @@ async def require_system_admin(current_user: User = Depends(get_current_user)) -
 
 # Alias for backward compatibility (will be deprecated)
 require_super_admin = require_system_admin
+
+
+async def get_company_entitlements(
+    current_user: User = Depends(get_current_user_with_company),
+    db: AsyncSession = Depends(get_db),
+) -> Entitlements:
+    """Cached feature and permission sets of the user's company plan."""
+    return await entitlement_resolver.resolve(db, current_user.company_id)
+
+
+def _require_entitlement(granted: Callable[[Entitlements], bool], missing_message: str):
+    async def dependency(
+        current_user: User = Depends(get_current_active_user),
+        db: AsyncSession = Depends(get_db),
+    ) -> User:
+        if UserRole.SYSTEM_ADMIN.value in [
+            ur.role.name for ur in current_user.user_roles
+        ]:
+            return current_user
+        if not current_user.company_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Company association required",
+            )
+        entitlements = await entitlement_resolver.resolve(db, current_user.company_id)
+        if not entitlements.has_subscription:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="No active subscription found",
+            )
+        if not granted(entitlements):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail=missing_message
+            )
+        return current_user
+
+    return dependency
+
+
+def require_feature(feature_name: str):
+    """Require the user's company plan to include ``feature_name``.
+
+    Usage: ``current_user: User = Depends(require_feature("exam_management"))``.
+    System admins always pass.
+    """
+    return _require_entitlement(
+        lambda entitlements: entitlements.has_feature(feature_name),
+        f"Feature '{feature_name}' not available in your plan",
+    )
+
+
+def require_permission(permission_key: str):
+    """Require the user's company plan to grant ``permission_key``.
+
+    Usage: ``Depends(require_permission("user_management.deactivate"))``.
+    System admins always pass.
+    """
+    return _require_entitlement(
+        lambda entitlements: entitlements.has_permission(permission_key),
+        f"Permission '{permission_key}' not available in your plan",
+    )
@@ -15,6 +15,7 @@ from app.schemas.subscription import (
     PlanFeatureAdd,
     PlanFeatureInfo,
 )
+from app.services.entitlement_service import entitlement_resolver
 from app.utils.auth import require_roles
 from app.utils.constants import UserRole
 
@@ -141,6 +142,8 @@ async def update_feature(
             )
 
     updated_feature = await feature_crud.update(db, db_obj=feature, obj_in=feature_data)
+    # Names and permission keys are compiled into every plan's entitlements
+    await entitlement_resolver.invalidate_all()
     return updated_feature
 
 
@@ -169,6 +172,7 @@ async def delete_feature(
         )
 
     await feature_crud.remove(db, id=feature_id)
+    await entitlement_resolver.invalidate_all()
 
 
 # ============================================================================
@@ -226,6 +230,7 @@ async def add_feature_to_plan(
         feature_id=feature_data.feature_id,
         added_by=current_user.id,
     )
+    await entitlement_resolver.invalidate_plan(plan_id)
 
     # Load relationships for response
     await db.refresh(plan_feature, ["feature", "plan"])
@@ -255,6 +260,7 @@ async def remove_feature_from_plan(
 
     if not removed:
         raise HTTPException(status_code=404, detail="Feature not found in this plan")
+    await entitlement_resolver.invalidate_plan(plan_id)
 
 
 @router.get(API_ROUTES.FEATURES.SEARCH, response_model=list[FeatureInfo])
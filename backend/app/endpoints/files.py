@@ -1,18 +1,29 @@
 import os
 from pathlib import Path, PurePosixPath
-
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from urllib.parse import quote
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Request,
+    UploadFile,
+    status,
+)
 from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.config.endpoints import API_ROUTES
 from app.database import get_db
 from app.dependencies import get_current_active_user, get_optional_current_user
 from app.models.message import Message
-from app.models.role import UserRole
 from app.models.user import User
-from app.utils.constants import UserRole as UserRoleEnum
+from app.services.blob_store import BLOB_PREFIX, blob_store
+from app.services.file_access_service import file_access_service
+from app.services.file_streaming import local_file_response, storage_object_response
+from app.services.upload_stream import FileTooLargeError
+from app.utils.constants import VirusStatus
 from app.utils.logging import get_logger
 from app.utils.permissions import is_super_admin
 
@@ -106,88 +117,39 @@ async def check_file_access_permission(
     Check if user has permission to access a file.
     Returns True if:
     1. User is the sender or recipient of a message containing this file
-    2. User is super admin (can access all files)
+    2. User uploaded the file
+    3. User is super admin (can access all files)
     """
     try:
-        # Check if user is super admin
-        user_result = await db.execute(
-            select(User)
-            .options(selectinload(User.user_roles).selectinload(UserRole.role))
-            .where(User.id == user_id)
-        )
-        user = user_result.scalar_one_or_none()
-        if not user:
-            return False
-
-        # Check if user has system admin role
-        for user_role in user.user_roles:
-            if user_role.role.name == UserRoleEnum.SYSTEM_ADMIN.value:
-                return True
-
-        # Normalize the file path to match against the stored file_url
-        # The s3_key from URL might be URL encoded, so we need to handle this
-        import urllib.parse
-
-        from sqlalchemy import or_
-
-        # Create search patterns to handle different scenarios
-        patterns_to_try = []
-
-        # Pattern 1: If file_path looks like a URL path, use it directly
-        if file_path.startswith("/api/files/download/"):
-            patterns_to_try.append(file_path)
-            # Also try without the /api/files/download/ prefix
-            path_only = file_path.replace("/api/files/download/", "")
-            patterns_to_try.append(path_only)
-        else:
-            # Pattern 2: Create the expected URL pattern from file path
-            expected_url = f"/api/files/download/{file_path}"
-            patterns_to_try.append(expected_url)
-            # Also try the path only
-            patterns_to_try.append(file_path)
-
-        # Pattern 3: Always include filename-only matching as fallback
-        filename = os.path.basename(file_path)
-        patterns_to_try.append(filename)
-
-        # Build OR conditions for pattern matching
-        file_conditions = []
-        for pattern in patterns_to_try:
-            # Exact match
-            file_conditions.append(Message.file_url == pattern)
-            # LIKE match (contains the pattern)
-            file_conditions.append(Message.file_url.like(f"%{pattern}%"))
-
-            # URL decoded version if different
-            try:
-                decoded = urllib.parse.unquote(pattern)
-                if decoded != pattern:
-                    file_conditions.append(Message.file_url.like(f"%{decoded}%"))
-            except Exception:
-                pass
-
-        # Check if this file is attached to any message where user is sender or recipient
-        message_result = await db.execute(
-            select(Message).where(
-                or_(*file_conditions)
-                & ((Message.sender_id == user_id) | (Message.recipient_id == user_id))
-            )
-        )
+        return await file_access_service.can_access(db, user_id, file_path)
+    except Exception as e:
+        logger.error(f"Error checking file access permission: {e}")
+        return False
 
-        message = message_result.scalar_one_or_none()
-        if message:
-            # Check if message is visible to user (not deleted)
-            return message.is_visible_to_user(user_id)
 
-        return False
+def _storage_download_url(s3_key: str) -> str:
+    """API download URL for an object in MinIO, shaped like local storage's."""
+    api_host = os.environ.get("API_HOST", "http://localhost:8000")
+    return f"{api_host}/api/files/download/{quote(s3_key)}"
+
 
+def _queue_scan(attachment_id: int) -> None:
+    """Ask the worker to scan a new attachment now.
+
+    Best effort: if the broker is unreachable, the periodic bulk scan still
+    picks up pending attachments.
+    """
+    from app.workers.jobs_files import scan_uploaded_file
+
+    try:
+        scan_uploaded_file.apply_async((attachment_id,), retry=False)  # type: ignore[attr-defined]
     except Exception as e:
-        logger.error(f"Error checking file access permission: {e}")
-        return False
+        logger.warning(f"Could not queue scan for attachment {attachment_id}: {e}")
 
 
 @router.post(API_ROUTES.FILES.UPLOAD)
 async def upload_file(
+    request: Request,
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
@@ -215,44 +177,35 @@ async def upload_file(
 
     logger.info(f"File type allowed: {file.filename}")
 
-    # Check file size
-    file_content = await file.read()
-    logger.info(f"File content read: {len(file_content)} bytes")
+    # Determine upload category based on content type or file purpose
+    # Profile avatars should use a different category for easier access control
+    upload_category = "message-attachments"  # Default category
 
-    if len(file_content) > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File too large. Maximum size is {MAX_FILE_SIZE} bytes",
-        )
+    # Check if this is likely a profile avatar (image file without message context)
+    if file.content_type and file.content_type.startswith("image/"):
+        # For now, treat all image uploads as potential profile avatars
+        # In the future, this could be determined by a request parameter
+        upload_category = "profile-avatars"
 
-    # Try local storage directly (skip MinIO for now)
+    if upload_category == "message-attachments":
+        return await _upload_attachment(request, file, current_user, db)
 
+    # Avatars stay in local storage, where their prefix makes them public
     try:
         from app.services.local_storage_service import get_local_storage_service
 
         storage_service = get_local_storage_service()
 
-        # Determine upload category based on content type or file purpose
-        # Profile avatars should use a different category for easier access control
-        upload_category = "message-attachments"  # Default category
-
-        # Check if this is likely a profile avatar (image file without message context)
-        if file.content_type and file.content_type.startswith("image/"):
-            # For now, treat all image uploads as potential profile avatars
-            # In the future, this could be determined by a request parameter
-            upload_category = "profile-avatars"
-
-        # Upload with local storage
-        file_path, file_hash, file_size = await storage_service.upload_file_data(
-            file_content,
-            file.filename,
-            file.content_type or "application/octet-stream",
-            current_user.id,
-            upload_category,
+        # Stream to local storage; the size limit is enforced while reading
+        file_path, file_hash, file_size = await storage_service.upload_file(
+            file, current_user.id, upload_category, max_size=MAX_FILE_SIZE
         )
+        logger.info(f"File content streamed: {file_size} bytes")
 
-        # Generate download URL
+        # Generate download URL and record the uploader as owner
         download_url = storage_service.get_download_url(file_path)
+        file_access_service.grant_owner(db, download_url, current_user.id)
+        await db.commit()
 
         logger.info(
             f"File uploaded to local storage: {file.filename} -> {file_path} by user {current_user.id}"
@@ -270,6 +223,11 @@ async def upload_file(
         }
         return response_data
 
+    except FileTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File too large. Maximum size is {MAX_FILE_SIZE} bytes",
+        ) from e
     except Exception as e:
         import traceback
 
@@ -283,10 +241,64 @@ async def upload_file(
         ) from e
 
 
+async def _upload_attachment(
+    request: Request, file: UploadFile, current_user: User, db: AsyncSession
+) -> dict:
+    """Store a message attachment as a deduplicated, reference-counted blob.
+
+    Content seen before is neither stored nor scanned again: the attachment
+    references the existing object and inherits its virus verdict.
+    """
+    try:
+        attachment = await blob_store.create_attachment(
+            db,
+            owner_id=current_user.id,
+            file=file,
+            upload_ip=request.client.host if request.client else None,
+            max_size=MAX_FILE_SIZE,
+        )
+        file_access_service.grant(db, attachment.s3_key, [current_user.id])
+        await db.commit()
+    except FileTooLargeError as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File too large. Maximum size is {MAX_FILE_SIZE} bytes",
+        ) from e
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Error saving attachment {file.filename}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error saving file - {type(e).__name__}: {str(e)}",
+        ) from e
+
+    if attachment.virus_status == VirusStatus.PENDING.value:
+        _queue_scan(attachment.id)
+
+    logger.info(
+        f"Attachment stored: {file.filename} -> {attachment.s3_key} by user {current_user.id}"
+    )
+    return {
+        "file_url": _storage_download_url(attachment.s3_key),
+        "file_path": attachment.s3_key,
+        "file_name": file.filename,
+        "file_size": attachment.file_size,
+        "file_type": file.content_type,
+        "s3_key": attachment.s3_key,
+        "success": True,
+        "storage_type": "s3",
+        "attachment_id": attachment.id,
+        "virus_status": attachment.virus_status,
+    }
+
+
 @router.get(API_ROUTES.FILES.DOWNLOAD)
 async def download_file(
+    request: Request,
     s3_key: str,
     download: str | None = None,  # Add query parameter to control download behavior
+    presign: bool = False,  # Return a presigned MinIO URL instead of the content
     current_user: User | None = Depends(get_optional_current_user),
     db: AsyncSession = Depends(get_db),
 ):
@@ -327,23 +339,29 @@ async def download_file(
 
         storage_service = get_storage_service()
 
-        # Check if file exists
-        if storage_service.file_exists(safe_key):
-            # Generate presigned URL for download
-            download_url = storage_service.get_presigned_url(safe_key)
-            return {
-                "download_url": download_url,
-                "s3_key": safe_key,
-                "expires_in": "1 hour",
-            }
+        if presign:
+            # Check if file exists
+            if storage_service.file_exists(safe_key):
+                # Generate presigned URL for download
+                download_url = storage_service.get_presigned_url(safe_key)
+                return {
+                    "download_url": download_url,
+                    "s3_key": safe_key,
+                    "expires_in": "1 hour",
+                }
+
+        else:
+            response = await storage_object_response(
+                request, safe_key, storage=storage_service, inline=download != "true"
+            )
+            if response is not None:
+                return response
 
     except Exception as e:
         logger.warning(f"MinIO download failed, trying local storage: {str(e)}")
 
     # Fall back to local storage
     try:
-        from fastapi.responses import FileResponse
-
         from app.services.local_storage_service import get_local_storage_service
 
         storage_service = get_local_storage_service()
@@ -376,19 +394,13 @@ async def download_file(
             elif file_ext in ["doc", "docx"]:
                 media_type = "application/msword"
 
-            # Control download behavior
-            if download == "true":
-                # Force download with attachment disposition
-                headers = {"Content-Disposition": f"attachment; filename={filename}"}
-            else:
-                # Try to display inline (prevent auto-download)
-                headers = {"Content-Disposition": f"inline; filename={filename}"}
-
-            return FileResponse(
-                path=str(full_file_path),
-                filename=filename,
+            # download=true forces attachment disposition, otherwise inline
+            return await local_file_response(
+                request,
+                full_file_path,
                 media_type=media_type,
-                headers=headers,
+                filename=filename,
+                inline=download != "true",
             )
 
         # File not found in either storage
@@ -410,6 +422,7 @@ async def download_file(
 async def delete_file(
     s3_key: str,
     current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
 ):
     """Delete a file from storage (super admin only)."""
 
@@ -421,6 +434,28 @@ async def delete_file(
             detail="Super admin privileges required to delete files",
         )
 
+    # Shared blobs are deleted through their attachments' references
+    if safe_key.startswith(f"{BLOB_PREFIX}/"):
+        try:
+            deleted = await blob_store.delete_attachments(db, safe_key)
+            if deleted:
+                await file_access_service.revoke(db, safe_key)
+                await db.commit()
+                logger.info(
+                    f"Deleted {deleted} attachments of {safe_key} by user {current_user.id}"
+                )
+                return {"message": "File deleted successfully"}
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Error deleting blob {safe_key}: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Error deleting file",
+            ) from e
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="File not found"
+        )
+
     try:
         from app.services.storage_service import get_storage_service
 
@@ -430,6 +465,8 @@ async def delete_file(
             success = storage_service.delete_file(safe_key)
 
             if success:
+                await file_access_service.revoke(db, safe_key)
+                await db.commit()
                 logger.info(
                     f"File deleted from MinIO: {safe_key} by user {current_user.id}"
                 )
@@ -457,6 +494,8 @@ async def delete_file(
         local_path = _resolve_local_path(local_storage.base_path, safe_key)
         if local_path.exists():
             local_path.unlink()
+            await file_access_service.revoke(db, safe_key)
+            await db.commit()
             logger.info(
                 f"File deleted from local storage: {safe_key} by user {current_user.id}"
             )
@@ -478,6 +517,7 @@ async def delete_file(
 
 @router.get(API_ROUTES.FILES.MESSAGE_FILE)
 async def serve_message_file(
+    request: Request,
     user_id: int,
     filename: str,
     current_user: User = Depends(get_current_active_user),
@@ -486,8 +526,6 @@ async def serve_message_file(
     """Serve message attachment files with proper security checks."""
     from pathlib import Path
 
-    from fastapi.responses import FileResponse
-
     # Security check - user can only access their own files or files in messages they're part of
     file_path = f"message_files/{user_id}/{filename}"
 
@@ -529,17 +567,7 @@ async def serve_message_file(
             status_code=status.HTTP_403_FORBIDDEN, detail="Invalid file path"
         ) from e
 
-    # Determine media type
-    import mimetypes
-
-    media_type, _ = mimetypes.guess_type(str(full_file_path))
-    if not media_type:
-        media_type = "application/octet-stream"
-
-    # Return file
-    return FileResponse(
-        path=str(full_file_path),
-        filename=filename,
-        media_type=media_type,
-        headers={"Content-Disposition": f"inline; filename={filename}"},
+    # Return file (media type guessed from the extension)
+    return await local_file_response(
+        request, full_file_path, filename=filename, inline=True
     )
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.endpoints import API_ROUTES
@@ -14,6 +14,7 @@ from app.schemas.message import (
     MessageReadRequest,
     MessageSearchRequest,
 )
+from app.services.message_search_service import message_search_service
 from app.services.message_service import message_service
 from app.services.notification_service import notification_service
 from app.utils.logging import get_logger
@@ -43,14 +44,21 @@ async def validate_messaging_permission(
 @router.get(API_ROUTES.MESSAGES.CONVERSATIONS, response_model=ConversationListResponse)
 async def get_conversations(
     search: str | None = None,
+    limit: int | None = Query(None, ge=1, le=200),
+    cursor: str | None = None,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Get list of users the current user has exchanged messages with."""
-    conversations = await message_service.get_conversations(db, current_user.id, search)
+    conversations, next_cursor = await message_service.get_conversation_page(
+        db, current_user.id, search_query=search, limit=limit, cursor=cursor
+    )
 
     return ConversationListResponse(
-        conversations=conversations, total=len(conversations)
+        conversations=conversations,
+        total=len(conversations),
+        next_cursor=next_cursor,
+        has_more=next_cursor is not None,
     )
 
 
@@ -154,7 +162,10 @@ async def search_messages(
     db: AsyncSession = Depends(get_db),
 ):
     """Search messages by content and sender name."""
-    messages, total = await message.search_messages_with_count(
+    messages, next_cursor = await message_search_service.search_messages(
+        db, current_user.id, search_request
+    )
+    total = await message_search_service.count_messages(
         db, current_user.id, search_request
     )
 
@@ -185,7 +196,8 @@ async def search_messages(
     return MessageListResponse(
         messages=message_infos,
         total=total,
-        has_more=(search_request.offset + len(messages)) < total,
+        has_more=next_cursor is not None,
+        next_cursor=next_cursor,
     )
 
 
@@ -1,14 +1,33 @@
-from fastapi import APIRouter, Depends, Query
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Depends, Header, Query, Request, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.config.endpoints import API_ROUTES
 from app.database import get_db
 from app.dependencies import get_current_active_user
 from app.models.user import User
-from app.services.notification_service import notification_service
+from app.services.notification_service import (
+    notification_event,
+    notification_service,
+    serialize_notification,
+)
+from app.services.notification_stream import (
+    NotificationStream,
+    StreamLimitExceeded,
+    format_sse,
+)
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter()
 
+# EventSource reconnect delay after the stream ends
+RECONNECT_DELAY_MS = 3000
+
 
 @router.get(API_ROUTES.NOTIFICATIONS.BASE)
 async def get_notifications(
@@ -22,20 +41,142 @@ async def get_notifications(
         db, current_user.id, limit, unread_only
     )
 
+    return {"notifications": [serialize_notification(n) for n in notifications]}
+
+
+def _polling_fallback(status_code: int, detail: str) -> JSONResponse:
+    """Tell the client to poll ``/updates`` instead of holding a stream."""
+    interval = settings.notification_poll_interval_seconds
+    return JSONResponse(
+        status_code=status_code,
+        content={
+            "detail": detail,
+            "fallback": "polling",
+            "poll_interval_seconds": interval,
+        },
+        headers={"Retry-After": str(interval)},
+    )
+
+
+async def _event_stream(
+    request: Request,
+    stream: NotificationStream,
+    replay: list[dict],
+    resync: bool,
+) -> AsyncIterator[str]:
+    manager = notification_service.stream_manager
+    keepalive = settings.notification_stream_keepalive_seconds
+    last_id = 0
+    try:
+        yield f"retry: {RECONNECT_DELAY_MS}\n\n"
+        if resync:
+            # Too much was missed to replay; the client reloads its list
+            yield format_sse({"reason": "replay_limit"}, "resync")
+        for event in replay:
+            last_id = event["id"]
+            yield format_sse(event["data"], event["event"], event["id"])
+
+        # After an overflow, flush what was queued and end the stream so the
+        # client reconnects with Last-Event-ID and replays the rest
+        while not (stream.overflowed and stream.queue.empty()):
+            event = await stream.next_event(keepalive)
+            if event is None:
+                if await request.is_disconnected():
+                    break
+                yield ": keepalive\n\n"
+                continue
+            # Published between subscribing and the replay query
+            if event["id"] <= last_id:
+                continue
+            last_id = event["id"]
+            yield format_sse(event["data"], event["event"], event["id"])
+    finally:
+        await manager.close(stream)
+
+
+@router.get(API_ROUTES.NOTIFICATIONS.STREAM)
+async def stream_notifications(
+    request: Request,
+    last_event_id: int | None = Query(None, ge=0),
+    last_event_id_header: str | None = Header(None, alias="Last-Event-ID"),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Push new notifications and message arrivals as server-sent events.
+
+    Event ids are notification ids; a reconnecting client sends
+    ``Last-Event-ID`` (or ``last_event_id``) and is replayed what it missed.
+    When push is unavailable or the user has too many streams open, the
+    response is 503/429 with a hint to poll ``/updates`` instead.
+    """
+    if not settings.notification_stream_enabled:
+        return _polling_fallback(
+            status.HTTP_503_SERVICE_UNAVAILABLE, "Notification push is disabled"
+        )
+
+    resume_from = last_event_id
+    if last_event_id_header and last_event_id_header.isdigit():
+        resume_from = int(last_event_id_header)
+
+    manager = notification_service.stream_manager
+    try:
+        # Subscribe before the replay query so nothing falls in between
+        stream = await manager.open(current_user.id)
+    except StreamLimitExceeded as e:
+        return _polling_fallback(status.HTTP_429_TOO_MANY_REQUESTS, str(e))
+    except Exception as e:
+        logger.error(
+            "Notification stream unavailable", user_id=current_user.id, error=str(e)
+        )
+        return _polling_fallback(
+            status.HTTP_503_SERVICE_UNAVAILABLE, "Notification push is unavailable"
+        )
+
+    replay: list[dict] = []
+    resync = False
+    try:
+        if resume_from is not None:
+            limit = settings.notification_replay_limit
+            missed = await notification_service.get_notifications_after(
+                db, current_user.id, resume_from, limit + 1
+            )
+            resync = len(missed) > limit
+            if not resync and missed:
+                unread_count = await notification_service.get_unread_count(
+                    db, current_user.id
+                )
+                replay = [notification_event(n, unread_count) for n in missed]
+    except Exception:
+        await manager.close(stream)
+        raise
+    finally:
+        # Don't hold a pooled DB connection for the lifetime of the stream
+        await db.close()
+
+    return StreamingResponse(
+        _event_stream(request, stream, replay, resync),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get(API_ROUTES.NOTIFICATIONS.UPDATES)
+async def get_notification_updates(
+    after_id: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Polling fallback: notifications after ``after_id`` and the unread count."""
+    notifications = await notification_service.get_notifications_after(
+        db, current_user.id, after_id, limit
+    )
+    unread_count = await notification_service.get_unread_count(db, current_user.id)
     return {
-        "notifications": [
-            {
-                "id": n.id,
-                "type": n.type,
-                "title": n.title,
-                "message": n.message,
-                "payload": n.payload,
-                "is_read": n.is_read,
-                "created_at": n.created_at,
-                "read_at": n.read_at,
-            }
-            for n in notifications
-        ]
+        "notifications": [serialize_notification(n) for n in notifications],
+        "unread_count": unread_count,
+        "last_event_id": notifications[-1].id if notifications else after_id,
+        "poll_interval_seconds": settings.notification_poll_interval_seconds,
     }
 
 
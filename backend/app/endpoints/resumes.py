@@ -1,12 +1,13 @@
 import logging
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.endpoints import API_ROUTES
 from app.database import get_db
 from app.dependencies import get_current_user
+from app.models.resume_export_job import ResumeExportJob
 from app.models.user import User
 from app.schemas.resume import (
     BulkActionResult,
@@ -22,6 +23,8 @@ from app.schemas.resume import (
     ProjectInfo,
     PublicResumeInfo,
     ResumeCreate,
+    ResumeExportJobInfo,
+    ResumeExportRequest,
     ResumeInfo,
     ResumeListResponse,
     ResumePublicSettings,
@@ -37,6 +40,7 @@ from app.schemas.resume import (
     WorkExperienceInfo,
 )
 from app.services.pdf_service import PDFService
+from app.services.resume_export_service import resume_export_service
 from app.services.resume_service import ResumeService
 from app.utils.datetime_utils import get_utc_now
 
@@ -555,6 +559,92 @@ async def bulk_resume_action(
     )
 
 
+# Batch PDF export
+def _export_job_info(job: ResumeExportJob) -> ResumeExportJobInfo:
+    return ResumeExportJobInfo(
+        job_id=job.id,
+        status=job.status,
+        total_count=job.total_count,
+        completed_count=job.completed_count,
+        failed_count=job.failed_count,
+        progress=round(job.processed_count * 100 / job.total_count, 1)
+        if job.total_count
+        else 100.0,
+        errors=job.errors or [],
+        error_message=job.error_message,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        download_ready=job.is_finished and job.completed_count > 0,
+    )
+
+
+@router.post(
+    API_ROUTES.RESUMES.EXPORTS, response_model=ResumeExportJobInfo, status_code=202
+)
+async def create_resume_export(
+    export_request: ResumeExportRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Start a background job exporting several resumes as a zip of PDFs."""
+    try:
+        job = await resume_export_service.create_job(
+            db,
+            current_user.id,
+            export_request.resume_ids,
+            format=export_request.format,
+            include_contact_info=export_request.include_contact_info,
+            watermark=export_request.watermark,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return _export_job_info(job)
+
+
+@router.get(API_ROUTES.RESUMES.EXPORT_BY_ID, response_model=ResumeExportJobInfo)
+async def get_resume_export(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Get progress and per-resume failures of an export job."""
+    job = await resume_export_service.get_job(db, job_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return _export_job_info(job)
+
+
+@router.get(API_ROUTES.RESUMES.EXPORT_DOWNLOAD)
+async def download_resume_export(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Stream the exported PDFs as a zip archive."""
+    job = await resume_export_service.get_job(db, job_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    if not job.is_finished:
+        raise HTTPException(status_code=409, detail="Export is still in progress")
+    if not job.completed_count:
+        raise HTTPException(status_code=409, detail="Export produced no PDFs")
+
+    # Check storage before the response starts; a PDF vanishing mid-stream
+    # would truncate the archive
+    results, errors = await resume_export_service.check_outputs(job)
+    if not results:
+        raise HTTPException(status_code=410, detail="Exported PDFs have expired")
+
+    return StreamingResponse(
+        resume_export_service.iter_zip(job, results, errors),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="resumes_export_{job.id}.zip"'
+        },
+    )
+
+
 # Public resume viewing (for published resumes)
 @router.get(API_ROUTES.RESUMES.PUBLIC, response_class=HTMLResponse)
 async def view_public_resume(slug: str, db: AsyncSession = Depends(get_db)):
@@ -24,6 +24,7 @@ from app.schemas.subscription import (
     SubscriptionPlanInfo,
     SubscriptionPlanWithFeatures,
 )
+from app.services.entitlement_service import entitlement_resolver
 from app.services.subscription_service import subscription_service
 from app.utils.auth import require_roles
 from app.utils.constants import PlanChangeRequestStatus, UserRole
@@ -154,6 +155,7 @@ async def subscribe_to_plan(
     # Create subscription
     subscription_data.company_id = current_user.company_id
     subscription = await subscription_crud.create(db, obj_in=subscription_data)
+    await entitlement_resolver.invalidate_company(current_user.company_id)
 
     return subscription
 
@@ -194,6 +196,7 @@ async def update_my_subscription(
     updated_subscription = await subscription_crud.update(
         db, db_obj=subscription, obj_in=subscription_data
     )
+    await entitlement_resolver.invalidate_company(current_user.company_id)
 
     return updated_subscription
 
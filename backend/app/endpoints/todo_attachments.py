@@ -1,8 +1,15 @@
-import io
 import os
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Request,
+    UploadFile,
+    status,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.endpoints import API_ROUTES
@@ -21,6 +28,7 @@ from app.schemas.todo_attachment import (
     TodoAttachmentList,
 )
 from app.services.file_storage_service import file_storage_service
+from app.services.file_streaming import local_file_response
 from app.services.todo_permissions import TodoPermissionService
 
 router = APIRouter()
@@ -178,6 +186,7 @@ async def get_attachment_details(
 
 @router.get(API_ROUTES.TODO_ATTACHMENTS.DOWNLOAD, summary="Download attachment file")
 async def download_attachment(
+    request: Request,
     todo_id: int,
     attachment_id: int,
     db: AsyncSession = Depends(get_db),
@@ -204,16 +213,19 @@ async def download_attachment(
     if not os.path.exists(db_attachment.file_path):
         raise HTTPException(status_code=404, detail="File not found on disk")
 
-    # Return file response
-    return FileResponse(
-        path=db_attachment.file_path,
-        filename=db_attachment.original_filename,
+    # Stream the file, honoring Range and If-None-Match
+    return await local_file_response(
+        request,
+        db_attachment.file_path,
         media_type=db_attachment.mime_type,
+        filename=db_attachment.original_filename,
+        inline=False,
     )
 
 
 @router.get(API_ROUTES.TODO_ATTACHMENTS.PREVIEW, summary="Preview attachment file")
 async def preview_attachment(
+    request: Request,
     todo_id: int,
     attachment_id: int,
     db: AsyncSession = Depends(get_db),
@@ -246,17 +258,13 @@ async def preview_attachment(
     if not os.path.exists(db_attachment.file_path):
         raise HTTPException(status_code=404, detail="File not found on disk")
 
-    # Return file for preview
-    file_content = file_storage_service.get_file_content(db_attachment.file_path)
-    if not file_content:
-        raise HTTPException(status_code=404, detail="Could not read file")
-
-    return StreamingResponse(
-        io.BytesIO(file_content),
+    # Stream for inline display; PDF viewers and <video> seek with Range
+    return await local_file_response(
+        request,
+        db_attachment.file_path,
         media_type=db_attachment.mime_type,
-        headers={
-            "Content-Disposition": f"inline; filename={db_attachment.original_filename}"
-        },
+        filename=db_attachment.original_filename,
+        inline=True,
     )
 
 
@@ -23,6 +23,7 @@ from app.schemas.user import (
 )
 from app.services.auth_service import auth_service
 from app.services.email_service import email_service
+from app.services.principal_cache import principal_cache
 from app.services.user_connection_service import user_connection_service
 from app.utils.constants import UserRole as UserRoleEnum
 from app.utils.permissions import is_company_admin, is_recruiter, is_super_admin
@@ -596,6 +597,9 @@ async def bulk_resend_activation(
         except Exception as e:
             errors.append(f"Error sending activation email to user {user_id}: {str(e)}")
 
+    # The queued emails carry the new temporary passwords
+    await db.commit()
+
     return {
         "message": f"Successfully sent activation emails to {sent_count} user(s)",
         "sent_count": sent_count,
@@ -906,6 +910,7 @@ async def update_user(
                 db.add(user_role)
 
     await db.commit()
+    await principal_cache.invalidate_user(user_id)
     await db.refresh(user)
 
     # Return updated user info
@@ -1,12 +1,28 @@
+import asyncio
 import json
 import logging
+import uuid
 
 from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud
+from app.config import settings
 from app.config.endpoints import API_ROUTES
 from app.database import get_db
+from app.dependencies import require_system_admin
+from app.models.user import User
+from app.services.pubsub_service import (
+    PresenceRegistry,
+    PubSubBackend,
+    get_presence_registry,
+    get_pubsub_backend,
+)
+from app.services.websocket_fanout import (
+    BackpressurePolicy,
+    FanoutMetrics,
+    QueuedWebSocketSender,
+)
 
 # Remove the complex auth dependency for now
 
@@ -17,21 +33,89 @@ router = APIRouter()
 
 # Connection manager for video call rooms
 class VideoCallConnectionManager:
-    def __init__(self):
-        # Store active connections: room_id -> {user_id: websocket}
+    """Video call signaling across workers.
+
+    Sockets are held by the worker that accepted them; every room event is
+    published on the room's pub/sub channel and each worker delivers it to the
+    sockets it holds. Room membership is kept in a shared presence registry
+    whose entries expire unless refreshed, so participants of a crashed worker
+    are cleaned up after ``presence_ttl`` seconds.
+    """
+
+    CHANNEL_PREFIX = "video:room:"
+
+    def __init__(
+        self,
+        pubsub: PubSubBackend | None = None,
+        presence: PresenceRegistry | None = None,
+        presence_ttl: int | None = None,
+    ):
+        # Store active connections held by this worker: room_id -> {user_id: websocket}
         self.active_connections: dict[str, dict[int, WebSocket]] = {}
-        # Store user rooms: user_id -> room_id
+        # Store user rooms for local connections: user_id -> room_id
         self.user_rooms: dict[int, str] = {}
+        # Outbound queue + writer task per local connection: user_id -> sender
+        self.senders: dict[int, QueuedWebSocketSender] = {}
+        self.metrics = FanoutMetrics()
+        self.send_queue_size = settings.video_send_queue_size
+        self.backpressure_policy = BackpressurePolicy(
+            settings.video_backpressure_policy
+        )
+        self.node_id = uuid.uuid4().hex
+        self.presence_ttl = presence_ttl or settings.video_presence_ttl_seconds
+        self._pubsub = pubsub
+        self._presence = presence
+        self._heartbeat_task: asyncio.Task | None = None
+
+    @property
+    def pubsub(self) -> PubSubBackend:
+        if self._pubsub is None:
+            self._pubsub = get_pubsub_backend()
+        return self._pubsub
+
+    @property
+    def presence(self) -> PresenceRegistry:
+        if self._presence is None:
+            self._presence = get_presence_registry()
+        return self._presence
+
+    def _channel(self, room_id: str) -> str:
+        return f"{self.CHANNEL_PREFIX}{room_id}"
 
     async def connect(self, websocket: WebSocket, room_id: str, user_id: int):
         """Connect a user to a video call room."""
         await websocket.accept()
 
+        # A user reconnecting into another room leaves the previous one first
+        previous_room = self.user_rooms.get(user_id)
+        if previous_room is not None and previous_room != room_id:
+            previous_socket = self.active_connections.get(previous_room, {}).get(
+                user_id
+            )
+            if previous_socket is not None:
+                await self.disconnect(user_id, previous_socket)
+
         if room_id not in self.active_connections:
             self.active_connections[room_id] = {}
+            await self.pubsub.subscribe(self._channel(room_id), self._handle_event)
 
         self.active_connections[room_id][user_id] = websocket
         self.user_rooms[user_id] = room_id
+        # A reconnecting user replaces their previous socket's sender
+        previous = self.senders.pop(user_id, None)
+        if previous is not None:
+            await previous.close()
+        self.senders[user_id] = QueuedWebSocketSender(
+            websocket,
+            room_id,
+            user_id,
+            metrics=self.metrics,
+            max_queue_size=self.send_queue_size,
+            policy=self.backpressure_policy,
+            on_slow_consumer=self._handle_slow_consumer,
+        )
+        await self.presence.add(self._channel(room_id), str(user_id), self.presence_ttl)
+        self._ensure_heartbeat()
 
         logger.info(f"User {user_id} connected to video call room {room_id}")
 
@@ -42,61 +126,79 @@ class VideoCallConnectionManager:
             exclude_user=user_id,
         )
 
-    async def disconnect(self, user_id: int):
-        """Disconnect a user from their video call room."""
-        if user_id in self.user_rooms:
-            room_id = self.user_rooms[user_id]
+    async def disconnect(self, user_id: int, websocket: WebSocket):
+        """Disconnect a user from their video call room.
 
-            # Remove from active connections
-            if (
-                room_id in self.active_connections
-                and user_id in self.active_connections[room_id]
-            ):
-                del self.active_connections[room_id][user_id]
+        A no-op unless ``websocket`` is the user's current connection, so an
+        old socket closing after a reconnect leaves the new one in place.
+        """
+        room_id = self.user_rooms.get(user_id)
+        if room_id is None:
+            return
+        if self.active_connections.get(room_id, {}).get(user_id) is not websocket:
+            return
 
-                # Clean up empty rooms
-                if not self.active_connections[room_id]:
-                    del self.active_connections[room_id]
+        del self.active_connections[room_id][user_id]
+        # Clean up empty rooms
+        if not self.active_connections[room_id]:
+            del self.active_connections[room_id]
+            await self.pubsub.unsubscribe(self._channel(room_id), self._handle_event)
 
-            del self.user_rooms[user_id]
+        del self.user_rooms[user_id]
+        sender = self.senders.pop(user_id, None)
+        if sender is not None:
+            await sender.close()
+        await self.presence.remove(self._channel(room_id), str(user_id))
 
-            logger.info(f"User {user_id} disconnected from video call room {room_id}")
+        logger.info(f"User {user_id} disconnected from video call room {room_id}")
 
-            # Notify other participants that user left
-            await self.broadcast_to_room(
-                room_id,
-                {"type": "user_left", "user_id": user_id, "room_id": room_id},
-                exclude_user=user_id,
-            )
+        # Notify other participants that user left
+        await self.broadcast_to_room(
+            room_id,
+            {"type": "user_left", "user_id": user_id, "room_id": room_id},
+            exclude_user=user_id,
+        )
 
-    async def send_personal_message(self, message: dict, user_id: int):
-        """Send a message to a specific user."""
-        if user_id in self.user_rooms:
-            room_id = self.user_rooms[user_id]
-            if (
-                room_id in self.active_connections
-                and user_id in self.active_connections[room_id]
-            ):
-                websocket = self.active_connections[room_id][user_id]
-                try:
-                    await websocket.send_text(json.dumps(message))
-                except Exception as e:
-                    logger.error(f"Failed to send message to user {user_id}: {e}")
+    async def get_room_participants(self, room_id: str) -> list[int]:
+        """Get the users connected to a room on any worker."""
+        members = await self.presence.members(self._channel(room_id))
+        return [int(member) for member in members]
+
+    async def send_personal_message(
+        self, message: dict, user_id: int, room_id: str | None = None
+    ):
+        """Send a message to a specific user.
+
+        Users connected to this worker are written to directly; otherwise the
+        message is published on ``room_id`` for the worker holding the user.
+        """
+        if await self._send_local(message, user_id):
+            return
+        if room_id:
+            await self.pubsub.publish(
+                self._channel(room_id),
+                {
+                    "origin": self.node_id,
+                    "room_id": room_id,
+                    "target_user_id": user_id,
+                    "message": message,
+                },
+            )
 
     async def broadcast_to_room(
         self, room_id: str, message: dict, exclude_user: int | None = None
     ):
         """Broadcast a message to all users in a room."""
-        if room_id in self.active_connections:
-            for user_id, websocket in self.active_connections[room_id].items():
-                if exclude_user and user_id == exclude_user:
-                    continue
-                try:
-                    await websocket.send_text(json.dumps(message))
-                except Exception as e:
-                    logger.error(
-                        f"Failed to broadcast to user {user_id} in room {room_id}: {e}"
-                    )
+        await self._deliver_local(room_id, message, exclude_user)
+        await self.pubsub.publish(
+            self._channel(room_id),
+            {
+                "origin": self.node_id,
+                "room_id": room_id,
+                "exclude_user": exclude_user,
+                "message": message,
+            },
+        )
 
     async def forward_signaling_message(
         self, room_id: str, sender_id: int, message: dict
@@ -107,7 +209,7 @@ class VideoCallConnectionManager:
         if target_user_id:
             # Send to specific user
             await self.send_personal_message(
-                {**message, "sender_id": sender_id}, target_user_id
+                {**message, "sender_id": sender_id}, target_user_id, room_id=room_id
             )
         else:
             # Broadcast to all other users in room
@@ -115,11 +217,82 @@ class VideoCallConnectionManager:
                 room_id, {**message, "sender_id": sender_id}, exclude_user=sender_id
             )
 
+    async def _handle_event(self, event: dict):
+        """Deliver a room event published by another worker to local sockets."""
+        if event.get("origin") == self.node_id:
+            return
+
+        room_id = event["room_id"]
+        target_user_id = event.get("target_user_id")
+        if target_user_id is not None:
+            if self.user_rooms.get(target_user_id) == room_id:
+                await self._send_local(event["message"], target_user_id)
+            return
+
+        await self._deliver_local(room_id, event["message"], event.get("exclude_user"))
+
+    async def _send_local(self, message: dict, user_id: int) -> bool:
+        sender = self.senders.get(user_id)
+        if sender is None:
+            return False
+        sender.send(json.dumps(message))
+        return True
+
+    async def _deliver_local(
+        self, room_id: str, message: dict, exclude_user: int | None = None
+    ):
+        """Queue one serialized frame for every local socket in the room.
+
+        Frames are handed to per-connection writer tasks, so a slow client
+        never delays delivery to the rest of the room.
+        """
+        if room_id not in self.active_connections:
+            return
+        frame = json.dumps(message)
+        for user_id in list(self.active_connections[room_id]):
+            if exclude_user and user_id == exclude_user:
+                continue
+            sender = self.senders.get(user_id)
+            if sender is not None:
+                sender.send(frame)
+
+    async def _handle_slow_consumer(self, sender: QueuedWebSocketSender):
+        if self.senders.get(sender.user_id) is sender:
+            await self.disconnect(sender.user_id, sender.websocket)
+
+    def _ensure_heartbeat(self):
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
+
+    async def _heartbeat(self):
+        """Refresh presence of local connections until none are left."""
+        interval = max(self.presence_ttl / 3, 1)
+        while self.user_rooms:
+            await asyncio.sleep(interval)
+            for user_id, room_id in list(self.user_rooms.items()):
+                try:
+                    await self.presence.add(
+                        self._channel(room_id), str(user_id), self.presence_ttl
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to refresh presence for user {user_id}: {e}")
+
 
 # Global connection manager instance
 manager = VideoCallConnectionManager()
 
 
+@router.get(API_ROUTES.WEBSOCKET_VIDEO.METRICS)
+async def get_video_signaling_metrics(
+    room_id: str | None = None,
+    current_user: User = Depends(require_system_admin),
+):
+    """Get send-queue depth and delivery latency per room on this worker."""
+    if room_id:
+        return {"rooms": [manager.metrics.room_snapshot(room_id)]}
+    return {"rooms": manager.metrics.snapshot()}
+
+
 @router.websocket(API_ROUTES.WEBSOCKET_VIDEO.WS_VIDEO)
 async def websocket_video_endpoint(
     websocket: WebSocket, room_id: str, db: AsyncSession = Depends(get_db)
@@ -154,7 +327,7 @@ async def websocket_video_endpoint(
         await manager.connect(websocket, room_id, user_id)
 
         # Send initial room state
-        room_participants = list(manager.active_connections.get(room_id, {}).keys())
+        room_participants = await manager.get_room_participants(room_id)
         await manager.send_personal_message(
             {
                 "type": "room_state",
@@ -219,4 +392,4 @@ async def websocket_video_endpoint(
         logger.error(f"WebSocket connection error: {e}")
     finally:
         if user_id:
-            await manager.disconnect(user_id)
+            await manager.disconnect(user_id, websocket)
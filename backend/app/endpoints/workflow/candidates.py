@@ -1,3 +1,5 @@
+from dataclasses import asdict
+
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -10,6 +12,7 @@ from app.dependencies import get_current_active_user
 from app.models.user import User
 from app.schemas.workflow.candidate_workflow import (
     BulkCandidateAssignment,
+    BulkCandidateAssignmentReport,
     CandidateTimeline,
     CandidateWorkflowCreate,
     CandidateWorkflowDetails,
@@ -19,27 +22,22 @@ from app.schemas.workflow.candidate_workflow import (
     RecruiterWorkload,
 )
 from app.schemas.workflow.enums import CandidateWorkflowStatus
+from app.services.workflow.bulk_assignment import (
+    ALREADY_ASSIGNED,
+    ASSIGNED,
+    FAILED,
+    STARTED,
+    BulkAssignmentReport,
+)
 from app.services.workflow.workflow_engine import workflow_engine
 
 router = APIRouter()
 
 
-@router.post(
-    API_ROUTES.WORKFLOWS.CANDIDATES,
-    response_model=CandidateWorkflowInfo,
-    status_code=status.HTTP_201_CREATED,
-)
-async def assign_candidate_to_workflow(
-    workflow_id: int,
-    assignment: CandidateWorkflowCreate,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
-):
-    """
-    Assign a candidate to a recruitment workflow.
-
-    Requires: workflow owner or viewer with assignment permissions
-    """
+async def _ensure_can_manage_assignments(
+    db: AsyncSession, workflow_id: int, current_user: User
+) -> None:
+    """Raise unless the user may assign candidates to the workflow"""
     wf = await workflow.get(db, id=workflow_id)
     if not wf:
         raise HTTPException(
@@ -69,6 +67,25 @@ async def assign_candidate_to_workflow(
             status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
         )
 
+
+@router.post(
+    API_ROUTES.WORKFLOWS.CANDIDATES,
+    response_model=CandidateWorkflowInfo,
+    status_code=status.HTTP_201_CREATED,
+)
+async def assign_candidate_to_workflow(
+    workflow_id: int,
+    assignment: CandidateWorkflowCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Assign a candidate to a recruitment workflow.
+
+    Requires: workflow owner or viewer with assignment permissions
+    """
+    await _ensure_can_manage_assignments(db, workflow_id, current_user)
+
     try:
         candidate_wf = await workflow_engine.assign_candidate(
             db,
@@ -94,44 +111,56 @@ async def bulk_assign_candidates(
     """
     Bulk assign multiple candidates to a recruitment workflow.
     """
-    wf = await workflow.get(db, id=workflow_id)
-    if not wf:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Workflow not found",
-        )
+    await _ensure_can_manage_assignments(db, workflow_id, current_user)
 
-    # Check permissions
-    if current_user.role == "employer":
-        if wf.employer_company_id != current_user.company_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
-            )
-    elif current_user.role == "recruiter":
-        has_access = await workflow_viewer.check_user_access(
-            db,
-            workflow_id=workflow_id,
-            user_id=current_user.id,
-            required_permission="manage_assignments",
-        )
-        if not has_access:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions"
-            )
-    else:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
-        )
+    report = await _bulk_assign(db, workflow_id, bulk_assignment)
+    return report.candidate_workflows
 
-    candidate_workflows = await workflow_engine.bulk_assign_candidates(
-        db,
+
+@router.post(
+    API_ROUTES.WORKFLOWS.CANDIDATES_IMPORT,
+    response_model=BulkCandidateAssignmentReport,
+)
+async def import_candidates(
+    workflow_id: int,
+    bulk_assignment: BulkCandidateAssignment,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Assign a hiring event's candidates to a workflow in bulk.
+
+    Reports what happened to every candidate: assigned, started,
+    already_assigned, or failed with the reason.
+    """
+    await _ensure_can_manage_assignments(db, workflow_id, current_user)
+
+    report = await _bulk_assign(db, workflow_id, bulk_assignment)
+    return BulkCandidateAssignmentReport(
         workflow_id=workflow_id,
-        candidate_ids=bulk_assignment.candidate_ids,
-        assigned_recruiter_id=bulk_assignment.assigned_recruiter_id,
-        start_immediately=bulk_assignment.start_immediately,
+        assigned=report.count(ASSIGNED),
+        started=report.count(STARTED),
+        already_assigned=report.count(ALREADY_ASSIGNED),
+        failed=report.count(FAILED),
+        outcomes=[asdict(outcome) for outcome in report.outcomes],
     )
 
-    return candidate_workflows
+
+async def _bulk_assign(
+    db: AsyncSession, workflow_id: int, bulk_assignment: BulkCandidateAssignment
+) -> BulkAssignmentReport:
+    try:
+        return await workflow_engine.bulk_assign_candidates(
+            db,
+            workflow_id=workflow_id,
+            candidate_ids=bulk_assignment.candidate_ids,
+            assigned_recruiter_id=bulk_assignment.assigned_recruiter_id,
+            start_immediately=bulk_assignment.start_immediately,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
 
 
 @router.get(API_ROUTES.WORKFLOWS.CANDIDATES, response_model=list[CandidateWorkflowInfo])
@@ -366,13 +395,21 @@ async def update_candidate_workflow_status(
 @router.get(API_ROUTES.WORKFLOWS.CANDIDATE_TIMELINE, response_model=CandidateTimeline)
 async def get_candidate_timeline(
     candidate_workflow_id: int,
+    after: int | None = Query(
+        None, description="Return events after this cursor (next_cursor of a page)"
+    ),
+    limit: int = Query(100, ge=1, le=500),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """
     Get timeline for a candidate workflow.
+
+    Pages through the workflow event log oldest first. Pass the returned
+    ``next_cursor`` as ``after`` to read the next page, or to poll for new
+    events since the last request.
     """
-    candidate_wf = await candidate_workflow.get_with_details(
+    candidate_wf = await candidate_workflow.get_with_workflow(
         db, id=candidate_workflow_id
     )
     if not candidate_wf:
@@ -408,8 +445,16 @@ async def get_candidate_timeline(
             status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
         )
 
-    timeline_items = await workflow_engine.get_candidate_timeline(
-        db, candidate_workflow_id
+    (
+        timeline_items,
+        next_cursor,
+        has_more,
+    ) = await workflow_engine.get_candidate_timeline(
+        db,
+        candidate_workflow_id,
+        after=after,
+        limit=limit,
+        workflow_name=candidate_wf.workflow.name,
     )
 
     return CandidateTimeline(
@@ -420,6 +465,8 @@ async def get_candidate_timeline(
         process_name=candidate_wf.workflow.name,
         current_status=CandidateWorkflowStatus(candidate_wf.status),
         timeline_items=timeline_items,
+        next_cursor=next_cursor,
+        has_more=has_more,
     )
 
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from dataclasses import asdict
 from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, Response, status
@@ -11,6 +12,7 @@ from app.config.endpoints import API_ROUTES
 from app.crud.todo import todo as todo_crud
 from app.crud.workflow.workflow import workflow
 from app.crud.workflow.workflow_node import workflow_node
+from app.crud.workflow.workflow_node_connection import workflow_node_connection
 from app.database import get_db
 from app.dependencies import get_current_active_user
 from app.models.user import User
@@ -19,6 +21,7 @@ from app.schemas.workflow.enums import NodeType
 from app.schemas.workflow.workflow_node import (
     NodeIntegrationInterview,
     NodeIntegrationTodo,
+    WorkflowGraphAnalysis,
     WorkflowNodeCreate,
     WorkflowNodeCreateWithIntegration,
     WorkflowNodeInfo,
@@ -38,10 +41,11 @@ def _get_user_roles(user: User) -> set[str]:
     return {user_role.role.name for user_role in user.user_roles}
 
 
-def _ensure_workflow_can_be_edited(workflow_obj, user: User) -> None:
+def _ensure_workflow_access(workflow_obj, user: User) -> bool:
+    """Raise unless ``user`` may modify the workflow; True for system admins."""
     roles = _get_user_roles(user)
     if UserRole.SYSTEM_ADMIN.value in roles:
-        return None
+        return True
 
     if not roles.intersection({UserRole.MEMBER.value, UserRole.ADMIN.value}):
         raise HTTPException(
@@ -54,6 +58,12 @@ def _ensure_workflow_can_be_edited(workflow_obj, user: User) -> None:
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You do not have access to this workflow",
         )
+    return False
+
+
+def _ensure_workflow_can_be_edited(workflow_obj, user: User) -> None:
+    if _ensure_workflow_access(workflow_obj, user):
+        return None
 
     if not workflow_obj.can_be_edited:
         raise HTTPException(
@@ -274,6 +284,25 @@ async def create_workflow_node_endpoint(
     return _serialise_node(node)
 
 
+@router.get(
+    API_ROUTES.WORKFLOWS.NODE_GRAPH,
+    response_model=WorkflowGraphAnalysis,
+)
+async def get_workflow_node_graph_endpoint(
+    workflow_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> WorkflowGraphAnalysis:
+    """Cycles, unreachable and dead-end nodes, and the execution order."""
+    wf = await _load_workflow(db, workflow_id)
+    _ensure_workflow_access(wf, current_user)
+
+    analysis = await workflow_node_connection.analyze_workflow(
+        db, workflow_id=workflow_id
+    )
+    return WorkflowGraphAnalysis.model_validate(asdict(analysis))
+
+
 @router.post(
     API_ROUTES.WORKFLOWS.NODE_WITH_INTEGRATION,
     status_code=status.HTTP_201_CREATED,
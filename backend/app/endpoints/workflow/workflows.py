@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -480,6 +482,13 @@ async def validate_workflow(
 @router.get(API_ROUTES.WORKFLOWS.ANALYTICS, response_model=ProcessAnalytics)
 async def get_workflow_analytics(
     workflow_id: int,
+    since: datetime | None = Query(
+        None,
+        description="Only candidates assigned and steps created at or after this time",
+    ),
+    until: datetime | None = Query(
+        None, description="Only candidates assigned and steps created before this time"
+    ),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
@@ -514,7 +523,15 @@ async def get_workflow_analytics(
                 status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
             )
 
-    analytics = await workflow_engine.get_process_analytics(db, workflow_id)
+    if since and until and since >= until:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="since must be earlier than until",
+        )
+
+    analytics = await workflow_engine.get_process_analytics(
+        db, workflow_id, since=since, until=until
+    )
 
     return ProcessAnalytics(
         workflow_id=workflow_id,
@@ -528,6 +545,8 @@ async def get_workflow_analytics(
         node_statistics=analytics["node_statistics"],
         bottleneck_nodes=analytics["bottleneck_nodes"],
         recruiter_workload=analytics["recruiter_workload"],
+        since=since,
+        until=until,
     )
 
 
@@ -9,6 +9,8 @@ from fastapi.responses import JSONResponse
 from app.database import init_db
 from app.middleware import RequestContextMiddleware, StructuredLoggingMiddleware
 from app.routers import include_routers
+from app.services.email_template_service import email_template_service
+from app.services.pdf_renderer import shutdown_pdf_renderer
 from app.utils.logging import configure_structlog, get_logger
 
 # Configure structured logging
@@ -30,6 +32,9 @@ async def lifespan(app: FastAPI):
         await init_db()
         logger.info("Database initialized", component="database")
 
+        templates = email_template_service.preload()
+        logger.info("Email templates compiled", count=templates, component="email")
+
         # Test Redis connection - TEMPORARILY DISABLED FOR DOCKER ISSUES
         # redis_conn = await get_redis()
         # await redis_conn.ping()
@@ -46,6 +51,7 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down MiraiWorks API", component="shutdown")
+    await shutdown_pdf_renderer()
 
 
 # Create FastAPI app
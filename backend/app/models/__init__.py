@@ -13,6 +13,7 @@ from app.models.company import Company
 from app.models.company_connection import CompanyConnection  # Import BEFORE Company
 from app.models.company_subscription import CompanySubscription
 from app.models.connection_invitation import ConnectionInvitation
+from app.models.conversation import Conversation
 from app.models.education import ProfileEducation
 from app.models.exam import (
     Exam,
@@ -27,6 +28,8 @@ from app.models.exam import (
     SessionStatus,
 )
 from app.models.feature import Feature
+from app.models.file_access import FileAccessEntry
+from app.models.file_blob import FileBlob
 from app.models.holiday import Holiday
 from app.models.interview import Interview, InterviewProposal
 from app.models.interview_note import InterviewNote
@@ -41,6 +44,7 @@ from app.models.meeting import (
 )
 from app.models.message import Message
 from app.models.notification import Notification
+from app.models.outbound_email import OutboundEmail
 from app.models.plan_change_request import PlanChangeRequest
 from app.models.plan_feature import PlanFeature
 from app.models.position import CompanyProfile, Position, PositionApplication
@@ -59,6 +63,7 @@ from app.models.resume import (
     Skill,
     WorkExperience,
 )
+from app.models.resume_export_job import ResumeExportJob
 from app.models.role import Role, UserRole
 from app.models.skill import ProfileSkill
 from app.models.subscription_plan import SubscriptionPlan
@@ -78,6 +83,7 @@ from app.models.video_call import (
 )
 from app.models.work_experience import ProfileWorkExperience
 from app.models.workflow import Workflow
+from app.models.workflow_event import WorkflowEvent
 from app.models.workflow_node import WorkflowNode
 from app.models.workflow_node_connection import WorkflowNodeConnection
 from app.models.workflow_node_execution import WorkflowNodeExecution
@@ -97,12 +103,17 @@ __all__ = [
     "OauthAccount",
     "AuditLog",
     "Notification",
+    "OutboundEmail",
     "Message",
+    "Conversation",
     "Attachment",
+    "FileAccessEntry",
+    "FileBlob",
     "Interview",
     "InterviewProposal",
     "InterviewNote",
     "Resume",
+    "ResumeExportJob",
     "WorkExperience",
     "Education",
     "Skill",
@@ -151,6 +162,7 @@ __all__ = [
     "WorkflowNodeExecution",
     "WorkflowViewer",
     "CandidateWorkflow",
+    "WorkflowEvent",
     "QuestionBank",
     "QuestionBankItem",
     "SubscriptionPlan",
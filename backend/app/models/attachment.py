@@ -28,14 +28,20 @@ class Attachment(BaseModel):
     )
     original_filename: Mapped[str] = mapped_column(String(255), nullable=False)
     s3_key: Mapped[str] = mapped_column(
-        String(500), nullable=False, unique=True, index=True
-    )  # S3 object key
+        String(500), nullable=False, index=True
+    )  # S3 object key (shared by attachments with identical content)
     s3_bucket: Mapped[str] = mapped_column(String(255), nullable=False)
     mime_type: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
     file_size: Mapped[int] = mapped_column(BigInteger, nullable=False)
     sha256_hash: Mapped[str] = mapped_column(
         String(64), nullable=False, index=True
     )  # File hash for deduplication
+    blob_id: Mapped[int | None] = mapped_column(
+        Integer,
+        ForeignKey("file_blobs.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )  # Content-addressed object this attachment references
 
     # Virus scanning
     virus_status: Mapped[str] = mapped_column(
@@ -61,6 +67,7 @@ class Attachment(BaseModel):
     # Relationships
     message = relationship("Message", back_populates="attachments")
     owner = relationship("User")
+    blob = relationship("FileBlob")
 
     @property
     def file_size_mb(self):
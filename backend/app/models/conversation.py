@@ -0,0 +1,80 @@
+from datetime import datetime
+
+from sqlalchemy import (
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import BaseModel
+
+
+class Conversation(BaseModel):
+    """Denormalized summary of the direct-message thread between two users.
+
+    One row per user pair, keyed by the ordered pair (``user_low_id`` is always
+    the smaller user id). Maintained in the same transaction as message writes
+    and read receipts so the inbox and unread badges are index lookups instead
+    of aggregates over the full ``messages`` table.
+    """
+
+    __tablename__ = "conversation_summaries"
+
+    user_low_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    user_high_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    # Latest message still visible to the low / high side of the pair
+    last_message_id_low: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("messages.id", ondelete="SET NULL"), nullable=True
+    )
+    last_message_id_high: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("messages.id", ondelete="SET NULL"), nullable=True
+    )
+    last_activity_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    # Unread messages addressed to the low / high side of the pair
+    unread_count_low: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    unread_count_high: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    # Relationships
+    user_low = relationship("User", foreign_keys=[user_low_id])
+    user_high = relationship("User", foreign_keys=[user_high_id])
+
+    __table_args__ = (
+        UniqueConstraint("user_low_id", "user_high_id", name="uq_conversation_pair"),
+        Index("idx_conversation_low_activity", "user_low_id", "last_activity_at"),
+        Index("idx_conversation_high_activity", "user_high_id", "last_activity_at"),
+    )
+
+    def __repr__(self):
+        return f"<Conversation(user_low_id={self.user_low_id}, user_high_id={self.user_high_id})>"
+
+    @staticmethod
+    def ordered_pair(user_a_id: int, user_b_id: int) -> tuple[int, int]:
+        """Return the ``(low, high)`` key for a pair of users."""
+        return (
+            (user_a_id, user_b_id) if user_a_id < user_b_id else (user_b_id, user_a_id)
+        )
+
+    def other_user_id(self, user_id: int) -> int:
+        """Return the id of the conversation partner of ``user_id``."""
+        return self.user_high_id if user_id == self.user_low_id else self.user_low_id
+
+    def last_message_id_for(self, user_id: int) -> int | None:
+        """Return the id of the latest message visible to ``user_id``."""
+        if user_id == self.user_low_id:
+            return self.last_message_id_low
+        return self.last_message_id_high
+
+    def unread_count_for(self, user_id: int) -> int:
+        """Return the number of unread messages addressed to ``user_id``."""
+        if user_id == self.user_low_id:
+            return self.unread_count_low
+        return self.unread_count_high
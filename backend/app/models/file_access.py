@@ -0,0 +1,37 @@
+from sqlalchemy import ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import BaseModel
+
+
+class FileAccessEntry(BaseModel):
+    """Grants one user access to one stored file.
+
+    ``storage_key`` is the normalized key the download endpoint receives (for
+    example ``message-attachments/8/2025/09/report.pdf``). A row without a
+    ``message_id`` is an ownership grant written on upload; a row with one
+    grants a message participant access for as long as the message remains
+    visible to them. ``todo_id`` records the todo the file is attached to so
+    deleting the todo drops its grants.
+    """
+
+    __tablename__ = "file_access_entries"
+
+    storage_key: Mapped[str] = mapped_column(String(500), nullable=False)
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    message_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("messages.id", ondelete="CASCADE"), nullable=True
+    )
+    todo_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("todos.id", ondelete="CASCADE"), nullable=True
+    )
+
+    __table_args__ = (
+        Index("idx_file_access_key_user", "storage_key", "user_id"),
+        Index("idx_file_access_message", "message_id"),
+    )
+
+    def __repr__(self):
+        return f"<FileAccessEntry(storage_key={self.storage_key!r}, user_id={self.user_id})>"
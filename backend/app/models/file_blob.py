@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import BaseModel
+from app.utils.constants import VirusStatus
+
+
+class FileBlob(BaseModel):
+    """One stored object per distinct file content (SHA-256).
+
+    Attachments with identical bytes share a blob; ``ref_count`` tracks how
+    many attachments point at it and the object is deleted when it drops to
+    zero. The virus verdict lives here too, so a file that was already
+    scanned is not scanned again when someone uploads another copy.
+    """
+
+    __tablename__ = "file_blobs"
+
+    sha256_hash: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)
+    s3_key: Mapped[str] = mapped_column(String(500), nullable=False)
+    file_size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    content_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    virus_status: Mapped[str] = mapped_column(
+        String(20), nullable=False, default=VirusStatus.PENDING.value
+    )
+    virus_scan_result: Mapped[str | None] = mapped_column(Text, nullable=True)
+    scanned_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    @property
+    def has_verdict(self) -> bool:
+        return self.virus_status in (
+            VirusStatus.CLEAN.value,
+            VirusStatus.INFECTED.value,
+        )
+
+    def __repr__(self):
+        return (
+            f"<FileBlob(sha256_hash={self.sha256_hash!r}, ref_count={self.ref_count})>"
+        )
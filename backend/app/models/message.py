@@ -4,6 +4,7 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -59,6 +60,16 @@ class Message(BaseModel):
     )
     attachments = relationship("Attachment", back_populates="message")
 
+    __table_args__ = (
+        # ngram parser so Japanese text (no word separators) is searchable
+        Index(
+            "ft_messages_content",
+            "content",
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ),
+    )
+
     def __repr__(self):
         return f"<Message(id={self.id}, sender_id={self.sender_id}, recipient_id={self.recipient_id})>"
 
@@ -0,0 +1,46 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import BaseModel
+from app.utils.constants import OutboundEmailStatus
+from app.utils.db_types import LONGTEXT
+
+
+class OutboundEmail(BaseModel):
+    """One queued message to one recipient, delivered by the mail worker.
+
+    ``next_attempt_at`` is when the row may next be picked up: the retry time
+    for a failed attempt, or the end of the lease while a worker is sending
+    it, so a row abandoned by a crashed worker is retried after the lease.
+    """
+
+    __tablename__ = "outbound_emails"
+
+    to_email: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Lower-cased domain of to_email, for per-domain rate limits
+    recipient_domain: Mapped[str] = mapped_column(String(255), nullable=False)
+    subject: Mapped[str] = mapped_column(String(500), nullable=False)
+    html_body: Mapped[str] = mapped_column(LONGTEXT, nullable=False)
+    text_body: Mapped[str | None] = mapped_column(LONGTEXT, nullable=True)
+
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False, default=OutboundEmailStatus.QUEUED.value
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    sent_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    __table_args__ = (
+        Index("idx_outbound_email_due", "status", "next_attempt_at"),
+        Index("idx_outbound_email_domain_sent", "recipient_domain", "sent_at"),
+    )
+
+    def __repr__(self):
+        return f"<OutboundEmail(id={self.id}, to={self.to_email!r}, status={self.status!r})>"
@@ -0,0 +1,60 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import BaseModel
+from app.utils.constants import ResumeExportStatus
+
+
+class ResumeExportJob(BaseModel):
+    """Background export of many resumes as PDFs bundled into one zip.
+
+    The Celery worker updates the counters and the ``results``/``errors``
+    lists as each resume finishes, so the row doubles as the progress record
+    read by the status endpoint.
+    """
+
+    __tablename__ = "resume_export_jobs"
+
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    status: Mapped[str] = mapped_column(
+        String(30), nullable=False, default=ResumeExportStatus.PENDING.value
+    )
+    celery_task_id: Mapped[str | None] = mapped_column(String(255))
+
+    # Render options applied to every resume in the batch
+    resume_ids: Mapped[list] = mapped_column(JSON, nullable=False)
+    format: Mapped[str] = mapped_column(String(10), nullable=False, default="A4")
+    include_contact_info: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=True
+    )
+    watermark: Mapped[str | None] = mapped_column(String(100))
+
+    total_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    completed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    failed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # [{"resume_id", "file_path", "filename", "file_size"}]
+    results: Mapped[list | None] = mapped_column(JSON)
+    # [{"resume_id", "error"}]
+    errors: Mapped[list | None] = mapped_column(JSON)
+    error_message: Mapped[str | None] = mapped_column(String(500))
+
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+    user = relationship("User")
+
+    @property
+    def processed_count(self) -> int:
+        return self.completed_count + self.failed_count
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (
+            ResumeExportStatus.COMPLETED.value,
+            ResumeExportStatus.COMPLETED_WITH_ERRORS.value,
+            ResumeExportStatus.FAILED.value,
+        )
@@ -0,0 +1,69 @@
+from datetime import datetime
+
+from sqlalchemy import (
+    DECIMAL,
+    JSON,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import BaseModel
+from app.utils.datetime_utils import get_utc_now
+
+
+class WorkflowEvent(BaseModel):
+    """One state change of a candidate's workflow, in an append-only log.
+
+    The workflow engine writes a row whenever it starts or completes a
+    candidate's process, creates or completes a node execution, or moves
+    the candidate on. Rows are never updated. Timelines page through them by
+    ``id``, and analytics read them by ``(workflow_id, occurred_at)``.
+
+    ``data`` snapshots what the timeline shows, e.g. the node title, so
+    history reads need no joins and survive edits to the workflow.
+    """
+
+    __tablename__ = "workflow_events"
+
+    candidate_workflow_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("candidate_workflows.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    workflow_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("workflows.id", ondelete="CASCADE"), nullable=False
+    )
+    # process_started, node_started, node_completed, advanced, process_completed
+    event_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    node_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("workflow_nodes.id", ondelete="SET NULL"), nullable=True
+    )
+    execution_id: Mapped[int | None] = mapped_column(
+        Integer,
+        ForeignKey("workflow_node_executions.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    actor_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )
+    result: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    score: Mapped[float | None] = mapped_column(DECIMAL(5, 2), nullable=True)
+    data: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    occurred_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=get_utc_now
+    )
+
+    __table_args__ = (
+        Index("idx_workflow_event_candidate", "candidate_workflow_id", "id"),
+        Index("idx_workflow_event_workflow_time", "workflow_id", "occurred_at"),
+    )
+
+    def __repr__(self):
+        return (
+            f"<WorkflowEvent(id={self.id}, type={self.event_type!r}, "
+            f"candidate_workflow_id={self.candidate_workflow_id})>"
+        )
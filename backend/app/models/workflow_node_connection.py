@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from datetime import datetime
 from typing import TYPE_CHECKING
 
@@ -13,6 +14,53 @@ if TYPE_CHECKING:
     from app.models.workflow import Workflow
     from app.models.workflow_node import WorkflowNode
 
+ConditionPredicate = Callable[[str, dict | None], bool]
+
+SUCCESS_RESULTS = frozenset({"pass", "completed", "approved"})
+FAILURE_RESULTS = frozenset({"fail", "failed", "rejected"})
+
+
+def compile_condition(
+    condition_type: str, condition_config: dict | None
+) -> ConditionPredicate:
+    """Turn a connection's condition into a predicate over (result, data).
+
+    The config is read once here, so evaluating the predicate does no lookups.
+    """
+    if condition_type == "always":
+        return lambda execution_result, execution_data: True
+
+    if condition_type == "success":
+        return lambda execution_result, execution_data: (
+            execution_result in SUCCESS_RESULTS
+        )
+
+    if condition_type == "failure":
+        return lambda execution_result, execution_data: (
+            execution_result in FAILURE_RESULTS
+        )
+
+    if condition_type == "conditional" and condition_config:
+        required_result = condition_config.get("required_result")
+        min_score = condition_config.get("min_score")
+
+        def evaluate_custom(execution_result: str, execution_data: dict | None) -> bool:
+            # Simple condition evaluation
+            if required_result and execution_result == required_result:
+                return True
+
+            # Score-based conditions
+            if min_score and execution_data:
+                score = execution_data.get("score")
+                if score is not None and score >= min_score:
+                    return True
+
+            return False
+
+        return evaluate_custom
+
+    return lambda execution_result, execution_data: False
+
 
 class WorkflowNodeConnection(Base):
     __tablename__ = "workflow_node_connections"
@@ -85,41 +133,8 @@ class WorkflowNodeConnection(Base):
         self, execution_result: str, execution_data: dict | None = None
     ) -> bool:
         """Evaluate whether this connection should be taken based on execution result"""
-        if self.condition_type == "always":
-            return True
-
-        if self.condition_type == "success":
-            return execution_result in ["pass", "completed", "approved"]
-
-        if self.condition_type == "failure":
-            return execution_result in ["fail", "failed", "rejected"]
-
-        if self.condition_type == "conditional" and self.condition_config:
-            # Custom condition evaluation based on config
-            return self._evaluate_custom_condition(execution_result, execution_data)
-
-        return False
-
-    def _evaluate_custom_condition(
-        self, execution_result: str, execution_data: dict | None = None
-    ) -> bool:
-        """Evaluate custom conditions based on condition_config"""
-        if not self.condition_config:
-            return False
-
-        # Simple condition evaluation
-        required_result = self.condition_config.get("required_result")
-        if required_result and execution_result == required_result:
-            return True
-
-        # Score-based conditions
-        min_score = self.condition_config.get("min_score")
-        if min_score and execution_data:
-            score = execution_data.get("score")
-            if score is not None and score >= min_score:
-                return True
-
-        return False
+        predicate = compile_condition(self.condition_type, self.condition_config)
+        return predicate(execution_result, execution_data)
 
     def __repr__(self) -> str:
         return f"<WorkflowNodeConnection(id={self.id}, {self.source_node_id}->{self.target_node_id}, condition='{self.condition_type}')>"
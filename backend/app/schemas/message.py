@@ -52,19 +52,23 @@ class ConversationSummary(BaseModel):
 class MessageSearchRequest(BaseModel):
     query: str | None = None  # Search in message content and sender names
     with_user_id: int | None = None  # Filter messages with specific user
-    limit: int = 50
-    offset: int = 0
+    limit: int = Field(default=50, ge=1, le=200)
+    offset: int = 0  # Deprecated: only 0 is accepted; page with ``cursor``
+    cursor: str | None = None  # ``next_cursor`` from the previous page
 
 
 class MessageListResponse(BaseModel):
     messages: list[MessageInfo]
     total: int
     has_more: bool
+    next_cursor: str | None = None
 
 
 class ConversationListResponse(BaseModel):
     conversations: list[ConversationSummary]
     total: int
+    next_cursor: str | None = None  # Pass back as ``cursor`` to get the next page
+    has_more: bool = False
 
 
 class MessageReadRequest(BaseModel):
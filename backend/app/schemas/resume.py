@@ -626,6 +626,34 @@ class PDFGenerationResponse(BaseModel):
     file_size: int  # in bytes
 
 
+# Batch PDF export
+class ResumeExportRequest(BaseModel):
+    resume_ids: list[int] = Field(..., min_length=1, max_length=500)
+    format: str = Field("A4", pattern="^(A4|Letter)$")
+    include_contact_info: bool = True
+    watermark: str | None = Field(None, max_length=100)
+
+
+class ResumeExportError(BaseModel):
+    resume_id: int
+    error: str
+
+
+class ResumeExportJobInfo(BaseModel):
+    job_id: int
+    status: str
+    total_count: int
+    completed_count: int
+    failed_count: int
+    progress: float  # 0-100
+    errors: list[ResumeExportError] = []
+    error_message: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    download_ready: bool = False
+
+
 # Japanese Resume specific schemas
 class RirekishoData(BaseModel):
     """Rirekisho (traditional Japanese resume) specific data structure"""
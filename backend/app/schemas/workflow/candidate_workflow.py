@@ -122,6 +122,9 @@ class CandidateTimeline(BaseModel):
     process_name: str
     current_status: CandidateWorkflowStatus
     timeline_items: list[dict[str, Any]] = Field(default_factory=list)
+    # Last event id returned; pass back as ``after`` to page or poll
+    next_cursor: int | None = None
+    has_more: bool = False
 
 
 class TimelineItem(BaseModel):
@@ -225,6 +228,28 @@ class BulkCandidateAssignment(BaseModel):
         return v
 
 
+class CandidateAssignmentOutcome(BaseModel):
+    """What bulk assignment did for one candidate"""
+
+    candidate_id: int
+    status: str = Field(
+        ..., description="assigned, started, already_assigned or failed"
+    )
+    candidate_workflow_id: int | None = None
+    error: str | None = None
+
+
+class BulkCandidateAssignmentReport(BaseModel):
+    """Schema for the per-candidate result of a bulk assignment"""
+
+    workflow_id: int
+    assigned: int = Field(..., description="Candidates newly assigned")
+    started: int = Field(..., description="Candidates assigned and started")
+    already_assigned: int
+    failed: int
+    outcomes: list[CandidateAssignmentOutcome]
+
+
 class CandidateWorkflowStatistics(BaseModel):
     """Schema for candidate process statistics"""
 
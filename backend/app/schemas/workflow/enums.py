@@ -61,6 +61,16 @@ class ExecutionResult(str, Enum):
     SKIPPED = "skipped"
 
 
+class WorkflowEventType(str, Enum):
+    """Entries of the candidate workflow event log"""
+
+    PROCESS_STARTED = "process_started"
+    NODE_STARTED = "node_started"
+    NODE_COMPLETED = "node_completed"
+    ADVANCED = "advanced"
+    PROCESS_COMPLETED = "process_completed"
+
+
 class ConnectionConditionType(str, Enum):
     """Condition types for node connections"""
 
@@ -191,3 +191,6 @@ class ProcessAnalytics(BaseModel):
     node_statistics: list[dict[str, Any]]
     bottleneck_nodes: list[dict[str, Any]]
     recruiter_workload: list[dict[str, Any]]
+    # Time window the figures cover; None means unbounded
+    since: datetime | None = None
+    until: datetime | None = None
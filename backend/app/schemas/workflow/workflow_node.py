@@ -337,6 +337,23 @@ class WorkflowNodeConnectionInfo(BaseModel):
         from_attributes = True
 
 
+class WorkflowGraphAnalysis(BaseModel):
+    """Structure of a workflow's node graph, for the visual editor"""
+
+    node_ids: list[int]
+    start_node_ids: list[int]
+    end_node_ids: list[int]
+    orphaned_node_ids: list[int]
+    cycles: list[list[int]] = Field(
+        ..., description="One path per cycle, ending on its first node"
+    )
+    unreachable_node_ids: list[int]
+    dead_end_node_ids: list[int]
+    topological_order: list[int] | None = Field(
+        None, description="Node ids in execution order; null if there are cycles"
+    )
+
+
 class NodeReorder(BaseModel):
     """Schema for reordering nodes"""
 
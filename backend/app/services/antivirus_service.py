@@ -1,13 +1,19 @@
+import asyncio
 import logging
-import socket
-import struct
 
 from sqlalchemy import select, update
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.config import settings
+from app.database import AsyncSessionLocal
 from app.models.attachment import Attachment
-from app.services.storage_service import get_storage_service
+from app.services.blob_store import blob_store
+from app.services.clamav_client import (
+    AsyncClamAVClient,
+    ClamAVError,
+    iterate_in_thread,
+)
+from app.services.storage_service import StorageService, get_storage_service
 from app.utils.constants import VirusStatus
 from app.utils.datetime_utils import get_utc_now
 
@@ -17,115 +23,78 @@ logger = logging.getLogger(__name__)
 class AntivirusService:
     """ClamAV antivirus scanning service."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        client: AsyncClamAVClient | None = None,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        storage: StorageService | None = None,
+    ):
         self.clamav_host = settings.clamav_host
         self.clamav_port = settings.clamav_port
-        self.timeout = 30  # 30 seconds timeout
+        self.timeout = settings.clamav_timeout_seconds
+        self._client = client
+        self._session_factory = session_factory or AsyncSessionLocal
+        self._storage = storage
+
+    @property
+    def client(self) -> AsyncClamAVClient:
+        if self._client is None:
+            self._client = AsyncClamAVClient(
+                self.clamav_host,
+                self.clamav_port,
+                pool_size=settings.clamav_pool_size,
+                timeout=self.timeout,
+                chunk_size=settings.clamav_chunk_size,
+            )
+        return self._client
+
+    @property
+    def storage(self) -> StorageService:
+        if self._storage is None:
+            self._storage = get_storage_service()
+        return self._storage
 
     async def scan_file_by_s3_key(self, s3_key: str) -> tuple[VirusStatus, str]:
         """
-        Scan file stored in S3 by downloading and scanning.
+        Scan file stored in S3, piping the object stream into INSTREAM.
         Returns (status, scan_result_message).
         """
         try:
-            # Download file from S3
-            file_data = await self._download_file_from_s3(s3_key)
-            if not file_data:
-                return VirusStatus.ERROR, "Failed to download file from S3"
-
-            # Scan the file data
-            return await self._scan_data(file_data)
+            chunks = self.storage.iter_file(s3_key, self.client.chunk_size)
+            return await self.client.instream(iterate_in_thread(chunks))
 
+        except ClamAVError as e:
+            logger.error(f"ClamAV scan error for {s3_key}: {e}")
+            return VirusStatus.ERROR, f"Scan failed: {str(e)}"
+        except TimeoutError:
+            return VirusStatus.ERROR, "Scan timeout"
         except Exception as e:
             logger.error(f"File scan failed for {s3_key}: {e}")
             return VirusStatus.ERROR, f"Scan error: {str(e)}"
 
-    async def _download_file_from_s3(self, s3_key: str) -> bytes | None:
-        """Download file data from S3."""
-        try:
-            # Get presigned URL and download
-            url = get_storage_service().get_presigned_url(s3_key)
-
-            import httpx
-
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url)
-                if response.status_code == 200:
-                    return response.content
-                else:
-                    logger.error(
-                        f"Failed to download file from S3: {response.status_code}"
-                    )
-                    return None
-
-        except Exception as e:
-            logger.error(f"S3 download error: {e}")
-            return None
-
     async def _scan_data(self, data: bytes) -> tuple[VirusStatus, str]:
         """Scan binary data using ClamAV."""
         try:
-            # Connect to ClamAV daemon
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(self.timeout)
-            sock.connect((self.clamav_host, self.clamav_port))
-
-            try:
-                # Send INSTREAM command
-                sock.send(b"zINSTREAM\0")
-
-                # Send file data in chunks
-                chunk_size = 1024
-                for i in range(0, len(data), chunk_size):
-                    chunk = data[i : i + chunk_size]
-                    # Send chunk size (4 bytes, network byte order) + chunk
-                    sock.send(struct.pack(">L", len(chunk)) + chunk)
-
-                # Send 0-length chunk to indicate end
-                sock.send(struct.pack(">L", 0))
-
-                # Receive response
-                response = sock.recv(1024).decode("utf-8").strip()
-
-                # Parse response
-                if "FOUND" in response:
-                    virus_name = response.split(":")[1].strip()
-                    return VirusStatus.INFECTED, f"Virus detected: {virus_name}"
-                elif "OK" in response:
-                    return VirusStatus.CLEAN, "File is clean"
-                else:
-                    return VirusStatus.ERROR, f"Unexpected response: {response}"
-
-            finally:
-                sock.close()
-
-        except TimeoutError:
-            return VirusStatus.ERROR, "Scan timeout"
-        except ConnectionRefusedError:
-            logger.error("Cannot connect to ClamAV daemon")
-            return VirusStatus.ERROR, "Antivirus service unavailable"
-        except Exception as e:
+            return await self.client.instream([data])
+        except ClamAVError as e:
             logger.error(f"ClamAV scan error: {e}")
             return VirusStatus.ERROR, f"Scan failed: {str(e)}"
+        except TimeoutError:
+            return VirusStatus.ERROR, "Scan timeout"
 
     async def ping_clamav(self) -> bool:
         """Test connection to ClamAV daemon."""
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(5)
-            sock.connect((self.clamav_host, self.clamav_port))
-
-            try:
-                sock.send(b"zPING\0")
-                response = sock.recv(1024).decode("utf-8").strip()
-                return "PONG" in response
-            finally:
-                sock.close()
-
+            return await self.client.ping()
         except Exception as e:
             logger.error(f"ClamAV ping failed: {e}")
             return False
 
+    async def close(self) -> None:
+        """Close pooled clamd connections (end of a worker task or app)."""
+        if self._client is not None:
+            await self._client.close()
+
     async def scan_attachment(self, db: AsyncSession, attachment_id: int) -> bool:
         """
         Scan attachment and update its virus status.
@@ -152,20 +121,29 @@ class AntivirusService:
                 )
                 return True
 
+            # Identical content that was already scanned keeps its verdict
+            blob = await blob_store.find_verdict(db, attachment.sha256_hash)
+            if blob is not None:
+                attachment.virus_status = blob.virus_status
+                attachment.virus_scan_result = blob.virus_scan_result
+                attachment.scanned_at = blob.scanned_at
+                attachment.is_available = blob.virus_status == VirusStatus.CLEAN.value
+                await db.commit()
+                logger.info(
+                    f"Attachment {attachment_id} reused verdict for "
+                    f"{attachment.sha256_hash}: {blob.virus_status}"
+                )
+                return True
+
             # Scan the file
             status, result_message = await self.scan_file_by_s3_key(attachment.s3_key)
 
             # Update attachment
-            await db.execute(
-                update(Attachment)
-                .where(Attachment.id == attachment_id)
-                .values(
-                    virus_status=status.value,
-                    virus_scan_result=result_message,
-                    scanned_at=get_utc_now(),
-                    is_available=(status == VirusStatus.CLEAN),
-                )
-            )
+            attachment.virus_status = status.value
+            attachment.virus_scan_result = result_message
+            attachment.scanned_at = get_utc_now()
+            attachment.is_available = status == VirusStatus.CLEAN
+            await blob_store.record_verdict(db, attachment)
 
             await db.commit()
 
@@ -206,7 +184,8 @@ class AntivirusService:
 
     async def bulk_scan_pending_files(self, db: AsyncSession, limit: int = 10) -> int:
         """
-        Scan pending files in batch.
+        Scan pending files in batch, up to ``clamav_scan_concurrency`` at once.
+        Each scan uses its own session from ``session_factory``.
         Returns number of files scanned.
         """
         try:
@@ -214,22 +193,21 @@ class AntivirusService:
             result = await db.execute(
                 select(Attachment.id)
                 .where(Attachment.virus_status == VirusStatus.PENDING.value)
+                .order_by(Attachment.id)
                 .limit(limit)
             )
-
             attachment_ids = result.scalars().all()
-            scanned_count = 0
 
-            for attachment_id in attachment_ids:
-                if await self.scan_attachment(db, attachment_id):
-                    scanned_count += 1
+            semaphore = asyncio.Semaphore(settings.clamav_scan_concurrency)
 
-                # Small delay between scans to avoid overwhelming ClamAV
-                import asyncio
+            async def scan_one(attachment_id: int) -> bool:
+                async with semaphore, self._session_factory() as session:
+                    return await self.scan_attachment(session, attachment_id)
 
-                await asyncio.sleep(0.1)
-
-            return scanned_count
+            results = await asyncio.gather(
+                *(scan_one(attachment_id) for attachment_id in attachment_ids)
+            )
+            return sum(results)
 
         except Exception as e:
             logger.error(f"Bulk scan failed: {e}")
@@ -14,6 +14,7 @@ from app.models.auth import RefreshToken
 from app.models.role import UserRole as UserRoleModel
 from app.models.user import User
 from app.rbac import is_admin_role
+from app.services.principal_cache import principal_cache
 from app.utils.constants import UserRole
 from app.utils.datetime_utils import get_utc_now
 
@@ -133,6 +134,7 @@ class AuthService:
         )
 
         await db.commit()
+        await principal_cache.invalidate_user(user_id)
         return result.rowcount > 0
 
     async def verify_refresh_token(self, db: AsyncSession, token: str) -> User | None:
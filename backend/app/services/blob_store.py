@@ -0,0 +1,230 @@
+"""Content-addressed attachment storage with reference counting.
+
+Each distinct file content is stored once, under a key derived from its
+SHA-256, and tracked by a ``FileBlob`` row. Attachments reference the blob
+instead of owning an object; the object is deleted when the last reference
+is released. Virus verdicts are recorded on the blob, so a second copy of a
+file that was already scanned inherits the verdict instead of being scanned
+again.
+
+Reference counts are changed under the blob row's lock (the upsert in
+``_acquire`` and ``SELECT ... FOR UPDATE`` in ``release``), so concurrent
+uploads and cleanups of the same content cannot lose or double-delete the
+object. Like the CRUD helpers, methods stage changes and callers commit.
+
+The file upload endpoint stores message attachments through
+``create_attachment``; profile avatars and other non-attachment files keep
+their own storage paths.
+"""
+
+import asyncio
+
+from fastapi import UploadFile
+from sqlalchemy import select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.attachment import Attachment
+from app.models.file_blob import FileBlob
+from app.services.storage_service import StorageService, get_storage_service
+from app.services.upload_stream import (
+    UploadResult,
+    hash_upload,
+    stream_upload_to_minio,
+)
+from app.utils.constants import VirusStatus
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+BLOB_PREFIX = "blobs"
+
+
+def blob_key(sha256_hash: str) -> str:
+    """Object key for a content hash, fanned out by its first two hex digits."""
+    return f"{BLOB_PREFIX}/{sha256_hash[:2]}/{sha256_hash}"
+
+
+class BlobStore:
+    def __init__(self, storage: StorageService | None = None):
+        self._storage = storage
+
+    @property
+    def storage(self) -> StorageService:
+        if self._storage is None:
+            self._storage = get_storage_service()
+        return self._storage
+
+    async def _acquire(
+        self, db: AsyncSession, content: UploadResult, content_type: str
+    ) -> FileBlob:
+        """Create the blob row or add a reference to the existing one."""
+        stmt = mysql_insert(FileBlob).values(
+            sha256_hash=content.sha256,
+            s3_key=blob_key(content.sha256),
+            file_size=content.size,
+            content_type=content_type,
+            ref_count=1,
+            virus_status=VirusStatus.PENDING.value,
+        )
+        await db.execute(stmt.on_duplicate_key_update(ref_count=FileBlob.ref_count + 1))
+        result = await db.execute(
+            select(FileBlob)
+            .where(FileBlob.sha256_hash == content.sha256)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one()
+
+    async def store_upload(
+        self,
+        db: AsyncSession,
+        file: UploadFile,
+        content_type: str,
+        max_size: int | None = None,
+    ) -> FileBlob:
+        """Reference the blob for an upload, storing the object if it is new.
+
+        The upload is hashed first (from Starlette's spooled copy), so a
+        duplicate is never sent to storage.
+        """
+        content = await hash_upload(file, max_size or settings.max_file_size)
+        blob = await self._acquire(db, content, content_type)
+        if not await asyncio.to_thread(self.storage.file_exists, blob.s3_key):
+            await stream_upload_to_minio(
+                self.storage.client,
+                self.storage.bucket,
+                blob.s3_key,
+                file,
+                content_type,
+                max_size=content.size,
+            )
+            logger.info("Stored new blob", s3_key=blob.s3_key, size=content.size)
+        return blob
+
+    async def store_data(
+        self, db: AsyncSession, data: bytes, content_type: str
+    ) -> FileBlob:
+        """Reference the blob for in-memory data, storing it if it is new."""
+        content = UploadResult(
+            sha256=self.storage.calculate_file_hash(data), size=len(data)
+        )
+        blob = await self._acquire(db, content, content_type)
+        if not await asyncio.to_thread(self.storage.file_exists, blob.s3_key):
+            await asyncio.to_thread(
+                self.storage.put_file_data, blob.s3_key, data, content_type
+            )
+        return blob
+
+    async def create_attachment(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: int,
+        file: UploadFile,
+        message_id: int | None = None,
+        upload_ip: str | None = None,
+        max_size: int | None = None,
+    ) -> Attachment:
+        """Store an upload and create an attachment referencing its blob.
+
+        If the content already has a verdict the attachment inherits it and
+        needs no scan; otherwise it stays ``pending`` for the scanner.
+        """
+        content_type = file.content_type or "application/octet-stream"
+        blob = await self.store_upload(db, file, content_type, max_size)
+        attachment = Attachment(
+            message_id=message_id,
+            owner_id=owner_id,
+            original_filename=file.filename or "file",
+            s3_key=blob.s3_key,
+            s3_bucket=self.storage.bucket,
+            mime_type=content_type,
+            file_size=blob.file_size,
+            sha256_hash=blob.sha256_hash,
+            blob_id=blob.id,
+            upload_ip=upload_ip,
+        )
+        if blob.has_verdict:
+            attachment.virus_status = blob.virus_status
+            attachment.virus_scan_result = blob.virus_scan_result
+            attachment.scanned_at = blob.scanned_at
+            attachment.is_available = blob.virus_status == VirusStatus.CLEAN.value
+        db.add(attachment)
+        await db.flush()
+        return attachment
+
+    async def record_verdict(self, db: AsyncSession, attachment: Attachment) -> None:
+        """Copy an attachment's final scan verdict onto its blob."""
+        if attachment.virus_status not in (
+            VirusStatus.CLEAN.value,
+            VirusStatus.INFECTED.value,
+        ):
+            return
+        await db.execute(
+            update(FileBlob)
+            .where(FileBlob.sha256_hash == attachment.sha256_hash)
+            .values(
+                virus_status=attachment.virus_status,
+                virus_scan_result=attachment.virus_scan_result,
+                scanned_at=attachment.scanned_at,
+            )
+        )
+
+    async def find_verdict(self, db: AsyncSession, sha256_hash: str) -> FileBlob | None:
+        """Return the blob for a hash if it already has a verdict."""
+        result = await db.execute(
+            select(FileBlob).where(FileBlob.sha256_hash == sha256_hash)
+        )
+        blob = result.scalar_one_or_none()
+        return blob if blob is not None and blob.has_verdict else None
+
+    async def release(self, db: AsyncSession, blob_id: int) -> bool:
+        """Drop one reference; delete the object with the last one.
+
+        Returns True when the blob (and its object) was deleted.
+        """
+        result = await db.execute(
+            select(FileBlob)
+            .where(FileBlob.id == blob_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        blob = result.scalar_one_or_none()
+        if blob is None:
+            return False
+        blob.ref_count -= 1
+        if blob.ref_count > 0:
+            return False
+
+        # Keep the row (and the reference) if storage refuses the delete,
+        # so the next cleanup run retries instead of leaking the object
+        if not await asyncio.to_thread(self.storage.delete_file, blob.s3_key):
+            blob.ref_count += 1
+            raise RuntimeError(f"Failed to delete blob object {blob.s3_key}")
+        await db.delete(blob)
+        logger.info("Released last reference to blob", s3_key=blob.s3_key)
+        return True
+
+    async def delete_attachments(self, db: AsyncSession, s3_key: str) -> int:
+        """Delete the attachments stored under a blob key, releasing each reference.
+
+        The object is deleted with the last reference. Returns how many
+        attachments were deleted.
+        """
+        result = await db.execute(
+            select(Attachment).where(
+                Attachment.s3_key == s3_key, Attachment.blob_id.isnot(None)
+            )
+        )
+        attachments = list(result.scalars().all())
+        for attachment in attachments:
+            await db.delete(attachment)
+        # Rows go before the blob they reference
+        await db.flush()
+        for attachment in attachments:
+            await self.release(db, attachment.blob_id)  # type: ignore[arg-type]
+        return len(attachments)
+
+
+blob_store = BlobStore()
@@ -0,0 +1,80 @@
+"""Base for per-worker caches invalidated over the pub/sub backplane.
+
+Subclasses keep their own entry storage and implement ``_clear`` to drop the
+entries an invalidation message names. ``_invalidate`` clears the local copy
+and publishes the message on ``channel`` so every other worker clears its
+copy too; a missed broadcast is bounded by ``ttl_seconds``.
+
+Every invalidation bumps ``generation``. A loader reads the generation before
+querying and stores its result only if it is unchanged, so a value loaded
+before a concurrent edit is never cached after it.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from typing import Any
+
+from app.services.pubsub_service import PubSubBackend, get_pubsub_backend
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class BroadcastInvalidatedCache(ABC):
+    # Pub/sub channel invalidations travel on, e.g. "principals:invalidate"
+    channel: str
+
+    def __init__(self, ttl_seconds: float, pubsub: PubSubBackend | None = None):
+        self.ttl_seconds = ttl_seconds
+        self.generation = 0
+        self._pubsub = pubsub
+        self._subscribed = False
+
+    @property
+    def pubsub(self) -> PubSubBackend:
+        if self._pubsub is None:
+            self._pubsub = get_pubsub_backend()
+        return self._pubsub
+
+    async def _ensure_subscribed(self) -> None:
+        if self._subscribed:
+            return
+        try:
+            await self.pubsub.subscribe(self.channel, self._handle_invalidation)
+            self._subscribed = True
+        except Exception as e:
+            # Still correct locally; other workers' edits apply after the TTL
+            logger.warning(
+                "Cache invalidations unavailable", channel=self.channel, error=str(e)
+            )
+
+    def _expires_at(self) -> float:
+        return time.monotonic() + self.ttl_seconds
+
+    @staticmethod
+    def _fresh(entry: tuple[float, Any] | None) -> bool:
+        """Whether an ``(expires_at, value)`` entry exists and has not expired."""
+        return entry is not None and entry[0] > time.monotonic()
+
+    @abstractmethod
+    def _clear(self, message: dict[str, Any]) -> None:
+        """Drop the local entries ``message`` names."""
+
+    def _apply(self, message: dict[str, Any]) -> None:
+        self.generation += 1
+        self._clear(message)
+
+    async def _handle_invalidation(self, message: dict[str, Any]) -> None:
+        self._apply(message)
+
+    async def _invalidate(self, message: dict[str, Any]) -> None:
+        self._apply(message)
+        try:
+            await self.pubsub.publish(self.channel, message)
+        except Exception as e:
+            logger.warning(
+                "Cache invalidation not broadcast",
+                channel=self.channel,
+                error=str(e),
+                **message,
+            )
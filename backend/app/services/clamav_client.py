@@ -0,0 +1,211 @@
+"""Asyncio client for clamd's INSTREAM protocol with pooled sessions.
+
+Each pooled connection runs a clamd ``IDSESSION`` so several scans reuse one
+TCP connection; replies carry a ``<id>: `` prefix that is stripped here.
+Scans stream their input in ``chunk_size`` pieces, so memory use is one chunk
+per active scan regardless of file size. Sessions idle longer than clamd's
+``IdleTimeout`` (or closed by clamd) are discarded instead of reused.
+
+Pool state is bound to the running event loop and rebuilt when a different
+loop uses the client, as happens across ``asyncio.run`` calls in Celery tasks.
+"""
+
+import asyncio
+import contextlib
+import re
+import struct
+import time
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+
+from app.utils.constants import VirusStatus
+
+DEFAULT_CHUNK_SIZE = 256 * 1024
+_REPLY_ID = re.compile(rb"^\d+: ")
+
+
+class ClamAVError(Exception):
+    """clamd could not be reached or answered unexpectedly."""
+
+
+async def iterate_in_thread(iterator: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """Drain a blocking iterator (e.g. a MinIO stream) from a worker thread."""
+    sentinel = object()
+    try:
+        while True:
+            chunk = await asyncio.to_thread(next, iterator, sentinel)
+            if chunk is sentinel:
+                return
+            yield chunk  # type: ignore[misc]
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await asyncio.to_thread(close)
+
+
+def parse_scan_reply(reply: str) -> tuple[VirusStatus, str]:
+    """Map a clamd ``stream: ...`` reply to a status and message."""
+    if reply.endswith("FOUND"):
+        virus_name = reply.split(":", 1)[-1].removesuffix("FOUND").strip()
+        return VirusStatus.INFECTED, f"Virus detected: {virus_name}"
+    if reply.endswith("OK"):
+        return VirusStatus.CLEAN, "File is clean"
+    return VirusStatus.ERROR, f"Unexpected response: {reply}"
+
+
+class _Session:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.last_used = time.monotonic()
+
+    def is_stale(self, idle_timeout: float) -> bool:
+        return (
+            self.reader.at_eof()
+            or self.writer.is_closing()
+            or time.monotonic() - self.last_used > idle_timeout
+        )
+
+    async def request(self, command: bytes, timeout: float) -> str:
+        self.writer.write(b"z" + command + b"\0")
+        await asyncio.wait_for(self.writer.drain(), timeout=timeout)
+        return await self.read_reply(timeout)
+
+    async def read_reply(self, timeout: float) -> str:
+        try:
+            reply = await asyncio.wait_for(
+                self.reader.readuntil(b"\0"), timeout=timeout
+            )
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            raise ClamAVError("clamd closed the connection") from e
+        self.last_used = time.monotonic()
+        return _REPLY_ID.sub(b"", reply.rstrip(b"\0")).decode("utf-8").strip()
+
+    async def close(self) -> None:
+        with contextlib.suppress(Exception):
+            self.writer.write(b"zEND\0")
+            self.writer.close()
+            await self.writer.wait_closed()
+
+
+class AsyncClamAVClient:
+    """Pooled, non-blocking clamd client."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        *,
+        pool_size: int = 4,
+        timeout: float = 30.0,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        idle_timeout: float = 25.0,
+    ):
+        self.host = host
+        self.port = port
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        # Kept below clamd's default IdleTimeout of 30 seconds
+        self.idle_timeout = idle_timeout
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._idle: deque[_Session] = deque()
+        self._slots: asyncio.Semaphore | None = None
+
+    def _bind_loop(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._slots is None:
+            # Sessions opened on another loop cannot be used (or closed) here
+            self._loop = loop
+            self._idle.clear()
+            self._slots = asyncio.Semaphore(self.pool_size)
+        return self._slots
+
+    async def _connect(self) -> _Session:
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), timeout=self.timeout
+            )
+        except (OSError, TimeoutError) as e:
+            raise ClamAVError(f"Cannot connect to clamd: {e}") from e
+        writer.write(b"zIDSESSION\0")
+        await writer.drain()
+        return _Session(reader, writer)
+
+    async def _checkout(self) -> _Session:
+        while self._idle:
+            session = self._idle.pop()
+            if not session.is_stale(self.idle_timeout):
+                return session
+            await session.close()
+        return await self._connect()
+
+    @contextlib.asynccontextmanager
+    async def _session(self) -> AsyncIterator[_Session]:
+        async with self._bind_loop():
+            session = await self._checkout()
+            try:
+                yield session
+            except BaseException:
+                # The session may be mid-command; never hand it out again
+                await session.close()
+                raise
+            else:
+                self._idle.append(session)
+
+    async def ping(self) -> bool:
+        async with self._session() as session:
+            reply = await session.request(b"PING", self.timeout)
+        return reply == "PONG"
+
+    async def instream(
+        self, chunks: AsyncIterable[bytes] | Iterable[bytes]
+    ) -> tuple[VirusStatus, str]:
+        """Scan a byte stream, sending it to clamd as it is produced.
+
+        ``timeout`` bounds each write and the wait for the verdict, not the
+        whole upload, so large files are not cut off.
+        """
+        async with self._session() as session:
+            return await self._send_stream(session, chunks)
+
+    async def _send_stream(
+        self, session: _Session, chunks: AsyncIterable[bytes] | Iterable[bytes]
+    ) -> tuple[VirusStatus, str]:
+        writer = session.writer
+        writer.write(b"zINSTREAM\0")
+
+        async def send(chunk: bytes) -> None:
+            # Storage chunks may be larger than the frames clamd should get
+            for start in range(0, len(chunk), self.chunk_size):
+                frame = chunk[start : start + self.chunk_size]
+                writer.write(struct.pack(">L", len(frame)))
+                writer.write(frame)
+                await asyncio.wait_for(writer.drain(), timeout=self.timeout)
+
+        try:
+            if isinstance(chunks, AsyncIterable):
+                async for chunk in chunks:
+                    await send(chunk)
+            else:
+                for chunk in chunks:
+                    await send(chunk)
+            writer.write(struct.pack(">L", 0))
+            await asyncio.wait_for(writer.drain(), timeout=self.timeout)
+        except ConnectionError as e:
+            # clamd aborts the upload when StreamMaxLength is exceeded
+            if not session.reader.at_eof():
+                raise ClamAVError(f"clamd connection lost: {e}") from e
+
+        status, message = parse_scan_reply(await session.read_reply(self.timeout))
+        if status == VirusStatus.ERROR:
+            # e.g. "INSTREAM size limit exceeded. ERROR"; clamd drops the session
+            raise ClamAVError(message)
+        return status, message
+
+    async def close(self) -> None:
+        """Close idle sessions owned by the running loop."""
+        if self._loop is asyncio.get_running_loop():
+            while self._idle:
+                await self._idle.pop().close()
+        self._idle.clear()
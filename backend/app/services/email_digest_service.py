@@ -0,0 +1,331 @@
+"""Shared debounce and digest coalescing for notification emails.
+
+Notification services pass each email through ``EmailDigestService.submit``
+with a debounce key (say, one conversation for one recipient). The first
+email for a key goes out immediately and opens a window. Emails for that key
+inside the window are queued for their recipient instead. Once the window
+ends, everything queued for the recipient goes out as one digest email, and
+the keys' windows are opened again.
+
+Windows and queued items live in a ``DebounceStore`` shared by every worker:
+Redis keys with TTLs in deployments, and an in-memory fake in tests and
+single-worker development (``EMAIL_DEBOUNCE_BACKEND``). Due digests are sent
+by the periodic ``flush_email_digests`` task.
+"""
+
+import html
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import redis.asyncio as redis
+
+from app.config import settings
+from app.services.email_service import EmailService, email_service
+from app.services.email_template_service import email_template_service
+from app.utils.datetime_utils import get_utc_now
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Queued items are dropped if no flush picks them up within a day
+ITEM_RETENTION_SECONDS = 24 * 3600
+
+
+class DebounceStore(ABC):
+    """Debounce windows with TTL expiry, plus per-recipient digest queues."""
+
+    @abstractmethod
+    async def acquire(self, key: str, ttl_seconds: int) -> bool:
+        """Open a window for ``key`` unless one is open; True if it was opened."""
+
+    @abstractmethod
+    async def rearm(self, key: str, ttl_seconds: int) -> None:
+        """Open (or extend) the window for ``key``."""
+
+    @abstractmethod
+    async def release(self, key: str) -> None:
+        """Close the window for ``key`` early."""
+
+    @abstractmethod
+    async def defer(self, recipient: str, item: dict[str, Any], due_at: float) -> None:
+        """Queue ``item`` for ``recipient``; the first queued item sets ``due_at``."""
+
+    @abstractmethod
+    async def pop_due(self, now: float, limit: int) -> list[str]:
+        """Claim recipients whose digest is due; each goes to one caller only."""
+
+    @abstractmethod
+    async def drain(self, recipient: str) -> list[dict[str, Any]]:
+        """Remove and return the items queued for ``recipient``."""
+
+    async def close(self) -> None:  # noqa: B027
+        """Release connections held by the store."""
+
+
+class InMemoryDebounceStore(DebounceStore):
+    """Process-local store with the same expiry semantics as Redis."""
+
+    def __init__(self):
+        self._windows: dict[str, float] = {}
+        self._items: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        self._due: dict[str, float] = {}
+        self._purge_at = 1024
+
+    def _purge_expired(self, now: float) -> None:
+        for key in [k for k, expires_at in self._windows.items() if expires_at <= now]:
+            del self._windows[key]
+        self._purge_at = max(1024, 2 * len(self._windows))
+
+    async def acquire(self, key: str, ttl_seconds: int) -> bool:
+        now = time.time()
+        if len(self._windows) >= self._purge_at:
+            self._purge_expired(now)
+        expires_at = self._windows.get(key)
+        if expires_at is not None and expires_at > now:
+            return False
+        self._windows[key] = now + ttl_seconds
+        return True
+
+    async def rearm(self, key: str, ttl_seconds: int) -> None:
+        self._windows[key] = time.time() + ttl_seconds
+
+    async def release(self, key: str) -> None:
+        self._windows.pop(key, None)
+
+    async def defer(self, recipient: str, item: dict[str, Any], due_at: float) -> None:
+        # Round-trip through JSON like the Redis store does
+        self._items[recipient].append(json.loads(json.dumps(item)))
+        self._due.setdefault(recipient, due_at)
+
+    async def pop_due(self, now: float, limit: int) -> list[str]:
+        due = sorted(
+            (due_at, recipient)
+            for recipient, due_at in self._due.items()
+            if due_at <= now
+        )[:limit]
+        for _, recipient in due:
+            del self._due[recipient]
+        return [recipient for _, recipient in due]
+
+    async def drain(self, recipient: str) -> list[dict[str, Any]]:
+        return self._items.pop(recipient, [])
+
+
+class RedisDebounceStore(DebounceStore):
+    """Windows are ``SET NX EX`` keys; digests are lists indexed by a due-time zset."""
+
+    def __init__(self, url: str, prefix: str = "email_debounce:"):
+        self._redis = redis.from_url(url, decode_responses=True)
+        self._prefix = prefix
+        self._due_key = f"{prefix}due"
+
+    def _window_key(self, key: str) -> str:
+        return f"{self._prefix}window:{key}"
+
+    def _items_key(self, recipient: str) -> str:
+        return f"{self._prefix}items:{recipient}"
+
+    async def acquire(self, key: str, ttl_seconds: int) -> bool:
+        return bool(
+            await self._redis.set(self._window_key(key), "1", nx=True, ex=ttl_seconds)
+        )
+
+    async def rearm(self, key: str, ttl_seconds: int) -> None:
+        await self._redis.set(self._window_key(key), "1", ex=ttl_seconds)
+
+    async def release(self, key: str) -> None:
+        await self._redis.delete(self._window_key(key))
+
+    async def defer(self, recipient: str, item: dict[str, Any], due_at: float) -> None:
+        items_key = self._items_key(recipient)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.rpush(items_key, json.dumps(item))
+            pipe.expire(items_key, ITEM_RETENTION_SECONDS)
+            pipe.zadd(self._due_key, {recipient: due_at}, nx=True)
+            await pipe.execute()
+
+    async def pop_due(self, now: float, limit: int) -> list[str]:
+        candidates = await self._redis.zrangebyscore(
+            self._due_key, "-inf", now, start=0, num=limit
+        )
+        if not candidates:
+            return []
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for recipient in candidates:
+                pipe.zrem(self._due_key, recipient)
+            removed = await pipe.execute()
+        # Whoever removed the entry owns the digest
+        return [r for r, won in zip(candidates, removed, strict=True) if won]
+
+    async def drain(self, recipient: str) -> list[dict[str, Any]]:
+        items_key = self._items_key(recipient)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.lrange(items_key, 0, -1)
+            pipe.delete(items_key)
+            raw, _ = await pipe.execute()
+        return [json.loads(item) for item in raw]
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+_debounce_store: DebounceStore | None = None
+
+
+def get_debounce_store() -> DebounceStore:
+    """Get the process-wide debounce store."""
+    global _debounce_store
+    if _debounce_store is None:
+        if settings.email_debounce_backend == "redis":
+            _debounce_store = RedisDebounceStore(settings.redis_url)
+        else:
+            _debounce_store = InMemoryDebounceStore()
+    return _debounce_store
+
+
+def render_digest(items: list[dict[str, Any]]) -> tuple[str, str]:
+    """HTML and text lists of the queued notifications, oldest first."""
+    html_rows = []
+    text_rows = []
+    for item in items:
+        title = html.escape(item["title"])
+        if item.get("url"):
+            title = f'<a href="{html.escape(item["url"], quote=True)}">{title}</a>'
+        html_rows.append(
+            f'<li style="margin-bottom: 12px;"><strong>{title}</strong>'
+            f'<br><span style="color: #495057;">{html.escape(item["summary"])}</span></li>'
+        )
+        text_rows.append(f"- {item['title']}: {item['summary']}")
+        if item.get("url"):
+            text_rows.append(f"  {item['url']}")
+    return "\n".join(html_rows), "\n".join(text_rows)
+
+
+class EmailDigestService:
+    def __init__(
+        self,
+        store: DebounceStore | None = None,
+        email: EmailService | None = None,
+        window_seconds: int | None = None,
+    ):
+        self._store = store
+        self.email = email or email_service
+        self.window_seconds = window_seconds or settings.email_digest_window_seconds
+
+    @property
+    def store(self) -> DebounceStore:
+        if self._store is None:
+            self._store = get_debounce_store()
+        return self._store
+
+    async def submit(
+        self,
+        key: str,
+        recipient_email: str,
+        recipient_name: str,
+        *,
+        title: str,
+        summary: str,
+        send: Callable[[], Awaitable[bool]],
+        url: str | None = None,
+    ) -> bool:
+        """Send an email now, or roll it into the recipient's next digest.
+
+        Args:
+            key: Debounce scope, e.g. ``message:<conversation>:<recipient id>``
+            send: Sends the individual email and returns whether it was accepted
+            title, summary, url: How the email appears as a digest entry
+
+        Returns:
+            False only if the email had to be sent now and that failed.
+        """
+        try:
+            opened = await self.store.acquire(key, self.window_seconds)
+        except Exception as e:
+            logger.warning("Email debounce unavailable", key=key, error=str(e))
+            return await send()
+
+        if opened:
+            sent = await send()
+            if not sent:
+                # Let the next attempt through instead of queueing it
+                try:
+                    await self.store.release(key)
+                except Exception as e:
+                    logger.warning(
+                        "Email debounce release failed", key=key, error=str(e)
+                    )
+            return sent
+
+        item = {
+            "key": key,
+            "recipient_name": recipient_name,
+            "title": title,
+            "summary": summary,
+            "url": url,
+            "queued_at": get_utc_now().isoformat(),
+        }
+        try:
+            await self.store.defer(
+                recipient_email, item, time.time() + self.window_seconds
+            )
+        except Exception as e:
+            logger.warning("Email digest queue unavailable", key=key, error=str(e))
+            return await send()
+        logger.info("Email coalesced into digest", key=key)
+        return True
+
+    async def _send_digest(self, recipient: str, items: list[dict[str, Any]]) -> bool:
+        count = len(items)
+        subject = (
+            f"You have {count} new notification{'s' if count != 1 else ''} - MiraiWorks"
+        )
+        items_html, items_text = render_digest(items)
+        context = {
+            "recipient_name": items[-1]["recipient_name"],
+            "notification_count": count,
+            "items_html": items_html,
+            "items_text": items_text,
+            "notifications_url": f"{settings.app_base_url}/notifications",
+        }
+        html_body, text_body = email_template_service.render_email_template(
+            "notifications/digest", context, subject, "Notification Digest"
+        )
+        return await self.email.send_email([recipient], subject, html_body, text_body)
+
+    async def flush_due(self, limit: int | None = None) -> int:
+        """Send every digest whose window has ended; returns how many were sent."""
+        limit = limit or settings.email_digest_batch_size
+        sent = 0
+        for recipient in await self.store.pop_due(time.time(), limit):
+            items = await self.store.drain(recipient)
+            if not items:
+                continue
+            try:
+                delivered = await self._send_digest(recipient, items)
+            except Exception as e:
+                logger.error("Email digest failed", error=str(e))
+                delivered = False
+            if not delivered:
+                # Try again in the next window rather than dropping them
+                due_at = time.time() + self.window_seconds
+                for item in items:
+                    await self.store.defer(recipient, item, due_at)
+                continue
+            sent += 1
+            # The digest counts as the window's email for each key it covered
+            for key in dict.fromkeys(item["key"] for item in items):
+                await self.store.rearm(key, self.window_seconds)
+        return sent
+
+    async def close(self) -> None:
+        """Close store connections (end of a worker task)."""
+        if self._store is not None:
+            await self._store.close()
+
+
+email_digest_service = EmailDigestService()
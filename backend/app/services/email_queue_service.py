@@ -0,0 +1,315 @@
+"""Persistent outbound email queue delivered by the Celery mail worker.
+
+``EmailService.send_email`` only records one ``OutboundEmail`` row per
+recipient and nudges the worker, so request handlers (and bulk loops over
+many users) never wait on SMTP. The worker claims due rows in batches,
+sends them concurrently over the pooled SMTP transport and records each
+outcome: sent, retried later with exponential backoff, or failed for good
+once attempts run out or the server rejects the message permanently (5xx).
+
+Per-domain rate limits are enforced when claiming: rows sent to a domain
+in the last minute (plus rows currently leased for sending) count against
+its budget, and rows over budget stay queued for a later run. Domains out
+of budget are excluded from the claim query itself, so one throttled
+domain's backlog never crowds the others out of a batch. Claims use
+``SELECT ... FOR UPDATE SKIP LOCKED`` so several workers can drain the
+queue without sending a message twice.
+
+Bodies can carry 2FA codes, temporary passwords and reset links, so rows
+are only kept while they matter: sent rows leave once they fall out of the
+rate window, permanently failed rows once they are as old.
+"""
+
+import asyncio
+import smtplib
+from collections import Counter
+from datetime import timedelta
+from email.message import EmailMessage
+from email.utils import formataddr
+
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.outbound_email import OutboundEmail
+from app.services.smtp_transport import SMTPConnectionPool
+from app.utils.constants import OutboundEmailStatus
+from app.utils.datetime_utils import get_utc_now
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+RATE_WINDOW = timedelta(minutes=1)
+# A claimed row is retried by another run if its worker dies mid-send
+SEND_LEASE = timedelta(minutes=5)
+PURGE_BATCH_SIZE = 1000
+
+
+def recipient_domain(email: str) -> str:
+    return email.rpartition("@")[2].strip().lower()
+
+
+def build_message(
+    to_email: str, subject: str, html_body: str, text_body: str | None
+) -> EmailMessage:
+    """HTML message, with the plain-text body as the preferred fallback part."""
+    message = EmailMessage()
+    message["Subject"] = subject
+    message["From"] = formataddr((settings.from_name, settings.from_email))
+    message["To"] = to_email
+    if text_body:
+        message.set_content(text_body, charset="utf-8")
+        message.add_alternative(html_body, subtype="html", charset="utf-8")
+    else:
+        message.set_content(html_body, subtype="html", charset="utf-8")
+    return message
+
+
+def is_permanent_failure(error: Exception) -> bool:
+    """5xx replies mean retrying the same message cannot succeed."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500 and not isinstance(
+            error, smtplib.SMTPAuthenticationError
+        )
+    return False
+
+
+def retry_delay(attempts: int) -> timedelta:
+    seconds = settings.email_retry_base_seconds * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(seconds, settings.email_retry_max_seconds))
+
+
+def domain_limit(domain: str) -> int:
+    return settings.email_domain_rate_limits.get(
+        domain, settings.email_domain_rate_limit_per_minute
+    )
+
+
+class EmailQueueService:
+    def __init__(
+        self,
+        transport: SMTPConnectionPool | None = None,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+    ):
+        self._transport = transport
+        self._session_factory = session_factory or AsyncSessionLocal
+
+    @property
+    def transport(self) -> SMTPConnectionPool:
+        if self._transport is None:
+            self._transport = SMTPConnectionPool(
+                settings.smtp_host,
+                settings.smtp_port,
+                username=settings.smtp_username,
+                password=settings.smtp_password,
+                use_tls=settings.smtp_use_tls,
+                use_ssl=settings.smtp_use_ssl,
+                pool_size=settings.smtp_pool_size,
+                timeout=settings.smtp_timeout_seconds,
+                idle_timeout=settings.smtp_idle_timeout_seconds,
+            )
+        return self._transport
+
+    async def enqueue(
+        self,
+        to_emails: list[str],
+        subject: str,
+        html_body: str,
+        text_body: str | None = None,
+    ) -> list[int]:
+        """Persist one message per recipient and return the row ids."""
+        now = get_utc_now()
+        rows = [
+            OutboundEmail(
+                to_email=to_email,
+                recipient_domain=recipient_domain(to_email),
+                subject=subject,
+                html_body=html_body,
+                text_body=text_body,
+                next_attempt_at=now,
+            )
+            for to_email in dict.fromkeys(to_emails)
+        ]
+        async with self._session_factory() as db:
+            db.add_all(rows)
+            await db.commit()
+        return [row.id for row in rows]
+
+    def dispatch(self) -> None:
+        """Ask the worker to drain the queue now.
+
+        Best effort: if the broker is unreachable, the periodic sweep still
+        delivers the queued rows.
+        """
+        from app.workers.email_tasks import deliver_outbound_emails
+
+        try:
+            deliver_outbound_emails.apply_async(retry=False)  # type: ignore[attr-defined]
+        except Exception as e:
+            logger.warning("Could not dispatch mail worker", error=str(e))
+
+    async def _claim(self, db: AsyncSession, limit: int) -> list[OutboundEmail]:
+        """Lease up to ``limit`` due rows that fit their domains' budgets."""
+        now = get_utc_now()
+        in_window = await db.execute(
+            select(OutboundEmail.recipient_domain, func.count())
+            .where(
+                or_(
+                    and_(
+                        OutboundEmail.status == OutboundEmailStatus.SENT.value,
+                        OutboundEmail.sent_at >= now - RATE_WINDOW,
+                    ),
+                    and_(
+                        OutboundEmail.status == OutboundEmailStatus.SENDING.value,
+                        OutboundEmail.next_attempt_at > now,
+                    ),
+                )
+            )
+            .group_by(OutboundEmail.recipient_domain)
+        )
+        used: Counter[str] = Counter(dict(in_window.tuples().all()))
+
+        # Over-budget domains are left out of the query, so their backlog
+        # cannot fill the batch and starve every other domain
+        saturated = {
+            domain for domain, count in used.items() if count >= domain_limit(domain)
+        }
+        claimed: list[OutboundEmail] = []
+        while True:
+            conditions = [
+                OutboundEmail.status.in_(
+                    [
+                        OutboundEmailStatus.QUEUED.value,
+                        OutboundEmailStatus.SENDING.value,
+                    ]
+                ),
+                OutboundEmail.next_attempt_at <= now,
+            ]
+            if saturated:
+                conditions.append(
+                    OutboundEmail.recipient_domain.notin_(sorted(saturated))
+                )
+            if claimed:
+                conditions.append(OutboundEmail.id.notin_([row.id for row in claimed]))
+            result = await db.execute(
+                select(OutboundEmail)
+                .where(*conditions)
+                .order_by(OutboundEmail.next_attempt_at, OutboundEmail.id)
+                .limit(limit - len(claimed))
+                .with_for_update(skip_locked=True)
+            )
+            skipped = False
+            for row in result.scalars():
+                if used[row.recipient_domain] >= domain_limit(row.recipient_domain):
+                    # Also covers domains with no budget at all (limit <= 0)
+                    saturated.add(row.recipient_domain)
+                    skipped = True
+                    continue
+                used[row.recipient_domain] += 1
+                row.status = OutboundEmailStatus.SENDING.value
+                row.next_attempt_at = now + SEND_LEASE
+                row.attempts += 1
+                claimed.append(row)
+            # A skipped row means a domain just ran out of budget; look again
+            # without it. Otherwise the batch is full or nothing else is due.
+            if not skipped or len(claimed) >= limit:
+                break
+        await db.commit()
+        return claimed
+
+    async def _send(self, row: OutboundEmail) -> Exception | None:
+        message = build_message(row.to_email, row.subject, row.html_body, row.text_body)
+        try:
+            await self.transport.send(message)
+        except Exception as e:
+            return e
+        return None
+
+    async def deliver_batch(self, limit: int | None = None) -> int:
+        """Send one batch of due messages and return how many were attempted."""
+        limit = limit or settings.email_queue_batch_size
+        async with self._session_factory() as db:
+            claimed = await self._claim(db, limit)
+            if not claimed:
+                return 0
+
+            # The transport's pool bounds how many are in flight at once
+            errors = await asyncio.gather(*(self._send(row) for row in claimed))
+
+            now = get_utc_now()
+            for row, error in zip(claimed, errors, strict=True):
+                if error is None:
+                    row.status = OutboundEmailStatus.SENT.value
+                    row.sent_at = now
+                    row.last_error = None
+                    continue
+                row.last_error = str(error)[:1000]
+                if (
+                    is_permanent_failure(error)
+                    or row.attempts >= settings.email_max_attempts
+                ):
+                    row.status = OutboundEmailStatus.FAILED.value
+                    logger.error(
+                        "Email delivery failed",
+                        email_id=row.id,
+                        to=row.to_email,
+                        attempts=row.attempts,
+                        error=row.last_error,
+                    )
+                else:
+                    row.status = OutboundEmailStatus.QUEUED.value
+                    row.next_attempt_at = now + retry_delay(row.attempts)
+            await db.commit()
+        return len(claimed)
+
+    async def drain(self, max_batches: int = 10) -> int:
+        """Deliver batches until nothing is due (or ``max_batches`` ran)."""
+        total = 0
+        for _ in range(max_batches):
+            sent = await self.deliver_batch()
+            if not sent:
+                break
+            total += sent
+        return total
+
+    async def purge_finished(self, batch_size: int = PURGE_BATCH_SIZE) -> int:
+        """Delete sent and failed rows older than the rate window.
+
+        Rows go in batches so the delete never holds long locks on the queue;
+        returns how many were deleted.
+        """
+        cutoff = get_utc_now() - RATE_WINDOW
+        finished = or_(
+            and_(
+                OutboundEmail.status == OutboundEmailStatus.SENT.value,
+                OutboundEmail.sent_at < cutoff,
+            ),
+            and_(
+                OutboundEmail.status == OutboundEmailStatus.FAILED.value,
+                OutboundEmail.updated_at < cutoff,
+            ),
+        )
+        deleted = 0
+        async with self._session_factory() as db:
+            while True:
+                result = await db.execute(
+                    select(OutboundEmail.id).where(finished).limit(batch_size)
+                )
+                ids = list(result.scalars())
+                if not ids:
+                    break
+                await db.execute(delete(OutboundEmail).where(OutboundEmail.id.in_(ids)))
+                await db.commit()
+                deleted += len(ids)
+        return deleted
+
+    async def close(self) -> None:
+        """Close pooled SMTP connections (end of a worker task)."""
+        if self._transport is not None:
+            await self._transport.close()
+
+
+email_queue_service = EmailQueueService()
@@ -1,16 +1,15 @@
 import logging
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
 
 from app.config import settings
+from app.services.email_queue_service import EmailQueueService, email_queue_service
 from app.services.email_template_service import email_template_service
 
 logger = logging.getLogger(__name__)
 
 
 class EmailService:
-    def __init__(self):
+    def __init__(self, queue: EmailQueueService | None = None):
+        self.queue = queue or email_queue_service
         self.smtp_host = settings.smtp_host
         self.smtp_port = settings.smtp_port
         self.smtp_from = settings.smtp_from
@@ -23,66 +22,23 @@ class EmailService:
         html_body: str,
         text_body: str | None = None,
     ) -> bool:
-        """Send an email via SMTP."""
+        """Queue an email for the mail worker; True once it is queued.
+
+        Delivery (pooled SMTP, retries, per-domain rate limits) happens in
+        the background, so callers never wait on the SMTP server.
+        """
         try:
-            # Log what we're about to send for debugging
-            logger.info(f"Sending email to {to_emails}")
-            logger.info(f"Subject: {subject}")
-            logger.info(f"HTML body length: {len(html_body)}")
-            logger.info(f"Text body provided: {text_body is not None}")
-
-            # Create message with proper structure
-            if text_body:
-                # Send multipart alternative (HTML + text)
-                msg = MIMEMultipart("alternative")
-                msg["Subject"] = subject
-                msg["From"] = f"{settings.from_name} <{settings.from_email}>"
-                msg["To"] = ", ".join(to_emails)
-
-                # Set proper headers
-                msg["MIME-Version"] = "1.0"
-                msg["Content-Type"] = "multipart/alternative"
-
-                # Add text part first (fallback)
-                text_part = MIMEText(text_body, "plain", "utf-8")
-                msg.attach(text_part)
-
-                # Add HTML part second (preferred)
-                html_part = MIMEText(html_body, "html", "utf-8")
-                msg.attach(html_part)
-
-                logger.info("Created multipart/alternative email")
-            else:
-                # Send HTML only
-                msg = MIMEText(html_body, "html", "utf-8")
-                msg["Subject"] = subject
-                msg["From"] = f"{settings.from_name} <{settings.from_email}>"
-                msg["To"] = ", ".join(to_emails)
-                msg["MIME-Version"] = "1.0"
-
-                logger.info("Created HTML-only email")
-
-            # Send email
-            with smtplib.SMTP(settings.smtp_host, settings.smtp_port) as server:
-                if settings.smtp_use_tls:
-                    server.starttls()
-                elif settings.smtp_use_ssl:
-                    server = smtplib.SMTP_SSL(settings.smtp_host, settings.smtp_port)
-
-                if settings.smtp_username and settings.smtp_password:
-                    server.login(settings.smtp_username, settings.smtp_password)
-
-                server.send_message(msg)
-
-            logger.info(
-                f"Email sent successfully to {to_emails} with subject: {subject}"
+            email_ids = await self.queue.enqueue(
+                to_emails, subject, html_body, text_body
             )
-            return True
-
         except Exception as e:
-            logger.error(f"Failed to send email to {to_emails}: {str(e)}")
+            logger.error(f"Failed to queue email to {to_emails}: {str(e)}")
             return False
 
+        logger.info(f"Queued email {email_ids} to {to_emails} with subject: {subject}")
+        self.queue.dispatch()
+        return True
+
     async def send_2fa_code(self, email: str, code: str, user_name: str) -> bool:
         """Send 2FA verification code via email."""
         subject = "Your MiraiWorks Verification Code"
@@ -1,4 +1,5 @@
 import re
+from collections.abc import Mapping
 from pathlib import Path
 from typing import Any
 
@@ -11,11 +12,67 @@ except ImportError:
     Environment = None  # type: ignore
     FileSystemLoader = None  # type: ignore
 
+# A bare ``{{ name }}`` placeholder; anything else needs the Jinja2 path
+_PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+_JINJA_SYNTAX = re.compile(r"\{\{|\{%|\{#")
+
+BASE_TEMPLATE = "base.html"
+
+
+class _Fragments:
+    """A template split once into static text and ``{{ name }}`` slots.
+
+    Rendering only joins the pre-split static pieces with the context values,
+    so the static parts are never scanned again. Placeholders missing from
+    the context render empty, as in Jinja2, or are kept as written when
+    ``keep_missing`` is set (the behaviour of the no-Jinja2 fallback).
+    """
+
+    def __init__(self, source: str, keep_missing: bool = False):
+        self._keep_missing = keep_missing
+        self._static: list[str] = []
+        self._slots: list[tuple[str, str]] = []
+        position = 0
+        for match in _PLACEHOLDER.finditer(source):
+            self._static.append(source[position : match.start()])
+            self._slots.append((match.group(1), match.group(0)))
+            position = match.end()
+        self._static.append(source[position:])
+
+    @classmethod
+    def supports(cls, source: str) -> bool:
+        """True if every template tag in ``source`` is a bare placeholder."""
+        return len(_JINJA_SYNTAX.findall(source)) == len(_PLACEHOLDER.findall(source))
+
+    def render(self, context: Mapping[str, Any]) -> str:
+        parts = [self._static[0]]
+        for (name, raw), static in zip(self._slots, self._static[1:], strict=True):
+            if name in context:
+                parts.append(str(context[name]))
+            elif self._keep_missing:
+                parts.append(raw)
+            parts.append(static)
+        return "".join(parts)
+
 
 class EmailTemplateService:
-    def __init__(self):
-        self.template_dir = Path(__file__).parent.parent / "templates" / "emails"
-        self.base_template_path = self.template_dir / "base.html"
+    """Renders email templates from ``templates/emails``.
+
+    Each template file is read and compiled once and kept in a registry
+    keyed by its path; an entry is recompiled when the file's mtime changes,
+    so edited templates are picked up without a restart. The base layout is
+    pre-split around its placeholders, so wrapping a body in it is a string
+    join rather than another template render.
+    """
+
+    def __init__(self, template_dir: Path | None = None):
+        self.template_dir = (
+            template_dir or Path(__file__).parent.parent / "templates" / "emails"
+        )
+        self.base_template_path = self.template_dir / BASE_TEMPLATE
+        # relative path -> (mtime_ns, compiled template)
+        self._registry: dict[str, tuple[int, Any]] = {}
+        self.compile_count = 0
 
         if (
             JINJA2_AVAILABLE
@@ -28,54 +85,46 @@ class EmailTemplateService:
                 loader=FileSystemLoader(str(self.template_dir)), autoescape=False
             )
         else:
-            # Fallback to regex replacement if Jinja2 not available
+            # Fallback to placeholder substitution if Jinja2 not available
             self.jinja_env = None
 
-    def _load_template(self, template_path: str, format_type: str = "html") -> str:
-        """Load a template file from the templates directory.
+    def _compile(self, source: str) -> Any:
+        if self.jinja_env is None or _Fragments.supports(source):
+            return _Fragments(source, keep_missing=self.jinja_env is None)
+        return self.jinja_env.from_string(source)
+
+    def get_template(self, relative_path: str) -> Any:
+        """Return the compiled template at ``relative_path``.
 
         Args:
-            template_path: Path to template like 'auth/activation' or 'notifications/message_notification'
-            format_type: File extension ('html' or 'txt')
+            relative_path: Path like 'auth/activation.html' or 'base.html'
         """
-        full_template_path = self.template_dir / f"{template_path}.{format_type}"
-
-        if not full_template_path.exists():
-            raise FileNotFoundError(f"Template not found: {full_template_path}")
-
-        with open(full_template_path, encoding="utf-8") as file:
-            return file.read()
-
-    def _load_base_template(self) -> str:
-        """Load the base HTML template."""
-        if not self.base_template_path.exists():
-            raise FileNotFoundError(
-                f"Base template not found: {self.base_template_path}"
-            )
-
-        with open(self.base_template_path, encoding="utf-8") as file:
-            return file.read()
-
-    def _render_template(self, template_content: str, context: dict[str, Any]) -> str:
-        """Render a template with the given context."""
-        if JINJA2_AVAILABLE and self.jinja_env is not None:
-            # Use Jinja2 for proper template rendering
-            template = self.jinja_env.from_string(template_content)
-            try:
-                return template.render(context)
-            except Exception as e:
-                raise ValueError(f"Template rendering error: {e}") from e
-        else:
-            # Fallback: Simple regex replacement for {{ variable }} patterns
-            try:
-                result = template_content
-                for key, value in context.items():
-                    # Replace {{ key }} with value
-                    pattern = r"\{\{\s*" + re.escape(key) + r"\s*\}\}"
-                    result = re.sub(pattern, str(value), result)
-                return result
-            except Exception as e:
-                raise ValueError(f"Template rendering error: {e}") from e
+        path = self.template_dir / relative_path
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._registry.pop(relative_path, None)
+            raise FileNotFoundError(f"Template not found: {path}") from None
+
+        entry = self._registry.get(relative_path)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+
+        compiled = self._compile(path.read_text(encoding="utf-8"))
+        self._registry[relative_path] = (mtime, compiled)
+        self.compile_count += 1
+        return compiled
+
+    def preload(self) -> int:
+        """Compile every template up front (at startup); returns the count."""
+        paths = sorted(
+            path
+            for pattern in ("*.html", "*.txt")
+            for path in self.template_dir.rglob(pattern)
+        )
+        for path in paths:
+            self.get_template(path.relative_to(self.template_dir).as_posix())
+        return len(paths)
 
     def render_email_template(
         self,
@@ -97,43 +146,19 @@ class EmailTemplateService:
             Tuple of (html_content, text_content)
         """
         try:
-            if JINJA2_AVAILABLE and self.jinja_env is not None:
-                # Use Jinja2 for proper template rendering with inheritance
-                # Load the content template
-                content_template = self.jinja_env.get_template(f"{template_path}.html")
-                rendered_content = content_template.render(context)
-
-                # Load the base template
-                base_template = self.jinja_env.get_template("base.html")
-                base_context = {
-                    "subject": subject,
-                    "header_title": header_title,
-                    "content": rendered_content,
-                }
-                html_body = base_template.render(base_context)
-
-                # Load and render the text template
-                text_template = self.jinja_env.get_template(f"{template_path}.txt")
-                text_body = text_template.render(context)
-
-            else:
-                # Fallback method for systems without Jinja2
-                # Load and render the content template (HTML)
-                html_content_template = self._load_template(template_path, "html")
-                rendered_content = self._render_template(html_content_template, context)
+            content_template = self.get_template(f"{template_path}.html")
+            base_template = self.get_template(BASE_TEMPLATE)
+            text_template = self.get_template(f"{template_path}.txt")
 
-                # Load base template and wrap the content
-                base_template = self._load_base_template()
-                base_context = {
+            rendered_content = content_template.render(context)
+            html_body = base_template.render(
+                {
                     "subject": subject,
                     "header_title": header_title,
                     "content": rendered_content,
                 }
-                html_body = self._render_template(base_template, base_context)
-
-                # Load and render the text template
-                text_template = self._load_template(template_path, "txt")
-                text_body = self._render_template(text_template, context)
+            )
+            text_body = text_template.render(context)
 
             return html_body, text_body
 
@@ -0,0 +1,142 @@
+"""Cached subscription entitlements for feature and permission checks.
+
+A plan's features are compiled once into flat sets of feature names and
+permission keys, and each company is mapped to its active plan. After that,
+``has_feature``/``has_permission`` are set lookups, with no queries on gated
+requests.
+
+Both caches are per worker. Writers call ``invalidate_plan`` (plan-feature
+edits), ``invalidate_company`` (subscription changes, approved plan changes)
+or ``invalidate_all`` (feature renames and deletes). Invalidation clears the
+local cache and is broadcast on the pub/sub backplane, so other workers clear
+theirs too. Entries also expire after ``entitlement_cache_ttl_seconds`` in
+case a broadcast is missed.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.company_subscription import CompanySubscription
+from app.models.feature import Feature
+from app.models.plan_feature import PlanFeature
+from app.services.broadcast_cache import BroadcastInvalidatedCache
+from app.services.pubsub_service import PubSubBackend
+
+
+@dataclass(frozen=True)
+class Entitlements:
+    """What a company's active plan grants; ``plan_id`` is None without one."""
+
+    plan_id: int | None
+    features: frozenset[str] = frozenset()
+    permissions: frozenset[str] = frozenset()
+
+    @property
+    def has_subscription(self) -> bool:
+        return self.plan_id is not None
+
+    def has_feature(self, feature_name: str) -> bool:
+        return feature_name in self.features
+
+    def has_permission(self, permission_key: str) -> bool:
+        return permission_key in self.permissions
+
+
+NO_SUBSCRIPTION = Entitlements(plan_id=None)
+
+
+class EntitlementResolver(BroadcastInvalidatedCache):
+    channel = "entitlements:invalidate"
+
+    def __init__(
+        self, pubsub: PubSubBackend | None = None, ttl_seconds: float | None = None
+    ):
+        super().__init__(
+            ttl_seconds
+            if ttl_seconds is not None
+            else settings.entitlement_cache_ttl_seconds,
+            pubsub,
+        )
+        # plan_id -> (expires_at, entitlements)
+        self._plans: dict[int, tuple[float, Entitlements]] = {}
+        # company_id -> (expires_at, plan_id or None)
+        self._companies: dict[int, tuple[float, int | None]] = {}
+        self.compile_count = 0
+
+    async def _load_company_plan(self, db: AsyncSession, company_id: int) -> int | None:
+        result = await db.execute(
+            select(CompanySubscription.plan_id).where(
+                CompanySubscription.company_id == company_id,
+                CompanySubscription.is_active,
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def _compile_plan(self, db: AsyncSession, plan_id: int) -> Entitlements:
+        """Flatten every feature attached to the plan, parents and children alike."""
+        result = await db.execute(
+            select(Feature.name, Feature.permission_key)
+            .join(PlanFeature, PlanFeature.feature_id == Feature.id)
+            .where(PlanFeature.plan_id == plan_id)
+        )
+        rows = result.all()
+        self.compile_count += 1
+        return Entitlements(
+            plan_id=plan_id,
+            features=frozenset(name for name, _ in rows),
+            permissions=frozenset(key for _, key in rows if key),
+        )
+
+    async def resolve(self, db: AsyncSession, company_id: int) -> Entitlements:
+        """Entitlements of ``company_id``; queries only on a cache miss."""
+        await self._ensure_subscribed()
+        generation = self.generation
+        expires_at = self._expires_at()
+
+        company_entry = self._companies.get(company_id)
+        if self._fresh(company_entry):
+            plan_id = company_entry[1]  # type: ignore[index]
+        else:
+            plan_id = await self._load_company_plan(db, company_id)
+            if generation == self.generation:
+                self._companies[company_id] = (expires_at, plan_id)
+
+        if plan_id is None:
+            return NO_SUBSCRIPTION
+
+        plan_entry = self._plans.get(plan_id)
+        if self._fresh(plan_entry):
+            return plan_entry[1]  # type: ignore[index]
+        entitlements = await self._compile_plan(db, plan_id)
+        if generation == self.generation:
+            self._plans[plan_id] = (expires_at, entitlements)
+        return entitlements
+
+    def _clear(self, message: dict[str, Any]) -> None:
+        if message.get("all"):
+            self._plans.clear()
+            self._companies.clear()
+            return
+        if message.get("plan_id") is not None:
+            self._plans.pop(message["plan_id"], None)
+        if message.get("company_id") is not None:
+            self._companies.pop(message["company_id"], None)
+
+    async def invalidate_plan(self, plan_id: int) -> None:
+        """Call after a plan's features change (committed)."""
+        await self._invalidate({"plan_id": plan_id})
+
+    async def invalidate_company(self, company_id: int) -> None:
+        """Call after a company's subscription or plan changes (committed)."""
+        await self._invalidate({"company_id": company_id})
+
+    async def invalidate_all(self) -> None:
+        """Call after catalog edits that can affect every plan."""
+        await self._invalidate({"all": True})
+
+
+entitlement_resolver = EntitlementResolver()
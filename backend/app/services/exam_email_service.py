@@ -5,6 +5,10 @@ from datetime import datetime
 
 from app.models.exam import Exam
 from app.models.user import User
+from app.services.email_digest_service import (
+    EmailDigestService,
+    email_digest_service,
+)
 from app.services.email_service import email_service
 from app.utils.datetime_utils import get_utc_now
 
@@ -14,8 +18,10 @@ logger = logging.getLogger(__name__)
 class ExamEmailService:
     """Service for sending exam-related email notifications."""
 
-    def __init__(self):
+    def __init__(self, email_digest: EmailDigestService | None = None):
         self.email_service = email_service
+        # Several assignments or reminders for a candidate arrive as a digest
+        self.email_digest = email_digest or email_digest_service
 
     async def send_exam_assignment_notification(
         self,
@@ -142,11 +148,21 @@ Good luck!
 MiraiWorks Recruitment System
             """
 
-            success = await self.email_service.send_email(
-                to_emails=[candidate.email],
-                subject=subject,
-                html_body=html_body,
-                text_body=text_body,
+            success = await self.email_digest.submit(
+                f"exam_assignment:{candidate.id}",
+                candidate.email,
+                candidate.full_name,
+                title=subject,
+                summary=f"Due {due_date.strftime('%Y-%m-%d %H:%M')}"
+                if due_date
+                else "No due date",
+                url=exam_url,
+                send=lambda: self.email_service.send_email(
+                    to_emails=[candidate.email],
+                    subject=subject,
+                    html_body=html_body,
+                    text_body=text_body,
+                ),
             )
 
             if success:
@@ -234,11 +250,19 @@ Best regards,
 MiraiWorks Recruitment System
             """
 
-            return await self.email_service.send_email(
-                to_emails=[candidate.email],
-                subject=subject,
-                html_body=html_body,
-                text_body=text_body,
+            return await self.email_digest.submit(
+                f"exam_reminder:{candidate.id}",
+                candidate.email,
+                candidate.full_name,
+                title=subject,
+                summary=f"Due {due_date.strftime('%Y-%m-%d %H:%M')}",
+                url=exam_url,
+                send=lambda: self.email_service.send_email(
+                    to_emails=[candidate.email],
+                    subject=subject,
+                    html_body=html_body,
+                    text_body=text_body,
+                ),
             )
 
         except Exception as e:
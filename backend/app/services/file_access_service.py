@@ -0,0 +1,188 @@
+"""File-ownership index backing download permission checks.
+
+Every uploaded or attached file gets ``file_access_entries`` rows keyed by its
+normalized storage key: one for the uploader and one per participant of each
+message that carries it. ``can_access`` is then a single lookup on the
+``(storage_key, user_id)`` index instead of ``LIKE '%...%'`` scans over
+``messages.file_url``.
+
+Positive answers are cached per ``(user_id, storage_key)`` for
+``file_access_cache_ttl_seconds``. Denials are never cached, so a file shared
+on another worker becomes readable immediately; ``revoke`` clears the local
+cache for the key and other workers expire it within the TTL.
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from pathlib import PurePosixPath
+from urllib.parse import unquote, urlsplit
+
+from sqlalchemy import and_, delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.file_access import FileAccessEntry
+from app.models.message import Message
+from app.services.principal_cache import principal_cache
+
+DOWNLOAD_URL_PREFIX = "/api/files/download/"
+MAX_STORAGE_KEY_LENGTH = 500
+
+
+def normalize_file_key(value: str | None) -> str | None:
+    """Reduce a download URL or storage key to the key the index stores.
+
+    ``http://host/api/files/download/a%20b/c.pdf``, ``/api/files/download/a
+    b/c.pdf`` and ``a b/c.pdf`` all normalize to ``a b/c.pdf``. Returns
+    ``None`` for empty, traversing or over-long values.
+    """
+    if not value:
+        return None
+    path = value.strip()
+    if "://" in path:
+        path = urlsplit(path).path
+    prefix_at = path.find(DOWNLOAD_URL_PREFIX)
+    if prefix_at != -1:
+        # Download URLs carry the key percent-encoded; bare keys do not
+        path = unquote(path[prefix_at + len(DOWNLOAD_URL_PREFIX) :].split("?")[0])
+
+    path = path.replace("\\", "/").lstrip("/")
+    if not path:
+        return None
+    posix_path = PurePosixPath(path)
+    if ".." in posix_path.parts:
+        return None
+    key = str(posix_path)
+    return key if len(key) <= MAX_STORAGE_KEY_LENGTH else None
+
+
+class FileAccessCache:
+    """Bounded TTL cache of granted ``(user_id, storage_key)`` pairs."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 10_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._expires: OrderedDict[tuple[int, str], float] = OrderedDict()
+
+    def is_granted(self, user_id: int, storage_key: str) -> bool:
+        entry = (user_id, storage_key)
+        expires_at = self._expires.get(entry)
+        if expires_at is None:
+            return False
+        if expires_at < time.monotonic():
+            del self._expires[entry]
+            return False
+        return True
+
+    def grant(self, user_id: int, storage_key: str) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        entry = (user_id, storage_key)
+        self._expires[entry] = time.monotonic() + self.ttl_seconds
+        self._expires.move_to_end(entry)
+        while len(self._expires) > self.max_entries:
+            self._expires.popitem(last=False)
+
+    def forget(self, storage_key: str) -> None:
+        for entry in [entry for entry in self._expires if entry[1] == storage_key]:
+            del self._expires[entry]
+
+    def clear(self) -> None:
+        self._expires.clear()
+
+
+class FileAccessService:
+    """Maintains and queries the file-access index.
+
+    The ``grant_*``/``revoke`` writers only stage changes on the session;
+    callers commit them together with the upload, message or attachment they
+    describe.
+    """
+
+    def __init__(self, cache: FileAccessCache | None = None):
+        self.cache = cache or FileAccessCache(settings.file_access_cache_ttl_seconds)
+
+    def grant(
+        self,
+        db: AsyncSession,
+        storage_key: str,
+        user_ids: Iterable[int],
+        *,
+        message_id: int | None = None,
+        todo_id: int | None = None,
+    ) -> None:
+        """Stage access rows for ``user_ids`` on ``storage_key``."""
+        db.add_all(
+            FileAccessEntry(
+                storage_key=storage_key,
+                user_id=user_id,
+                message_id=message_id,
+                todo_id=todo_id,
+            )
+            for user_id in dict.fromkeys(user_ids)
+        )
+
+    def grant_owner(self, db: AsyncSession, file_url: str, owner_id: int) -> None:
+        """Record the uploader of a file as its owner."""
+        storage_key = normalize_file_key(file_url)
+        if storage_key:
+            self.grant(db, storage_key, [owner_id])
+
+    def grant_message(self, db: AsyncSession, message: Message) -> None:
+        """Give both participants of a flushed message access to its file."""
+        storage_key = normalize_file_key(message.file_url)
+        if storage_key:
+            self.grant(
+                db,
+                storage_key,
+                [message.sender_id, message.recipient_id],
+                message_id=message.id,
+            )
+
+    async def revoke(self, db: AsyncSession, storage_key: str) -> None:
+        """Stage removal of every grant on ``storage_key`` (file deleted)."""
+        await db.execute(
+            delete(FileAccessEntry).where(FileAccessEntry.storage_key == storage_key)
+        )
+        self.cache.forget(storage_key)
+
+    async def can_access(self, db: AsyncSession, user_id: int, file_key: str) -> bool:
+        """Return whether ``user_id`` may read the file at ``file_key``.
+
+        True for system admins, the uploader, and participants of a message
+        carrying the file that is still visible to them.
+        """
+        storage_key = normalize_file_key(file_key)
+        if storage_key is None:
+            return False
+        if self.cache.is_granted(user_id, storage_key):
+            return True
+
+        granted = await db.scalar(
+            select(FileAccessEntry.id)
+            .outerjoin(Message, FileAccessEntry.message_id == Message.id)
+            .where(
+                FileAccessEntry.storage_key == storage_key,
+                FileAccessEntry.user_id == user_id,
+                or_(
+                    FileAccessEntry.message_id.is_(None),
+                    and_(Message.sender_id == user_id, ~Message.is_deleted_by_sender),
+                    and_(
+                        Message.recipient_id == user_id,
+                        ~Message.is_deleted_by_recipient,
+                    ),
+                ),
+            )
+            .limit(1)
+        )
+        if granted is None:
+            principal = await principal_cache.get(db, user_id)
+            if principal is None or not principal.is_system_admin:
+                return False
+
+        self.cache.grant(user_id, storage_key)
+        return True
+
+
+file_access_service = FileAccessService()
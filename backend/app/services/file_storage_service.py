@@ -9,6 +9,7 @@ from pathlib import Path
 from fastapi import HTTPException, UploadFile
 
 from app.config import settings
+from app.services.upload_stream import FileTooLargeError, stream_upload_to_path
 
 logger = logging.getLogger(__name__)
 
@@ -116,20 +117,14 @@ class FileStorageService:
         )
 
         try:
-            # Ensure directory exists
-            Path(full_path).parent.mkdir(parents=True, exist_ok=True)
-
-            # Save file
-            with open(full_path, "wb") as buffer:
-                content = await file.read()
-                buffer.write(content)
-
-            # Verify file was saved correctly
-            if not os.path.exists(full_path):
-                raise Exception("File was not saved successfully")
+            # Stream to disk in chunks; the size limit is re-checked as bytes
+            # arrive in case the upload grew after validation
+            upload = await stream_upload_to_path(
+                file, full_path, max_size=self.MAX_FILE_SIZE
+            )
 
             # Verify file size matches
-            actual_size = os.path.getsize(full_path)
+            actual_size = upload.size
             if actual_size != file_info["file_size"]:
                 os.remove(full_path)  # Clean up
                 raise Exception(
@@ -142,9 +137,16 @@ class FileStorageService:
                 "stored_filename": stored_filename,
                 "file_path": full_path,
                 "file_size": actual_size,
+                "file_hash": upload.sha256,
                 **file_info,
             }
 
+        except FileTooLargeError as e:
+            raise HTTPException(
+                status_code=400,
+                detail=f"File validation failed: File size exceeds "
+                f"{self.MAX_FILE_SIZE // (1024 * 1024)}MB limit",
+            ) from e
         except Exception as e:
             logger.error(f"Failed to save file {file.filename}: {e}")
             # Clean up partial file if it exists
@@ -0,0 +1,314 @@
+"""Range-aware streaming of stored files for download and preview endpoints.
+
+Local files and MinIO objects are served in fixed-size chunks straight from
+their source, never read into memory whole. Every response advertises
+``Accept-Ranges: bytes`` and carries an ``ETag``:
+
+* ``If-None-Match`` matching the ETag returns ``304 Not Modified``.
+* A single ``Range: bytes=`` request (honoring ``If-Range``) returns
+  ``206 Partial Content``; an unsatisfiable one returns ``416``. Multi-range
+  requests are answered with the full body, which RFC 9110 permits.
+
+Local files are handed to the server with the ASGI ``zerocopysend``
+extension (sendfile) when it offers one, and read in chunks otherwise.
+"""
+
+import mimetypes
+import os
+from email.utils import formatdate
+from pathlib import Path
+from urllib.parse import quote
+
+import anyio
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from app.services.storage_service import StorageService, get_storage_service
+
+STREAM_CHUNK_SIZE = 256 * 1024
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+
+
+class RangeNotSatisfiableError(ValueError):
+    """The requested byte range lies outside the file."""
+
+
+def parse_range_header(
+    range_header: str | None, file_size: int
+) -> tuple[int, int] | None:
+    """Parse a single ``bytes=`` range into an inclusive ``(start, end)``.
+
+    Returns ``None`` when the whole file should be served (no header, an
+    unsupported unit, a malformed or multi-range header).
+    """
+    if not range_header:
+        return None
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else file_size - 1
+        else:
+            # Suffix range: the final N bytes
+            suffix = int(last)
+            start, end = max(file_size - suffix, 0), file_size - 1
+    except ValueError:
+        return None
+
+    if (not first and suffix <= 0) or start >= file_size or start > end:
+        raise RangeNotSatisfiableError(range_header)
+    return start, min(end, file_size - 1)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match`` header against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == wanted
+        for candidate in if_none_match.split(",")
+    )
+
+
+def content_disposition(filename: str | None, inline: bool) -> str:
+    disposition = "inline" if inline else "attachment"
+    if not filename:
+        return disposition
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"{disposition}; filename*=utf-8''{quoted}"
+    return f'{disposition}; filename="{filename}"'
+
+
+class LocalFileResponse(Response):
+    """Serves all or part of a local file, using sendfile when available."""
+
+    chunk_size = STREAM_CHUNK_SIZE
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        start: int,
+        end: int,
+        status_code: int,
+        headers: dict[str, str],
+        media_type: str,
+        send_header_only: bool = False,
+    ):
+        self.path = path
+        self.start = start
+        self.length = end - start + 1
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.send_header_only = send_header_only
+        self.init_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        if self.send_header_only or self.length <= 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        if ZEROCOPY_EXTENSION in scope.get("extensions", {}):
+            with open(self.path, "rb") as file:
+                await send(
+                    {
+                        "type": ZEROCOPY_EXTENSION,
+                        "file": file,
+                        "offset": self.start,
+                        "count": self.length,
+                        "more_body": False,
+                    }
+                )
+            return
+
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.start)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": remaining > 0,
+                    }
+                )
+            if remaining > 0:
+                # File shrank underneath us; end the body rather than hang
+                await send(
+                    {"type": "http.response.body", "body": b"", "more_body": False}
+                )
+
+
+def _conditional_response(
+    request: Request,
+    *,
+    etag: str,
+    file_size: int,
+    last_modified: float | None,
+    media_type: str,
+    filename: str | None,
+    inline: bool,
+) -> tuple[Response | None, dict[str, str], tuple[int, int] | None]:
+    """Resolve caching and range headers shared by every storage backend.
+
+    Returns either a finished response (304/416) or the headers and byte
+    range (``None`` for the whole file) to serve.
+    """
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+        "Content-Disposition": content_disposition(filename, inline),
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers), headers, None
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if if_range and if_range.strip() != etag:
+        range_header = None
+
+    try:
+        byte_range = parse_range_header(range_header, file_size)
+    except RangeNotSatisfiableError:
+        return (
+            Response(
+                status_code=416,
+                headers={**headers, "Content-Range": f"bytes */{file_size}"},
+                media_type=media_type,
+            ),
+            headers,
+            None,
+        )
+
+    if byte_range is None:
+        headers["Content-Length"] = str(file_size)
+    else:
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+        headers["Content-Length"] = str(end - start + 1)
+    return None, headers, byte_range
+
+
+def guess_media_type(filename: str | None) -> str:
+    return (filename and mimetypes.guess_type(filename)[0]) or (
+        "application/octet-stream"
+    )
+
+
+async def local_file_response(
+    request: Request,
+    path: str | os.PathLike[str],
+    *,
+    media_type: str | None = None,
+    filename: str | None = None,
+    inline: bool = True,
+) -> Response:
+    """Stream a local file with Range, ETag and sendfile support."""
+    stat_result = await anyio.to_thread.run_sync(os.stat, path)
+    filename = filename if filename is not None else Path(path).name
+    media_type = media_type or guess_media_type(filename)
+    etag = f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+
+    finished, headers, byte_range = _conditional_response(
+        request,
+        etag=etag,
+        file_size=stat_result.st_size,
+        last_modified=stat_result.st_mtime,
+        media_type=media_type,
+        filename=filename,
+        inline=inline,
+    )
+    if finished is not None:
+        return finished
+
+    start, end = byte_range or (0, stat_result.st_size - 1)
+    return LocalFileResponse(
+        path,
+        start,
+        end,
+        status_code=206 if byte_range else 200,
+        headers=headers,
+        media_type=media_type,
+        send_header_only=request.method == "HEAD",
+    )
+
+
+async def storage_object_response(
+    request: Request,
+    s3_key: str,
+    *,
+    storage: StorageService | None = None,
+    media_type: str | None = None,
+    filename: str | None = None,
+    inline: bool = True,
+) -> Response | None:
+    """Stream a MinIO object with Range and ETag support.
+
+    Returns ``None`` when the object does not exist.
+    """
+    storage = storage or get_storage_service()
+    info = await anyio.to_thread.run_sync(storage.get_file_info, s3_key)
+    if info is None:
+        return None
+
+    filename = filename if filename is not None else os.path.basename(s3_key)
+    media_type = media_type or info.get("content_type") or guess_media_type(filename)
+    etag = f'"{info["etag"]}"'
+    last_modified = info.get("last_modified")
+
+    finished, headers, byte_range = _conditional_response(
+        request,
+        etag=etag,
+        file_size=info["size"],
+        last_modified=last_modified.timestamp() if last_modified else None,
+        media_type=media_type,
+        filename=filename,
+        inline=inline,
+    )
+    if finished is not None:
+        return finished
+    if request.method == "HEAD":
+        return Response(
+            status_code=206 if byte_range else 200,
+            headers=headers,
+            media_type=media_type,
+        )
+
+    if byte_range is None:
+        body = storage.iter_file(s3_key, STREAM_CHUNK_SIZE)
+    else:
+        start, end = byte_range
+        body = storage.iter_file(
+            s3_key, STREAM_CHUNK_SIZE, offset=start, length=end - start + 1
+        )
+    return StreamingResponse(
+        body,
+        status_code=206 if byte_range else 200,
+        headers=headers,
+        media_type=media_type,
+    )
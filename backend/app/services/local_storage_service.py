@@ -2,6 +2,9 @@ import hashlib
 import uuid
 from pathlib import Path
 
+from fastapi import UploadFile
+
+from app.services.upload_stream import stream_upload_to_path
 from app.utils.datetime_utils import get_utc_now
 from app.utils.logging import get_logger
 
@@ -71,6 +74,24 @@ class LocalStorageService:
 
         return file_path, file_hash, file_size
 
+    async def upload_file(
+        self,
+        file: UploadFile,
+        user_id: int,
+        folder: str = "attachments",
+        max_size: int | None = None,
+    ) -> tuple[str, str, int]:
+        """Stream an upload to disk and return (file_path, sha256_hash, file_size).
+
+        Raises ``FileTooLargeError`` once more than ``max_size`` bytes arrive.
+        """
+        file_path = self.generate_file_path(user_id, file.filename or "file", folder)
+        result = await stream_upload_to_path(file, file_path, max_size=max_size)
+
+        logger.info(f"File uploaded to local storage: {file.filename} -> {file_path}")
+
+        return file_path, result.sha256, result.size
+
     def get_download_url(self, file_path: str) -> str:
         """Generate a download URL for the file."""
         # For local storage, we'll use the API endpoint
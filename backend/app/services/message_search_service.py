@@ -0,0 +1,598 @@
+"""Ranked full-text search over direct messages.
+
+Three interchangeable backends are available, selected with the
+``MESSAGE_SEARCH_BACKEND`` setting:
+
+* ``fulltext`` - MySQL ``FULLTEXT`` index on ``messages.content`` built with the
+  ngram parser, so Japanese and English text are both searchable. InnoDB keeps
+  the index up to date on every insert.
+* ``memory`` - process-local inverted index (word tokens for Latin text,
+  character bigrams for CJK text). Intended for tests and single-process
+  development; it is filled incrementally by ``index_message`` and rebuilt
+  by ``reindex``.
+* ``like`` - the legacy ``ILIKE '%q%'`` scan, kept as a fallback and as the
+  baseline for benchmarks.
+
+All backends return hits ordered by ``(score, message id)`` descending and
+page with an opaque keyset cursor. Scores are integers (relevance in units of
+``1 / SCORE_SCALE``) so the cursor round-trips exactly and the next page
+compares against the same value the database ranked by.
+"""
+
+import base64
+import math
+import re
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from dataclasses import dataclass
+
+from fastapi import HTTPException, status
+from sqlalchemy import (
+    Integer,
+    and_,
+    cast,
+    desc,
+    func,
+    literal,
+    or_,
+    select,
+    text,
+    union_all,
+)
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.config import settings
+from app.models.message import Message
+from app.models.user import User
+from app.schemas.message import MessageSearchRequest
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# ngram_token_size defaults to 2 in MySQL; shorter queries cannot hit the index
+MIN_FULLTEXT_QUERY_LENGTH = 2
+REINDEX_BATCH_SIZE = 1000
+# Relevance is rounded to millionths and compared as an integer
+SCORE_SCALE = 1_000_000
+
+_BOOLEAN_OPERATORS = re.compile(r'[+\-<>()~*"@]')
+_TOKEN_RUNS = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """A message id with its relevance score in units of ``1 / SCORE_SCALE``."""
+
+    message_id: int
+    score: int
+
+
+@dataclass(frozen=True)
+class _IndexedMessage:
+    """Participants and visibility of an indexed message."""
+
+    sender_id: int
+    recipient_id: int
+    is_deleted_by_sender: bool
+    is_deleted_by_recipient: bool
+
+    def is_visible_to_user(self, user_id: int) -> bool:
+        if user_id == self.sender_id:
+            return not self.is_deleted_by_sender
+        if user_id == self.recipient_id:
+            return not self.is_deleted_by_recipient
+        return False
+
+
+def encode_search_cursor(score: int, message_id: int) -> str:
+    """Encode a search keyset position as an opaque cursor string."""
+    raw = f"{score}|{message_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_search_cursor(cursor: str) -> tuple[int, int]:
+    """Decode a cursor produced by ``encode_search_cursor``."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        score, message_id = raw.rsplit("|", 1)
+        return int(score), int(message_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        ) from e
+
+
+def _is_cjk(char: str) -> bool:
+    name = unicodedata.name(char, "")
+    return name.startswith(("CJK", "HIRAGANA", "KATAKANA", "HANGUL"))
+
+
+def tokenize(value: str) -> list[str]:
+    """Split text into index terms.
+
+    Latin/number runs become lowercase words; runs of CJK characters (which
+    have no word separators) become overlapping character bigrams, matching
+    MySQL's ngram parser with ``ngram_token_size=2``.
+    """
+    tokens: list[str] = []
+    for run in _TOKEN_RUNS.findall(unicodedata.normalize("NFKC", value).lower()):
+        current: list[str] = []
+        current_is_cjk = False
+        for char in run + " ":
+            char_is_cjk = char != " " and _is_cjk(char)
+            if current and (char == " " or char_is_cjk != current_is_cjk):
+                segment = "".join(current)
+                if current_is_cjk and len(segment) > 1:
+                    tokens.extend(segment[i : i + 2] for i in range(len(segment) - 1))
+                else:
+                    tokens.append(segment)
+                current = []
+            if char != " ":
+                current.append(char)
+                current_is_cjk = char_is_cjk
+    return tokens
+
+
+def _visible_to(user_id: int):
+    return or_(
+        and_(Message.sender_id == user_id, ~Message.is_deleted_by_sender),
+        and_(Message.recipient_id == user_id, ~Message.is_deleted_by_recipient),
+    )
+
+
+def _with_user(with_user_id: int):
+    return or_(
+        Message.sender_id == with_user_id,
+        Message.recipient_id == with_user_id,
+    )
+
+
+def _user_name_match(query: str):
+    search_term = f"%{query}%"
+    return or_(
+        User.first_name.ilike(search_term),
+        User.last_name.ilike(search_term),
+        User.email.ilike(search_term),
+    )
+
+
+class MessageSearchBackend(ABC):
+    """Interface implemented by message search backends."""
+
+    name: str
+
+    @abstractmethod
+    async def search(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        query: str,
+        *,
+        with_user_id: int | None = None,
+        limit: int = 50,
+        after: tuple[int, int] | None = None,
+    ) -> list[SearchHit]:
+        """Return up to ``limit`` hits ranked after the ``after`` position."""
+
+    @abstractmethod
+    async def count(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        query: str,
+        *,
+        with_user_id: int | None = None,
+    ) -> int:
+        """Return the total number of hits for ``query``."""
+
+    async def index_message(self, message: Message) -> None:  # noqa: B027
+        """Index a newly written message (no-op when the database does it)."""
+
+    @abstractmethod
+    async def reindex(self, db: AsyncSession) -> int:
+        """Rebuild the index from the ``messages`` table; returns message count."""
+
+
+class LikeSearchBackend(MessageSearchBackend):
+    """Legacy ``ILIKE`` scan across content and sender name/email."""
+
+    name = "like"
+
+    @staticmethod
+    def _matches(query: str, user_id: int, with_user_id: int | None):
+        search_term = f"%{query}%"
+        stmt = (
+            select(Message.id)
+            .join(Message.sender)
+            .where(
+                _visible_to(user_id),
+                or_(Message.content.ilike(search_term), _user_name_match(query)),
+            )
+        )
+        if with_user_id:
+            stmt = stmt.where(_with_user(with_user_id))
+        return stmt
+
+    async def search(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        query: str,
+        *,
+        with_user_id: int | None = None,
+        limit: int = 50,
+        after: tuple[int, int] | None = None,
+    ) -> list[SearchHit]:
+        stmt = self._matches(query, user_id, with_user_id)
+        if after:
+            stmt = stmt.where(Message.id < after[1])
+
+        result = await db.execute(stmt.order_by(desc(Message.id)).limit(limit))
+        return [SearchHit(message_id, 0) for message_id in result.scalars()]
+
+    async def count(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        query: str,
+        *,
+        with_user_id: int | None = None,
+    ) -> int:
+        matches = self._matches(query, user_id, with_user_id).subquery()
+        result = await db.execute(select(func.count()).select_from(matches))
+        return result.scalar() or 0
+
+    async def reindex(self, db: AsyncSession) -> int:
+        result = await db.execute(select(func.count(Message.id)))
+        return result.scalar() or 0
+
+
+class FulltextSearchBackend(MessageSearchBackend):
+    """MySQL ``FULLTEXT ... WITH PARSER ngram`` index on message content."""
+
+    name = "fulltext"
+
+    def __init__(self, fallback: MessageSearchBackend | None = None):
+        self.fallback = fallback or LikeSearchBackend()
+
+    @staticmethod
+    def _boolean_query(query: str) -> str:
+        """Require every whitespace-separated term, each matched as a phrase."""
+        terms = _BOOLEAN_OPERATORS.sub(" ", query).split()
+        return " ".join(f'+"{term}"' for term in terms)
+
+    @staticmethod
+    def _uses_index(query: str, boolean_query: str) -> bool:
+        return len(query.strip()) >= MIN_FULLTEXT_QUERY_LENGTH and bool(boolean_query)
+
+    def _hits(
+        self, query: str, boolean_query: str, user_id: int, with_user_id: int | None
+    ):
+        """Content and sender matches, one row per match with its score."""
+        relevance = match(Message.content, against=boolean_query).in_boolean_mode()
+        content_hits = select(
+            Message.id.label("message_id"), relevance.label("score")
+        ).where(relevance, _visible_to(user_id))
+
+        # Sender name/email matches come from the (small) users table and
+        # rank below any content match.
+        sender_ids = select(User.id).where(_user_name_match(query))
+        sender_hits = select(
+            Message.id.label("message_id"), literal(0.0).label("score")
+        ).where(Message.sender_id.in_(sender_ids), _visible_to(user_id))
+
+        if with_user_id:
+            content_hits = content_hits.where(_with_user(with_user_id))
+            sender_hits = sender_hits.where(_with_user(with_user_id))
+
+        return union_all(content_hits, sender_hits).subquery()
+
+    async def search(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        query: str,
+        *,
+        with_user_id: int | None = None,
+        limit: int = 50,
+        after: tuple[int, int] | None = None,
+    ) -> list[SearchHit]:
+        boolean_query = self._boolean_query(query)
+        if not self._uses_index(query, boolean_query):
+            return await self.fallback.search(
+                db,
+                user_id,
+                query,
+                with_user_id=with_user_id,
+                limit=limit,
+                after=after,
+            )
+
+        hits = self._hits(query, boolean_query, user_id, with_user_id)
+        score = cast(func.round(func.max(hits.c.score) * SCORE_SCALE), Integer)
+        stmt = select(hits.c.message_id, score.label("score")).group_by(
+            hits.c.message_id
+        )
+        if after:
+            after_score, after_id = after
+            stmt = stmt.having(
+                or_(
+                    score < after_score,
+                    and_(score == after_score, hits.c.message_id < after_id),
+                )
+            )
+
+        result = await db.execute(
+            stmt.order_by(desc("score"), desc(hits.c.message_id)).limit(limit)
+        )
+        return [SearchHit(row.message_id, int(row.score)) for row in result]
+
+    async def count(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        query: str,
+        *,
+        with_user_id: int | None = None,
+    ) -> int:
+        boolean_query = self._boolean_query(query)
+        if not self._uses_index(query, boolean_query):
+            return await self.fallback.count(
+                db, user_id, query, with_user_id=with_user_id
+            )
+
+        hits = self._hits(query, boolean_query, user_id, with_user_id)
+        result = await db.execute(select(func.count(func.distinct(hits.c.message_id))))
+        return result.scalar() or 0
+
+    async def reindex(self, db: AsyncSession) -> int:
+        # Rebuilds the InnoDB full-text index (and merges its deleted-doc list)
+        await db.execute(text("OPTIMIZE TABLE messages"))
+        result = await db.execute(select(func.count(Message.id)))
+        return result.scalar() or 0
+
+
+class InMemorySearchBackend(MessageSearchBackend):
+    """Process-local inverted index with TF-IDF ranking."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._postings: dict[str, dict[int, int]] = defaultdict(dict)
+        self._documents: dict[int, _IndexedMessage] = {}
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._documents.clear()
+
+    def _add(self, message: Message) -> None:
+        self._documents[message.id] = _IndexedMessage(
+            sender_id=message.sender_id,
+            recipient_id=message.recipient_id,
+            is_deleted_by_sender=bool(message.is_deleted_by_sender),
+            is_deleted_by_recipient=bool(message.is_deleted_by_recipient),
+        )
+        for token in tokenize(message.content or ""):
+            postings = self._postings[token]
+            postings[message.id] = postings.get(message.id, 0) + 1
+
+    async def index_message(self, message: Message) -> None:
+        self._add(message)
+
+    async def _score(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        query: str,
+        with_user_id: int | None,
+    ) -> dict[int, int]:
+        """Score every indexed message matching ``query`` visible to the user."""
+        scores: dict[int, int] = {}
+        tokens = tokenize(query)
+        if tokens and all(token in self._postings for token in tokens):
+            total_docs = len(self._documents) or 1
+            candidates = set.intersection(
+                *(set(self._postings[token]) for token in tokens)
+            )
+            for message_id in candidates:
+                scores[message_id] = round(
+                    SCORE_SCALE
+                    * sum(
+                        self._postings[token][message_id]
+                        * math.log(1 + total_docs / len(self._postings[token]))
+                        for token in tokens
+                    )
+                )
+
+        result = await db.execute(select(User.id).where(_user_name_match(query)))
+        sender_ids = set(result.scalars())
+        if sender_ids:
+            for message_id, message in self._documents.items():
+                if message.sender_id in sender_ids:
+                    scores.setdefault(message_id, 0)
+
+        visible = {}
+        for message_id, score in scores.items():
+            message = self._documents[message_id]
+            if not message.is_visible_to_user(user_id):
+                continue
+            if with_user_id and with_user_id not in (
+                message.sender_id,
+                message.recipient_id,
+            ):
+                continue
+            visible[message_id] = score
+        return visible
+
+    async def search(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        query: str,
+        *,
+        with_user_id: int | None = None,
+        limit: int = 50,
+        after: tuple[int, int] | None = None,
+    ) -> list[SearchHit]:
+        scores = await self._score(db, user_id, query, with_user_id)
+        hits = [
+            SearchHit(message_id, score)
+            for message_id, score in scores.items()
+            if not after or (score, message_id) < after
+        ]
+        hits.sort(key=lambda hit: (hit.score, hit.message_id), reverse=True)
+        return hits[:limit]
+
+    async def count(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        query: str,
+        *,
+        with_user_id: int | None = None,
+    ) -> int:
+        return len(await self._score(db, user_id, query, with_user_id))
+
+    async def reindex(self, db: AsyncSession) -> int:
+        self.clear()
+        last_id = 0
+        while True:
+            result = await db.execute(
+                select(Message)
+                .where(Message.id > last_id)
+                .order_by(Message.id)
+                .limit(REINDEX_BATCH_SIZE)
+            )
+            batch = list(result.scalars().all())
+            if not batch:
+                break
+            for message in batch:
+                self._add(message)
+            last_id = batch[-1].id
+        return len(self._documents)
+
+
+def create_search_backend(name: str) -> MessageSearchBackend:
+    """Create a search backend by its configured name."""
+    backends: dict[str, type[MessageSearchBackend]] = {
+        "fulltext": FulltextSearchBackend,
+        "memory": InMemorySearchBackend,
+        "like": LikeSearchBackend,
+    }
+    if name not in backends:
+        raise ValueError(f"Unknown message search backend: {name}")
+    return backends[name]()
+
+
+class MessageSearchService:
+    """Search messages visible to a user through the configured backend."""
+
+    def __init__(self, backend: MessageSearchBackend | None = None):
+        self.backend = backend or create_search_backend(settings.message_search_backend)
+
+    async def search_messages(
+        self, db: AsyncSession, user_id: int, search_request: MessageSearchRequest
+    ) -> tuple[list[Message], str | None]:
+        """Return one ranked page of messages and the cursor for the next page."""
+        if search_request.offset:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="offset is no longer supported; page with cursor instead",
+            )
+        query = (search_request.query or "").strip()
+        after = (
+            decode_search_cursor(search_request.cursor)
+            if search_request.cursor
+            else None
+        )
+
+        if query:
+            hits = await self.backend.search(
+                db,
+                user_id,
+                query,
+                with_user_id=search_request.with_user_id,
+                limit=search_request.limit + 1,
+                after=after,
+            )
+        else:
+            # No search term: most recent messages first, same keyset shape
+            stmt = select(Message.id).where(_visible_to(user_id))
+            if search_request.with_user_id:
+                stmt = stmt.where(_with_user(search_request.with_user_id))
+            if after:
+                stmt = stmt.where(Message.id < after[1])
+            result = await db.execute(
+                stmt.order_by(desc(Message.id)).limit(search_request.limit + 1)
+            )
+            hits = [SearchHit(message_id, 0) for message_id in result.scalars()]
+
+        next_cursor = None
+        if len(hits) > search_request.limit:
+            hits = hits[: search_request.limit]
+            next_cursor = encode_search_cursor(hits[-1].score, hits[-1].message_id)
+
+        if not hits:
+            return [], None
+
+        result = await db.execute(
+            select(Message)
+            .options(
+                selectinload(Message.sender),
+                selectinload(Message.recipient),
+            )
+            .where(Message.id.in_([hit.message_id for hit in hits]))
+        )
+        messages_by_id = {msg.id: msg for msg in result.scalars().all()}
+        messages = [
+            messages_by_id[hit.message_id]
+            for hit in hits
+            if hit.message_id in messages_by_id
+        ]
+        return messages, next_cursor
+
+    async def count_messages(
+        self, db: AsyncSession, user_id: int, search_request: MessageSearchRequest
+    ) -> int:
+        """Return how many messages match the request across all pages."""
+        query = (search_request.query or "").strip()
+        if query:
+            return await self.backend.count(
+                db, user_id, query, with_user_id=search_request.with_user_id
+            )
+
+        stmt = select(func.count(Message.id)).where(_visible_to(user_id))
+        if search_request.with_user_id:
+            stmt = stmt.where(_with_user(search_request.with_user_id))
+        result = await db.execute(stmt)
+        return result.scalar() or 0
+
+    async def index_message(self, message: Message) -> None:
+        """Index a newly written message; failures never block sending."""
+        try:
+            await self.backend.index_message(message)
+        except Exception as e:
+            logger.error(
+                "Failed to index message",
+                message_id=message.id,
+                error=str(e),
+                component="message_search",
+            )
+
+    async def reindex(self, db: AsyncSession) -> int:
+        """Rebuild the search index for all messages."""
+        count = await self.backend.reindex(db)
+        logger.info(
+            "Message search index rebuilt",
+            backend=self.backend.name,
+            message_count=count,
+            component="message_search",
+        )
+        return count
+
+
+# Create singleton instance
+message_search_service = MessageSearchService()
@@ -1,8 +1,13 @@
+import base64
+from datetime import datetime
+
 from fastapi import HTTPException, status
-from sqlalchemy import and_, desc, func, or_, select
+from sqlalchemy import and_, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.crud.conversation import conversation as conversation_crud
+from app.crud.messages import message as message_crud
 from app.models.message import Message
 from app.models.user import User
 from app.schemas.message import (
@@ -12,12 +17,32 @@ from app.schemas.message import (
     MessageSearchRequest,
 )
 from app.services.company_connection_service import company_connection_service
+from app.services.file_access_service import file_access_service
+from app.services.message_search_service import message_search_service
 from app.utils.datetime_utils import get_utc_now
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 
+def encode_conversation_cursor(last_activity: datetime, other_user_id: int) -> str:
+    """Encode an inbox keyset position as an opaque cursor string."""
+    raw = f"{last_activity.isoformat()}|{other_user_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_conversation_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by ``encode_conversation_cursor``."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        last_activity, other_user_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(last_activity), int(other_user_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        ) from e
+
+
 class MessageService:
     def __init__(self):
         pass
@@ -60,8 +85,12 @@ class MessageService:
         )
 
         db.add(message)
+        await db.flush()
+        await conversation_crud.record_message(db, message)
+        file_access_service.grant_message(db, message)
         await db.commit()
         await db.refresh(message)
+        await message_search_service.index_message(message)
 
         logger.info(
             "Direct message sent",
@@ -121,109 +150,59 @@ class MessageService:
         )  # Return in ascending order (oldest first, newest at bottom)
 
     async def get_conversations(
-        self, db: AsyncSession, user_id: int, search_query: str | None = None
+        self,
+        db: AsyncSession,
+        user_id: int,
+        search_query: str | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
     ) -> list[ConversationSummary]:
         """Get list of users the current user has exchanged messages with."""
-        # SQLite-compatible approach: use CASE statements instead of greatest/least
-        from sqlalchemy import case
-
-        # Subquery to get the latest message between user and each other user
-        latest_message_subquery = (
-            select(
-                case(
-                    (
-                        Message.sender_id > Message.recipient_id,
-                        Message.sender_id,
-                    ),
-                    else_=Message.recipient_id,
-                ).label("user1"),
-                case(
-                    (
-                        Message.sender_id < Message.recipient_id,
-                        Message.sender_id,
-                    ),
-                    else_=Message.recipient_id,
-                ).label("user2"),
-                func.max(Message.created_at).label("last_activity"),
-            )
-            .where(
-                or_(
-                    Message.sender_id == user_id,
-                    Message.recipient_id == user_id,
-                )
-            )
-            .group_by("user1", "user2")
-            .subquery()
+        conversations, _ = await self.get_conversation_page(
+            db, user_id, search_query=search_query, limit=limit, cursor=cursor
         )
+        return conversations
 
-        # Get conversation partners
-        conversations = []
-        result = await db.execute(
-            select(
-                latest_message_subquery.c.user1,
-                latest_message_subquery.c.user2,
-                latest_message_subquery.c.last_activity,
-            ).order_by(desc(latest_message_subquery.c.last_activity))
+    async def get_conversation_page(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        search_query: str | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> tuple[list[ConversationSummary], str | None]:
+        """Get one page of the inbox and the cursor for the next page.
+
+        The page is built with a fixed number of queries regardless of how
+        many conversations the user has: one lookup on the conversation
+        summary table for partners, last activity and unread counts (plus the
+        partner company eager load), and one query for the latest messages.
+        """
+        before = decode_conversation_cursor(cursor) if cursor else None
+        rows = await conversation_crud.get_inbox_page(
+            db,
+            user_id,
+            search_query=search_query,
+            limit=limit + 1 if limit is not None else None,
+            before=before,
         )
 
-        for row in result.fetchall():
-            other_user_id = row.user1 if row.user2 == user_id else row.user2
-
-            # Get other user info
-            other_user_result = await db.execute(
-                select(User)
-                .options(selectinload(User.company))
-                .where(User.id == other_user_id)
-            )
-            other_user = other_user_result.scalar_one_or_none()
-            if not other_user:
-                continue
-
-            # Apply search filter
-            if search_query:
-                search_lower = search_query.lower()
-                if not (
-                    search_lower in other_user.full_name.lower()
-                    or search_lower in other_user.email.lower()
-                ):
-                    continue
-
-            # Get latest message
-            latest_msg_result = await db.execute(
-                select(Message)
-                .options(
-                    selectinload(Message.sender),
-                    selectinload(Message.recipient),
-                )
-                .where(
-                    or_(
-                        and_(
-                            Message.sender_id == user_id,
-                            Message.recipient_id == other_user_id,
-                            ~Message.is_deleted_by_sender,
-                        ),
-                        and_(
-                            Message.sender_id == other_user_id,
-                            Message.recipient_id == user_id,
-                            ~Message.is_deleted_by_recipient,
-                        ),
-                    )
-                )
-                .order_by(desc(Message.created_at))
-                .limit(1)
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            last_row = rows[-1]
+            next_cursor = encode_conversation_cursor(
+                last_row.last_activity, last_row.User.id
             )
-            latest_message = latest_msg_result.scalar_one_or_none()
-
-            # Count unread messages from other user
-            unread_result = await db.execute(
-                select(func.count(Message.id)).where(
-                    Message.sender_id == other_user_id,
-                    Message.recipient_id == user_id,
-                    ~Message.is_read,
-                    ~Message.is_deleted_by_recipient,
-                )
-            )
-            unread_count = unread_result.scalar()
+
+        latest_messages = await message_crud.get_messages_by_ids(
+            db, [row.last_message_id for row in rows if row.last_message_id]
+        )
+
+        conversations = []
+        for row in rows:
+            other_user = row.User
+            latest_message = latest_messages.get(row.last_message_id)
 
             # Convert to response format
             last_message_info = None
@@ -256,65 +235,21 @@ class MessageService:
                 if other_user.company
                 else None,
                 last_message=last_message_info,
-                unread_count=unread_count or 0,
+                unread_count=int(row.unread_count or 0),
                 last_activity=row.last_activity,
             )
             conversations.append(conversation)
 
-        return conversations
+        return conversations, next_cursor
 
     async def search_messages(
         self, db: AsyncSession, user_id: int, search_request: MessageSearchRequest
     ) -> list[Message]:
         """Search messages by content and sender name."""
-        query = (
-            select(Message)
-            .options(
-                selectinload(Message.sender),
-                selectinload(Message.recipient),
-            )
-            .where(
-                or_(
-                    and_(
-                        Message.sender_id == user_id,
-                        ~Message.is_deleted_by_sender,
-                    ),
-                    and_(
-                        Message.recipient_id == user_id,
-                        ~Message.is_deleted_by_recipient,
-                    ),
-                )
-            )
-        )
-
-        # Apply search filters
-        if search_request.query:
-            search_term = f"%{search_request.query}%"
-            query = query.join(Message.sender).where(
-                or_(
-                    Message.content.ilike(search_term),
-                    User.first_name.ilike(search_term),
-                    User.last_name.ilike(search_term),
-                    User.email.ilike(search_term),
-                )
-            )
-
-        if search_request.with_user_id:
-            query = query.where(
-                or_(
-                    Message.sender_id == search_request.with_user_id,
-                    Message.recipient_id == search_request.with_user_id,
-                )
-            )
-
-        query = (
-            query.order_by(desc(Message.created_at))
-            .offset(search_request.offset)
-            .limit(search_request.limit)
+        messages, _ = await message_search_service.search_messages(
+            db, user_id, search_request
         )
-
-        result = await db.execute(query)
-        return list(result.scalars().all())
+        return messages
 
     async def mark_messages_as_read(
         self, db: AsyncSession, user_id: int, message_ids: list[int]
@@ -331,12 +266,15 @@ class MessageService:
         messages = result.scalars().all()
 
         count = 0
+        read_counts: dict[int, int] = {}
         for message in messages:
             message.is_read = True
             message.read_at = get_utc_now()
+            read_counts[message.sender_id] = read_counts.get(message.sender_id, 0) + 1
             count += 1
 
         if count > 0:
+            await conversation_crud.mark_read(db, user_id, read_counts)
             await db.commit()
             logger.info(
                 f"Marked {count} messages as read",
@@ -367,6 +305,7 @@ class MessageService:
             count += 1
 
         if count > 0:
+            await conversation_crud.mark_all_read(db, user_id, other_user_id)
             await db.commit()
             logger.info(
                 f"Marked conversation as read - {count} messages",
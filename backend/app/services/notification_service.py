@@ -1,6 +1,6 @@
 import logging
-from datetime import timedelta
 
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -8,19 +8,63 @@ from sqlalchemy.orm import selectinload
 from app.models.message import Message
 from app.models.notification import Notification
 from app.models.user import User
-
-# Import moved to avoid circular import
-# from app.endpoints.messaging_ws import connection_manager, is_user_online
-# WebSocket functionality removed - using HTTP polling instead
+from app.services.email_digest_service import (
+    EmailDigestService,
+    email_digest_service,
+)
 from app.services.email_service import email_service
+from app.services.notification_stream import (
+    NotificationStreamManager,
+    notification_stream_manager,
+)
 from app.utils.datetime_utils import get_utc_now
 
 logger = logging.getLogger(__name__)
 
+# Message arrivals get their own SSE event name so clients can route them
+MESSAGE_NOTIFICATION_TYPE = "new_message"
+
+
+def serialize_notification(notification: Notification) -> dict:
+    return {
+        "id": notification.id,
+        "type": notification.type,
+        "title": notification.title,
+        "message": notification.message,
+        "payload": notification.payload,
+        "is_read": notification.is_read,
+        "created_at": notification.created_at,
+        "read_at": notification.read_at,
+    }
+
+
+def notification_event_name(notification_type: str) -> str:
+    if notification_type == MESSAGE_NOTIFICATION_TYPE:
+        return "message"
+    return "notification"
+
+
+def notification_event(notification: Notification, unread_count: int) -> dict:
+    """Stream event for a notification; its id doubles as the SSE event id."""
+    return {
+        "id": notification.id,
+        "event": notification_event_name(notification.type),
+        "data": {
+            "notification": jsonable_encoder(serialize_notification(notification)),
+            "unread_count": unread_count,
+        },
+    }
+
 
 class NotificationService:
-    def __init__(self):
-        self._email_debounce = {}  # Track last email sent per conversation to prevent spam
+    def __init__(
+        self,
+        stream_manager: NotificationStreamManager | None = None,
+        email_digest: EmailDigestService | None = None,
+    ):
+        self.stream_manager = stream_manager or notification_stream_manager
+        # Shared across workers: at most one email per conversation per window
+        self.email_digest = email_digest or email_digest_service
 
     async def create_notification(
         self,
@@ -44,12 +88,29 @@ class NotificationService:
         await db.commit()
         await db.refresh(notification)
 
-        # Note: Real-time notifications now handled via HTTP polling
-        # WebSocket functionality was removed from the messaging system
         logger.debug(f"Created notification {notification.id} for user {user_id}")
+        await self.push_notification(db, notification)
 
         return notification
 
+    async def push_notification(
+        self, db: AsyncSession, notification: Notification
+    ) -> None:
+        """Push a stored notification to the user's open streams, if any.
+
+        Best effort: clients that miss it replay from their last event id
+        or see it on their next poll.
+        """
+        try:
+            if not await self.stream_manager.is_online(notification.user_id):
+                return
+            unread_count = await self.get_unread_count(db, notification.user_id)
+            await self.stream_manager.publish(
+                notification.user_id, notification_event(notification, unread_count)
+            )
+        except Exception as e:
+            logger.warning(f"Failed to push notification {notification.id}: {e}")
+
     async def handle_new_message_notifications(
         self,
         db: AsyncSession,
@@ -75,8 +136,12 @@ class NotificationService:
             )
             return
 
-        # WebSocket functionality removed - assume user may need email notification
-        recipient_online = False  # Always assume offline for email notifications
+        # Recipients with an open notification stream see the message live
+        try:
+            recipient_online = await self.stream_manager.is_online(recipient_id)
+        except Exception as e:
+            logger.warning(f"Presence check failed for user {recipient_id}: {e}")
+            recipient_online = False
 
         # Always create in-app notification for message history
         await self.create_notification(
@@ -101,35 +166,39 @@ class NotificationService:
             logger.info(f"Email notifications disabled for user {recipient_id}")
             return
 
-        # Check debounce to prevent email spam (max 1 email per conversation per 5 minutes)
+        # Recipients with an open notification stream already saw the message
+        if recipient_online:
+            return
+
+        preview = (
+            message.content[:100] + "..."
+            if len(message.content) > 100
+            else message.content
+        )
+        conversation_url = f"{email_service.app_base_url}/messages?user={sender_id}"
         conversation_key = (
             f"{min(sender_id, recipient_id)}_{max(sender_id, recipient_id)}"
         )
-        now = get_utc_now()
-
-        if conversation_key in self._email_debounce:
-            last_email_time = self._email_debounce[conversation_key]
-            if now - last_email_time < timedelta(minutes=5):
-                logger.info(
-                    f"Email notification debounced for conversation {conversation_key}"
-                )
-                return
 
-        # Send email notification only if recipient is not currently online or not in the conversation
-        if not recipient_online:
-            success = await email_service.send_message_notification(
+        success = await self.email_digest.submit(
+            f"message:{conversation_key}:{recipient_id}",
+            recipient.email,
+            recipient.full_name,
+            title=f"New message from {sender.full_name}",
+            summary=preview,
+            url=conversation_url,
+            send=lambda: email_service.send_message_notification(
                 recipient.email,
                 recipient.full_name,
                 sender.full_name,
                 message.content,
-                f"{email_service.app_base_url}/messages?user={sender_id}",
-            )
-
-            if success:
-                self._email_debounce[conversation_key] = now
-                logger.info(f"Email notification sent to {recipient.email}")
-            else:
-                logger.error(f"Failed to send email notification to {recipient.email}")
+                conversation_url,
+            ),
+        )
+        if success:
+            logger.info(f"Email notification handled for {recipient.email}")
+        else:
+            logger.error(f"Failed to send email notification to {recipient.email}")
 
     async def get_user_notifications(
         self, db: AsyncSession, user_id: int, limit: int = 50, unread_only: bool = False
@@ -148,6 +217,18 @@ class NotificationService:
         result = await db.execute(query)
         return list(result.scalars().all())
 
+    async def get_notifications_after(
+        self, db: AsyncSession, user_id: int, after_id: int, limit: int
+    ) -> list[Notification]:
+        """Notifications newer than ``after_id``, oldest first (for replay)."""
+        result = await db.execute(
+            select(Notification)
+            .where(Notification.user_id == user_id, Notification.id > after_id)
+            .order_by(Notification.id)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
     async def mark_notifications_as_read(
         self, db: AsyncSession, user_id: int, notification_ids: list[int]
     ) -> int:
@@ -0,0 +1,195 @@
+"""Server-sent event push channel for notifications.
+
+Each open stream is held by the worker that accepted it. New notifications
+are published on the recipient's pub/sub channel, and every worker pushes
+them to the streams it holds for that user. Event ids are notification ids,
+so a client reconnecting with ``Last-Event-ID`` is replayed what it missed
+from the database. A stream whose queue overflows is ended, and the client
+catches up the same way.
+
+Open streams are also registered in the shared presence registry. That
+gives a per-user connection limit across workers and an "is this user
+online" check. Entries expire unless refreshed, so streams of a crashed
+worker stop counting after ``presence_ttl`` seconds.
+"""
+
+import asyncio
+import contextlib
+import json
+import uuid
+from collections import defaultdict
+from typing import Any
+
+from app.config import settings
+from app.services.pubsub_service import (
+    PresenceRegistry,
+    PubSubBackend,
+    get_presence_registry,
+    get_pubsub_backend,
+)
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class StreamLimitExceeded(Exception):
+    """The user already has the maximum number of open streams."""
+
+
+def format_sse(data: dict[str, Any], event: str, event_id: int | None = None) -> str:
+    """Serialize one server-sent event."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+class NotificationStream:
+    """One open SSE connection: a bounded queue of events for the client."""
+
+    def __init__(self, user_id: int, max_queue_size: int):
+        self.user_id = user_id
+        self.connection_id = uuid.uuid4().hex
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(
+            maxsize=max_queue_size
+        )
+        # Set when events were dropped; the client must resume from its last id
+        self.overflowed = False
+
+    def push(self, event: dict[str, Any]) -> None:
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def next_event(self, timeout: float) -> dict[str, Any] | None:
+        """Wait for the next event; None on timeout (time for a keepalive)."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except TimeoutError:
+            return None
+
+
+class NotificationStreamManager:
+    CHANNEL_PREFIX = "notifications:user:"
+
+    def __init__(
+        self,
+        pubsub: PubSubBackend | None = None,
+        presence: PresenceRegistry | None = None,
+        max_connections_per_user: int | None = None,
+        presence_ttl: int | None = None,
+    ):
+        self.streams: dict[int, set[NotificationStream]] = defaultdict(set)
+        self.max_connections_per_user = (
+            max_connections_per_user
+            or settings.notification_stream_max_connections_per_user
+        )
+        self.presence_ttl = presence_ttl or settings.notification_presence_ttl_seconds
+        self.queue_size = settings.notification_stream_queue_size
+        self._pubsub = pubsub
+        self._presence = presence
+        self._heartbeat_task: asyncio.Task | None = None
+
+    @property
+    def pubsub(self) -> PubSubBackend:
+        if self._pubsub is None:
+            self._pubsub = get_pubsub_backend()
+        return self._pubsub
+
+    @property
+    def presence(self) -> PresenceRegistry:
+        if self._presence is None:
+            self._presence = get_presence_registry()
+        return self._presence
+
+    def _channel(self, user_id: int) -> str:
+        return f"{self.CHANNEL_PREFIX}{user_id}"
+
+    async def open(self, user_id: int) -> NotificationStream:
+        """Register a stream for ``user_id`` on this worker.
+
+        Raises ``StreamLimitExceeded`` when the user already has
+        ``max_connections_per_user`` streams open on any worker.
+        """
+        channel = self._channel(user_id)
+        stream = NotificationStream(user_id, self.queue_size)
+        # Claim a slot before touching local state, so a failure here leaves
+        # nothing behind for the heartbeat to keep alive
+        if not await self.presence.add_within_limit(
+            channel,
+            stream.connection_id,
+            self.presence_ttl,
+            self.max_connections_per_user,
+        ):
+            raise StreamLimitExceeded(
+                f"At most {self.max_connections_per_user} notification streams per user"
+            )
+
+        if not self.streams.get(user_id):
+            try:
+                await self.pubsub.subscribe(channel, self._handle_event)
+            except Exception:
+                with contextlib.suppress(Exception):
+                    await self.pubsub.unsubscribe(channel, self._handle_event)
+                    await self.presence.remove(channel, stream.connection_id)
+                raise
+        self.streams[user_id].add(stream)
+        self._ensure_heartbeat()
+        return stream
+
+    async def close(self, stream: NotificationStream) -> None:
+        channel = self._channel(stream.user_id)
+        streams = self.streams.get(stream.user_id)
+        if streams is None or stream not in streams:
+            return
+        streams.discard(stream)
+        if not streams:
+            del self.streams[stream.user_id]
+            await self.pubsub.unsubscribe(channel, self._handle_event)
+        await self.presence.remove(channel, stream.connection_id)
+
+    async def publish(self, user_id: int, event: dict[str, Any]) -> None:
+        """Push ``event`` to every stream of ``user_id`` on every worker."""
+        await self.pubsub.publish(
+            self._channel(user_id), {"user_id": user_id, "event": event}
+        )
+
+    async def is_online(self, user_id: int) -> bool:
+        """True if the user has an open stream on any worker."""
+        return bool(await self.presence.members(self._channel(user_id)))
+
+    async def _handle_event(self, message: dict[str, Any]) -> None:
+        for stream in list(self.streams.get(message["user_id"], ())):
+            stream.push(message["event"])
+
+    def _ensure_heartbeat(self) -> None:
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
+
+    async def _heartbeat(self) -> None:
+        """Refresh presence of local streams until none are left."""
+        interval = max(self.presence_ttl / 3, 1)
+        while self.streams:
+            await asyncio.sleep(interval)
+            for user_id, streams in list(self.streams.items()):
+                for stream in list(streams):
+                    try:
+                        await self.presence.add(
+                            self._channel(user_id),
+                            stream.connection_id,
+                            self.presence_ttl,
+                        )
+                    except Exception as e:
+                        logger.error(
+                            "Failed to refresh notification presence",
+                            user_id=user_id,
+                            error=str(e),
+                        )
+
+
+notification_stream_manager = NotificationStreamManager()
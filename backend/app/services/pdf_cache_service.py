@@ -0,0 +1,160 @@
+"""Content-addressed cache for generated resume PDFs.
+
+A PDF is stored under ``resumes/pdfs/<resume_id>/<key>.pdf`` where ``key`` is
+a SHA-256 of everything that affects the rendered output: the prepared
+resume data, template, theme color, font, custom CSS, page format, watermark
+and contact-info flag. Regenerating an unchanged resume therefore finds the
+existing object and skips rendering and upload entirely.
+
+Because the key changes whenever the inputs do, stale entries are never
+served; ``invalidate`` (called from the ``ResumeService`` update paths) and
+``evict`` only reclaim storage. Eviction keeps the newest
+``PDF_CACHE_MAX_VARIANTS_PER_RESUME`` objects per resume and drops anything
+older than ``PDF_CACHE_TTL_DAYS``.
+"""
+
+import asyncio
+import hashlib
+import json
+from collections import defaultdict
+from datetime import timedelta
+from typing import Any
+
+from app.config import settings
+from app.services.storage_service import StorageService, get_storage_service
+from app.utils.datetime_utils import get_utc_now
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+PDF_CACHE_FOLDER = "resumes/pdfs"
+# Bump when template markup or PDF styling changes so old renders are not reused
+PDF_RENDER_VERSION = 1
+
+
+def compute_pdf_cache_key(
+    resume_data: dict[str, Any],
+    *,
+    template_id: str | None,
+    theme_color: str | None,
+    font_family: str | None,
+    resume_css: str | None,
+    custom_css: str | None,
+    format: str,
+    watermark: str | None,
+    include_contact_info: bool,
+) -> str:
+    """Hash the rendering inputs into a stable cache key."""
+    payload = {
+        "version": PDF_RENDER_VERSION,
+        "resume": resume_data,
+        "template_id": template_id,
+        "theme_color": theme_color,
+        "font_family": font_family,
+        "resume_css": resume_css,
+        "custom_css": custom_css,
+        "format": format,
+        "watermark": watermark,
+        "include_contact_info": include_contact_info,
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class PDFCacheService:
+    """Looks up, stores and evicts cached PDFs in object storage."""
+
+    def __init__(self, storage: StorageService | None = None):
+        self._storage = storage
+
+    @property
+    def storage(self) -> StorageService:
+        if self._storage is None:
+            self._storage = get_storage_service()
+        return self._storage
+
+    @staticmethod
+    def resume_prefix(resume_id: int) -> str:
+        return f"{PDF_CACHE_FOLDER}/{resume_id}/"
+
+    def object_key(self, resume_id: int, cache_key: str) -> str:
+        return f"{self.resume_prefix(resume_id)}{cache_key}.pdf"
+
+    async def get(self, resume_id: int, cache_key: str) -> dict[str, Any] | None:
+        """Return ``{"file_path", "file_size"}`` for a cached PDF, if present."""
+        file_path = self.object_key(resume_id, cache_key)
+        info = await asyncio.to_thread(self.storage.get_file_info, file_path)
+        if info is None:
+            return None
+        return {"file_path": file_path, "file_size": info["size"]}
+
+    async def put(self, resume_id: int, cache_key: str, pdf_data: bytes) -> str:
+        """Store a rendered PDF and trim surplus variants for the resume."""
+        file_path = self.object_key(resume_id, cache_key)
+        await asyncio.to_thread(
+            self.storage.put_file_data, file_path, pdf_data, "application/pdf"
+        )
+        await self._trim(self.resume_prefix(resume_id), keep={file_path})
+        return file_path
+
+    async def invalidate(self, resume_id: int) -> int:
+        """Drop every cached PDF for a resume."""
+        objects = await asyncio.to_thread(
+            self.storage.list_files, self.resume_prefix(resume_id)
+        )
+        return await self._delete([obj["s3_key"] for obj in objects])
+
+    async def evict(
+        self,
+        older_than_days: int | None = None,
+        max_variants_per_resume: int | None = None,
+    ) -> int:
+        """Evict expired PDFs and surplus variants across all resumes."""
+        older_than_days = older_than_days or settings.pdf_cache_ttl_days
+        max_variants = (
+            max_variants_per_resume or settings.pdf_cache_max_variants_per_resume
+        )
+        cutoff = get_utc_now() - timedelta(days=older_than_days)
+
+        objects = await asyncio.to_thread(
+            self.storage.list_files, f"{PDF_CACHE_FOLDER}/"
+        )
+        by_resume: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for obj in objects:
+            by_resume[obj["s3_key"].rsplit("/", 1)[0]].append(obj)
+
+        expired = []
+        for variants in by_resume.values():
+            variants.sort(key=lambda obj: obj["last_modified"], reverse=True)
+            for index, obj in enumerate(variants):
+                if index >= max_variants or obj["last_modified"] < cutoff:
+                    expired.append(obj["s3_key"])
+
+        evicted = await self._delete(expired)
+        logger.info(
+            "Evicted cached PDFs",
+            evicted=evicted,
+            scanned=len(objects),
+            component="pdf_cache",
+        )
+        return evicted
+
+    async def _trim(self, prefix: str, keep: set[str]) -> None:
+        objects = await asyncio.to_thread(self.storage.list_files, prefix)
+        objects.sort(key=lambda obj: obj["last_modified"], reverse=True)
+        surplus = [
+            obj["s3_key"]
+            for obj in objects[settings.pdf_cache_max_variants_per_resume :]
+            if obj["s3_key"] not in keep
+        ]
+        await self._delete(surplus)
+
+    async def _delete(self, keys: list[str]) -> int:
+        deleted = 0
+        for key in keys:
+            if await asyncio.to_thread(self.storage.delete_file, key):
+                deleted += 1
+        return deleted
+
+
+pdf_cache_service = PDFCacheService()
@@ -0,0 +1,248 @@
+"""HTML-to-PDF renderers shared by every PDFService instance.
+
+Starting Chromium costs far more than rendering a resume, so the Playwright
+renderer keeps one browser alive per process together with a pool of pages.
+The pool size bounds how many renders run at once; pages are recycled after
+``recycle_after`` renders or on any error, and the browser is relaunched
+when a health check finds it disconnected.
+
+Select the renderer with the ``PDF_RENDERER`` setting: ``playwright``
+(default), ``weasyprint`` or ``fake`` (deterministic output for tests).
+"""
+
+import asyncio
+import contextlib
+import hashlib
+from abc import ABC, abstractmethod
+from typing import Any
+
+from app.config import settings
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+PDF_MARGIN = {"top": "0.5in", "right": "0.5in", "bottom": "0.5in", "left": "0.5in"}
+
+
+class PDFRenderer(ABC):
+    """Renders an HTML document to PDF bytes."""
+
+    name: str
+
+    @abstractmethod
+    async def render(self, html_content: str, format: str = "A4") -> bytes:
+        """Render ``html_content`` to PDF."""
+
+    async def health_check(self) -> bool:
+        """Return whether the renderer can accept work."""
+        return True
+
+    async def close(self) -> None:  # noqa: B027
+        """Release browsers/threads held by the renderer."""
+
+
+class _PooledPage:
+    def __init__(self, page: Any):
+        self.page = page
+        self.renders = 0
+
+
+class BrowserPoolRenderer(PDFRenderer):
+    """Long-lived headless Chromium with a bounded pool of reusable pages."""
+
+    name = "playwright"
+
+    def __init__(
+        self,
+        pool_size: int = 4,
+        recycle_after: int = 100,
+        render_timeout: float = 30.0,
+    ):
+        self.pool_size = pool_size
+        self.recycle_after = recycle_after
+        self.render_timeout = render_timeout
+        self._playwright: Any = None
+        self._browser: Any = None
+        self._pages: asyncio.Queue[_PooledPage] | None = None
+        self._start_lock = asyncio.Lock()
+
+    async def _start(self) -> None:
+        async with self._start_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return
+            try:
+                from playwright.async_api import async_playwright  # type: ignore
+            except ImportError as e:
+                raise RuntimeError(
+                    "Playwright not installed. Install with: pip install playwright"
+                ) from e
+
+            await self._shutdown()
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=True)
+            self._pages = asyncio.Queue()
+            for _ in range(self.pool_size):
+                self._pages.put_nowait(_PooledPage(await self._browser.new_page()))
+            logger.info(
+                "PDF browser pool started",
+                pool_size=self.pool_size,
+                component="pdf_renderer",
+            )
+
+    async def _replace_page(self, pooled: _PooledPage) -> _PooledPage:
+        with contextlib.suppress(Exception):
+            await pooled.page.close()
+        return _PooledPage(await self._browser.new_page())
+
+    async def render(self, html_content: str, format: str = "A4") -> bytes:
+        if not await self.health_check():
+            await self._start()
+        assert self._pages is not None
+        pages = self._pages
+
+        # Waiting for a free page is what bounds concurrency
+        pooled = await pages.get()
+        try:
+            await asyncio.wait_for(
+                pooled.page.set_content(html_content, wait_until="networkidle"),
+                timeout=self.render_timeout,
+            )
+            pdf_data = await asyncio.wait_for(
+                pooled.page.pdf(
+                    format=format, print_background=True, margin=PDF_MARGIN
+                ),
+                timeout=self.render_timeout,
+            )
+            pooled.renders += 1
+            if pooled.renders >= self.recycle_after:
+                pooled = await self._replace_page(pooled)
+            return pdf_data
+        except Exception:
+            # A page that failed mid-render may be wedged; never reuse it
+            if self._browser is not None and self._browser.is_connected():
+                pooled = await self._replace_page(pooled)
+            raise
+        finally:
+            pages.put_nowait(pooled)
+
+    async def health_check(self) -> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    async def _shutdown(self) -> None:
+        if self._browser is not None:
+            with contextlib.suppress(Exception):
+                await self._browser.close()
+        if self._playwright is not None:
+            with contextlib.suppress(Exception):
+                await self._playwright.stop()
+        self._browser = None
+        self._playwright = None
+        self._pages = None
+
+    async def close(self) -> None:
+        async with self._start_lock:
+            await self._shutdown()
+
+
+class WeasyPrintRenderer(PDFRenderer):
+    """WeasyPrint renderer run in worker threads with bounded concurrency."""
+
+    name = "weasyprint"
+
+    def __init__(self, max_concurrency: int = 4):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    @staticmethod
+    def _render_sync(html_content: str, format: str) -> bytes:
+        try:
+            import weasyprint  # type: ignore
+        except ImportError as e:
+            raise RuntimeError(
+                "WeasyPrint not installed. Install with: pip install weasyprint"
+            ) from e
+
+        # Configure CSS for print
+        css_string = f"""
+        @page {{
+            size: {format};
+            margin: 0.5in;
+        }}
+
+        body {{
+            print-color-adjust: exact;
+            -webkit-print-color-adjust: exact;
+        }}
+        """
+        html_doc = weasyprint.HTML(string=html_content)
+        css_doc = weasyprint.CSS(string=css_string)
+        return html_doc.write_pdf(stylesheets=[css_doc])
+
+    async def render(self, html_content: str, format: str = "A4") -> bytes:
+        async with self._semaphore:
+            return await asyncio.to_thread(self._render_sync, html_content, format)
+
+
+class FakePDFRenderer(PDFRenderer):
+    """Deterministic in-process renderer for tests and benchmarks.
+
+    Produces small PDF-shaped bytes embedding a hash of the input, optionally
+    sleeping ``render_delay`` seconds to stand in for browser work, and
+    records how many renders ran concurrently.
+    """
+
+    name = "fake"
+
+    def __init__(self, max_concurrency: int = 4, render_delay: float = 0.0):
+        self.render_delay = render_delay
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.render_count = 0
+        self.active = 0
+        self.max_active = 0
+
+    async def render(self, html_content: str, format: str = "A4") -> bytes:
+        async with self._semaphore:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            try:
+                if self.render_delay:
+                    await asyncio.sleep(self.render_delay)
+                self.render_count += 1
+                digest = hashlib.sha256(f"{format}:{html_content}".encode()).hexdigest()
+                return b"%PDF-1.4\n% fake render " + digest.encode() + b"\n%%EOF\n"
+            finally:
+                self.active -= 1
+
+
+def create_pdf_renderer(name: str | None = None) -> PDFRenderer:
+    """Create a renderer from settings (or an explicit renderer name)."""
+    name = name or settings.pdf_renderer
+    if name == "playwright":
+        return BrowserPoolRenderer(
+            pool_size=settings.pdf_pool_size,
+            recycle_after=settings.pdf_page_recycle_after,
+            render_timeout=settings.pdf_render_timeout_seconds,
+        )
+    if name == "weasyprint":
+        return WeasyPrintRenderer(max_concurrency=settings.pdf_pool_size)
+    if name == "fake":
+        return FakePDFRenderer(max_concurrency=settings.pdf_pool_size)
+    raise ValueError(f"Unknown PDF renderer: {name}")
+
+
+_pdf_renderer: PDFRenderer | None = None
+
+
+def get_pdf_renderer() -> PDFRenderer:
+    """Get the process-wide PDF renderer."""
+    global _pdf_renderer
+    if _pdf_renderer is None:
+        _pdf_renderer = create_pdf_renderer()
+    return _pdf_renderer
+
+
+async def shutdown_pdf_renderer() -> None:
+    """Close the process-wide renderer (called on application shutdown)."""
+    global _pdf_renderer
+    if _pdf_renderer is not None:
+        await _pdf_renderer.close()
+        _pdf_renderer = None
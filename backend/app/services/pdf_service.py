@@ -1,9 +1,16 @@
+import asyncio
 import logging
 import uuid
 from datetime import timedelta
 from typing import Any
 
 from app.models.resume import Resume
+from app.services.pdf_cache_service import (
+    PDFCacheService,
+    compute_pdf_cache_key,
+    pdf_cache_service,
+)
+from app.services.pdf_renderer import PDFRenderer, get_pdf_renderer
 from app.services.storage_service import get_storage_service
 from app.services.template_service import TemplateService
 from app.utils.datetime_utils import get_utc_now
@@ -14,9 +21,28 @@ logger = logging.getLogger(__name__)
 class PDFService:
     """Service for generating PDF resumes from HTML templates."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        renderer: PDFRenderer | None = None,
+        pdf_cache: PDFCacheService | None = None,
+    ):
         self.template_service = TemplateService()
+        # Renderer is shared per process so the browser pool outlives requests
+        self._renderer = renderer
         # Storage service will be lazily loaded when needed
+        self._pdf_cache = pdf_cache
+
+    @property
+    def pdf_cache(self) -> PDFCacheService:
+        if self._pdf_cache is None:
+            self._pdf_cache = pdf_cache_service
+        return self._pdf_cache
+
+    @property
+    def renderer(self) -> PDFRenderer:
+        if self._renderer is None:
+            self._renderer = get_pdf_renderer()
+        return self._renderer
 
     async def generate_pdf(
         self,
@@ -26,50 +52,33 @@ class PDFService:
         watermark: str | None = None,
         custom_css: str | None = None,
     ) -> dict[str, Any]:
-        """Generate PDF from resume data."""
+        """Generate PDF from resume data and return a temporary download URL."""
         try:
-            # Render HTML
-            html_content = await self.template_service.render_resume(
-                resume, resume.template_id, custom_css
-            )
-
-            # Modify HTML for PDF generation
-            pdf_html = self._prepare_html_for_pdf(
-                html_content, format, include_contact_info, watermark
-            )
-
-            # Generate PDF
-            pdf_data = await self._convert_html_to_pdf(pdf_html, format)
-
-            # Upload to storage
-            filename = f"resume_{resume.id}_{uuid.uuid4().hex[:8]}.pdf"
-            file_path = await get_storage_service().upload_file(
-                pdf_data,
-                filename,
-                "resumes/pdfs",
-                content_type="application/pdf",  # type: ignore
+            stored = await self.store_pdf(
+                resume, format, include_contact_info, watermark, custom_css
             )
+            file_path = stored["file_path"]
 
             # Generate temporary download URL
-            download_url = await get_storage_service().generate_presigned_url(  # type: ignore
-                file_path,
-                expires_in=3600,  # 1 hour
+            download_url = self.pdf_cache.storage.get_presigned_url(
+                file_path, expires=timedelta(hours=1)
             )
 
             # Update resume record
             resume.pdf_file_path = file_path
-            resume.pdf_generated_at = get_utc_now()
             resume.download_count = (resume.download_count or 0) + 1
 
             result = {
                 "pdf_url": download_url,
                 "file_path": file_path,
-                "file_size": len(pdf_data),
+                "file_size": stored["file_size"],
                 "expires_at": get_utc_now() + timedelta(hours=1),
+                "cached": stored["cached"],
             }
 
             logger.info(
-                f"Generated PDF for resume {resume.id}, size: {len(pdf_data)} bytes"
+                f"Generated PDF for resume {resume.id}, "
+                f"size: {stored['file_size']} bytes, cached: {stored['cached']}"
             )
             return result
 
@@ -77,97 +86,59 @@ class PDFService:
             logger.error(f"Error generating PDF: {str(e)}")
             raise
 
-    async def _convert_html_to_pdf(
-        self, html_content: str, format: str = "A4"
-    ) -> bytes:
-        """Convert HTML content to PDF using playwright or weasyprint."""
-        try:
-            # Option 1: Using playwright (recommended for better CSS support)
-            if await self._is_playwright_available():
-                return await self._convert_with_playwright(html_content, format)
-
-            # Option 2: Using weasyprint (fallback)
-            elif await self._is_weasyprint_available():
-                return await self._convert_with_weasyprint(html_content, format)
-
-            else:
-                raise RuntimeError(
-                    "No PDF generation library available (playwright or weasyprint)"
-                )
+    async def store_pdf(
+        self,
+        resume: Resume,
+        format: str = "A4",
+        include_contact_info: bool = True,
+        watermark: str | None = None,
+        custom_css: str | None = None,
+    ) -> dict[str, Any]:
+        """Return the stored PDF for a resume, rendering it only on a cache miss.
 
-        except Exception as e:
-            logger.error(f"Error converting HTML to PDF: {str(e)}")
-            raise
+        Unchanged resumes rendered with the same options are served from the
+        PDF cache without rendering or uploading again.
+        """
+        cache_key = compute_pdf_cache_key(
+            self.template_service._prepare_resume_data(resume),
+            template_id=resume.template_id,
+            theme_color=resume.theme_color,
+            font_family=resume.font_family,
+            resume_css=resume.custom_css,
+            custom_css=custom_css,
+            format=format,
+            watermark=watermark,
+            include_contact_info=include_contact_info,
+        )
 
-    async def _convert_with_playwright(self, html_content: str, format: str) -> bytes:
-        """Convert HTML to PDF using Playwright."""
-        try:
-            from playwright.async_api import async_playwright  # type: ignore
-
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page()
-
-                # Set content
-                await page.set_content(html_content, wait_until="networkidle")
-
-                # Configure PDF options
-                pdf_options = {
-                    "format": format,
-                    "print_background": True,
-                    "margin": {
-                        "top": "0.5in",
-                        "right": "0.5in",
-                        "bottom": "0.5in",
-                        "left": "0.5in",
-                    },
-                }
+        cached = await self.pdf_cache.get(resume.id, cache_key)
+        if cached:
+            return {**cached, "cached": True}
 
-                # Generate PDF
-                pdf_data = await page.pdf(**pdf_options)
-                await browser.close()
+        # Render HTML
+        html_content = await self.template_service.render_resume(
+            resume, resume.template_id, custom_css
+        )
 
-                return pdf_data
+        # Modify HTML for PDF generation
+        pdf_html = self._prepare_html_for_pdf(
+            html_content, format, include_contact_info, watermark
+        )
 
-        except ImportError as e:
-            raise RuntimeError(
-                "Playwright not installed. Install with: pip install playwright"
-            ) from e
-        except Exception as e:
-            logger.error(f"Playwright PDF conversion error: {str(e)}")
-            raise
+        # Generate PDF and store it under its cache key
+        pdf_data = await self._convert_html_to_pdf(pdf_html, format)
+        file_path = await self.pdf_cache.put(resume.id, cache_key, pdf_data)
+        resume.pdf_generated_at = get_utc_now()
+        return {"file_path": file_path, "file_size": len(pdf_data), "cached": False}
 
-    async def _convert_with_weasyprint(self, html_content: str, format: str) -> bytes:
-        """Convert HTML to PDF using WeasyPrint."""
+    async def _convert_html_to_pdf(
+        self, html_content: str, format: str = "A4"
+    ) -> bytes:
+        """Convert HTML content to PDF through the shared renderer pool."""
         try:
-            import weasyprint  # type: ignore
-
-            # Configure CSS for print
-            css_string = f"""
-            @page {{
-                size: {format};
-                margin: 0.5in;
-            }}
-
-            body {{
-                print-color-adjust: exact;
-                -webkit-print-color-adjust: exact;
-            }}
-            """
-
-            # Convert to PDF
-            html_doc = weasyprint.HTML(string=html_content)
-            css_doc = weasyprint.CSS(string=css_string)
-
-            pdf_data = html_doc.write_pdf(stylesheets=[css_doc])
-            return pdf_data
-
-        except ImportError as e:
-            raise RuntimeError(
-                "WeasyPrint not installed. Install with: pip install weasyprint"
-            ) from e
+            return await self.renderer.render(html_content, format)
         except Exception as e:
-            logger.error(f"WeasyPrint PDF conversion error: {str(e)}")
+            logger.error(f"Error converting HTML to PDF: {str(e)}")
             raise
 
     def _prepare_html_for_pdf(
@@ -241,20 +212,6 @@ class PDFService:
 
         return html_content
 
-    async def _is_playwright_available(self) -> bool:
-        """Check if Playwright is available."""
-        try:
-            return True
-        except ImportError:
-            return False
-
-    async def _is_weasyprint_available(self) -> bool:
-        """Check if WeasyPrint is available."""
-        try:
-            return True
-        except ImportError:
-            return False
-
     async def get_pdf_preview_image(self, resume: Resume) -> str | None:
         """Generate a preview image of the PDF."""
         try:
@@ -319,39 +276,45 @@ class PDFService:
     async def bulk_generate_pdfs(
         self, resume_ids: list[int], user_id: int
     ) -> dict[str, Any]:
-        """Generate PDFs for multiple resumes."""
-        results = {"success": [], "errors": [], "total": len(resume_ids)}
-
-        # This could be implemented as a background task for large batches
-        for resume_id in resume_ids:
-            try:
-                # Get resume with ownership check
-                from app.database import get_db
+        """Generate PDFs for multiple resumes.
 
-                async with get_db() as db:  # type: ignore
-                    from app.services.resume_service import ResumeService
-
-                    resume_service = ResumeService()
+        Resumes are loaded up front and rendered in parallel; the renderer
+        pool bounds how many renders actually run at once.
+        """
+        from app.database import AsyncSessionLocal
+        from app.services.resume_service import ResumeService
 
-                    resume = await resume_service.get_resume(db, resume_id, user_id)
-                    if not resume:
-                        results["errors"].append(f"Resume {resume_id} not found")
-                        continue
+        results = {"success": [], "errors": [], "total": len(resume_ids)}
+        resume_service = ResumeService()
 
+        async with AsyncSessionLocal() as db:
+            resumes = []
+            for resume_id in resume_ids:
+                # Get resume with ownership check
+                resume = await resume_service.get_resume(db, resume_id, user_id)
+                if not resume:
+                    results["errors"].append(f"Resume {resume_id} not found")
+                    continue
+                resumes.append(resume)
+
+            async def _generate(resume: Resume) -> None:
+                try:
                     pdf_result = await self.generate_pdf(resume)
                     results["success"].append(
                         {
-                            "resume_id": resume_id,
+                            "resume_id": resume.id,
                             "pdf_url": pdf_result["pdf_url"],
                             "file_size": pdf_result["file_size"],
                         }
                     )
+                except Exception as e:
+                    logger.error(
+                        f"Error generating PDF for resume {resume.id}: {str(e)}"
+                    )
+                    results["errors"].append(f"Resume {resume.id}: {str(e)}")
 
-                    await db.commit()
-
-            except Exception as e:
-                logger.error(f"Error generating PDF for resume {resume_id}: {str(e)}")
-                results["errors"].append(f"Resume {resume_id}: {str(e)}")
+            await asyncio.gather(*(_generate(resume) for resume in resumes))
+            await db.commit()
 
         return results
 
@@ -617,9 +580,9 @@ class PDFService:
 
         from datetime import datetime
 
-        from jinja2 import Template
-
-        template = Template(html_template)
+        template = self.template_service.get_compiled_template(
+            "pdf/rirekisho", html_template
+        )
 
         # Calculate age if birth_date is available
         age = None
@@ -921,9 +884,9 @@ class PDFService:
 
         from datetime import datetime
 
-        from jinja2 import Template
-
-        template = Template(html_template)
+        template = self.template_service.get_compiled_template(
+            "pdf/shokumu", html_template
+        )
 
         # Group skills by category
         skills_by_category = {}
@@ -965,15 +928,16 @@ class PDFService:
             creation_date=creation_date,
         )
 
-    async def cleanup_old_pdfs(self, older_than_days: int = 30) -> int:
-        """Clean up old generated PDFs to save storage space."""
+    async def cleanup_old_pdfs(
+        self,
+        older_than_days: int | None = None,
+        max_variants_per_resume: int | None = None,
+    ) -> int:
+        """Evict old or surplus cached PDFs to save storage space."""
         try:
-            # This would query for resumes with old PDF files and clean them up
-            # Implementation depends on your cleanup strategy
-
-            cleanup_count = 0
-            # ... cleanup logic here ...
-
+            cleanup_count = await self.pdf_cache.evict(
+                older_than_days, max_variants_per_resume
+            )
             logger.info(f"Cleaned up {cleanup_count} old PDF files")
             return cleanup_count
 
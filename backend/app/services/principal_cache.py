@@ -0,0 +1,172 @@
+"""Cached snapshots of authenticated users for permission checks.
+
+``get_current_user`` loads the user once per request and records a compact
+``Principal`` (id, company, role names, flags). Permission helpers that only
+need a user's roles read the snapshot instead of querying ``user_roles``
+again; on a miss they load it with a single query.
+
+The cache is per worker, bounded, and short-lived. Writers that change roles,
+suspend or delete users, or revoke tokens call ``invalidate_user`` after
+committing; the invalidation is broadcast on the pub/sub backplane so every
+worker drops its copy.
+"""
+
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.role import Role, UserRole
+from app.models.user import User
+from app.services.broadcast_cache import BroadcastInvalidatedCache
+from app.services.pubsub_service import PubSubBackend
+from app.utils.constants import UserRole as UserRoleEnum
+
+
+@dataclass(frozen=True)
+class Principal:
+    """What permission checks need to know about a user."""
+
+    user_id: int
+    company_id: int | None
+    roles: frozenset[str] = frozenset()
+    is_active: bool = True
+    is_admin: bool = False
+    is_suspended: bool = False
+
+    def has_role(self, role: UserRoleEnum | str) -> bool:
+        return (role.value if isinstance(role, UserRoleEnum) else role) in self.roles
+
+    @property
+    def is_system_admin(self) -> bool:
+        return UserRoleEnum.SYSTEM_ADMIN.value in self.roles
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        """Snapshot a user whose ``user_roles`` and their roles are loaded."""
+        return cls(
+            user_id=user.id,
+            company_id=user.company_id,
+            roles=frozenset(user_role.role.name for user_role in user.user_roles),
+            is_active=bool(user.is_active),
+            is_admin=bool(user.is_admin),
+            is_suspended=bool(user.is_suspended),
+        )
+
+
+class PrincipalCache(BroadcastInvalidatedCache):
+    channel = "principals:invalidate"
+
+    def __init__(
+        self,
+        pubsub: PubSubBackend | None = None,
+        ttl_seconds: float | None = None,
+        max_entries: int | None = None,
+    ):
+        super().__init__(
+            ttl_seconds
+            if ttl_seconds is not None
+            else settings.principal_cache_ttl_seconds,
+            pubsub,
+        )
+        self.max_entries = max_entries or settings.principal_cache_max_entries
+        # user_id -> (expires_at, principal), least recently stored first
+        self._entries: OrderedDict[int, tuple[float, Principal]] = OrderedDict()
+        self.load_count = 0
+
+    def peek(self, user_id: int) -> Principal | None:
+        """The cached principal of ``user_id``, without touching the database."""
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        if not self._fresh(entry):
+            del self._entries[user_id]
+            return None
+        return entry[1]
+
+    async def put(self, principal: Principal, generation: int | None = None) -> None:
+        """Cache ``principal`` unless an invalidation happened since ``generation``.
+
+        Pass the ``generation`` read before loading the user, so a snapshot
+        loaded before a concurrent role change is not stored after it.
+        """
+        await self._ensure_subscribed()
+        if self.ttl_seconds <= 0:
+            return
+        if generation is not None and generation != self.generation:
+            return
+        self._entries[principal.user_id] = (self._expires_at(), principal)
+        self._entries.move_to_end(principal.user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _load(self, db: AsyncSession, user_id: int) -> Principal | None:
+        result = await db.execute(
+            select(
+                User.company_id,
+                User.is_active,
+                User.is_admin,
+                User.is_suspended,
+                Role.name,
+            )
+            .outerjoin(UserRole, UserRole.user_id == User.id)
+            .outerjoin(Role, Role.id == UserRole.role_id)
+            .where(User.id == user_id)
+        )
+        rows = result.all()
+        self.load_count += 1
+        if not rows:
+            return None
+        company_id, is_active, is_admin, is_suspended, _ = rows[0]
+        return Principal(
+            user_id=user_id,
+            company_id=company_id,
+            roles=frozenset(name for *_, name in rows if name),
+            is_active=bool(is_active),
+            is_admin=bool(is_admin),
+            is_suspended=bool(is_suspended),
+        )
+
+    async def get(self, db: AsyncSession, user_id: int) -> Principal | None:
+        """Principal of ``user_id``; None if there is no such user."""
+        principal = self.peek(user_id)
+        if principal is not None:
+            return principal
+        generation = self.generation
+        principal = await self._load(db, user_id)
+        if principal is not None:
+            await self.put(principal, generation)
+        return principal
+
+    async def get_roles(self, db: AsyncSession, user_id: int) -> frozenset[str]:
+        """Role names of ``user_id`` (empty if there is no such user)."""
+        principal = await self.get(db, user_id)
+        return principal.roles if principal is not None else frozenset()
+
+    def _clear(self, message: dict[str, Any]) -> None:
+        if message.get("all"):
+            self._entries.clear()
+            return
+        for user_id in message.get("user_ids", []):
+            self._entries.pop(user_id, None)
+
+    async def invalidate_user(self, user_id: int) -> None:
+        """Call after a user's roles, status or tokens change (committed)."""
+        await self._invalidate({"user_ids": [user_id]})
+
+    async def invalidate_users(self, user_ids: Iterable[int]) -> None:
+        """Bulk form of ``invalidate_user``."""
+        user_ids = list(user_ids)
+        if user_ids:
+            await self._invalidate({"user_ids": user_ids})
+
+    async def invalidate_all(self) -> None:
+        """Drop every cached principal, on every worker."""
+        await self._invalidate({"all": True})
+
+
+principal_cache = PrincipalCache()
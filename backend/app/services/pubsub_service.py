@@ -0,0 +1,280 @@
+"""Cross-process pub/sub and presence for real-time features.
+
+WebSocket connections live in a single uvicorn worker, so anything that has to
+reach a socket held by another worker or node goes through a backplane:
+
+* ``PubSubBackend`` - fire-and-forget JSON messages on named channels.
+* ``PresenceRegistry`` - shared set of members per key with TTL expiry, so
+  entries left behind by a crashed worker disappear on their own.
+
+Redis implementations are used in deployments; the in-memory ones keep the
+same semantics inside one process and are used by tests (``ENVIRONMENT=test``)
+and single-worker development. Select with the ``PUBSUB_BACKEND`` setting.
+"""
+
+import asyncio
+import contextlib
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import redis.asyncio as redis
+
+from app.config import settings
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+MessageHandler = Callable[[dict[str, Any]], Awaitable[None]]
+
+
+class PubSubBackend(ABC):
+    """Publish JSON messages to channels and dispatch them to local handlers."""
+
+    def __init__(self):
+        self._handlers: dict[str, list[MessageHandler]] = defaultdict(list)
+
+    @abstractmethod
+    async def publish(self, channel: str, message: dict[str, Any]) -> None:
+        """Publish a message to every subscriber of ``channel`` on every node."""
+
+    @abstractmethod
+    async def _subscribe_channel(self, channel: str) -> None:
+        """Start receiving messages for ``channel`` on this node."""
+
+    @abstractmethod
+    async def _unsubscribe_channel(self, channel: str) -> None:
+        """Stop receiving messages for ``channel`` on this node."""
+
+    async def subscribe(self, channel: str, handler: MessageHandler) -> None:
+        """Register ``handler`` for messages published on ``channel``."""
+        first = not self._handlers[channel]
+        self._handlers[channel].append(handler)
+        if first:
+            await self._subscribe_channel(channel)
+
+    async def unsubscribe(self, channel: str, handler: MessageHandler) -> None:
+        """Remove ``handler``; the channel is dropped with its last handler."""
+        handlers = self._handlers.get(channel)
+        if not handlers or handler not in handlers:
+            return
+        handlers.remove(handler)
+        if not handlers:
+            del self._handlers[channel]
+            await self._unsubscribe_channel(channel)
+
+    async def _dispatch(self, channel: str, message: dict[str, Any]) -> None:
+        for handler in list(self._handlers.get(channel, [])):
+            try:
+                await handler(message)
+            except Exception as e:
+                logger.error(
+                    "Pub/sub handler failed",
+                    channel=channel,
+                    error=str(e),
+                    component="pubsub",
+                )
+
+    async def close(self) -> None:  # noqa: B027
+        """Release connections held by the backend."""
+
+
+class InMemoryPubSub(PubSubBackend):
+    """Process-local pub/sub with the same delivery semantics as Redis."""
+
+    async def publish(self, channel: str, message: dict[str, Any]) -> None:
+        # Round-trip through JSON so handlers never share mutable payloads
+        await self._dispatch(channel, json.loads(json.dumps(message)))
+
+    async def _subscribe_channel(self, channel: str) -> None:
+        pass
+
+    async def _unsubscribe_channel(self, channel: str) -> None:
+        pass
+
+
+class RedisPubSub(PubSubBackend):
+    """Redis ``PUBLISH``/``SUBSCRIBE`` backplane with one listener per process."""
+
+    def __init__(self, url: str):
+        super().__init__()
+        self._redis = redis.from_url(url, decode_responses=True)
+        self._pubsub = self._redis.pubsub()
+        self._listener: asyncio.Task | None = None
+
+    async def publish(self, channel: str, message: dict[str, Any]) -> None:
+        await self._redis.publish(channel, json.dumps(message))
+
+    async def _subscribe_channel(self, channel: str) -> None:
+        await self._pubsub.subscribe(channel)
+        # listen() returns once nothing is subscribed, so restart it on demand
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def _unsubscribe_channel(self, channel: str) -> None:
+        await self._pubsub.unsubscribe(channel)
+
+    async def _listen(self) -> None:
+        try:
+            async for item in self._pubsub.listen():
+                if item.get("type") != "message":
+                    continue
+                try:
+                    message = json.loads(item["data"])
+                except (TypeError, ValueError):
+                    logger.warning(
+                        "Dropping malformed pub/sub message",
+                        channel=item.get("channel"),
+                        component="pubsub",
+                    )
+                    continue
+                await self._dispatch(item["channel"], message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Pub/sub listener stopped", error=str(e), component="pubsub")
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+        await self._pubsub.aclose()
+        await self._redis.aclose()
+
+
+class PresenceRegistry(ABC):
+    """Shared ``key -> members`` registry where each member expires after a TTL."""
+
+    @abstractmethod
+    async def add(self, key: str, member: str, ttl_seconds: int) -> None:
+        """Add or refresh ``member`` under ``key`` for ``ttl_seconds``."""
+
+    @abstractmethod
+    async def add_within_limit(
+        self, key: str, member: str, ttl_seconds: int, limit: int
+    ) -> bool:
+        """Add ``member`` unless ``key`` already has ``limit`` live members.
+
+        The check and the add are one atomic step across processes. Returns
+        False (and adds nothing) when the limit is reached.
+        """
+
+    @abstractmethod
+    async def remove(self, key: str, member: str) -> None:
+        """Remove ``member`` from ``key``."""
+
+    @abstractmethod
+    async def members(self, key: str) -> list[str]:
+        """Return the live (non-expired) members of ``key``."""
+
+
+class InMemoryPresenceRegistry(PresenceRegistry):
+    """Process-local presence registry."""
+
+    def __init__(self):
+        self._entries: dict[str, dict[str, float]] = defaultdict(dict)
+
+    async def add(self, key: str, member: str, ttl_seconds: int) -> None:
+        self._entries[key][member] = time.time() + ttl_seconds
+
+    async def add_within_limit(
+        self, key: str, member: str, ttl_seconds: int, limit: int
+    ) -> bool:
+        # No await between the check and the add, so this is atomic in-process
+        if len(await self.members(key)) >= limit:
+            return False
+        await self.add(key, member, ttl_seconds)
+        return True
+
+    async def remove(self, key: str, member: str) -> None:
+        entries = self._entries.get(key)
+        if entries is not None:
+            entries.pop(member, None)
+            if not entries:
+                del self._entries[key]
+
+    async def members(self, key: str) -> list[str]:
+        entries = self._entries.get(key, {})
+        now = time.time()
+        for member in [m for m, expires_at in entries.items() if expires_at <= now]:
+            del entries[member]
+        return sorted(entries)
+
+
+class RedisPresenceRegistry(PresenceRegistry):
+    """Presence stored as a Redis sorted set scored by expiry time."""
+
+    # KEYS[1]: set; ARGV: member, now, expires_at, ttl_seconds, limit
+    ADD_WITHIN_LIMIT = """
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[2])
+    if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[5]) then
+        return 0
+    end
+    redis.call('ZADD', KEYS[1], ARGV[3], ARGV[1])
+    redis.call('EXPIRE', KEYS[1], ARGV[4])
+    return 1
+    """
+
+    def __init__(self, url: str, prefix: str = "presence:"):
+        self._redis = redis.from_url(url, decode_responses=True)
+        self._prefix = prefix
+        self._add_within_limit = self._redis.register_script(self.ADD_WITHIN_LIMIT)
+
+    async def add(self, key: str, member: str, ttl_seconds: int) -> None:
+        redis_key = self._prefix + key
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(redis_key, {member: time.time() + ttl_seconds})
+            # The whole set goes away once its newest member would have expired
+            pipe.expire(redis_key, ttl_seconds)
+            await pipe.execute()
+
+    async def add_within_limit(
+        self, key: str, member: str, ttl_seconds: int, limit: int
+    ) -> bool:
+        now = time.time()
+        added = await self._add_within_limit(
+            keys=[self._prefix + key],
+            args=[member, now, now + ttl_seconds, ttl_seconds, limit],
+        )
+        return bool(added)
+
+    async def remove(self, key: str, member: str) -> None:
+        await self._redis.zrem(self._prefix + key, member)
+
+    async def members(self, key: str) -> list[str]:
+        redis_key = self._prefix + key
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(redis_key, "-inf", time.time())
+            pipe.zrange(redis_key, 0, -1)
+            _, members = await pipe.execute()
+        return sorted(members)
+
+
+_pubsub_backend: PubSubBackend | None = None
+_presence_registry: PresenceRegistry | None = None
+
+
+def get_pubsub_backend() -> PubSubBackend:
+    """Get the process-wide pub/sub backend."""
+    global _pubsub_backend
+    if _pubsub_backend is None:
+        if settings.pubsub_backend == "redis":
+            _pubsub_backend = RedisPubSub(settings.redis_url)
+        else:
+            _pubsub_backend = InMemoryPubSub()
+    return _pubsub_backend
+
+
+def get_presence_registry() -> PresenceRegistry:
+    """Get the process-wide presence registry."""
+    global _presence_registry
+    if _presence_registry is None:
+        if settings.pubsub_backend == "redis":
+            _presence_registry = RedisPresenceRegistry(settings.redis_url)
+        else:
+            _presence_registry = InMemoryPresenceRegistry()
+    return _presence_registry
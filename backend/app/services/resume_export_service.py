@@ -0,0 +1,349 @@
+"""Background batch export of resume PDFs.
+
+``create_job`` records a ``ResumeExportJob`` and hands it to the Celery
+worker, which renders the resumes with bounded parallelism through
+``PDFService.store_pdf`` (so unchanged resumes come straight from the PDF
+cache). Progress and per-resume failures are written to the job row as each
+resume finishes; one failing resume never aborts the batch.
+
+Each PDF is then copied to a key owned by the job, so editing a resume or
+evicting the PDF cache cannot delete it before the download. Those copies are
+purged after ``resume_export_retention_days``.
+
+The download is a zip assembled on the fly: each stored PDF is streamed from
+object storage into the archive chunk by chunk, so neither the worker nor the
+API process ever holds the whole batch in memory. ``check_outputs`` confirms
+the PDFs still exist before the response starts; missing ones are listed in
+the errors file instead.
+"""
+
+import asyncio
+import re
+import zipfile
+from collections.abc import Iterator
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.crud.resume import resume as resume_crud
+from app.database import AsyncSessionLocal
+from app.models.resume import Resume
+from app.models.resume_export_job import ResumeExportJob
+from app.services.pdf_cache_service import PDFCacheService
+from app.services.pdf_renderer import PDFRenderer, create_pdf_renderer
+from app.services.pdf_service import PDFService
+from app.services.storage_service import StorageService, get_storage_service
+from app.utils.constants import ResumeExportStatus
+from app.utils.datetime_utils import get_utc_now
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+ERRORS_FILENAME = "export_errors.txt"
+EXPORT_FOLDER = "resume_exports"
+
+
+class _ZipChunkBuffer:
+    """Write-only sink that hands zip output back in chunks."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def export_filename(resume: Resume) -> str:
+    """Archive member name for a resume's PDF."""
+    label = resume.full_name or resume.title or "resume"
+    safe = re.sub(r"[^\w.-]+", "_", label).strip("_") or "resume"
+    return f"{safe}_{resume.id}.pdf"
+
+
+def export_output_key(job_id: int, resume_id: int) -> str:
+    """Storage key of a job's own copy of a resume's PDF."""
+    return f"{EXPORT_FOLDER}/{job_id}/{resume_id}.pdf"
+
+
+class ResumeExportService:
+    """Creates, runs and streams batch PDF export jobs."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        storage: StorageService | None = None,
+    ):
+        self._session_factory = session_factory or AsyncSessionLocal
+        self._storage = storage
+
+    @property
+    def storage(self) -> StorageService:
+        if self._storage is None:
+            self._storage = get_storage_service()
+        return self._storage
+
+    async def create_job(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        resume_ids: list[int],
+        format: str = "A4",
+        include_contact_info: bool = True,
+        watermark: str | None = None,
+    ) -> ResumeExportJob:
+        """Record an export job and queue it on the Celery worker."""
+        from app.workers.resume_tasks import export_resume_pdfs
+
+        resume_ids = list(dict.fromkeys(resume_ids))
+        if len(resume_ids) > settings.resume_export_max_resumes:
+            raise ValueError(
+                f"Cannot export more than {settings.resume_export_max_resumes} "
+                "resumes at once"
+            )
+
+        job = ResumeExportJob(
+            user_id=user_id,
+            resume_ids=resume_ids,
+            format=format,
+            include_contact_info=include_contact_info,
+            watermark=watermark,
+            total_count=len(resume_ids),
+            results=[],
+            errors=[],
+        )
+        db.add(job)
+        await db.commit()
+
+        task = export_resume_pdfs.delay(job.id)
+        job.celery_task_id = task.id
+        await db.commit()
+        await db.refresh(job)
+        return job
+
+    async def get_job(
+        self, db: AsyncSession, job_id: int, user_id: int
+    ) -> ResumeExportJob | None:
+        result = await db.execute(
+            select(ResumeExportJob).where(
+                ResumeExportJob.id == job_id, ResumeExportJob.user_id == user_id
+            )
+        )
+        return result.scalars().first()
+
+    async def run_job(
+        self, job_id: int, renderer: PDFRenderer | None = None
+    ) -> ResumeExportJob:
+        """Render every resume in the job, recording progress as it goes."""
+        # Worker tasks run in their own event loop, so the job gets its own pool
+        owns_renderer = renderer is None
+        renderer = renderer or create_pdf_renderer()
+        pdf_service = PDFService(
+            renderer=renderer, pdf_cache=PDFCacheService(self._storage)
+        )
+
+        async with self._session_factory() as db:
+            job = await db.get(ResumeExportJob, job_id)
+            if job is None:
+                raise ValueError(f"Export job {job_id} not found")
+
+            job.status = ResumeExportStatus.RUNNING.value
+            job.started_at = get_utc_now()
+            results: list[dict[str, Any]] = []
+            errors: list[dict[str, Any]] = []
+            job.results, job.errors = [], []
+            await db.commit()
+
+            progress_lock = asyncio.Lock()
+
+            async def record(
+                result: dict[str, Any] | None, error: dict[str, Any] | None
+            ) -> None:
+                async with progress_lock:
+                    if result:
+                        results.append(result)
+                    if error:
+                        errors.append(error)
+                    job.completed_count = len(results)
+                    job.failed_count = len(errors)
+                    job.results = list(results)
+                    job.errors = list(errors)
+                    await db.commit()
+
+            try:
+                resumes = await resume_crud.get_many_with_details(
+                    db, ids=job.resume_ids, user_id=job.user_id
+                )
+                semaphore = asyncio.Semaphore(settings.resume_export_concurrency)
+
+                async def export_one(resume_id: int) -> None:
+                    resume = resumes.get(resume_id)
+                    if resume is None:
+                        await record(
+                            None, {"resume_id": resume_id, "error": "Resume not found"}
+                        )
+                        return
+                    file_path = export_output_key(job_id, resume_id)
+                    try:
+                        async with semaphore:
+                            stored = await pdf_service.store_pdf(
+                                resume,
+                                format=job.format,
+                                include_contact_info=job.include_contact_info,
+                                watermark=job.watermark,
+                            )
+                            # The cached object can be invalidated or evicted
+                            # at any time; the job keeps its own copy
+                            await asyncio.to_thread(
+                                self.storage.copy_file, stored["file_path"], file_path
+                            )
+                    except Exception as e:
+                        logger.error(
+                            "Resume export failed",
+                            job_id=job_id,
+                            resume_id=resume_id,
+                            error=str(e),
+                            component="resume_export",
+                        )
+                        await record(None, {"resume_id": resume_id, "error": str(e)})
+                        return
+                    await record(
+                        {
+                            "resume_id": resume_id,
+                            "file_path": file_path,
+                            "filename": export_filename(resume),
+                            "file_size": stored["file_size"],
+                        },
+                        None,
+                    )
+
+                await asyncio.gather(*(export_one(rid) for rid in job.resume_ids))
+
+                if not results:
+                    job.status = ResumeExportStatus.FAILED.value
+                    job.error_message = "No resumes could be exported"
+                elif errors:
+                    job.status = ResumeExportStatus.COMPLETED_WITH_ERRORS.value
+                else:
+                    job.status = ResumeExportStatus.COMPLETED.value
+            except Exception as e:
+                job.status = ResumeExportStatus.FAILED.value
+                job.error_message = str(e)[:500]
+                raise
+            finally:
+                job.finished_at = get_utc_now()
+                await db.commit()
+                if owns_renderer:
+                    await renderer.close()
+
+            logger.info(
+                "Resume export finished",
+                job_id=job_id,
+                status=job.status,
+                completed=job.completed_count,
+                failed=job.failed_count,
+                component="resume_export",
+            )
+            return job
+
+    async def check_outputs(
+        self, job: ResumeExportJob
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """Split the job's results into PDFs still stored and errors for the rest.
+
+        Call before streaming, so a purged or missing PDF is reported in the
+        errors file instead of breaking the archive halfway through.
+        """
+        results = list(job.results or [])
+        stored = await asyncio.gather(
+            *(
+                asyncio.to_thread(self.storage.file_exists, result["file_path"])
+                for result in results
+            )
+        )
+        errors = list(job.errors or [])
+        available = []
+        for result, exists in zip(results, stored, strict=True):
+            if exists:
+                available.append(result)
+            else:
+                errors.append(
+                    {"resume_id": result["resume_id"], "error": "Exported PDF expired"}
+                )
+        return available, errors
+
+    def iter_zip(
+        self,
+        job: ResumeExportJob,
+        results: list[dict[str, Any]] | None = None,
+        errors: list[dict[str, Any]] | None = None,
+    ) -> Iterator[bytes]:
+        """Yield a zip of the job's PDFs, streaming each one from storage.
+
+        ``results``/``errors`` default to the job's; pass those returned by
+        ``check_outputs`` to leave out PDFs that are gone.
+        """
+        if results is None:
+            results = job.results or []
+        if errors is None:
+            errors = job.errors or []
+        buffer = _ZipChunkBuffer()
+        used_names: set[str] = set()
+        # PDFs are already compressed; storing them keeps the stream cheap
+        with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as zf:
+            for result in sorted(results, key=lambda r: r["resume_id"]):
+                name = result["filename"]
+                if name in used_names:
+                    name = f"{result['resume_id']}_{name}"
+                used_names.add(name)
+
+                with zf.open(name, mode="w") as member:
+                    for chunk in self.storage.iter_file(result["file_path"]):
+                        member.write(chunk)
+                        if data := buffer.take():
+                            yield data
+
+            if errors:
+                zf.writestr(
+                    ERRORS_FILENAME,
+                    "\n".join(
+                        f"Resume {error['resume_id']}: {error['error']}"
+                        for error in errors
+                    )
+                    + "\n",
+                )
+        if data := buffer.take():
+            yield data
+
+    async def purge_expired_outputs(self, older_than_days: int | None = None) -> int:
+        """Delete exported PDFs kept longer than the retention period."""
+        older_than_days = older_than_days or settings.resume_export_retention_days
+        cutoff = get_utc_now() - timedelta(days=older_than_days)
+        objects = await asyncio.to_thread(self.storage.list_files, f"{EXPORT_FOLDER}/")
+        purged = 0
+        for obj in objects:
+            if obj["last_modified"] < cutoff and await asyncio.to_thread(
+                self.storage.delete_file, obj["s3_key"]
+            ):
+                purged += 1
+        logger.info(
+            "Purged exported PDFs",
+            purged=purged,
+            scanned=len(objects),
+            component="resume_export",
+        )
+        return purged
+
+
+resume_export_service = ResumeExportService()
@@ -4,7 +4,7 @@ import secrets
 import string
 from datetime import timedelta
 
-from sqlalchemy import and_, select
+from sqlalchemy import and_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.resume import resume as resume_crud
@@ -26,6 +26,7 @@ from app.schemas.resume import (
     SkillCreate,
     WorkExperienceCreate,
 )
+from app.services.pdf_cache_service import pdf_cache_service
 from app.utils.constants import ResumeStatus, ResumeVisibility
 from app.utils.datetime_utils import get_utc_now
 
@@ -166,8 +167,10 @@ class ResumeService:
                 )
                 resume.slug = new_slug  # type: ignore
 
+            resume.pdf_file_path = None
             await db.commit()
             await db.refresh(resume)
+            await self._invalidate_pdf_cache(resume_id)
 
             logger.info(f"Updated resume {resume_id}")
             return resume
@@ -188,6 +191,7 @@ class ResumeService:
 
             await db.delete(resume)
             await db.commit()
+            await self._invalidate_pdf_cache(resume_id)
 
             logger.info(f"Deleted resume {resume_id}")
             return True
@@ -310,8 +314,10 @@ class ResumeService:
             )
 
             db.add(experience)
+            resume.pdf_file_path = None
             await db.commit()
             await db.refresh(experience)
+            await self._invalidate_pdf_cache(resume_id)
 
             return experience
 
@@ -345,8 +351,14 @@ class ResumeService:
                 if hasattr(experience, field):
                     setattr(experience, field, value)
 
+            await db.execute(
+                update(Resume)
+                .where(Resume.id == experience.resume_id)
+                .values(pdf_file_path=None)
+            )
             await db.commit()
             await db.refresh(experience)
+            await self._invalidate_pdf_cache(experience.resume_id)
 
             return experience
 
@@ -382,8 +394,10 @@ class ResumeService:
             )
 
             db.add(education)
+            resume.pdf_file_path = None
             await db.commit()
             await db.refresh(education)
+            await self._invalidate_pdf_cache(resume_id)
 
             return education
 
@@ -411,8 +425,10 @@ class ResumeService:
             )
 
             db.add(skill)
+            resume.pdf_file_path = None
             await db.commit()
             await db.refresh(skill)
+            await self._invalidate_pdf_cache(resume_id)
 
             return skill
 
@@ -521,8 +537,10 @@ class ResumeService:
             resume.template_id = template_id
             template.usage_count += 1  # type: ignore
 
+            resume.pdf_file_path = None
             await db.commit()
             await db.refresh(resume)
+            await self._invalidate_pdf_cache(resume_id)
 
             return resume
 
@@ -532,6 +550,16 @@ class ResumeService:
             raise
 
     # Utility methods
+    async def _invalidate_pdf_cache(self, resume_id: int) -> None:
+        """Drop cached PDFs once a change to the resume has been committed."""
+        try:
+            await pdf_cache_service.invalidate(resume_id)
+        except Exception as e:
+            # Cache keys already reflect the new content; this only frees storage
+            logger.warning(
+                f"Failed to invalidate PDF cache for resume {resume_id}: {str(e)}"
+            )
+
     async def _generate_unique_slug(
         self,
         db: AsyncSession,
@@ -0,0 +1,159 @@
+"""Pooled SMTP transport that keeps authenticated connections open.
+
+Connections are opened (and STARTTLS/AUTH performed) once and reused for
+later messages instead of reconnecting and logging in per message. smtplib
+is blocking, so every network call runs in a worker thread and the event
+loop is never blocked; the pool size bounds both open connections and
+messages in flight.
+
+A rejected message (``SMTPResponseException``/``SMTPRecipientsRefused``)
+leaves the session usable because smtplib sends ``RSET``; a dropped
+connection is discarded. Connections idle longer than ``idle_timeout`` are
+closed rather than reused, since servers drop idle sessions after a while.
+
+Pool state is bound to the running event loop and rebuilt when a different
+loop uses the transport, as happens across ``asyncio.run`` calls in Celery
+tasks.
+"""
+
+import asyncio
+import contextlib
+import smtplib
+import ssl
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from email.message import EmailMessage
+
+
+class _Connection:
+    def __init__(self, smtp: smtplib.SMTP):
+        self.smtp = smtp
+        self.last_used = time.monotonic()
+
+    def is_stale(self, idle_timeout: float) -> bool:
+        return (
+            self.smtp.sock is None or time.monotonic() - self.last_used > idle_timeout
+        )
+
+    async def close(self) -> None:
+        with contextlib.suppress(Exception):
+            await asyncio.to_thread(self.smtp.quit)
+        with contextlib.suppress(Exception):
+            self.smtp.close()
+
+
+class SMTPConnectionPool:
+    """Reusable, authenticated SMTP connections."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        *,
+        username: str | None = None,
+        password: str | None = None,
+        use_tls: bool = False,
+        use_ssl: bool = False,
+        pool_size: int = 4,
+        timeout: float = 30.0,
+        idle_timeout: float = 60.0,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.use_ssl = use_ssl
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.connections_opened = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._idle: deque[_Connection] = deque()
+        self._slots: asyncio.Semaphore | None = None
+
+    def _bind_loop(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._slots is None:
+            self._loop = loop
+            self._idle.clear()
+            self._slots = asyncio.Semaphore(self.pool_size)
+        return self._slots
+
+    def _open(self) -> smtplib.SMTP:
+        """Connect, upgrade to TLS and log in (blocking)."""
+        smtp: smtplib.SMTP
+        if self.use_ssl:
+            smtp = smtplib.SMTP_SSL(
+                self.host,
+                self.port,
+                timeout=self.timeout,
+                context=ssl.create_default_context(),
+            )
+        else:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls and not self.use_ssl:
+                smtp.starttls(context=ssl.create_default_context())
+            if self.username and self.password:
+                smtp.login(self.username, self.password)
+        except BaseException:
+            smtp.close()
+            raise
+        return smtp
+
+    async def _checkout(self) -> tuple[_Connection, bool]:
+        """Return an open connection and whether it was reused."""
+        while self._idle:
+            connection = self._idle.pop()
+            if not connection.is_stale(self.idle_timeout):
+                return connection, True
+            await connection.close()
+        smtp = await asyncio.to_thread(self._open)
+        self.connections_opened += 1
+        return _Connection(smtp), False
+
+    @contextlib.asynccontextmanager
+    async def _connection(self) -> AsyncIterator[tuple[_Connection, bool]]:
+        async with self._bind_loop():
+            connection, reused = await self._checkout()
+            try:
+                yield connection, reused
+            except smtplib.SMTPServerDisconnected:
+                await connection.close()
+                raise
+            except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+                # The server refused this message; the session is still good
+                connection.last_used = time.monotonic()
+                self._idle.append(connection)
+                raise
+            except BaseException:
+                await connection.close()
+                raise
+            else:
+                connection.last_used = time.monotonic()
+                self._idle.append(connection)
+
+    async def send(self, message: EmailMessage) -> None:
+        """Send one message, reconnecting once if a reused session dropped."""
+        reused = False
+        try:
+            async with self._connection() as (connection, reused):
+                await asyncio.to_thread(connection.smtp.send_message, message)
+                return
+        except smtplib.SMTPServerDisconnected:
+            if not reused:
+                raise
+        # The server dropped idle sessions (e.g. restarted); start afresh
+        while self._idle:
+            await self._idle.pop().close()
+        async with self._connection() as (connection, _):
+            await asyncio.to_thread(connection.smtp.send_message, message)
+
+    async def close(self) -> None:
+        """Close idle connections owned by the running loop."""
+        if self._loop is asyncio.get_running_loop():
+            while self._idle:
+                await self._idle.pop().close()
+        self._idle.clear()
@@ -1,6 +1,7 @@
 import hashlib
 import logging
 import uuid
+from collections.abc import Iterator
 from datetime import timedelta
 from typing import Any
 
@@ -9,6 +10,7 @@ from minio import Minio
 from minio.error import S3Error
 
 from app.config import settings
+from app.services.upload_stream import FileTooLargeError, stream_upload_to_minio
 from app.utils.datetime_utils import get_utc_now
 
 logger = logging.getLogger(__name__)
@@ -108,24 +110,38 @@ class StorageService:
             ) from e
 
     async def upload_file(
-        self, file: UploadFile, user_id: int, folder: str = "attachments"
+        self,
+        file: UploadFile,
+        user_id: int,
+        folder: str = "attachments",
+        max_size: int | None = None,
     ) -> tuple[str, str, int]:
         """
-        Upload file to S3 and return (s3_key, sha256_hash, file_size).
+        Stream file to S3 and return (s3_key, sha256_hash, file_size).
+
+        The upload is sent as a multipart upload in fixed-size parts, hashed
+        and size-checked as it is read, so it is never held in memory whole.
         """
         try:
-            # Read file data
-            file_data = await file.read()
             assert file.filename is not None
             assert file.content_type is not None
-            return await self.upload_file_data(
-                file_data,
-                file.filename,
+            s3_key = self.generate_s3_key(user_id, file.filename, folder)
+            result = await stream_upload_to_minio(
+                self.client,
+                self.bucket,
+                s3_key,
+                file,
                 file.content_type,
-                user_id,
-                folder,
+                max_size=max_size or settings.max_file_size,
             )
 
+            logger.info(f"Uploaded file to S3: {s3_key}")
+            return s3_key, result.sha256, result.size
+
+        except FileTooLargeError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+            ) from e
         except Exception as e:
             logger.error(f"File upload error: {e}")
             raise HTTPException(
@@ -200,9 +216,70 @@ class StorageService:
                 "etag": stat.etag,
             }
         except S3Error as e:
-            logger.error(f"Failed to get file info: {e}")
+            if e.code != "NoSuchKey":
+                logger.error(f"Failed to get file info: {e}")
             return None
 
+    def put_file_data(self, s3_key: str, file_data: bytes, content_type: str) -> int:
+        """Store data under an exact S3 key and return its size."""
+        from io import BytesIO
+
+        self.client.put_object(
+            bucket_name=self.bucket,
+            object_name=s3_key,
+            data=BytesIO(file_data),
+            length=len(file_data),
+            content_type=content_type,
+        )
+        logger.info(f"Uploaded file to S3: {s3_key}")
+        return len(file_data)
+
+    def copy_file(self, source_key: str, dest_key: str) -> None:
+        """Copy an object to another key server-side, without downloading it."""
+        from minio.commonconfig import CopySource
+
+        self.client.copy_object(
+            self.bucket, dest_key, CopySource(self.bucket, source_key)
+        )
+        logger.info(f"Copied file in S3: {source_key} -> {dest_key}")
+
+    def iter_file(
+        self,
+        s3_key: str,
+        chunk_size: int = 64 * 1024,
+        offset: int = 0,
+        length: int = 0,
+    ) -> Iterator[bytes]:
+        """Stream an object's content in chunks without buffering it whole.
+
+        ``offset``/``length`` select a byte range (``length=0`` reads to the end).
+        """
+        response = self.client.get_object(
+            self.bucket, s3_key, offset=offset, length=length
+        )
+        try:
+            yield from response.stream(chunk_size)
+        finally:
+            response.close()
+            response.release_conn()
+
+    def list_files(self, prefix: str) -> list[dict[str, Any]]:
+        """List objects under a key prefix."""
+        try:
+            return [
+                {
+                    "s3_key": obj.object_name,
+                    "size": obj.size,
+                    "last_modified": obj.last_modified,
+                }
+                for obj in self.client.list_objects(
+                    self.bucket, prefix=prefix, recursive=True
+                )
+            ]
+        except S3Error as e:
+            logger.error(f"Failed to list files: {e}")
+            return []
+
     def file_exists(self, s3_key: str) -> bool:
         """Check if file exists in S3."""
         try:
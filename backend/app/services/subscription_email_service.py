@@ -7,6 +7,10 @@ import logging
 
 from app.config import settings
 from app.models.plan_change_request import PlanChangeRequest
+from app.services.email_digest_service import (
+    EmailDigestService,
+    email_digest_service,
+)
 from app.services.email_service import EmailService
 from app.services.email_template_service import EmailTemplateService
 
@@ -14,9 +18,11 @@ logger = logging.getLogger(__name__)
 
 
 class SubscriptionEmailService:
-    def __init__(self):
+    def __init__(self, email_digest: EmailDigestService | None = None):
         self.email_service = EmailService()
         self.template_service = EmailTemplateService()
+        # Admins get one email per window, later requests come as a digest
+        self.email_digest = email_digest or email_digest_service
 
     async def send_plan_change_request_notification(
         self,
@@ -60,13 +66,24 @@ class SubscriptionEmailService:
                 header_title="Plan Change Request",
             )
 
-            # Send email
-            success = await self.email_service.send_email(
-                to_emails=admin_emails,
-                subject="New Plan Change Request - Action Required",
-                html_body=html_content,
-                text_body=text_content,
-            )
+            subject = "New Plan Change Request - Action Required"
+            success = True
+            for admin_email in admin_emails:
+                success &= await self.email_digest.submit(
+                    f"plan_change_request:{admin_email}",
+                    admin_email,
+                    "System Admin",
+                    title=subject,
+                    summary=f"{context['company_name']}: "
+                    f"{context['current_plan_name']} → {context['requested_plan_name']}",
+                    url=context["review_url"],
+                    send=lambda admin_email=admin_email: self.email_service.send_email(
+                        to_emails=[admin_email],
+                        subject=subject,
+                        html_body=html_content,
+                        text_body=text_content,
+                    ),
+                )
 
             if success:
                 logger.info(
@@ -6,9 +6,9 @@ from app.crud.company_subscription import company_subscription as subscription_c
 from app.crud.plan_change_request import (
     plan_change_request as plan_change_request_crud,
 )
-from app.crud.plan_feature import plan_feature as plan_feature_crud
 from app.crud.subscription_plan import subscription_plan as plan_crud
 from app.models.user import User
+from app.services.entitlement_service import Entitlements, entitlement_resolver
 from app.services.subscription_email_service import subscription_email_service
 from app.utils.constants import PlanChangeRequestStatus, PlanChangeRequestType, UserRole
 
@@ -16,6 +16,12 @@ from app.utils.constants import PlanChangeRequestStatus, PlanChangeRequestType,
 class SubscriptionService:
     """Business logic for subscription management."""
 
+    async def get_entitlements(
+        self, db: AsyncSession, *, company_id: int
+    ) -> Entitlements:
+        """Cached feature and permission sets of the company's active plan."""
+        return await entitlement_resolver.resolve(db, company_id)
+
     async def check_feature_access(
         self, db: AsyncSession, *, company_id: int, feature_name: str
     ) -> tuple[bool, str | None]:
@@ -25,20 +31,12 @@ class SubscriptionService:
         Returns:
             (has_access, error_message)
         """
-        # Get company subscription
-        subscription = await subscription_crud.get_active_by_company_id(
-            db, company_id=company_id
-        )
+        entitlements = await self.get_entitlements(db, company_id=company_id)
 
-        if not subscription:
+        if not entitlements.has_subscription:
             return False, "No active subscription found"
 
-        # Check if plan has this feature
-        has_feature = await plan_feature_crud.plan_has_feature_by_name(
-            db, plan_id=subscription.plan_id, feature_name=feature_name
-        )
-
-        if not has_feature:
+        if not entitlements.has_feature(feature_name):
             return False, f"Feature '{feature_name}' not available in your plan"
 
         return True, None
@@ -56,20 +54,12 @@ class SubscriptionService:
         Returns:
             (has_permission, error_message)
         """
-        # Get company subscription
-        subscription = await subscription_crud.get_active_by_company_id(
-            db, company_id=company_id
-        )
+        entitlements = await self.get_entitlements(db, company_id=company_id)
 
-        if not subscription:
+        if not entitlements.has_subscription:
             return False, "No active subscription found"
 
-        # Check if plan has feature with this permission key
-        has_permission = await plan_feature_crud.plan_has_feature_by_permission_key(
-            db, plan_id=subscription.plan_id, permission_key=permission_key
-        )
-
-        if not has_permission:
+        if not entitlements.has_permission(permission_key):
             return (
                 False,
                 f"Permission '{permission_key}' not available in your plan",
@@ -206,6 +196,7 @@ class SubscriptionService:
                     db_obj=subscription,
                     obj_in={"plan_id": request.requested_plan_id},
                 )
+                await entitlement_resolver.invalidate_company(request.company_id)
 
             # Send approval email to requester
             try:
@@ -1,4 +1,5 @@
 import logging
+from functools import lru_cache
 from typing import Any
 
 from jinja2 import BaseLoader, Environment, Template
@@ -8,13 +9,41 @@ from app.models.resume import Resume
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=512)
+def _apply_theme(template_css: str, theme_color: str, font_family: str) -> str:
+    """Substitute theme variables into a template stylesheet (memoized)."""
+    css = template_css.replace("{{theme_color}}", theme_color)
+    return css.replace("{{font_family}}", font_family)
+
+
 class TemplateService:
-    """Service for managing resume templates and rendering."""
+    """Service for managing resume templates and rendering.
+
+    The Jinja environment and its compiled templates are shared by every
+    instance, so each template source is parsed and compiled once per process
+    rather than on every render.
+    """
+
+    jinja_env = Environment(loader=BaseLoader())
+    _compiled_templates: dict[str, tuple[str, Template]] = {}
 
     def __init__(self):
-        self.jinja_env = Environment(loader=BaseLoader())
         self.default_templates = self._load_default_templates()
 
+    def get_compiled_template(self, name: str, source: str) -> Template:
+        """Return the compiled template registered as ``name``.
+
+        The template is compiled on first use and recompiled only when
+        ``source`` differs from the registered source.
+        """
+        entry = self._compiled_templates.get(name)
+        if entry is not None and (entry[0] is source or entry[0] == source):
+            return entry[1]
+
+        template = self.jinja_env.from_string(source)
+        self._compiled_templates[name] = (source, template)
+        return template
+
     def _load_default_templates(self) -> dict[str, dict[str, Any]]:
         """Load default resume templates."""
         return {
@@ -145,7 +174,9 @@ class TemplateService:
             resume_data = self._prepare_resume_data(resume)
 
             # Render HTML
-            template = Template(template_config["html_template"])
+            template = self.get_compiled_template(
+                f"resume/{template_config['name']}", template_config["html_template"]
+            )
             html_content = template.render(
                 resume=resume_data,
                 template_config=template_config,
@@ -328,9 +359,8 @@ class TemplateService:
         font_family: str,
     ) -> str:
         """Combine and customize CSS styles."""
-        # Replace template variables
-        css = template_css.replace("{{theme_color}}", theme_color)
-        css = css.replace("{{font_family}}", font_family)
+        # Replace template variables (cached per template, color and font)
+        css = _apply_theme(template_css, theme_color, font_family)
 
         # Add resume-specific CSS
         if resume_css:
@@ -5,6 +5,10 @@ import logging
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.todo_extension_request import TodoExtensionRequest
+from app.services.email_digest_service import (
+    EmailDigestService,
+    email_digest_service,
+)
 from app.services.email_service import email_service
 from app.services.notification_service import NotificationService
 from app.utils.constants import ExtensionRequestStatus, NotificationType
@@ -15,8 +19,9 @@ logger = logging.getLogger(__name__)
 class TodoExtensionNotificationService:
     """Service for handling todo extension request notifications and emails."""
 
-    def __init__(self):
+    def __init__(self, email_digest: EmailDigestService | None = None):
         self.notification_service = NotificationService()
+        self.email_digest = email_digest or email_digest_service
 
     async def notify_extension_request_created(
         self, db: AsyncSession, extension_request: TodoExtensionRequest
@@ -165,10 +170,19 @@ class TodoExtensionNotificationService:
             </p>
             """
 
-            await email_service.send_email(
-                to_emails=[extension_request.creator.email],
-                subject=subject,
-                html_body=email_content,
+            creator = extension_request.creator
+            await self.email_digest.submit(
+                f"todo_extension_request:{creator.id}",
+                creator.email,
+                f"{creator.first_name} {creator.last_name}",
+                title=subject,
+                summary=f"{requester_name} requested a due date of "
+                f"{extension_request.requested_due_date.strftime('%Y-%m-%d')}",
+                send=lambda: email_service.send_email(
+                    to_emails=[creator.email],
+                    subject=subject,
+                    html_body=email_content,
+                ),
             )
 
         except Exception as e:
@@ -244,10 +258,19 @@ class TodoExtensionNotificationService:
             </p>
             """
 
-            await email_service.send_email(
-                to_emails=[extension_request.requested_by.email],
-                subject=subject,
-                html_body=email_content,
+            requester = extension_request.requested_by
+            await self.email_digest.submit(
+                f"todo_extension_response:{requester.id}",
+                requester.email,
+                f"{requester.first_name} {requester.last_name}",
+                title=subject,
+                summary=f"Your extension request was {status_text.lower()} "
+                f"by {creator_name}",
+                send=lambda: email_service.send_email(
+                    to_emails=[requester.email],
+                    subject=subject,
+                    html_body=email_content,
+                ),
             )
 
         except Exception as e:
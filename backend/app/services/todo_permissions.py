@@ -3,10 +3,10 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.role import Role, UserRole
 from app.models.todo import Todo
 from app.models.todo_extension_request import TodoExtensionRequest
 from app.models.user import User
+from app.services.principal_cache import principal_cache
 from app.utils.constants import TodoStatus
 from app.utils.constants import UserRole as UserRoleEnum
 
@@ -17,13 +17,7 @@ class TodoPermissionService:
     @staticmethod
     async def get_user_roles(db: AsyncSession, user_id: int) -> list[str]:
         """Get all roles for a user."""
-        query = (
-            select(Role.name)
-            .join(UserRole, Role.id == UserRole.role_id)
-            .where(UserRole.user_id == user_id)
-        )
-        result = await db.execute(query)
-        return list(result.scalars().all())
+        return list(await principal_cache.get_roles(db, user_id))
 
     @staticmethod
     async def is_employer(db: AsyncSession, user_id: int) -> bool:
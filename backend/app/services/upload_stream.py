@@ -0,0 +1,144 @@
+"""Chunked upload pipeline shared by the storage backends.
+
+Uploads are read from the ``UploadFile`` in fixed-size chunks and written
+straight to their destination (a local file or a MinIO multipart upload)
+while SHA-256 and size are computed incrementally. The size limit is
+enforced as bytes arrive, so an oversized upload is rejected after at most
+``max_size + chunk_size`` bytes and never held in memory as a whole.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any
+
+from fastapi import UploadFile
+
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+# MinIO/S3 multipart parts must be at least 5 MiB
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+
+
+class FileTooLargeError(ValueError):
+    """Raised once an upload exceeds its size limit."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        super().__init__(f"File too large. Maximum size is {max_size} bytes")
+
+
+@dataclass
+class UploadResult:
+    sha256: str
+    size: int
+
+
+class _HashingReader:
+    """File-like reader that hashes, counts and size-limits what it reads."""
+
+    def __init__(self, source: IO[bytes], max_size: int | None):
+        self._source = source
+        self._max_size = max_size
+        self._digest = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._source.read(size)
+        self.size += len(chunk)
+        if self._max_size is not None and self.size > self._max_size:
+            raise FileTooLargeError(self._max_size)
+        self._digest.update(chunk)
+        return chunk
+
+    @property
+    def result(self) -> UploadResult:
+        return UploadResult(sha256=self._digest.hexdigest(), size=self.size)
+
+
+async def hash_upload(
+    file: UploadFile,
+    max_size: int | None = None,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> UploadResult:
+    """Hash and size-check an upload without storing it, then rewind it.
+
+    Used to look content up by digest before deciding whether to store it;
+    Starlette spools large uploads to disk, so this pass reads from there.
+    """
+    await file.seek(0)
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := await file.read(chunk_size):
+        size += len(chunk)
+        if max_size is not None and size > max_size:
+            raise FileTooLargeError(max_size)
+        digest.update(chunk)
+    await file.seek(0)
+    return UploadResult(sha256=digest.hexdigest(), size=size)
+
+
+async def stream_upload_to_path(
+    file: UploadFile,
+    destination: str | Path,
+    max_size: int | None = None,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> UploadResult:
+    """Copy an upload to ``destination`` chunk by chunk.
+
+    A partially written file is removed if the upload is rejected or fails.
+    """
+    destination = Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    await file.seek(0)
+    digest = hashlib.sha256()
+    size = 0
+
+    try:
+        with open(destination, "wb") as out:
+            while chunk := await file.read(chunk_size):
+                size += len(chunk)
+                if max_size is not None and size > max_size:
+                    raise FileTooLargeError(max_size)
+                digest.update(chunk)
+                await asyncio.to_thread(out.write, chunk)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(destination)
+        raise
+
+    return UploadResult(sha256=digest.hexdigest(), size=size)
+
+
+async def stream_upload_to_minio(
+    client: Any,
+    bucket: str,
+    object_name: str,
+    file: UploadFile,
+    content_type: str,
+    max_size: int | None = None,
+    part_size: int = MULTIPART_PART_SIZE,
+) -> UploadResult:
+    """Upload to MinIO as a multipart upload fed directly from the upload.
+
+    MinIO aborts the multipart upload if reading fails part-way, including
+    when the size limit is exceeded.
+    """
+    await file.seek(0)
+    reader = _HashingReader(file.file, max_size)
+    await asyncio.to_thread(
+        client.put_object,
+        bucket_name=bucket,
+        object_name=object_name,
+        data=reader,
+        length=-1,
+        part_size=part_size,
+        content_type=content_type,
+    )
+    return reader.result
@@ -5,12 +5,45 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import settings
 from app.models.user import User
 from app.models.video_call import VideoCall
+from app.services.email_digest_service import (
+    EmailDigestService,
+    email_digest_service,
+)
 from app.services.email_service import email_service
 
 
 class VideoNotificationService:
     """Service for handling video call email notifications."""
 
+    def __init__(self, email_digest: EmailDigestService | None = None):
+        # Repeated reschedules and issue reports for a call are coalesced
+        self.email_digest = email_digest or email_digest_service
+
+    async def _send_coalesced_email(
+        self,
+        key: str,
+        user: User,
+        subject: str,
+        summary: str,
+        template_name: str,
+        template_data: dict,
+        url: str,
+    ) -> None:
+        await self.email_digest.submit(
+            key,
+            user.email,
+            user.full_name or user.email,
+            title=subject,
+            summary=summary,
+            url=url,
+            send=lambda: email_service.send_template_email(
+                to_email=user.email,
+                subject=subject,
+                template_name=template_name,
+                template_data=template_data,
+            ),
+        )
+
     async def send_interview_scheduled_notification(
         self,
         db: AsyncSession,
@@ -131,11 +164,14 @@ class VideoNotificationService:
             "scheduled_time": video_call.scheduled_at.strftime("%Y年%m月%d日 %H:%M"),
         }
 
-        await email_service.send_template_email(
-            to_email=user.email,
-            subject=subject,
-            template_name="video_call_technical_issue",
-            template_data=template_data,
+        await self._send_coalesced_email(
+            f"video_technical_issue:{video_call.id}:{user.id}",
+            user,
+            subject,
+            issue_description,
+            "video_call_technical_issue",
+            template_data,
+            join_url,
         )
 
     # Private helper methods
@@ -327,11 +363,14 @@ class VideoNotificationService:
             "join_url": join_url,
         }
 
-        await email_service.send_template_email(
-            to_email=candidate.email,
-            subject=subject,
-            template_name="candidate_video_interview_rescheduled",
-            template_data=template_data,
+        await self._send_coalesced_email(
+            f"video_rescheduled:{video_call.id}:{candidate.id}",
+            candidate,
+            subject,
+            f"{template_data['old_time']} → {template_data['new_time']}",
+            "candidate_video_interview_rescheduled",
+            template_data,
+            join_url,
         )
 
     async def _send_interviewer_rescheduled_email(
@@ -356,11 +395,14 @@ class VideoNotificationService:
             "join_url": join_url,
         }
 
-        await email_service.send_template_email(
-            to_email=interviewer.email,
-            subject=subject,
-            template_name="interviewer_video_interview_rescheduled",
-            template_data=template_data,
+        await self._send_coalesced_email(
+            f"video_rescheduled:{video_call.id}:{interviewer.id}",
+            interviewer,
+            subject,
+            f"{template_data['old_time']} → {template_data['new_time']}",
+            "interviewer_video_interview_rescheduled",
+            template_data,
+            join_url,
         )
 
 
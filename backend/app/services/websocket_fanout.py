@@ -0,0 +1,211 @@
+"""Non-blocking WebSocket fan-out with per-connection send queues.
+
+Each connection gets a bounded outbound queue drained by its own writer task,
+so a slow client only delays itself. Frames are serialized once by the caller
+and enqueued for every recipient without awaiting the network. When a queue
+is full the connection's ``BackpressurePolicy`` decides what happens:
+
+* ``DROP_OLDEST`` - discard the oldest queued frame to make room.
+* ``DISCONNECT`` - close the slow consumer so it can reconnect and resync.
+
+``FanoutMetrics`` aggregates per-room delivery latency (enqueue to send),
+queue depth and drop/disconnect counters.
+"""
+
+import asyncio
+import contextlib
+import time
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable
+from enum import Enum
+from typing import Any
+
+from fastapi import WebSocket
+
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_QUEUE_SIZE = 256
+LATENCY_SAMPLE_SIZE = 500
+SLOW_CONSUMER_CLOSE_CODE = 1013  # Try again later
+
+
+class BackpressurePolicy(str, Enum):
+    DROP_OLDEST = "drop_oldest"
+    DISCONNECT = "disconnect"
+
+
+class _RoomStats:
+    def __init__(self):
+        self.latencies: deque[float] = deque(maxlen=LATENCY_SAMPLE_SIZE)
+        self.sent = 0
+        self.dropped = 0
+        self.disconnected = 0
+
+
+class FanoutMetrics:
+    """Per-room delivery metrics for queued WebSocket senders."""
+
+    def __init__(self):
+        self._rooms: dict[str, _RoomStats] = defaultdict(_RoomStats)
+        self._senders: dict[str, set[QueuedWebSocketSender]] = defaultdict(set)
+
+    def register(self, sender: "QueuedWebSocketSender") -> None:
+        self._senders[sender.room_id].add(sender)
+
+    def unregister(self, sender: "QueuedWebSocketSender") -> None:
+        senders = self._senders.get(sender.room_id)
+        if senders is not None:
+            senders.discard(sender)
+            if not senders:
+                del self._senders[sender.room_id]
+                self._rooms.pop(sender.room_id, None)
+
+    def record_sent(self, room_id: str, latency: float) -> None:
+        stats = self._rooms[room_id]
+        stats.sent += 1
+        stats.latencies.append(latency)
+
+    def record_dropped(self, room_id: str) -> None:
+        self._rooms[room_id].dropped += 1
+
+    def record_disconnected(self, room_id: str) -> None:
+        self._rooms[room_id].disconnected += 1
+
+    def room_snapshot(self, room_id: str) -> dict[str, Any]:
+        """Return latency (ms) and queue-depth figures for one room."""
+        stats = self._rooms.get(room_id) or _RoomStats()
+        depths = [sender.queue_depth for sender in self._senders.get(room_id, ())]
+        latencies = sorted(stats.latencies)
+
+        def percentile(fraction: float) -> float | None:
+            if not latencies:
+                return None
+            index = min(int(len(latencies) * fraction), len(latencies) - 1)
+            return round(latencies[index] * 1000, 3)
+
+        return {
+            "room_id": room_id,
+            "connections": len(depths),
+            "queue_depth_total": sum(depths),
+            "queue_depth_max": max(depths, default=0),
+            "latency_ms_p50": percentile(0.5),
+            "latency_ms_p95": percentile(0.95),
+            "latency_ms_max": percentile(1.0),
+            "frames_sent": stats.sent,
+            "frames_dropped": stats.dropped,
+            "slow_consumers_disconnected": stats.disconnected,
+        }
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """Return metrics for every room with connections on this worker."""
+        return [self.room_snapshot(room_id) for room_id in sorted(self._senders)]
+
+
+class QueuedWebSocketSender:
+    """Bounded outbound queue plus writer task for a single WebSocket."""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        room_id: str,
+        user_id: int,
+        *,
+        metrics: FanoutMetrics,
+        max_queue_size: int = DEFAULT_QUEUE_SIZE,
+        policy: BackpressurePolicy = BackpressurePolicy.DROP_OLDEST,
+        on_slow_consumer: Callable[["QueuedWebSocketSender"], Awaitable[None]]
+        | None = None,
+    ):
+        self.websocket = websocket
+        self.room_id = room_id
+        self.user_id = user_id
+        self.policy = policy
+        self._metrics = metrics
+        self._on_slow_consumer = on_slow_consumer
+        self._queue: asyncio.Queue[tuple[str, float]] = asyncio.Queue(
+            maxsize=max_queue_size
+        )
+        self._closed = False
+        self._closing: asyncio.Task | None = None
+        self._writer = asyncio.create_task(self._write_loop())
+        metrics.register(self)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def send(self, frame: str) -> bool:
+        """Queue a pre-serialized frame without waiting for the network.
+
+        Returns ``False`` when the frame was not queued (sender closed or
+        disconnected as a slow consumer).
+        """
+        if self._closed:
+            return False
+
+        if self._queue.full():
+            if self.policy == BackpressurePolicy.DISCONNECT:
+                self._metrics.record_disconnected(self.room_id)
+                logger.warning(
+                    "Disconnecting slow WebSocket consumer",
+                    room_id=self.room_id,
+                    user_id=self.user_id,
+                    component="websocket_fanout",
+                )
+                self._closed = True
+                self._closing = asyncio.create_task(self._disconnect_slow_consumer())
+                return False
+
+            self._queue.get_nowait()
+            self._queue.task_done()
+            self._metrics.record_dropped(self.room_id)
+
+        self._queue.put_nowait((frame, time.perf_counter()))
+        return True
+
+    async def drain(self) -> None:
+        """Wait until every queued frame has been written."""
+        await self._queue.join()
+
+    async def close(self) -> None:
+        """Stop the writer task; queued frames are discarded."""
+        self._closed = True
+        self._metrics.unregister(self)
+        if not self._writer.done():
+            self._writer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._writer
+
+    async def _write_loop(self) -> None:
+        while True:
+            frame, enqueued_at = await self._queue.get()
+            try:
+                await self.websocket.send_text(frame)
+                self._metrics.record_sent(
+                    self.room_id, time.perf_counter() - enqueued_at
+                )
+            except Exception as e:
+                logger.error(
+                    "Failed to send WebSocket frame",
+                    room_id=self.room_id,
+                    user_id=self.user_id,
+                    error=str(e),
+                    component="websocket_fanout",
+                )
+            finally:
+                self._queue.task_done()
+
+    async def _disconnect_slow_consumer(self) -> None:
+        with contextlib.suppress(Exception):
+            await self.websocket.close(
+                code=SLOW_CONSUMER_CLOSE_CODE, reason="Slow consumer"
+            )
+        if self._on_slow_consumer is not None:
+            await self._on_slow_consumer(self)
+        await self.close()
@@ -0,0 +1,144 @@
+"""Building blocks for set-based candidate assignment.
+
+``WorkflowEngineService.bulk_assign_candidates`` imports whole hiring events
+at once: existing assignments are found with one ``IN`` query, new ones are
+written with multi-row INSERTs, and when processes start right away the
+first node's executions, interviews and todos are inserted per chunk rather
+than per candidate. Each chunk is its own transaction, and every candidate
+gets an ``AssignmentOutcome`` in the returned report.
+
+The row builders here are shared with the one-at-a-time engine path so both
+produce identical interviews and todos.
+"""
+
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import and_, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.candidate_workflow import CandidateWorkflow
+from app.models.interview import Interview
+from app.models.todo import Todo
+from app.schemas.workflow.enums import InterviewNodeType, TodoNodeType
+from app.services.workflow.workflow_graph import CompiledNode
+from app.utils.constants import TodoType, VisibilityStatus
+from app.utils.datetime_utils import get_utc_now
+
+ASSIGNED = "assigned"
+STARTED = "started"
+ALREADY_ASSIGNED = "already_assigned"
+FAILED = "failed"
+
+
+@dataclass
+class AssignmentOutcome:
+    candidate_id: int
+    status: str
+    candidate_workflow_id: int | None = None
+    error: str | None = None
+
+
+@dataclass
+class BulkAssignmentReport:
+    workflow_id: int
+    outcomes: list[AssignmentOutcome] = field(default_factory=list)
+    # Rows created by this call, in input order
+    candidate_workflows: list[CandidateWorkflow] = field(default_factory=list)
+
+    def count(self, status: str) -> int:
+        return sum(1 for outcome in self.outcomes if outcome.status == status)
+
+
+def is_exam_node(node: CompiledNode) -> bool:
+    config = node.config or {}
+    return config.get("todo_type") == TodoNodeType.EXAM or bool(
+        config.get("exam_config")
+    )
+
+
+def interview_values(
+    node: CompiledNode,
+    *,
+    candidate_id: int,
+    candidate_name: str | None,
+    recruiter_id: int,
+    employer_company_id: int,
+) -> dict[str, Any]:
+    """Column values of the interview an interview node creates"""
+    config = node.config or {}
+    return {
+        "assignee_id": candidate_id,
+        "recruiter_id": recruiter_id,
+        "employer_company_id": employer_company_id,
+        "recruiter_company_id": employer_company_id,  # Same as employer for now
+        "workflow_id": node.workflow_id,
+        "title": f"{node.title} - {candidate_name or 'Candidate'}",
+        "description": node.description,
+        "interview_type": str(
+            config.get("interview_type", InterviewNodeType.VIDEO.value)
+        ),
+        "duration_minutes": config.get("duration_minutes", 60),
+        "preparation_notes": node.instructions,
+        "created_by": recruiter_id,
+    }
+
+
+def todo_values(
+    node: CompiledNode, *, candidate_id: int, owner_id: int
+) -> dict[str, Any]:
+    """Column values of the todo a regular or assignment todo node creates"""
+    config = node.config or {}
+    return {
+        "owner_id": owner_id,
+        "assignee_id": candidate_id,
+        "created_by": owner_id,
+        "workflow_id": node.workflow_id,
+        "title": node.title,
+        "description": node.description,
+        "todo_type": TodoType.ASSIGNMENT.value
+        if config.get("todo_type") == TodoNodeType.ASSIGNMENT
+        else TodoType.REGULAR.value,
+        "due_datetime": get_utc_now() + timedelta(days=config.get("due_in_days", 3)),
+        # Visible to both recruiter and candidate
+        "visibility_status": VisibilityStatus.VISIBLE.value,
+    }
+
+
+async def insert_for_assignees(
+    db: AsyncSession, model: type[Interview] | type[Todo], rows: list[dict[str, Any]]
+) -> dict[int, int]:
+    """Insert interviews or todos with one statement; returns assignee -> id.
+
+    MySQL has no RETURNING. ``lastrowid`` of a multi-row INSERT is the id of
+    its first row and every other row gets a larger one, so the new rows are
+    read back by workflow, assignee and ``id >= lastrowid``. Each assignee
+    appears once per call, and nothing else creates rows for a candidate
+    whose process is being started in the same transaction.
+    """
+    if not rows:
+        return {}
+    result = await db.execute(insert(model).values(rows))
+    first_id = result.lastrowid
+    assignee_ids = [row["assignee_id"] for row in rows]
+
+    created = await db.execute(
+        select(model.id, model.assignee_id)
+        .where(
+            and_(
+                model.workflow_id == rows[0]["workflow_id"],
+                model.assignee_id.in_(assignee_ids),
+                model.id >= first_id,
+            )
+        )
+        .order_by(model.id)
+    )
+    ids: dict[int, int] = {}
+    for row_id, assignee_id in created.all():
+        ids.setdefault(assignee_id, row_id)
+    if len(ids) != len(assignee_ids):
+        raise RuntimeError(
+            f"Expected {len(assignee_ids)} new {model.__tablename__}, found {len(ids)}"
+        )
+    return ids
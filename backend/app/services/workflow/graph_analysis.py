@@ -0,0 +1,288 @@
+"""Linear-time structural analysis of workflow graphs.
+
+Adjacency is built once from the node ids and ``(source, target)`` connection
+pairs. Cycles come from an iterative Tarjan pass, the topological order from
+Kahn's algorithm, and reachability from breadth-first searches. Everything is
+O(V + E) and nothing recurses, so large generated workflows cannot hit the
+recursion limit.
+
+Workflow validation, activation and the node editor all use
+``analyze_graph``; ``flow_validation_result`` turns its output into the
+issues and warnings that validation reports.
+"""
+
+from collections import deque
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+Adjacency = Mapping[int, Sequence[int]]
+
+
+@dataclass(frozen=True)
+class GraphAnalysis:
+    node_ids: tuple[int, ...]
+    edge_count: int
+    start_node_ids: tuple[int, ...]
+    end_node_ids: tuple[int, ...]
+    # Nodes with neither incoming nor outgoing connections
+    orphaned_node_ids: tuple[int, ...]
+    # One path per cycle, closing on its first node, e.g. [3, 4, 5, 3]
+    cycles: tuple[tuple[int, ...], ...]
+    # Nodes no start node leads to
+    unreachable_node_ids: tuple[int, ...]
+    # Nodes from which no end node can be reached
+    dead_end_node_ids: tuple[int, ...]
+    # None when the graph has cycles
+    topological_order: tuple[int, ...] | None
+
+    @property
+    def has_cycles(self) -> bool:
+        return bool(self.cycles)
+
+
+def strongly_connected_components(
+    node_ids: Sequence[int], adjacency: Adjacency
+) -> list[list[int]]:
+    """Tarjan's algorithm with an explicit stack instead of recursion."""
+    index: dict[int, int] = {}
+    lowlink: dict[int, int] = {}
+    stack: list[int] = []
+    on_stack: set[int] = set()
+    components: list[list[int]] = []
+    counter = 0
+
+    for root in node_ids:
+        if root in index:
+            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(adjacency.get(root, ())))]
+
+        while work:
+            node, successors = work[-1]
+            for successor in successors:
+                if successor not in index:
+                    index[successor] = lowlink[successor] = counter
+                    counter += 1
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(adjacency.get(successor, ()))))
+                    break
+                if successor in on_stack:
+                    lowlink[node] = min(lowlink[node], index[successor])
+            else:
+                # Every successor is done; close the node
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+    return components
+
+
+def topological_order(
+    node_ids: Sequence[int], adjacency: Adjacency
+) -> list[int] | None:
+    """Kahn's algorithm; ties keep ``node_ids`` order. None if there is a cycle."""
+    indegree = dict.fromkeys(node_ids, 0)
+    for node_id in node_ids:
+        for successor in adjacency.get(node_id, ()):
+            indegree[successor] += 1
+
+    queue = deque(node_id for node_id in node_ids if indegree[node_id] == 0)
+    order = []
+    while queue:
+        node_id = queue.popleft()
+        order.append(node_id)
+        for successor in adjacency.get(node_id, ()):
+            indegree[successor] -= 1
+            if indegree[successor] == 0:
+                queue.append(successor)
+
+    return order if len(order) == len(indegree) else None
+
+
+def reachable_from(sources: Iterable[int], adjacency: Adjacency) -> set[int]:
+    seen = set(sources)
+    queue = deque(seen)
+    while queue:
+        for successor in adjacency.get(queue.popleft(), ()):
+            if successor not in seen:
+                seen.add(successor)
+                queue.append(successor)
+    return seen
+
+
+def _cycle_through(start: int, members: set[int], adjacency: Adjacency) -> list[int]:
+    """Shortest path from ``start`` back to itself inside one component."""
+    parents: dict[int, int] = {}
+    queue = deque([start])
+    while queue:
+        node_id = queue.popleft()
+        for successor in adjacency.get(node_id, ()):
+            if successor == start:
+                path = [node_id]
+                while path[-1] != start:
+                    path.append(parents[path[-1]])
+                path.reverse()
+                return [*path, start]
+            if successor in members and successor not in parents:
+                parents[successor] = node_id
+                queue.append(successor)
+    return [start, start]
+
+
+def analyze_graph(
+    node_ids: Iterable[int],
+    edges: Iterable[tuple[int, int]],
+    start_node_ids: Iterable[int] | None = None,
+) -> GraphAnalysis:
+    """Analyze a workflow's nodes and connections in O(V + E).
+
+    Args:
+        node_ids: Nodes in display order; results keep this order
+        edges: ``(source, target)`` pairs; pairs touching unknown nodes are
+            ignored
+        start_node_ids: Entry points; defaults to nodes without incoming
+            connections
+    """
+    nodes = list(dict.fromkeys(node_ids))
+    known = set(nodes)
+
+    adjacency: dict[int, list[int]] = {}
+    reverse: dict[int, list[int]] = {}
+    edge_count = 0
+    for source, target in edges:
+        if source in known and target in known:
+            edge_count += 1
+            adjacency.setdefault(source, []).append(target)
+            reverse.setdefault(target, []).append(source)
+
+    if start_node_ids is None:
+        starts = [node_id for node_id in nodes if node_id not in reverse]
+    else:
+        starts = [
+            node_id for node_id in dict.fromkeys(start_node_ids) if node_id in known
+        ]
+    ends = [node_id for node_id in nodes if node_id not in adjacency]
+
+    cycles = []
+    for component in strongly_connected_components(nodes, adjacency):
+        start = min(component)
+        if len(component) > 1 or start in adjacency.get(start, ()):
+            cycles.append(tuple(_cycle_through(start, set(component), adjacency)))
+    cycles.sort()
+
+    reachable = reachable_from(starts, adjacency)
+    can_finish = reachable_from(ends, reverse)
+    order = topological_order(nodes, adjacency)
+
+    return GraphAnalysis(
+        node_ids=tuple(nodes),
+        edge_count=edge_count,
+        start_node_ids=tuple(starts),
+        end_node_ids=tuple(ends),
+        orphaned_node_ids=tuple(
+            node_id
+            for node_id in nodes
+            if node_id not in adjacency and node_id not in reverse
+        ),
+        cycles=tuple(cycles),
+        unreachable_node_ids=tuple(n for n in nodes if n not in reachable),
+        dead_end_node_ids=tuple(n for n in nodes if n not in can_finish),
+        topological_order=tuple(order) if order is not None else None,
+    )
+
+
+def flow_validation_result(analysis: GraphAnalysis) -> dict[str, Any]:
+    """Issues and warnings for a workflow, in the validation response format."""
+    issues: list[dict[str, Any]] = []
+    warnings: list[dict[str, Any]] = []
+
+    orphaned = analysis.orphaned_node_ids
+    if len(orphaned) > 1:  # Allow one orphaned node (could be start or end)
+        issues.append(
+            {
+                "type": "orphaned_nodes",
+                "message": f"Found {len(orphaned)} orphaned nodes",
+                "node_ids": list(orphaned),
+            }
+        )
+
+    if analysis.has_cycles:
+        issues.append(
+            {
+                "type": "cycle_detected",
+                "message": "Process contains cycles which may cause infinite loops",
+                "paths": [list(path) for path in analysis.cycles],
+            }
+        )
+
+    if not analysis.start_node_ids:
+        issues.append(
+            {"type": "no_start_node", "message": "Process has no clear start node"}
+        )
+    elif len(analysis.start_node_ids) > 1:
+        warnings.append(
+            {
+                "type": "multiple_start_nodes",
+                "message": (
+                    f"Process has {len(analysis.start_node_ids)} potential start nodes"
+                ),
+            }
+        )
+
+    if not analysis.end_node_ids:
+        warnings.append(
+            {"type": "no_end_node", "message": "Process has no clear end node"}
+        )
+
+    if analysis.start_node_ids and analysis.unreachable_node_ids:
+        warnings.append(
+            {
+                "type": "unreachable_nodes",
+                "message": (
+                    f"{len(analysis.unreachable_node_ids)} nodes cannot be "
+                    "reached from a start node"
+                ),
+                "node_ids": list(analysis.unreachable_node_ids),
+            }
+        )
+
+    if analysis.dead_end_node_ids:
+        warnings.append(
+            {
+                "type": "dead_end_nodes",
+                "message": (
+                    f"{len(analysis.dead_end_node_ids)} nodes cannot reach an end node"
+                ),
+                "node_ids": list(analysis.dead_end_node_ids),
+            }
+        )
+
+    return {
+        "is_valid": len(issues) == 0,
+        "issues": issues,
+        "warnings": warnings,
+        "total_nodes": len(analysis.node_ids),
+        "total_connections": analysis.edge_count,
+        "start_nodes": len(analysis.start_node_ids),
+        "end_nodes": len(analysis.end_node_ids),
+        "topological_order": (
+            list(analysis.topological_order)
+            if analysis.topological_order is not None
+            else None
+        ),
+    }
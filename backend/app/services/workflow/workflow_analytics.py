@@ -0,0 +1,111 @@
+"""Per-node workflow analytics from a single grouped query.
+
+``workflow_node_execution.get_node_aggregates`` returns one row per
+(node, status, result) with execution counts and duration and score totals.
+``node_statistics`` folds those rows into per-node statistics for every node
+of the compiled graph, and ``bottleneck_nodes`` ranks them, so a dashboard
+costs the same handful of queries however many nodes the workflow has.
+
+Totals rather than averages come back from the database so that groups can
+be combined exactly. Statistics are computed on read instead of being kept
+in a rollup table, which keeps arbitrary time windows possible.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.services.workflow.workflow_graph import CompiledNode
+
+
+@dataclass
+class NodeStatistics:
+    node_id: int
+    node_title: str
+    node_type: str
+    by_status: dict[str, int] = field(default_factory=dict)
+    by_result: dict[str, int] = field(default_factory=dict)
+    total_executions: int = 0
+    duration_seconds: float = 0.0
+    # Executions with both a start and a completion time
+    timed: int = 0
+    score_total: float = 0.0
+    scored: int = 0
+
+    def add(self, row: Any) -> None:
+        """Fold one ``get_node_aggregates`` row into the totals."""
+        self.by_status[row.status] = self.by_status.get(row.status, 0) + row.executions
+        if row.result is not None:
+            self.by_result[row.result] = (
+                self.by_result.get(row.result, 0) + row.executions
+            )
+        self.total_executions += row.executions
+        self.duration_seconds += float(row.duration_seconds or 0)
+        self.timed += row.timed
+        self.score_total += float(row.score_total or 0)
+        self.scored += row.scored
+
+    @property
+    def completion_rate(self) -> float:
+        if not self.total_executions:
+            return 0
+        return self.by_status.get("completed", 0) / self.total_executions * 100
+
+    @property
+    def average_duration_minutes(self) -> float:
+        return self.duration_seconds / self.timed / 60 if self.timed else 0
+
+    @property
+    def average_score(self) -> float | None:
+        return self.score_total / self.scored if self.scored else None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "node_id": self.node_id,
+            "node_title": self.node_title,
+            "node_type": self.node_type,
+            "total_executions": self.total_executions,
+            "by_status": self.by_status,
+            "by_result": self.by_result,
+            "completion_rate": self.completion_rate,
+            "average_duration_minutes": self.average_duration_minutes,
+            "average_score": self.average_score,
+        }
+
+
+def node_statistics(
+    nodes: Iterable[CompiledNode], aggregates: Iterable[Any]
+) -> list[NodeStatistics]:
+    """Statistics for each of ``nodes``, in order, including unused ones."""
+    stats = {
+        node.id: NodeStatistics(
+            node_id=node.id, node_title=node.title, node_type=node.node_type
+        )
+        for node in nodes
+    }
+    for row in aggregates:
+        node_stats = stats.get(row.node_id)
+        if node_stats is not None:
+            node_stats.add(row)
+    return list(stats.values())
+
+
+def bottleneck_nodes(
+    stats: Iterable[NodeStatistics], limit: int = 5
+) -> list[dict[str, Any]]:
+    """Slowest, least completed nodes first; nodes never executed are skipped."""
+    bottlenecks = [
+        {
+            "node_id": s.node_id,
+            "node_title": s.node_title,
+            "node_type": s.node_type,
+            "total_executions": s.total_executions,
+            "completion_rate": s.completion_rate,
+            "avg_duration_minutes": s.average_duration_minutes,
+            "bottleneck_score": s.average_duration_minutes + (100 - s.completion_rate),
+        }
+        for s in stats
+        if s.total_executions
+    ]
+    bottlenecks.sort(key=lambda b: b["bottleneck_score"], reverse=True)
+    return bottlenecks[:limit]
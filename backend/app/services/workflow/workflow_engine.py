@@ -1,26 +1,103 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.crud.interview import interview as interview_crud
 from app.crud.todo import todo as todo_crud
+from app.crud.user import user as user_crud
 from app.crud.workflow.candidate_workflow import candidate_workflow
 from app.crud.workflow.workflow import workflow
+from app.crud.workflow.workflow_event import workflow_event
 from app.crud.workflow.workflow_node import workflow_node
 from app.crud.workflow.workflow_node_connection import workflow_node_connection
 from app.crud.workflow.workflow_node_execution import workflow_node_execution
 from app.models.candidate_workflow import CandidateWorkflow
+from app.models.interview import Interview
+from app.models.todo import Todo
 from app.models.workflow import Workflow
+from app.models.workflow_event import WorkflowEvent
 from app.models.workflow_node import WorkflowNode
 from app.models.workflow_node_execution import WorkflowNodeExecution
-from app.schemas.workflow.enums import (
-    InterviewNodeType,
-    NodeType,
-    TodoNodeType,
-)
+from app.schemas.workflow.enums import NodeType, WorkflowEventType
 from app.services.exam_todo_service import exam_todo_service
+from app.services.workflow.bulk_assignment import (
+    ALREADY_ASSIGNED,
+    ASSIGNED,
+    FAILED,
+    STARTED,
+    AssignmentOutcome,
+    BulkAssignmentReport,
+    insert_for_assignees,
+    interview_values,
+    is_exam_node,
+    todo_values,
+)
+from app.services.workflow.workflow_analytics import (
+    bottleneck_nodes,
+    node_statistics,
+)
+from app.services.workflow.workflow_graph import CompiledNode, workflow_graphs
 from app.utils.datetime_utils import get_utc_now
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def _node_data(node: CompiledNode) -> dict[str, Any]:
+    """What the event log keeps about the node an event happened at"""
+    return {"node_title": node.title, "node_type": node.node_type}
+
+
+def _timeline_item(event: WorkflowEvent, workflow_name: str | None) -> dict[str, Any]:
+    """Present a log event as a candidate timeline entry"""
+    data = event.data or {}
+    node_title = data.get("node_title", "Step")
+    item: dict[str, Any] = {
+        "id": event.id,
+        "timestamp": event.occurred_at,
+        "event_type": event.event_type,
+        "node_id": event.node_id,
+    }
+    score = float(event.score) if event.score is not None else None
+
+    if event.event_type == WorkflowEventType.PROCESS_STARTED:
+        item.update(
+            title="Process Started",
+            description=f"Started workflow: {workflow_name or 'workflow'}",
+            icon="play",
+        )
+    elif event.event_type == WorkflowEventType.NODE_STARTED:
+        item.update(
+            title=f"Started: {node_title}",
+            description=f"Started {data.get('node_type', 'step')}: {node_title}",
+            icon="play-circle",
+        )
+    elif event.event_type == WorkflowEventType.NODE_COMPLETED:
+        item.update(
+            title=f"Completed: {node_title}",
+            description=f"Completed with result: {event.result}",
+            result=event.result,
+            score=score,
+            feedback=data.get("feedback"),
+            icon="check-circle" if event.result in ["pass", "approved"] else "x-circle",
+        )
+    elif event.event_type == WorkflowEventType.ADVANCED:
+        item.update(
+            title=f"Moved to: {node_title}",
+            description=f"Advanced after result: {event.result}",
+            icon="arrow-right",
+        )
+    elif event.event_type == WorkflowEventType.PROCESS_COMPLETED:
+        item.update(
+            title="Process Completed",
+            description=f"Process completed with result: {event.result}",
+            result=event.result,
+            score=score,
+            icon="flag",
+        )
+    return item
 
 
 class WorkflowEngineService:
@@ -58,15 +135,15 @@ class WorkflowEngineService:
         if not process:
             raise ValueError("Process not found")
 
-        # Validate process before activation
-        validation_result = await self.validate_process(db, workflow_id)
+        # Validate process before activation, reusing the loaded nodes
+        nodes = await workflow_node.get_by_workflow_id(db, workflow_id=workflow_id)
+        validation_result = await self.validate_process(db, workflow_id, nodes=nodes)
         if not validation_result["is_valid"]:
             raise ValueError(
                 f"Process validation failed: {validation_result['issues']}"
             )
 
         # Activate all nodes
-        nodes = await workflow_node.get_by_process_id(db, workflow_id=workflow_id)  # type: ignore
         for node in nodes:
             if node.status == "draft":
                 await workflow_node.activate_node(db, db_obj=node, updated_by=user_id)
@@ -131,22 +208,26 @@ class WorkflowEngineService:
             raise ValueError("Process has already been started")
 
         # Find the first node
-        start_nodes = await workflow_node.get_start_nodes(
-            db, workflow_id=candidate_proc.workflow_id
-        )
-        if not start_nodes:
+        graph = await workflow_graphs.get(db, candidate_proc.workflow_id)
+        if not graph.start_node_ids:
             raise ValueError("No start node found for this process")
 
-        first_node = start_nodes[0]  # Use the first start node
+        first_node_id = graph.start_node_ids[0]  # Use the first start node
 
         # Start the process
-        candidate_proc = await candidate_workflow.start_process(  # type: ignore
-            db, candidate_workflow=candidate_proc, first_node_id=first_node.id
+        candidate_proc = await candidate_workflow.start_workflow(
+            db, candidate_workflow=candidate_proc, first_node_id=first_node_id
+        )
+        await workflow_event.record(
+            db,
+            candidate_workflow_id=candidate_proc.id,
+            workflow_id=candidate_proc.workflow_id,
+            event_type=WorkflowEventType.PROCESS_STARTED.value,
         )
 
         # Create the first node execution
         await self.create_node_execution(
-            db, candidate_workflow_id=candidate_proc.id, node_id=first_node.id
+            db, candidate_workflow_id=candidate_proc.id, node_id=first_node_id
         )
 
         return candidate_proc
@@ -160,7 +241,8 @@ class WorkflowEngineService:
     ) -> WorkflowNodeExecution:
         """Create a new node execution"""
         # Get the node to determine configuration
-        node = await workflow_node.get(db, id=node_id)
+        graph = await workflow_graphs.get_for_node(db, node_id)
+        node = graph.nodes.get(node_id) if graph else None
         if not node:
             raise ValueError("Node not found")
 
@@ -172,7 +254,7 @@ class WorkflowEngineService:
             )
 
         execution_data = {
-            "candidate_process_id": candidate_workflow_id,
+            "candidate_workflow_id": candidate_workflow_id,
             "node_id": node_id,
             "assigned_to": assigned_to,
             "due_date": due_date,
@@ -186,6 +268,16 @@ class WorkflowEngineService:
         elif node.node_type == NodeType.TODO:
             await self._create_todo_for_execution(db, execution, node)
 
+        await workflow_event.record(
+            db,
+            candidate_workflow_id=candidate_workflow_id,
+            workflow_id=node.workflow_id,
+            event_type=WorkflowEventType.NODE_STARTED.value,
+            node_id=node_id,
+            execution_id=execution.id,
+            data=_node_data(node),
+        )
+
         return execution
 
     async def complete_node_execution(
@@ -213,6 +305,21 @@ class WorkflowEngineService:
             feedback=feedback,
             execution_data=execution_data,
         )
+        graph = await workflow_graphs.get_for_node(db, completed_execution.node_id)
+        node = graph.nodes.get(completed_execution.node_id) if graph else None
+        if node:
+            await workflow_event.record(
+                db,
+                candidate_workflow_id=completed_execution.candidate_workflow_id,
+                workflow_id=node.workflow_id,
+                event_type=WorkflowEventType.NODE_COMPLETED.value,
+                node_id=node.id,
+                execution_id=completed_execution.id,
+                actor_id=completed_by,
+                result=result,
+                score=score,
+                data={**_node_data(node), "feedback": feedback},
+            )
 
         # Advance to next node(s)
         await self.advance_to_next_node(
@@ -235,11 +342,11 @@ class WorkflowEngineService:
     ) -> list[WorkflowNodeExecution]:
         """Advance candidate to the next node(s)"""
         # Get next nodes based on execution result
-        next_nodes = await workflow_node.get_next_nodes(
-            db,
-            node_id=current_node_id,
-            execution_result=execution_result,
-            execution_data=execution_data,
+        graph = await workflow_graphs.get_for_node(db, current_node_id)
+        next_nodes = (
+            graph.next_nodes(current_node_id, execution_result, execution_data)
+            if graph
+            else []
         )
 
         new_executions = []
@@ -257,6 +364,19 @@ class WorkflowEngineService:
                 await candidate_workflow.advance_to_node(
                     db, candidate_workflow=candidate_proc, next_node_id=next_nodes[0].id
                 )
+                await workflow_event.record(
+                    db,
+                    candidate_workflow_id=candidate_workflow_id,
+                    workflow_id=candidate_proc.workflow_id,
+                    event_type=WorkflowEventType.ADVANCED.value,
+                    node_id=next_nodes[0].id,
+                    result=execution_result,
+                    data={
+                        **_node_data(next_nodes[0]),
+                        "from_node_id": current_node_id,
+                        "to_node_ids": [node.id for node in next_nodes],
+                    },
+                )
 
                 # Create executions for all next nodes
                 for next_node in next_nodes:
@@ -298,17 +418,25 @@ class WorkflowEngineService:
         elif final_result in ["fail", "rejected"]:
             final_result = "rejected"
 
-        completed_process = await candidate_workflow.complete_process(  # type: ignore
+        completed_process = await candidate_workflow.complete_workflow(
             db,
             candidate_workflow=candidate_proc,
             final_result=final_result,
             overall_score=overall_score,
         )
+        await workflow_event.record(
+            db,
+            candidate_workflow_id=completed_process.id,
+            workflow_id=completed_process.workflow_id,
+            event_type=WorkflowEventType.PROCESS_COMPLETED.value,
+            result=final_result,
+            score=overall_score,
+        )
 
         return completed_process
 
     async def _create_interview_for_execution(
-        self, db: AsyncSession, execution: WorkflowNodeExecution, node: WorkflowNode
+        self, db: AsyncSession, execution: WorkflowNodeExecution, node: CompiledNode
     ) -> None:
         """Create an interview for an interview node execution"""
         # Get candidate process details
@@ -318,21 +446,17 @@ class WorkflowEngineService:
         if not candidate_proc:
             return
 
-        config = node.config or {}
-
-        interview_data = {
-            "candidate_id": candidate_proc.candidate_id,
-            "recruiter_id": candidate_proc.assigned_recruiter_id
-            or execution.assigned_to,
-            "employer_company_id": candidate_proc.workflow.employer_company_id,
-            "recruiter_company_id": candidate_proc.workflow.employer_company_id,  # Same as employer for now
-            "title": f"{node.title} - {candidate_proc.candidate.name if candidate_proc.candidate else 'Candidate'}",  # type: ignore
-            "description": node.description,
-            "interview_type": config.get("interview_type", InterviewNodeType.VIDEO),
-            "duration_minutes": config.get("duration_minutes", 60),
-            "preparation_notes": node.instructions,
-            "created_by": execution.assigned_to or candidate_proc.assigned_recruiter_id,
-        }
+        interview_data = interview_values(
+            node,
+            candidate_id=candidate_proc.candidate_id,
+            candidate_name=candidate_proc.candidate.full_name
+            if candidate_proc.candidate
+            else None,
+            recruiter_id=candidate_proc.assigned_recruiter_id
+            or execution.assigned_to
+            or candidate_proc.workflow.created_by,
+            employer_company_id=candidate_proc.workflow.employer_company_id,
+        )
 
         # Create the interview
         interview = await interview_crud.create(db, obj_in=interview_data)  # type: ignore
@@ -343,7 +467,7 @@ class WorkflowEngineService:
         )
 
     async def _create_todo_for_execution(
-        self, db: AsyncSession, execution: WorkflowNodeExecution, node: WorkflowNode
+        self, db: AsyncSession, execution: WorkflowNodeExecution, node: CompiledNode
     ) -> None:
         """Create a todo for a todo node execution"""
         # Get candidate process details
@@ -356,7 +480,7 @@ class WorkflowEngineService:
         config = node.config or {}
 
         # Check if this is an exam TODO
-        if config.get("todo_type") == TodoNodeType.EXAM or config.get("exam_config"):
+        if is_exam_node(node):
             await self._create_exam_todo(db, execution, node, candidate_proc, config)
         else:
             # Regular TODO or assignment
@@ -366,7 +490,7 @@ class WorkflowEngineService:
         self,
         db: AsyncSession,
         execution: WorkflowNodeExecution,
-        node: WorkflowNode,
+        node: CompiledNode,
         candidate_proc: CandidateWorkflow,
         config: dict[str, Any],
     ) -> None:
@@ -393,28 +517,18 @@ class WorkflowEngineService:
         self,
         db: AsyncSession,
         execution: WorkflowNodeExecution,
-        node: WorkflowNode,
+        node: CompiledNode,
         candidate_proc: CandidateWorkflow,
         config: dict[str, Any],
     ) -> None:
         """Create a regular TODO or assignment"""
-        # Calculate due date
-        due_days = config.get("due_in_days", 3)
-        due_date = get_utc_now() + timedelta(days=due_days)
-
-        todo_data = {
-            "owner_id": candidate_proc.assigned_recruiter_id or execution.assigned_to,
-            "assignee_id": candidate_proc.candidate_id,
-            "created_by": execution.assigned_to or candidate_proc.assigned_recruiter_id,
-            "title": node.title,
-            "description": node.description,
-            "notes": node.instructions,
-            "todo_type": "assignment"
-            if config.get("todo_type") == TodoNodeType.ASSIGNMENT
-            else "regular",
-            "due_date": due_date,
-            "visibility": "shared",  # Visible to both recruiter and candidate
-        }
+        todo_data = todo_values(
+            node,
+            candidate_id=candidate_proc.candidate_id,
+            owner_id=candidate_proc.assigned_recruiter_id
+            or execution.assigned_to
+            or candidate_proc.workflow.created_by,
+        )
 
         # Create the todo
         todo = await todo_crud.create(db, obj_in=todo_data)  # type: ignore
@@ -425,13 +539,17 @@ class WorkflowEngineService:
         )
 
     async def validate_process(
-        self, db: AsyncSession, workflow_id: int
+        self,
+        db: AsyncSession,
+        workflow_id: int,
+        nodes: list[WorkflowNode] | None = None,
     ) -> dict[str, Any]:
         """Validate a process before activation"""
         # Get process nodes
-        nodes = await workflow_node.get_by_process_id(  # type: ignore
-            db, workflow_id=workflow_id, include_inactive=False
-        )
+        if nodes is None:
+            nodes = await workflow_node.get_by_workflow_id(
+                db, workflow_id=workflow_id, include_inactive=False
+            )
 
         issues = []
         warnings = []
@@ -450,8 +568,8 @@ class WorkflowEngineService:
             warnings.append("Process should have at least one interview or assessment")
 
         # Validate node connections
-        flow_validation = await workflow_node_connection.validate_process_flow(  # type: ignore
-            db, workflow_id=workflow_id
+        flow_validation = await workflow_node_connection.validate_workflow_flow(
+            db, workflow_id=workflow_id, nodes=nodes
         )
         issues.extend([issue["message"] for issue in flow_validation.get("issues", [])])
         warnings.extend(
@@ -469,6 +587,7 @@ class WorkflowEngineService:
             "warnings": warnings,
             "total_nodes": len(nodes),
             "node_types": list(node_types),
+            "topological_order": flow_validation["topological_order"],
         }
 
     def _validate_node_config(self, node: WorkflowNode) -> list[str]:
@@ -508,46 +627,69 @@ class WorkflowEngineService:
         return issues
 
     async def get_candidate_timeline(
-        self, db: AsyncSession, candidate_workflow_id: int
-    ) -> list[dict[str, Any]]:
-        """Get detailed timeline for a candidate process"""
-        return await candidate_workflow.get_timeline(
-            db, candidate_workflow_id=candidate_workflow_id
+        self,
+        db: AsyncSession,
+        candidate_workflow_id: int,
+        after: int | None = None,
+        limit: int = 100,
+        workflow_name: str | None = None,
+    ) -> tuple[list[dict[str, Any]], int | None, bool]:
+        """One page of a candidate's timeline, read from the event log.
+
+        Returns the items after event ``after``, the cursor to pass as
+        ``after`` next (the last event id, or ``after`` itself if there is
+        nothing new) and whether more events are already waiting.
+        """
+        events = await workflow_event.get_page(
+            db,
+            candidate_workflow_id=candidate_workflow_id,
+            after=after,
+            limit=limit + 1,
+        )
+        has_more = len(events) > limit
+        events = events[:limit]
+        next_cursor = events[-1].id if events else after
+        return (
+            [_timeline_item(event, workflow_name) for event in events],
+            next_cursor,
+            has_more,
         )
 
     async def get_process_analytics(
-        self, db: AsyncSession, workflow_id: int
+        self,
+        db: AsyncSession,
+        workflow_id: int,
+        since: datetime | None = None,
+        until: datetime | None = None,
     ) -> dict[str, Any]:
-        """Get comprehensive analytics for a process"""
-        # Basic statistics
-        stats = await candidate_workflow.get_statistics_by_process(  # type: ignore
-            db, workflow_id=workflow_id
+        """Get comprehensive analytics for a process.
+
+        Three grouped queries regardless of the number of nodes: candidate
+        statistics, per-node execution aggregates and recruiter workload.
+        ``since``/``until`` restrict them to candidates assigned and
+        executions created in ``[since, until)``.
+        """
+        stats = await candidate_workflow.get_statistics_by_workflow(
+            db, workflow_id=workflow_id, since=since, until=until
         )
 
-        # Node statistics
-        nodes = await workflow_node.get_by_process_id(db, workflow_id=workflow_id)  # type: ignore
-        node_stats = []
-
-        for node in nodes:
-            node_stat = await workflow_node.get_node_statistics(db, node_id=node.id)
-            node_stat["node_title"] = node.title
-            node_stat["node_type"] = node.node_type
-            node_stats.append(node_stat)
-
-        # Bottleneck analysis
-        bottlenecks = await workflow_node.get_bottleneck_nodes(
-            db, workflow_id=workflow_id
+        graph = await workflow_graphs.get(db, workflow_id)
+        aggregates = await workflow_node_execution.get_node_aggregates(
+            db, workflow_id=workflow_id, since=since, until=until
+        )
+        node_stats = node_statistics(
+            sorted(graph.nodes.values(), key=lambda node: node.sequence_order),
+            aggregates,
         )
 
-        # Execution workload
         workload = await workflow_node_execution.get_workload_by_assignee(
-            db, workflow_id=workflow_id
+            db, workflow_id=workflow_id, since=since, until=until
         )
 
         return {
             **stats,
-            "node_statistics": node_stats,
-            "bottleneck_nodes": bottlenecks,
+            "node_statistics": [s.as_dict() for s in node_stats],
+            "bottleneck_nodes": bottleneck_nodes(node_stats),
             "recruiter_workload": workload,
         }
 
@@ -558,20 +700,236 @@ class WorkflowEngineService:
         candidate_ids: list[int],
         assigned_recruiter_id: int | None = None,
         start_immediately: bool = False,
-    ) -> list[CandidateWorkflow]:
-        """Bulk assign multiple candidates to a process"""
-        assigned_processes = await candidate_workflow.bulk_assign_candidates(
-            db,
+        chunk_size: int | None = None,
+    ) -> BulkAssignmentReport:
+        """Bulk assign candidates to a process, optionally starting them.
+
+        Existing assignments and unknown candidates are found with one query
+        each. The rest are inserted, and started, in chunks of
+        ``workflow_bulk_assign_chunk_size`` with one transaction per chunk; a
+        chunk that fails is rolled back and its candidates reported as failed.
+        """
+        process = await workflow.get(db, id=workflow_id)
+        if not process:
+            raise ValueError("Process not found")
+        # Read up front: a failed chunk's rollback expires loaded rows
+        employer_company_id = process.employer_company_id
+        default_owner_id = process.created_by
+
+        first_node = None
+        if start_immediately:
+            graph = await workflow_graphs.get(db, workflow_id)
+            if not graph.start_node_ids:
+                raise ValueError("No start node found for this process")
+            first_node = graph.nodes[graph.start_node_ids[0]]
+
+        candidate_ids = list(dict.fromkeys(candidate_ids))
+        existing = await candidate_workflow.get_assigned_candidate_ids(
+            db, workflow_id=workflow_id, candidate_ids=candidate_ids
+        )
+        names = await user_crud.get_names(
+            db, [c for c in candidate_ids if c not in existing]
+        )
+
+        outcomes: dict[int, AssignmentOutcome] = {}
+        pending = []
+        for candidate_id in candidate_ids:
+            if candidate_id in existing:
+                outcomes[candidate_id] = AssignmentOutcome(
+                    candidate_id, ALREADY_ASSIGNED
+                )
+            elif candidate_id not in names:
+                outcomes[candidate_id] = AssignmentOutcome(
+                    candidate_id, FAILED, error="Candidate not found"
+                )
+            else:
+                pending.append(candidate_id)
+
+        size = chunk_size or settings.workflow_bulk_assign_chunk_size
+        for offset in range(0, len(pending), size):
+            chunk = pending[offset : offset + size]
+            try:
+                rows = await candidate_workflow.insert_many(
+                    db,
+                    workflow_id=workflow_id,
+                    candidate_ids=chunk,
+                    assigned_recruiter_id=assigned_recruiter_id,
+                )
+                if first_node:
+                    await self._start_candidate_processes(
+                        db,
+                        first_node,
+                        rows,
+                        names,
+                        employer_company_id=employer_company_id,
+                        default_owner_id=default_owner_id,
+                    )
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                logger.warning(
+                    "Bulk assignment chunk failed",
+                    workflow_id=workflow_id,
+                    candidates=len(chunk),
+                    error=str(e),
+                )
+                for candidate_id in chunk:
+                    outcomes[candidate_id] = AssignmentOutcome(
+                        candidate_id, FAILED, error=str(e)
+                    )
+                continue
+
+            for row in rows:
+                outcomes[row.candidate_id] = AssignmentOutcome(
+                    row.candidate_id, STARTED if first_node else ASSIGNED, row.id
+                )
+            if (
+                first_node
+                and first_node.node_type == NodeType.TODO
+                and is_exam_node(first_node)
+            ):
+                await self._create_exam_todos(db, first_node, rows, outcomes)
+
+        created = [
+            c for c in candidate_ids if outcomes[c].status in (ASSIGNED, STARTED)
+        ]
+        by_candidate = {
+            row.candidate_id: row
+            for row in await candidate_workflow.get_by_candidate_ids(
+                db, workflow_id=workflow_id, candidate_ids=created
+            )
+        }
+        return BulkAssignmentReport(
             workflow_id=workflow_id,
-            candidate_ids=candidate_ids,
-            assigned_recruiter_id=assigned_recruiter_id,
+            outcomes=[outcomes[c] for c in candidate_ids],
+            candidate_workflows=[by_candidate[c] for c in created],
         )
 
-        if start_immediately:
-            for candidate_proc in assigned_processes:
-                await self.start_candidate_process(db, candidate_proc.id)
+    async def _start_candidate_processes(
+        self,
+        db: AsyncSession,
+        node: CompiledNode,
+        rows: list[CandidateWorkflow],
+        candidate_names: dict[int, str],
+        *,
+        employer_company_id: int,
+        default_owner_id: int,
+    ) -> None:
+        """Start new candidate workflows at ``node`` without committing.
+
+        One UPDATE starts them, and their interviews or todos, their
+        executions and their log events are each written with one multi-row
+        INSERT. Exam todos are left to ``_create_exam_todos``.
+        """
+        started = await candidate_workflow.start_many(
+            db, candidate_workflow_ids=[row.id for row in rows], first_node_id=node.id
+        )
+        if started != len(rows):
+            raise RuntimeError(f"Started {started} of {len(rows)} candidate workflows")
+
+        interview_ids: dict[int, int] = {}
+        todo_ids: dict[int, int] = {}
+        if node.node_type == NodeType.INTERVIEW:
+            interview_ids = await insert_for_assignees(
+                db,
+                Interview,
+                [
+                    interview_values(
+                        node,
+                        candidate_id=row.candidate_id,
+                        candidate_name=candidate_names.get(row.candidate_id),
+                        recruiter_id=row.assigned_recruiter_id or default_owner_id,
+                        employer_company_id=employer_company_id,
+                    )
+                    for row in rows
+                ],
+            )
+        elif node.node_type == NodeType.TODO and not is_exam_node(node):
+            todo_ids = await insert_for_assignees(
+                db,
+                Todo,
+                [
+                    todo_values(
+                        node,
+                        candidate_id=row.candidate_id,
+                        owner_id=row.assigned_recruiter_id or default_owner_id,
+                    )
+                    for row in rows
+                ],
+            )
+
+        due_date = None
+        if node.estimated_duration_minutes:
+            due_date = get_utc_now() + timedelta(
+                minutes=node.estimated_duration_minutes
+            )
+        await workflow_node_execution.insert_many(
+            db,
+            rows=[
+                {
+                    "candidate_workflow_id": row.id,
+                    "node_id": node.id,
+                    "due_date": due_date,
+                    "interview_id": interview_ids.get(row.candidate_id),
+                    "todo_id": todo_ids.get(row.candidate_id),
+                }
+                for row in rows
+            ],
+        )
 
-        return assigned_processes
+        execution_ids = await workflow_node_execution.get_ids_for_node(
+            db, node_id=node.id, candidate_workflow_ids=[row.id for row in rows]
+        )
+        started_at = get_utc_now()
+        events = []
+        for row in rows:
+            for event_type, node_id, execution_id, data in [
+                (WorkflowEventType.PROCESS_STARTED, None, None, None),
+                (
+                    WorkflowEventType.NODE_STARTED,
+                    node.id,
+                    execution_ids[row.id],
+                    _node_data(node),
+                ),
+            ]:
+                events.append(
+                    {
+                        "candidate_workflow_id": row.id,
+                        "workflow_id": node.workflow_id,
+                        "event_type": event_type.value,
+                        "node_id": node_id,
+                        "execution_id": execution_id,
+                        "data": data,
+                        "occurred_at": started_at,
+                    }
+                )
+        await workflow_event.insert_many(db, rows=events)
+
+    async def _create_exam_todos(
+        self,
+        db: AsyncSession,
+        node: CompiledNode,
+        rows: list[CandidateWorkflow],
+        outcomes: dict[int, AssignmentOutcome],
+    ) -> None:
+        """Create exam todos for started candidates one by one.
+
+        The exam service also creates exam assignments and commits on its
+        own, so these stay per candidate; a failure is recorded on that
+        candidate's (already started) outcome.
+        """
+        targets = [(row.id, row.candidate_id) for row in rows]
+        for candidate_workflow_id, candidate_id in targets:
+            try:
+                (execution,) = await workflow_node_execution.get_for_node(
+                    db, node_id=node.id, candidate_workflow_ids=[candidate_workflow_id]
+                )
+                await self._create_exam_todo(
+                    db, execution, node, execution.candidate_workflow, node.config or {}
+                )
+            except Exception as e:
+                await db.rollback()
+                outcomes[candidate_id].error = f"Exam todo not created: {e}"
 
     async def clone_process(
         self,
@@ -0,0 +1,265 @@
+"""Compiled workflow definitions for the workflow engine.
+
+A workflow's nodes and connections are compiled once into a ``WorkflowGraph``:
+node snapshots, outgoing adjacency lists with precompiled condition
+predicates, and the start and end node sets. The engine routes candidate
+transitions through it, so the hot path does no definition queries.
+
+Graphs are cached per worker and stamped with a version that increases every
+time the workflow is recompiled. Node and connection edits, activation and
+cloning call ``invalidate``; the invalidation is broadcast on the pub/sub
+backplane so every worker recompiles on next use. Entries also expire after
+``workflow_graph_cache_ttl_seconds`` in case a broadcast is missed.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.workflow_node import WorkflowNode
+from app.models.workflow_node_connection import (
+    ConditionPredicate,
+    WorkflowNodeConnection,
+    compile_condition,
+)
+from app.services.broadcast_cache import BroadcastInvalidatedCache
+from app.services.pubsub_service import PubSubBackend
+
+
+@dataclass(frozen=True)
+class CompiledNode:
+    """The parts of a node definition the engine needs to run it."""
+
+    id: int
+    workflow_id: int
+    node_type: str
+    title: str
+    description: str | None
+    instructions: str | None
+    config: dict[str, Any] | None
+    estimated_duration_minutes: int | None
+    sequence_order: int
+    status: str
+
+    @property
+    def is_active(self) -> bool:
+        return self.status == "active"
+
+
+@dataclass(frozen=True)
+class CompiledEdge:
+    connection_id: int
+    target_id: int
+    condition_type: str
+    predicate: ConditionPredicate = field(compare=False)
+
+
+@dataclass(frozen=True)
+class WorkflowGraph:
+    workflow_id: int
+    version: int
+    nodes: dict[int, CompiledNode]
+    # source node id -> edges to active targets, in connection id order
+    outgoing: dict[int, tuple[CompiledEdge, ...]]
+    start_node_ids: tuple[int, ...]
+    end_node_ids: frozenset[int]
+
+    def next_nodes(
+        self,
+        node_id: int,
+        execution_result: str,
+        execution_data: dict[str, Any] | None = None,
+    ) -> list[CompiledNode]:
+        """Active nodes reached from ``node_id`` for this execution result."""
+        return [
+            self.nodes[edge.target_id]
+            for edge in self.outgoing.get(node_id, ())
+            if edge.predicate(execution_result, execution_data)
+        ]
+
+    @property
+    def start_nodes(self) -> list[CompiledNode]:
+        return [self.nodes[node_id] for node_id in self.start_node_ids]
+
+
+def compile_graph(
+    workflow_id: int,
+    version: int,
+    nodes: list[WorkflowNode],
+    connections: list[WorkflowNodeConnection],
+) -> WorkflowGraph:
+    """Build a graph from a workflow's node and connection rows."""
+    compiled = {
+        node.id: CompiledNode(
+            id=node.id,
+            workflow_id=node.workflow_id,
+            node_type=node.node_type,
+            title=node.title,
+            description=node.description,
+            instructions=node.instructions,
+            config=dict(node.config) if node.config else node.config,
+            estimated_duration_minutes=node.estimated_duration_minutes,
+            sequence_order=node.sequence_order,
+            status=node.status,
+        )
+        for node in nodes
+    }
+
+    outgoing: dict[int, list[CompiledEdge]] = {}
+    has_incoming: set[int] = set()
+    for connection in sorted(connections, key=lambda c: c.id):
+        target = compiled.get(connection.target_node_id)
+        if target is None or connection.source_node_id not in compiled:
+            continue
+        has_incoming.add(target.id)
+        if not target.is_active:
+            continue
+        outgoing.setdefault(connection.source_node_id, []).append(
+            CompiledEdge(
+                connection_id=connection.id,
+                target_id=target.id,
+                condition_type=connection.condition_type,
+                predicate=compile_condition(
+                    connection.condition_type, connection.condition_config
+                ),
+            )
+        )
+
+    # Same rule as ``workflow_node.get_start_nodes``: the active node at
+    # sequence 1, otherwise active nodes without incoming connections
+    active = sorted(
+        (node for node in compiled.values() if node.is_active),
+        key=lambda node: node.sequence_order,
+    )
+    first = [node.id for node in active if node.sequence_order == 1][:1]
+    start_node_ids = tuple(
+        first or [node.id for node in active if node.id not in has_incoming]
+    )
+    end_node_ids = frozenset(node.id for node in active if node.id not in outgoing)
+
+    return WorkflowGraph(
+        workflow_id=workflow_id,
+        version=version,
+        nodes=compiled,
+        outgoing={source: tuple(edges) for source, edges in outgoing.items()},
+        start_node_ids=start_node_ids,
+        end_node_ids=end_node_ids,
+    )
+
+
+class WorkflowGraphCache(BroadcastInvalidatedCache):
+    channel = "workflow_graphs:invalidate"
+
+    def __init__(
+        self,
+        pubsub: PubSubBackend | None = None,
+        ttl_seconds: float | None = None,
+        max_entries: int | None = None,
+    ):
+        super().__init__(
+            ttl_seconds
+            if ttl_seconds is not None
+            else settings.workflow_graph_cache_ttl_seconds,
+            pubsub,
+        )
+        self.max_entries = max_entries or settings.workflow_graph_cache_max_entries
+        # workflow_id -> (expires_at, graph), least recently compiled first
+        self._graphs: OrderedDict[int, tuple[float, WorkflowGraph]] = OrderedDict()
+        # node_id -> workflow_id, for the graphs currently cached
+        self._node_workflows: dict[int, int] = {}
+        self._versions: dict[int, int] = {}
+        self.compile_count = 0
+
+    def _cached(self, workflow_id: int) -> WorkflowGraph | None:
+        entry = self._graphs.get(workflow_id)
+        if entry is None:
+            return None
+        if not self._fresh(entry):
+            self._drop(workflow_id)
+            return None
+        return entry[1]
+
+    def _drop(self, workflow_id: int) -> None:
+        entry = self._graphs.pop(workflow_id, None)
+        if entry is None:
+            return
+        for node_id in entry[1].nodes:
+            if self._node_workflows.get(node_id) == workflow_id:
+                del self._node_workflows[node_id]
+
+    async def _compile(self, db: AsyncSession, workflow_id: int) -> WorkflowGraph:
+        nodes = await db.execute(
+            select(WorkflowNode).where(WorkflowNode.workflow_id == workflow_id)
+        )
+        connections = await db.execute(
+            select(WorkflowNodeConnection).where(
+                WorkflowNodeConnection.workflow_id == workflow_id
+            )
+        )
+        version = self._versions.get(workflow_id, 0) + 1
+        self._versions[workflow_id] = version
+        self.compile_count += 1
+        return compile_graph(
+            workflow_id,
+            version,
+            list(nodes.scalars().all()),
+            list(connections.scalars().all()),
+        )
+
+    async def get(self, db: AsyncSession, workflow_id: int) -> WorkflowGraph:
+        """Compiled graph of ``workflow_id``; queries only on a cache miss."""
+        await self._ensure_subscribed()
+        graph = self._cached(workflow_id)
+        if graph is not None:
+            return graph
+
+        generation = self.generation
+        graph = await self._compile(db, workflow_id)
+        if generation == self.generation and self.ttl_seconds > 0:
+            self._graphs[workflow_id] = (self._expires_at(), graph)
+            self._graphs.move_to_end(workflow_id)
+            for node_id in graph.nodes:
+                self._node_workflows[node_id] = workflow_id
+            while len(self._graphs) > self.max_entries:
+                self._drop(next(iter(self._graphs)))
+        return graph
+
+    async def get_for_node(
+        self, db: AsyncSession, node_id: int
+    ) -> WorkflowGraph | None:
+        """Graph of the workflow ``node_id`` belongs to; None for unknown nodes."""
+        workflow_id = self._node_workflows.get(node_id)
+        if workflow_id is not None:
+            graph = await self.get(db, workflow_id)
+            if node_id in graph.nodes:
+                return graph
+
+        workflow_id = await db.scalar(
+            select(WorkflowNode.workflow_id).where(WorkflowNode.id == node_id)
+        )
+        if workflow_id is None:
+            return None
+        return await self.get(db, workflow_id)
+
+    def _clear(self, message: dict[str, Any]) -> None:
+        if message.get("all"):
+            self._graphs.clear()
+            self._node_workflows.clear()
+            return
+        for workflow_id in message.get("workflow_ids", []):
+            self._drop(workflow_id)
+
+    async def invalidate(self, workflow_id: int) -> None:
+        """Call after a workflow's nodes or connections change (committed)."""
+        await self._invalidate({"workflow_ids": [workflow_id]})
+
+    async def invalidate_all(self) -> None:
+        """Drop every compiled graph, on every worker."""
+        await self._invalidate({"all": True})
+
+
+workflow_graphs = WorkflowGraphCache()
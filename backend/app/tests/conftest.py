@@ -1,5 +1,8 @@
+import hashlib
+import io
 import os
 import sys
+from datetime import datetime, timedelta
 from pathlib import Path
 
 BACKEND_DIR = Path(__file__).resolve().parents[1]
@@ -39,8 +42,12 @@ from app.main import app
 # Import all models to ensure they are registered with SQLAlchemy
 from app.models import *  # noqa: F403, F405  # Import all models
 from app.services.auth_service import auth_service
+from app.services.entitlement_service import entitlement_resolver
+from app.services.principal_cache import principal_cache
+from app.services.workflow.workflow_graph import workflow_graphs
 from app.utils.constants import CompanyType
 from app.utils.constants import UserRole as UserRoleEnum
+from app.utils.datetime_utils import get_utc_now
 
 # Test database URL - support both CI and local development
 _database_url = os.getenv("DATABASE_URL")
@@ -88,6 +95,25 @@ async def override_get_db():
 app.dependency_overrides[get_db] = override_get_db
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        default=False,
+        help="Run tests marked as timing benchmarks",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip wall-clock benchmarks unless explicitly requested."""
+    if config.getoption("--run-benchmarks"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="needs --run-benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
 def start_test_database():
     """Start Docker MySQL test database with optimized startup."""
     print("Starting MySQL test database...")
@@ -282,6 +308,10 @@ async def clean_database():
     """Clean database before test setup."""
     # Clear data before test fixtures run
     await fast_clear_data()
+    # Per-worker caches are keyed by ids that the truncate recycles
+    await entitlement_resolver.invalidate_all()
+    await principal_cache.invalidate_all()
+    await workflow_graphs.invalidate_all()
     yield
 
 
@@ -318,6 +348,210 @@ async def client():
         yield test_client
 
 
+class FakeMinio:
+    """Records ``put_object`` calls into an in-memory object map.
+
+    Unknown-length uploads (``length=-1``) are read in ``part_size`` parts the
+    way MinIO's multipart upload does; a failing read marks the upload aborted.
+    """
+
+    def __init__(self, objects: dict[str, bytes], last_modified: dict[str, datetime]):
+        self.objects = objects
+        self.last_modified = last_modified
+        self.puts = 0
+        self.parts: list[int] = []
+        self.aborted = False
+
+    def put_object(self, bucket_name, object_name, data, length, part_size=0, **kwargs):
+        self.puts += 1
+        if length != -1:
+            self._store(object_name, data.read())
+            return
+        body = bytearray()
+        try:
+            while part := data.read(part_size):
+                self.parts.append(len(part))
+                body += part
+        except Exception:
+            self.aborted = True
+            raise
+        self._store(object_name, bytes(body))
+
+    def _store(self, object_name: str, data: bytes):
+        self.objects[object_name] = data
+        self.last_modified[object_name] = get_utc_now()
+
+
+class FakeStorage:
+    """In-memory stand-in for StorageService.
+
+    ``last_modified`` can be rewritten to age objects, ``reads`` records the
+    byte range of every ``iter_file`` call and ``chunks_served`` counts the
+    chunks yielded.
+    """
+
+    bucket = "test"
+    chunk_size = 64 * 1024
+
+    def __init__(self, objects: dict[str, bytes] | None = None):
+        self.objects: dict[str, bytes] = objects if objects is not None else {}
+        self.content_types: dict[str, str] = {}
+        self.last_modified: dict[str, datetime] = {}
+        self.reads: list[tuple[int, int]] = []
+        self.chunks_served = 0
+        self.client = FakeMinio(self.objects, self.last_modified)
+
+    def calculate_file_hash(self, data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def file_exists(self, s3_key: str) -> bool:
+        return s3_key in self.objects
+
+    def get_file_info(self, s3_key: str):
+        if s3_key not in self.objects:
+            return None
+        data = self.objects[s3_key]
+        return {
+            "size": len(data),
+            "content_type": self.content_types.get(s3_key),
+            "last_modified": self.last_modified.get(s3_key),
+            "etag": hashlib.md5(data).hexdigest(),
+        }
+
+    def list_files(self, prefix: str) -> list[dict]:
+        return [
+            {
+                "s3_key": key,
+                "size": len(data),
+                "last_modified": self.last_modified.get(key),
+            }
+            for key, data in self.objects.items()
+            if key.startswith(prefix)
+        ]
+
+    def iter_file(
+        self,
+        s3_key: str,
+        chunk_size: int | None = None,
+        offset: int = 0,
+        length: int = 0,
+    ):
+        chunk_size = chunk_size or self.chunk_size
+        data = self.objects[s3_key]
+        end = offset + length if length else len(data)
+        self.reads.append((offset, end))
+        for position in range(offset, end, chunk_size):
+            self.chunks_served += 1
+            yield data[position : min(position + chunk_size, end)]
+
+    def put_file_data(self, s3_key: str, data: bytes, content_type: str) -> int:
+        self.client.put_object(self.bucket, s3_key, io.BytesIO(data), len(data))
+        self.content_types[s3_key] = content_type
+        return len(data)
+
+    def copy_file(self, source_key: str, dest_key: str) -> None:
+        self.objects[dest_key] = self.objects[source_key]
+        self.content_types[dest_key] = self.content_types.get(source_key)
+        self.last_modified[dest_key] = get_utc_now()
+
+    def delete_file(self, s3_key: str) -> bool:
+        self.content_types.pop(s3_key, None)
+        self.last_modified.pop(s3_key, None)
+        self.objects.pop(s3_key, None)
+        return True
+
+    def get_presigned_url(self, s3_key: str, expires: timedelta) -> str:
+        return f"https://storage.test/{s3_key}"
+
+
+@pytest.fixture(autouse=True)
+def blob_storage(monkeypatch):
+    """Keep uploaded attachments in memory instead of MinIO."""
+    from app.services.blob_store import blob_store
+
+    storage = FakeStorage()
+    monkeypatch.setattr(blob_store, "_storage", storage)
+    return storage
+
+
+@pytest.fixture
+def make_workers():
+    """Build workers that share one backplane, like uvicorn workers sharing Redis.
+
+    ``make_workers(worker_cls, count, **kwargs)`` returns ``count`` instances of
+    ``worker_cls``, each built with ``kwargs`` plus the ``shared`` collaborators:
+    by default one in-memory pub/sub backend and presence registry.
+    """
+    from app.services.pubsub_service import InMemoryPresenceRegistry, InMemoryPubSub
+
+    def make(worker_cls, count: int = 2, *, shared: dict | None = None, **kwargs):
+        if shared is None:
+            shared = {
+                "pubsub": InMemoryPubSub(),
+                "presence": InMemoryPresenceRegistry(),
+            }
+        return [worker_cls(**shared, **kwargs) for _ in range(count)]
+
+    return make
+
+
+@pytest.fixture
+def make_resume():
+    """Build an unsaved resume with a few visible experiences and skills."""
+    from app.models.resume import Resume, Skill, WorkExperience
+    from app.utils.constants import ResumeFormat
+
+    def make(**overrides) -> Resume:
+        fields = {
+            "id": 1,
+            "user_id": 1,
+            "title": "Backend Engineer",
+            "full_name": "Test Candidate",
+            "email": "candidate@test.com",
+            "template_id": "modern",
+            "theme_color": "#2563eb",
+            "font_family": "Inter",
+            "professional_summary": "Builds reliable services.",
+            "resume_format": ResumeFormat.INTERNATIONAL,
+        }
+        fields.update(overrides)
+        resume = Resume(**fields)
+        resume.experiences = [
+            WorkExperience(
+                id=idx,
+                company_name=f"Company {idx}",
+                position_title="Engineer",
+                start_date=datetime(2015 + idx, 4, 1),
+                is_visible=True,
+                display_order=idx,
+            )
+            for idx in range(3)
+        ]
+        resume.skills = [
+            Skill(
+                id=idx,
+                name=f"Skill {idx}",
+                category="Backend",
+                is_visible=True,
+                display_order=idx,
+            )
+            for idx in range(5)
+        ]
+        return resume
+
+    return make
+
+
+@pytest.fixture(autouse=True)
+def queued_scans(monkeypatch):
+    """Attachment ids the upload endpoint asked the worker to scan."""
+    from app.endpoints import files
+
+    scans: list[int] = []
+    monkeypatch.setattr(files, "_queue_scan", scans.append)
+    return scans
+
+
 # Optimized test fixtures with caching
 @pytest_asyncio.fixture
 async def test_roles(db_session):
@@ -599,9 +833,9 @@ async def get_auth_headers_for_user(client, user):
         json={"email": user.email, "password": password},
     )
 
-    assert response.status_code == 200, (
-        f"Login failed for user {user.email}: {response.text}"
-    )
+    assert (
+        response.status_code == 200
+    ), f"Login failed for user {user.email}: {response.text}"
     token_data = response.json()
     return {"Authorization": f"Bearer {token_data['access_token']}"}
 
@@ -0,0 +1,123 @@
+"""Tests for content-addressed attachment storage."""
+
+import hashlib
+import io
+
+import pytest
+from fastapi import UploadFile
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.attachment import Attachment
+from app.models.file_blob import FileBlob
+from app.models.user import User
+from app.services.antivirus_service import AntivirusService
+from app.services.blob_store import BlobStore, blob_key
+from app.services.clamav_client import AsyncClamAVClient
+from app.tests.conftest import FakeStorage
+from app.utils.constants import VirusStatus
+from app.utils.datetime_utils import get_utc_now
+
+
+def make_upload(data: bytes, filename: str = "report.pdf") -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename=filename)
+
+
+@pytest.mark.asyncio
+async def test_identical_uploads_share_one_object(
+    db_session: AsyncSession, test_user: User, test_admin_user: User
+):
+    storage = FakeStorage()
+    store = BlobStore(storage=storage)
+
+    first = await store.create_attachment(
+        db_session, owner_id=test_user.id, file=make_upload(b"same bytes", "a.pdf")
+    )
+    second = await store.create_attachment(
+        db_session,
+        owner_id=test_admin_user.id,
+        file=make_upload(b"same bytes", "b.pdf"),
+    )
+    other = await store.create_attachment(
+        db_session, owner_id=test_user.id, file=make_upload(b"other bytes")
+    )
+    await db_session.commit()
+
+    digest = hashlib.sha256(b"same bytes").hexdigest()
+    assert first.s3_key == second.s3_key == blob_key(digest)
+    assert first.blob_id == second.blob_id != other.blob_id
+    assert storage.client.puts == 2
+    assert storage.objects[first.s3_key] == b"same bytes"
+
+    blob = await db_session.get(FileBlob, first.blob_id)
+    assert blob.ref_count == 2
+
+
+@pytest.mark.asyncio
+async def test_known_clean_content_skips_scan(
+    db_session: AsyncSession, test_user: User
+):
+    storage = FakeStorage()
+    store = BlobStore(storage=storage)
+    first = await store.create_attachment(
+        db_session, owner_id=test_user.id, file=make_upload(b"scanned")
+    )
+    first.virus_status = VirusStatus.CLEAN.value
+    first.virus_scan_result = "File is clean"
+    first.scanned_at = get_utc_now()
+    await store.record_verdict(db_session, first)
+    await db_session.commit()
+
+    second = await store.create_attachment(
+        db_session, owner_id=test_user.id, file=make_upload(b"scanned")
+    )
+    await db_session.commit()
+    assert second.virus_status == VirusStatus.CLEAN.value
+    assert second.is_available
+
+    # A pending copy created before the verdict existed is resolved without
+    # contacting clamd (which is unreachable here)
+    legacy = Attachment(
+        owner_id=test_user.id,
+        original_filename="legacy.pdf",
+        s3_key="attachments/legacy.pdf",
+        s3_bucket="test",
+        mime_type="application/pdf",
+        file_size=7,
+        sha256_hash=first.sha256_hash,
+    )
+    db_session.add(legacy)
+    await db_session.commit()
+
+    service = AntivirusService(
+        client=AsyncClamAVClient("127.0.0.1", 1, timeout=1), storage=storage
+    )
+    assert await service.scan_attachment(db_session, legacy.id)
+    await db_session.refresh(legacy)
+    assert legacy.virus_status == VirusStatus.CLEAN.value
+    assert legacy.is_available
+
+
+@pytest.mark.asyncio
+async def test_last_release_deletes_object(db_session: AsyncSession, test_user: User):
+    storage = FakeStorage()
+    store = BlobStore(storage=storage)
+    attachments = [
+        await store.create_attachment(
+            db_session, owner_id=test_user.id, file=make_upload(b"shared")
+        )
+        for _ in range(2)
+    ]
+    await db_session.commit()
+    blob_id = attachments[0].blob_id
+    s3_key = attachments[0].s3_key
+
+    assert not await store.release(db_session, blob_id)
+    await db_session.commit()
+    assert s3_key in storage.objects
+
+    assert await store.release(db_session, blob_id)
+    await db_session.commit()
+    assert s3_key not in storage.objects
+    remaining = await db_session.execute(select(FileBlob).where(FileBlob.id == blob_id))
+    assert remaining.scalar_one_or_none() is None
@@ -0,0 +1,148 @@
+"""Tests for set-based bulk candidate assignment."""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from app.crud.workflow.candidate_workflow import candidate_workflow
+from app.crud.workflow.workflow_node import workflow_node as workflow_node_crud
+from app.crud.workflow.workflow_node_connection import (
+    workflow_node_connection as connection_crud,
+)
+from app.models.interview import Interview
+from app.models.user import User
+from app.models.workflow import Workflow
+from app.models.workflow_node_execution import WorkflowNodeExecution
+from app.services.workflow.bulk_assignment import (
+    ALREADY_ASSIGNED,
+    FAILED,
+    STARTED,
+)
+from app.services.workflow.workflow_engine import workflow_engine
+from app.tests.test_message_inbox import count_queries
+
+
+@pytest_asyncio.fixture
+async def candidates(db_session, test_company):
+    users = [
+        User(
+            email=f"candidate{i}@example.com",
+            first_name="Candidate",
+            last_name=str(i),
+            company_id=test_company.id,
+            hashed_password="not-a-real-hash",
+            is_active=True,
+        )
+        for i in range(60)
+    ]
+    db_session.add_all(users)
+    await db_session.commit()
+    return users
+
+
+@pytest_asyncio.fixture
+async def interview_workflow(db_session, test_company, test_employer_user):
+    """An active workflow that opens with an interview, then a todo."""
+    workflow = Workflow(
+        name="Hiring event",
+        employer_company_id=test_company.id,
+        created_by=test_employer_user.id,
+        status="active",
+    )
+    db_session.add(workflow)
+    await db_session.commit()
+
+    interview = await workflow_node_crud.create(
+        db_session,
+        obj_in={
+            "workflow_id": workflow.id,
+            "node_type": "interview",
+            "title": "First interview",
+            "sequence_order": 1,
+            "status": "active",
+            "estimated_duration_minutes": 60,
+            "config": {"interview_type": "video", "duration_minutes": 45},
+        },
+        created_by=test_employer_user.id,
+    )
+    todo = await workflow_node_crud.create(
+        db_session,
+        obj_in={
+            "workflow_id": workflow.id,
+            "node_type": "todo",
+            "title": "Take-home task",
+            "sequence_order": 2,
+            "status": "active",
+        },
+        created_by=test_employer_user.id,
+    )
+    await connection_crud.create_connection(
+        db_session,
+        workflow_id=workflow.id,
+        source_node_id=interview.id,
+        target_node_id=todo.id,
+    )
+    return workflow, interview
+
+
+@pytest.mark.asyncio
+async def test_bulk_start_is_set_based(
+    db_session, candidates, interview_workflow, test_employer_user
+):
+    workflow, first_node = interview_workflow
+    candidate_ids = [user.id for user in candidates]
+
+    with count_queries() as statements:
+        report = await workflow_engine.bulk_assign_candidates(
+            db_session,
+            workflow.id,
+            candidate_ids,
+            assigned_recruiter_id=test_employer_user.id,
+            start_immediately=True,
+            chunk_size=25,
+        )
+
+    # A fixed number of statements per chunk, not per candidate
+    assert len(statements) < 36
+    assert report.count(STARTED) == len(candidate_ids)
+    assert [o.candidate_id for o in report.outcomes] == candidate_ids
+    assert all(row.status == "in_progress" for row in report.candidate_workflows)
+    assert {row.current_node_id for row in report.candidate_workflows} == {
+        first_node.id
+    }
+
+    executions = (
+        await db_session.execute(
+            select(WorkflowNodeExecution.candidate_workflow_id, Interview.assignee_id)
+            .join(Interview, Interview.id == WorkflowNodeExecution.interview_id)
+            .where(WorkflowNodeExecution.node_id == first_node.id)
+        )
+    ).all()
+    by_workflow = {o.candidate_workflow_id: o.candidate_id for o in report.outcomes}
+    # Every execution is linked to the interview of its own candidate
+    assert dict(executions) == by_workflow
+
+
+@pytest.mark.asyncio
+async def test_outcomes_cover_existing_and_unknown_candidates(
+    db_session, candidates, interview_workflow
+):
+    workflow, _ = interview_workflow
+    first, second, third = (user.id for user in candidates[:3])
+    await candidate_workflow.bulk_assign_candidates(
+        db_session, workflow_id=workflow.id, candidate_ids=[first]
+    )
+
+    report = await workflow_engine.bulk_assign_candidates(
+        db_session, workflow.id, [first, second, 999_999, third]
+    )
+
+    assert [(o.candidate_id, o.status) for o in report.outcomes] == [
+        (first, ALREADY_ASSIGNED),
+        (second, "assigned"),
+        (999_999, FAILED),
+        (third, "assigned"),
+    ]
+    assert report.outcomes[2].error == "Candidate not found"
+    assert [row.candidate_id for row in report.candidate_workflows] == [second, third]
+    assert all(row.status == "not_started" for row in report.candidate_workflows)
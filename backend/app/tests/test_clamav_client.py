@@ -0,0 +1,275 @@
+"""Tests for the asyncio clamd client against an in-process fake clamd."""
+
+import asyncio
+import hashlib
+import struct
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from app.models.attachment import Attachment
+from app.services.antivirus_service import AntivirusService
+from app.services.clamav_client import (
+    AsyncClamAVClient,
+    ClamAVError,
+    iterate_in_thread,
+    parse_scan_reply,
+)
+from app.tests.conftest import TestingSessionLocal
+from app.utils.constants import VirusStatus
+
+EICAR = rb"X5O!P%@AP[4\PZX54(P^)7CC)7}$EICAR-STANDARD-ANTIVIRUS-TEST-FILE!$H+H*"
+MB = 1024 * 1024
+
+
+class FakeClamd:
+    """Speaks enough of clamd's z-command protocol for the client.
+
+    Records connections opened, INSTREAM frame sizes and the peak number of
+    scans in flight; flags streams containing the EICAR test string.
+    """
+
+    def __init__(self, scan_delay: float = 0.0, stream_max_length: int = 0):
+        self.scan_delay = scan_delay
+        self.stream_max_length = stream_max_length
+        self.connections = 0
+        self.frame_sizes: list[int] = []
+        self.active_scans = 0
+        self.max_active_scans = 0
+        self.scanned_bytes = 0
+        self._server: asyncio.AbstractServer | None = None
+        self.port = 0
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        assert self._server is not None
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer) -> None:
+        self.connections += 1
+        session = False
+        request_id = 0
+        try:
+            while True:
+                command = (await reader.readuntil(b"\0")).rstrip(b"\0")
+                request_id += 1
+                prefix = f"{request_id}: ".encode() if session else b""
+                if command == b"zIDSESSION":
+                    session = True
+                    request_id = 0
+                    continue
+                if command == b"zEND":
+                    break
+                if command == b"zPING":
+                    writer.write(prefix + b"PONG\0")
+                elif command == b"zINSTREAM":
+                    reply = await self._instream(reader)
+                    writer.write(prefix + reply + b"\0")
+                    if reply.endswith(b"ERROR"):
+                        await writer.drain()
+                        break
+                await writer.drain()
+                if not session:
+                    break
+        except asyncio.IncompleteReadError:
+            pass
+        finally:
+            writer.close()
+
+    async def _instream(self, reader) -> bytes:
+        self.active_scans += 1
+        self.max_active_scans = max(self.max_active_scans, self.active_scans)
+        try:
+            tail = b""
+            found = False
+            total = 0
+            while True:
+                (length,) = struct.unpack(">L", await reader.readexactly(4))
+                if length == 0:
+                    break
+                self.frame_sizes.append(length)
+                chunk = await reader.readexactly(length)
+                total += length
+                if self.stream_max_length and total > self.stream_max_length:
+                    return b"INSTREAM size limit exceeded. ERROR"
+                # Keep a tail so signatures split across frames are found
+                found = found or EICAR in tail + chunk
+                tail = chunk[-len(EICAR) :]
+            self.scanned_bytes += total
+            if self.scan_delay:
+                await asyncio.sleep(self.scan_delay)
+            if found:
+                return b"stream: Eicar-Test-Signature FOUND"
+            return b"stream: OK"
+        finally:
+            self.active_scans -= 1
+
+
+@pytest_asyncio.fixture
+async def clamd():
+    server = FakeClamd()
+    await server.start()
+    yield server
+    await server.stop()
+
+
+def make_client(clamd: FakeClamd, **kwargs) -> AsyncClamAVClient:
+    return AsyncClamAVClient("127.0.0.1", clamd.port, timeout=5, **kwargs)
+
+
+def test_parse_scan_reply():
+    assert parse_scan_reply("stream: OK") == (VirusStatus.CLEAN, "File is clean")
+    assert parse_scan_reply("stream: Eicar-Test-Signature FOUND") == (
+        VirusStatus.INFECTED,
+        "Virus detected: Eicar-Test-Signature",
+    )
+    assert parse_scan_reply("garbage")[0] == VirusStatus.ERROR
+
+
+@pytest.mark.asyncio
+async def test_clean_and_infected_streams(clamd):
+    client = make_client(clamd)
+    try:
+        assert await client.ping()
+        assert (await client.instream([b"hello"]))[0] == VirusStatus.CLEAN
+        status, message = await client.instream([b"prefix", EICAR, b"suffix"])
+        assert status == VirusStatus.INFECTED
+        assert "Eicar" in message
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_reused(clamd):
+    client = make_client(clamd, pool_size=2)
+    try:
+        for _ in range(5):
+            await client.instream([b"data"])
+        assert clamd.connections == 1
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_large_chunks_are_framed_at_chunk_size(clamd):
+    client = make_client(clamd, chunk_size=256 * 1024)
+
+    def storage_stream():
+        for _ in range(3):
+            yield b"\0" * MB
+
+    try:
+        status, _ = await client.instream(iterate_in_thread(storage_stream()))
+    finally:
+        await client.close()
+
+    assert status == VirusStatus.CLEAN
+    assert clamd.scanned_bytes == 3 * MB
+    assert set(clamd.frame_sizes) == {256 * 1024}
+
+
+@pytest.mark.asyncio
+async def test_pool_bounds_concurrent_scans():
+    clamd = FakeClamd(scan_delay=0.05)
+    await clamd.start()
+    client = make_client(clamd, pool_size=3)
+    try:
+        results = await asyncio.gather(*(client.instream([b"x"]) for _ in range(10)))
+    finally:
+        await client.close()
+        await clamd.stop()
+
+    assert all(status == VirusStatus.CLEAN for status, _ in results)
+    assert clamd.max_active_scans == 3
+    assert clamd.connections == 3
+
+
+@pytest.mark.asyncio
+async def test_size_limit_error_discards_session():
+    clamd = FakeClamd(stream_max_length=1024)
+    await clamd.start()
+    client = make_client(clamd)
+    try:
+        with pytest.raises(ClamAVError):
+            await client.instream([b"x" * 4096])
+        # The broken session is not reused
+        assert (await client.instream([b"ok"]))[0] == VirusStatus.CLEAN
+        assert clamd.connections == 2
+    finally:
+        await client.close()
+        await clamd.stop()
+
+
+@pytest.mark.asyncio
+async def test_unreachable_clamd_reports_error():
+    client = AsyncClamAVClient("127.0.0.1", 1, timeout=1)
+    service = AntivirusService(client=client)
+
+    status, message = await service._scan_data(b"data")
+
+    assert status == VirusStatus.ERROR
+    assert not await service.ping_clamav()
+
+
+@pytest.mark.asyncio
+async def test_service_streams_objects_from_storage(clamd, blob_storage):
+    blob_storage.objects.update(
+        {"clean.bin": b"a" * (2 * MB), "eicar.txt": b"a" * MB + EICAR}
+    )
+    service = AntivirusService(client=make_client(clamd), storage=blob_storage)
+    try:
+        assert (await service.scan_file_by_s3_key("clean.bin"))[0] == VirusStatus.CLEAN
+        assert (await service.scan_file_by_s3_key("eicar.txt"))[
+            0
+        ] == VirusStatus.INFECTED
+    finally:
+        await service.close()
+
+
+@pytest.mark.asyncio
+async def test_bulk_scan_runs_in_parallel(db_session, test_user, blob_storage):
+    clamd = FakeClamd(scan_delay=0.05)
+    await clamd.start()
+    objects = {f"attachments/{idx}.bin": b"data" for idx in range(8)}
+    objects["attachments/eicar.txt"] = EICAR
+    blob_storage.objects.update(objects)
+    db_session.add_all(
+        Attachment(
+            owner_id=test_user.id,
+            original_filename=s3_key.rsplit("/", 1)[-1],
+            s3_key=s3_key,
+            s3_bucket="test",
+            mime_type="application/octet-stream",
+            file_size=len(data),
+            sha256_hash=hashlib.sha256(data).hexdigest(),
+        )
+        for s3_key, data in objects.items()
+    )
+    await db_session.commit()
+
+    service = AntivirusService(
+        client=make_client(clamd, pool_size=4),
+        session_factory=TestingSessionLocal,
+        storage=blob_storage,
+    )
+    try:
+        scanned = await service.bulk_scan_pending_files(db_session, limit=20)
+    finally:
+        await service.close()
+        await clamd.stop()
+
+    assert scanned == len(objects)
+    assert clamd.max_active_scans > 1
+
+    statuses = dict(
+        (await db_session.execute(select(Attachment.s3_key, Attachment.virus_status)))
+        .tuples()
+        .all()
+    )
+    assert statuses.pop("attachments/eicar.txt") == VirusStatus.INFECTED.value
+    assert set(statuses.values()) == {VirusStatus.CLEAN.value}
@@ -0,0 +1,159 @@
+"""Tests for shared email debounce and digest coalescing."""
+
+import time
+
+import pytest
+
+from app.services import email_digest_service
+from app.services.email_digest_service import EmailDigestService, InMemoryDebounceStore
+
+
+class FakeClock:
+    """Replaces the service's ``time`` module; ``advance`` moves time forward."""
+
+    def __init__(self):
+        self.now = time.time()
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(email_digest_service, "time", fake)
+    return fake
+
+
+class RecordingEmail:
+    """Stands in for EmailService; records what would be queued."""
+
+    def __init__(self):
+        self.sent: list[dict] = []
+
+    async def send_email(self, to_emails, subject, html_body, text_body=None):
+        self.sent.append(
+            {"to": to_emails, "subject": subject, "html": html_body, "text": text_body}
+        )
+        return True
+
+
+@pytest.fixture
+def email() -> RecordingEmail:
+    return RecordingEmail()
+
+
+@pytest.fixture
+def shared_store(email) -> dict:
+    """The debounce store and email service every digest worker shares."""
+    return {"store": InMemoryDebounceStore(), "email": email}
+
+
+async def submit(worker: EmailDigestService, email: RecordingEmail, key: str, n: int):
+    async def send():
+        return await email.send_email(["bob@example.com"], f"Message {n}", "<p/>")
+
+    return await worker.submit(
+        key,
+        "bob@example.com",
+        "Bob",
+        title=f"Message {n}",
+        summary=f"Preview <{n}>",
+        url=f"https://example.com/messages/{n}",
+        send=send,
+    )
+
+
+@pytest.mark.asyncio
+async def test_window_is_shared_across_workers(make_workers, shared_store, email):
+    worker_a, worker_b = make_workers(
+        EmailDigestService, shared=shared_store, window_seconds=1
+    )
+
+    assert await submit(worker_a, email, "message:1_2:2", 1)
+    assert await submit(worker_b, email, "message:1_2:2", 2)
+    assert await submit(worker_a, email, "message:1_2:2", 3)
+
+    # One immediate email; the rest wait for the digest
+    assert [m["subject"] for m in email.sent] == ["Message 1"]
+
+
+@pytest.mark.asyncio
+async def test_queued_emails_go_out_as_one_digest(
+    clock, make_workers, shared_store, email
+):
+    worker_a, worker_b = make_workers(
+        EmailDigestService, shared=shared_store, window_seconds=1
+    )
+    await submit(worker_a, email, "message:1_2:2", 1)
+    await submit(worker_b, email, "message:1_2:2", 2)
+    await submit(worker_b, email, "message:1_3:2", 3)
+    await submit(worker_a, email, "message:1_3:2", 4)
+
+    # Not due yet
+    assert await worker_a.flush_due() == 0
+
+    clock.advance(1.1)
+    assert await worker_a.flush_due() == 1
+    assert await worker_b.flush_due() == 0
+
+    immediate, digest = email.sent[:2], email.sent[2:]
+    assert [m["subject"] for m in immediate] == ["Message 1", "Message 3"]
+    assert len(digest) == 1
+    assert digest[0]["to"] == ["bob@example.com"]
+    assert "2 new notifications" in digest[0]["subject"]
+    assert "Message 2" in digest[0]["text"] and "Message 4" in digest[0]["text"]
+    # Entries are escaped in the HTML part
+    assert "Preview &lt;2&gt;" in digest[0]["html"]
+
+
+@pytest.mark.asyncio
+async def test_digest_reopens_the_window(clock, make_workers, shared_store, email):
+    (worker,) = make_workers(
+        EmailDigestService, 1, shared=shared_store, window_seconds=1
+    )
+    await submit(worker, email, "exam_assignment:5", 1)
+    await submit(worker, email, "exam_assignment:5", 2)
+    clock.advance(1.1)
+    await worker.flush_due()
+
+    # Right after the digest, the next email is coalesced again
+    await submit(worker, email, "exam_assignment:5", 3)
+    assert len(email.sent) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_send_does_not_hold_the_window(make_workers, shared_store, email):
+    (worker,) = make_workers(
+        EmailDigestService, 1, shared=shared_store, window_seconds=300
+    )
+
+    async def failing_send():
+        return False
+
+    assert not await worker.submit(
+        "message:1_2:2",
+        "bob@example.com",
+        "Bob",
+        title="Message",
+        summary="Hi",
+        send=failing_send,
+    )
+    # The retry is sent immediately instead of waiting for a digest
+    assert await submit(worker, email, "message:1_2:2", 2)
+    assert [m["subject"] for m in email.sent] == ["Message 2"]
+
+
+@pytest.mark.asyncio
+async def test_expired_windows_are_purged(clock):
+    store = InMemoryDebounceStore()
+    store._purge_at = 10
+    for idx in range(10):
+        await store.acquire(f"key:{idx}", ttl_seconds=1)
+    clock.advance(1.1)
+
+    assert await store.acquire("key:new", ttl_seconds=1)
+    assert list(store._windows) == ["key:new"]
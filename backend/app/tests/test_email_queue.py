@@ -0,0 +1,285 @@
+"""Tests for the pooled SMTP transport and the outbound email queue."""
+
+import socket
+from datetime import timedelta
+
+import pytest
+from aiosmtpd.controller import Controller
+from sqlalchemy import select
+
+from app.config import settings
+from app.models.outbound_email import OutboundEmail
+from app.services.email_queue_service import (
+    RATE_WINDOW,
+    EmailQueueService,
+    build_message,
+)
+from app.services.email_service import EmailService
+from app.services.smtp_transport import SMTPConnectionPool
+from app.tests.conftest import TestingSessionLocal
+from app.utils.constants import OutboundEmailStatus
+from app.utils.datetime_utils import get_utc_now
+
+
+class SinkHandler:
+    """Accepts everything except recipients at bounce.example (550)."""
+
+    def __init__(self):
+        self.messages: list[tuple[str, list[str]]] = []
+        self.peers: set[tuple[str, int]] = set()
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.endswith("@bounce.example"):
+            return "550 5.1.1 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append((envelope.mail_from, list(envelope.rcpt_tos)))
+        self.peers.add(session.peer)
+        return "250 Message accepted"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_sink():
+    handler = SinkHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+def make_pool(controller: Controller, **kwargs) -> SMTPConnectionPool:
+    return SMTPConnectionPool(controller.hostname, controller.port, timeout=5, **kwargs)
+
+
+def make_queue(transport: SMTPConnectionPool) -> EmailQueueService:
+    return EmailQueueService(transport=transport, session_factory=TestingSessionLocal)
+
+
+async def rows_by_recipient(db_session) -> dict[str, OutboundEmail]:
+    db_session.expire_all()
+    result = await db_session.execute(select(OutboundEmail))
+    return {row.to_email: row for row in result.scalars()}
+
+
+def test_build_message_prefers_html_with_text_fallback():
+    message = build_message("a@example.com", "Hi", "<p>Hi</p>", "Hi")
+    assert message.get_content_type() == "multipart/alternative"
+    assert [part.get_content_type() for part in message.iter_parts()] == [
+        "text/plain",
+        "text/html",
+    ]
+    html_only = build_message("a@example.com", "Hi", "<p>Hi</p>", None)
+    assert html_only.get_content_type() == "text/html"
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_connections(smtp_sink):
+    controller, handler = smtp_sink
+    pool = make_pool(controller, pool_size=2)
+    try:
+        for idx in range(10):
+            await pool.send(
+                build_message(f"user{idx}@example.com", "Hi", "<p>Hi</p>", None)
+            )
+    finally:
+        await pool.close()
+
+    assert len(handler.messages) == 10
+    assert pool.connections_opened == 1
+    assert len(handler.peers) == 1
+
+
+@pytest.mark.asyncio
+async def test_queue_delivers_batch(db_session, smtp_sink):
+    controller, handler = smtp_sink
+    queue = make_queue(make_pool(controller, pool_size=3))
+    await queue.enqueue(
+        [f"user{idx}@example.com" for idx in range(6)], "Hello", "<p>Hello</p>", "Hello"
+    )
+    try:
+        assert await queue.drain() == 6
+    finally:
+        await queue.close()
+
+    assert sorted(rcpt[0] for _, rcpt in handler.messages) == sorted(
+        f"user{idx}@example.com" for idx in range(6)
+    )
+    assert len(handler.peers) <= 3
+    rows = await rows_by_recipient(db_session)
+    assert {row.status for row in rows.values()} == {OutboundEmailStatus.SENT.value}
+
+
+@pytest.mark.asyncio
+async def test_per_domain_rate_limit(db_session, smtp_sink, monkeypatch):
+    controller, handler = smtp_sink
+    monkeypatch.setattr(settings, "email_domain_rate_limits", {"slow.example": 2})
+    queue = make_queue(make_pool(controller))
+    await queue.enqueue(
+        [f"user{idx}@slow.example" for idx in range(5)] + ["user@fast.example"],
+        "Hello",
+        "<p>Hello</p>",
+    )
+    try:
+        assert await queue.drain() == 3
+    finally:
+        await queue.close()
+
+    rows = await rows_by_recipient(db_session)
+    statuses = [row.status for email, row in rows.items() if "slow" in email]
+    assert statuses.count(OutboundEmailStatus.SENT.value) == 2
+    assert statuses.count(OutboundEmailStatus.QUEUED.value) == 3
+    assert rows["user@fast.example"].status == OutboundEmailStatus.SENT.value
+
+
+@pytest.mark.asyncio
+async def test_throttled_backlog_does_not_starve_other_domains(
+    db_session, smtp_sink, monkeypatch
+):
+    controller, handler = smtp_sink
+    monkeypatch.setattr(settings, "email_domain_rate_limits", {"slow.example": 2})
+    queue = make_queue(make_pool(controller))
+    await queue.enqueue(["a@slow.example", "b@slow.example"], "Hi", "<p>Hi</p>")
+    # A backlog for the throttled domain, queued ahead of another domain
+    await queue.enqueue(
+        [f"user{idx}@slow.example" for idx in range(10)], "Hi", "<p>Hi</p>"
+    )
+    await queue.enqueue(["x@fast.example", "y@fast.example"], "Hi", "<p>Hi</p>")
+    try:
+        assert await queue.deliver_batch(limit=2) == 2
+        # slow.example is over budget; its older rows must not fill the batch
+        assert await queue.deliver_batch(limit=3) == 2
+        assert await queue.deliver_batch(limit=3) == 0
+    finally:
+        await queue.close()
+
+    rows = await rows_by_recipient(db_session)
+    assert rows["x@fast.example"].status == OutboundEmailStatus.SENT.value
+    assert rows["y@fast.example"].status == OutboundEmailStatus.SENT.value
+    assert all(
+        row.status == OutboundEmailStatus.QUEUED.value
+        for email, row in rows.items()
+        if email.startswith("user")
+    )
+
+
+@pytest.mark.asyncio
+async def test_domain_without_budget_is_held_back(db_session, smtp_sink, monkeypatch):
+    controller, handler = smtp_sink
+    monkeypatch.setattr(settings, "email_domain_rate_limits", {"paused.example": 0})
+    queue = make_queue(make_pool(controller))
+    await queue.enqueue(["a@paused.example", "b@paused.example"], "Hi", "<p>Hi</p>")
+    await queue.enqueue(["x@fast.example"], "Hi", "<p>Hi</p>")
+    try:
+        assert await queue.deliver_batch(limit=5) == 1
+        assert await queue.deliver_batch(limit=5) == 0
+    finally:
+        await queue.close()
+
+    rows = await rows_by_recipient(db_session)
+    assert rows["x@fast.example"].status == OutboundEmailStatus.SENT.value
+    assert rows["a@paused.example"].status == OutboundEmailStatus.QUEUED.value
+
+
+@pytest.mark.asyncio
+async def test_permanent_rejection_fails_without_retry(db_session, smtp_sink):
+    controller, handler = smtp_sink
+    queue = make_queue(make_pool(controller))
+    await queue.enqueue(["nobody@bounce.example", "ok@example.com"], "Hi", "<p>Hi</p>")
+    try:
+        await queue.deliver_batch()
+    finally:
+        await queue.close()
+
+    rows = await rows_by_recipient(db_session)
+    bounced = rows["nobody@bounce.example"]
+    assert bounced.status == OutboundEmailStatus.FAILED.value
+    assert bounced.attempts == 1
+    assert "No such user" in bounced.last_error
+    # The rejection did not break the pooled session for the next message
+    assert rows["ok@example.com"].status == OutboundEmailStatus.SENT.value
+
+
+@pytest.mark.asyncio
+async def test_unreachable_server_is_retried_later(db_session):
+    pool = SMTPConnectionPool("127.0.0.1", free_port(), timeout=1)
+    queue = make_queue(pool)
+    await queue.enqueue(["user@example.com"], "Hi", "<p>Hi</p>")
+
+    assert await queue.deliver_batch() == 1
+    # Backed off: not due again immediately
+    assert await queue.deliver_batch() == 0
+
+    rows = await rows_by_recipient(db_session)
+    row = rows["user@example.com"]
+    assert row.status == OutboundEmailStatus.QUEUED.value
+    assert row.attempts == 1
+    assert row.last_error
+
+
+@pytest.mark.asyncio
+async def test_purge_removes_finished_rows_past_the_rate_window(db_session):
+    now = get_utc_now()
+    old = now - RATE_WINDOW - timedelta(seconds=5)
+
+    def row(to_email: str, status: OutboundEmailStatus, **kwargs) -> OutboundEmail:
+        return OutboundEmail(
+            to_email=to_email,
+            recipient_domain="example.com",
+            subject="Your code",
+            html_body="<p>123456</p>",
+            status=status.value,
+            next_attempt_at=old,
+            **kwargs,
+        )
+
+    db_session.add_all(
+        [
+            row("old-sent@example.com", OutboundEmailStatus.SENT, sent_at=old),
+            row("new-sent@example.com", OutboundEmailStatus.SENT, sent_at=now),
+            row("old-failed@example.com", OutboundEmailStatus.FAILED, updated_at=old),
+            row("new-failed@example.com", OutboundEmailStatus.FAILED, updated_at=now),
+            row("queued@example.com", OutboundEmailStatus.QUEUED, updated_at=old),
+        ]
+    )
+    await db_session.commit()
+
+    queue = EmailQueueService(session_factory=TestingSessionLocal)
+    assert await queue.purge_finished(batch_size=1) == 2
+
+    rows = await rows_by_recipient(db_session)
+    assert sorted(rows) == [
+        "new-failed@example.com",
+        "new-sent@example.com",
+        "queued@example.com",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_send_email_only_queues(db_session, smtp_sink):
+    controller, handler = smtp_sink
+
+    class RecordingQueue(EmailQueueService):
+        dispatched = 0
+
+        def dispatch(self) -> None:
+            self.dispatched += 1
+
+    queue = RecordingQueue(
+        transport=make_pool(controller), session_factory=TestingSessionLocal
+    )
+    service = EmailService(queue=queue)
+
+    assert await service.send_email(["user@example.com"], "Hi", "<p>Hi</p>", "Hi")
+    assert queue.dispatched == 1
+    assert handler.messages == []
+
+    rows = await rows_by_recipient(db_session)
+    assert rows["user@example.com"].status == OutboundEmailStatus.QUEUED.value
@@ -0,0 +1,115 @@
+"""Tests and benchmark for the compiled email template registry."""
+
+import os
+import time
+
+import pytest
+
+import app.services.email_preview_service as email_preview_module
+from app.services.email_preview_service import EmailPreviewService
+from app.services.email_template_service import EmailTemplateService, _Fragments
+
+
+def write_templates(directory, body: str) -> None:
+    (directory / "base.html").write_text(
+        "<title>{{ subject }}</title><h1>{{ header_title }}</h1>{{ content }}"
+    )
+    (directory / "greeting.html").write_text(body)
+    (directory / "greeting.txt").write_text("Hi {{ name }}")
+
+
+def test_fragments_substitute_placeholders():
+    fragments = _Fragments("<p>{{ name }} / {{name}} / {{ missing }}</p>")
+    assert fragments.render({"name": "Ann"}) == "<p>Ann / Ann / </p>"
+
+    fallback = _Fragments("{{ name }} {{ missing }}", keep_missing=True)
+    assert fallback.render({"name": "Ann"}) == "Ann {{ missing }}"
+
+    assert _Fragments.supports("<p>{{ name }}</p>")
+    assert not _Fragments.supports("{% if name %}{{ name }}{% endif %}")
+    assert not _Fragments.supports("{{ name | upper }}")
+
+
+def test_templates_are_compiled_once(tmp_path):
+    write_templates(tmp_path, "<p>Hello {{ name }}</p>")
+    service = EmailTemplateService(template_dir=tmp_path)
+
+    for _ in range(5):
+        html, text = service.render_email_template(
+            "greeting", {"name": "Ann"}, "Subject", "Header"
+        )
+
+    assert html == "<title>Subject</title><h1>Header</h1><p>Hello Ann</p>"
+    assert text == "Hi Ann"
+    assert service.compile_count == 3
+
+
+def test_changed_template_is_recompiled(tmp_path):
+    write_templates(tmp_path, "<p>Hello {{ name }}</p>")
+    service = EmailTemplateService(template_dir=tmp_path)
+    service.render_email_template("greeting", {"name": "Ann"}, "S")
+
+    body = tmp_path / "greeting.html"
+    body.write_text("<p>Welcome {{ name }}</p>")
+    stat = body.stat()
+    os.utime(body, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    html, _ = service.render_email_template("greeting", {"name": "Ann"}, "S")
+    assert "Welcome Ann" in html
+    assert service.compile_count == 4
+
+
+def test_missing_template_raises_value_error(tmp_path):
+    write_templates(tmp_path, "<p>{{ name }}</p>")
+    service = EmailTemplateService(template_dir=tmp_path)
+    with pytest.raises(ValueError, match="Template not found"):
+        service.render_email_template("unknown", {}, "S")
+
+
+def test_preload_compiles_every_template():
+    service = EmailTemplateService()
+    count = service.preload()
+
+    assert count == service.compile_count > 0
+    service.render_email_template(
+        "auth/2fa_code", {"user_name": "Ann", "code": "123456"}, "S"
+    )
+    assert service.compile_count == count
+
+
+def test_preview_all_emails_reuses_compiled_templates(monkeypatch):
+    service = EmailTemplateService()
+    monkeypatch.setattr(email_preview_module, "email_template_service", service)
+    previews = EmailPreviewService()
+
+    previews.preview_all_emails()
+    compiled = service.compile_count
+    for _ in range(5):
+        results = previews.preview_all_emails()
+
+    assert compiled > 0
+    assert service.compile_count == compiled
+    assert all("error" not in result for result in results.values())
+    assert "John" in results["auth/activation"]["html_body"]
+
+
+@pytest.mark.benchmark
+def test_preview_all_emails_benchmark(monkeypatch):
+    service = EmailTemplateService()
+    monkeypatch.setattr(email_preview_module, "email_template_service", service)
+    previews = EmailPreviewService()
+    rounds = 200
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        # Forget compiled templates: every render reads and compiles again
+        service._registry.clear()
+        previews.preview_all_emails()
+    uncached = rounds / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        previews.preview_all_emails()
+    cached = rounds / (time.perf_counter() - started)
+
+    print(f"preview_all_emails/sec: uncached={uncached:.0f} compiled={cached:.0f}")
@@ -0,0 +1,169 @@
+"""Tests for the cached subscription entitlement resolver."""
+
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.crud.plan_feature import plan_feature as plan_feature_crud
+from app.dependencies import require_feature, require_permission
+from app.models.company_subscription import CompanySubscription
+from app.models.feature import Feature
+from app.models.role import UserRole
+from app.models.subscription_plan import SubscriptionPlan
+from app.models.user import User
+from app.services.entitlement_service import EntitlementResolver, entitlement_resolver
+from app.services.pubsub_service import InMemoryPubSub
+from app.services.subscription_service import subscription_service
+from app.tests.test_message_inbox import count_queries
+
+
+@pytest_asyncio.fixture
+async def plan_with_features(db_session, test_company):
+    """A plan with a parent feature and one of its two sub-features."""
+    plan = SubscriptionPlan(
+        name="premium", display_name="Premium", price_monthly=Decimal("100")
+    )
+    parent = Feature(
+        name="user_management",
+        display_name="User management",
+        permission_key="user_management",
+    )
+    db_session.add_all([plan, parent])
+    await db_session.flush()
+    deactivate = Feature(
+        name="deactivate_user",
+        display_name="Deactivate",
+        parent_feature_id=parent.id,
+        permission_key="user_management.deactivate",
+    )
+    suspend = Feature(
+        name="suspend_user",
+        display_name="Suspend",
+        parent_feature_id=parent.id,
+        permission_key="user_management.suspend",
+    )
+    db_session.add_all([deactivate, suspend])
+    await db_session.flush()
+    db_session.add(CompanySubscription(company_id=test_company.id, plan_id=plan.id))
+    await db_session.commit()
+
+    await plan_feature_crud.add_feature_to_plan(
+        db_session, plan_id=plan.id, feature_id=parent.id
+    )
+    await plan_feature_crud.add_feature_to_plan(
+        db_session, plan_id=plan.id, feature_id=deactivate.id
+    )
+    return plan, suspend
+
+
+@pytest.mark.asyncio
+async def test_plan_is_compiled_into_flat_sets(
+    db_session, test_company, plan_with_features
+):
+    entitlements = await subscription_service.get_entitlements(
+        db_session, company_id=test_company.id
+    )
+
+    assert entitlements.features == {"user_management", "deactivate_user"}
+    assert entitlements.permissions == {
+        "user_management",
+        "user_management.deactivate",
+    }
+    assert await subscription_service.check_permission(
+        db_session,
+        company_id=test_company.id,
+        permission_key="user_management.suspend",
+    ) == (False, "Permission 'user_management.suspend' not available in your plan")
+
+
+@pytest.mark.asyncio
+async def test_checks_are_served_without_queries(
+    db_session, test_company, plan_with_features
+):
+    await subscription_service.check_feature_access(
+        db_session, company_id=test_company.id, feature_name="user_management"
+    )
+
+    with count_queries() as statements:
+        for _ in range(50):
+            assert (
+                await subscription_service.check_feature_access(
+                    db_session,
+                    company_id=test_company.id,
+                    feature_name="user_management",
+                )
+            )[0]
+            assert (
+                await subscription_service.check_permission(
+                    db_session,
+                    company_id=test_company.id,
+                    permission_key="user_management.deactivate",
+                )
+            )[0]
+
+    assert statements == []
+
+
+@pytest.mark.asyncio
+async def test_plan_feature_edit_invalidates(
+    db_session, test_company, plan_with_features
+):
+    plan, suspend = plan_with_features
+    before = await entitlement_resolver.resolve(db_session, test_company.id)
+    assert not before.has_permission("user_management.suspend")
+
+    await plan_feature_crud.add_feature_to_plan(
+        db_session, plan_id=plan.id, feature_id=suspend.id
+    )
+    await entitlement_resolver.invalidate_plan(plan.id)
+
+    after = await entitlement_resolver.resolve(db_session, test_company.id)
+    assert after.has_permission("user_management.suspend")
+
+
+@pytest.mark.asyncio
+async def test_invalidation_reaches_other_workers(
+    db_session, test_company, plan_with_features
+):
+    pubsub = InMemoryPubSub()
+    worker_a = EntitlementResolver(pubsub=pubsub)
+    worker_b = EntitlementResolver(pubsub=pubsub)
+    await worker_a.resolve(db_session, test_company.id)
+    await worker_b.resolve(db_session, test_company.id)
+
+    # A plan change approved on worker A
+    subscription = (
+        await db_session.execute(
+            select(CompanySubscription).where(
+                CompanySubscription.company_id == test_company.id
+            )
+        )
+    ).scalar_one()
+    subscription.is_active = False
+    await db_session.commit()
+    await worker_a.invalidate_company(test_company.id)
+
+    entitlements = await worker_b.resolve(db_session, test_company.id)
+    assert not entitlements.has_subscription
+    assert worker_b.compile_count == 1
+
+
+@pytest.mark.asyncio
+async def test_dependencies_gate_on_the_plan(db_session, test_user, plan_with_features):
+    result = await db_session.execute(
+        select(User)
+        .where(User.id == test_user.id)
+        .options(selectinload(User.user_roles).selectinload(UserRole.role))
+    )
+    user = result.scalar_one()
+
+    allowed = require_permission("user_management.deactivate")
+    assert await allowed(current_user=user, db=db_session) is user
+
+    with pytest.raises(HTTPException) as exc_info:
+        await require_feature("suspend_user")(current_user=user, db=db_session)
+    assert exc_info.value.status_code == 403
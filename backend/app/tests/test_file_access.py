@@ -0,0 +1,141 @@
+"""Tests for the file-access index used by download permission checks."""
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.message import Message
+from app.models.user import User
+from app.services.file_access_service import (
+    FileAccessCache,
+    FileAccessService,
+    normalize_file_key,
+)
+from app.tests.test_message_inbox import count_queries
+
+FILE_URL = (
+    "http://localhost:8000/api/files/download/message-attachments/1/2025/11/a%20b.pdf"
+)
+FILE_KEY = "message-attachments/1/2025/11/a b.pdf"
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        FILE_URL,
+        "/api/files/download/message-attachments/1/2025/11/a%20b.pdf",
+        FILE_KEY,
+        "/" + FILE_KEY,
+    ],
+)
+def test_normalize_file_key_accepts_urls_and_keys(value):
+    assert normalize_file_key(value) == FILE_KEY
+
+
+@pytest.mark.parametrize("value", [None, "", "/", "a/../../etc/passwd", "x" * 501])
+def test_normalize_file_key_rejects_invalid_keys(value):
+    assert normalize_file_key(value) is None
+
+
+def test_cache_expires_and_forgets_keys():
+    cache = FileAccessCache(ttl_seconds=60, max_entries=2)
+    cache.grant(1, "a")
+    cache.grant(2, "a")
+    cache.grant(3, "b")
+
+    # Oldest entry evicted once the cache is full
+    assert not cache.is_granted(1, "a")
+    assert cache.is_granted(2, "a")
+
+    cache.forget("a")
+    assert not cache.is_granted(2, "a")
+    assert cache.is_granted(3, "b")
+
+    expired = FileAccessCache(ttl_seconds=0)
+    expired.grant(1, "a")
+    assert not expired.is_granted(1, "a")
+
+
+async def _message_with_file(
+    db_session: AsyncSession, service: FileAccessService, sender: User, recipient: User
+) -> Message:
+    message = Message(
+        sender_id=sender.id,
+        recipient_id=recipient.id,
+        content="📎 a b.pdf",
+        type="file",
+        file_url=FILE_URL,
+        file_name="a b.pdf",
+    )
+    db_session.add(message)
+    await db_session.flush()
+    service.grant_message(db_session, message)
+    await db_session.commit()
+    return message
+
+
+@pytest.mark.asyncio
+async def test_message_participants_can_access_file(
+    db_session: AsyncSession, test_user: User, test_admin_user: User
+):
+    service = FileAccessService(cache=FileAccessCache(ttl_seconds=60))
+    await _message_with_file(db_session, service, test_user, test_admin_user)
+
+    assert await service.can_access(db_session, test_user.id, FILE_KEY)
+    assert await service.can_access(db_session, test_admin_user.id, FILE_URL)
+    assert not await service.can_access(
+        db_session, test_user.id, "message-attachments/1/2025/11/other.pdf"
+    )
+
+
+@pytest.mark.asyncio
+async def test_outsider_and_deleted_message_are_denied(
+    db_session: AsyncSession,
+    test_user: User,
+    test_admin_user: User,
+    test_employer_user: User,
+):
+    service = FileAccessService(cache=FileAccessCache(ttl_seconds=0))
+    message = await _message_with_file(db_session, service, test_user, test_admin_user)
+
+    assert not await service.can_access(db_session, test_employer_user.id, FILE_KEY)
+
+    message.is_deleted_by_recipient = True
+    await db_session.commit()
+    assert not await service.can_access(db_session, test_admin_user.id, FILE_KEY)
+    assert await service.can_access(db_session, test_user.id, FILE_KEY)
+
+
+@pytest.mark.asyncio
+async def test_owner_grant_and_revoke(db_session: AsyncSession, test_user: User):
+    service = FileAccessService(cache=FileAccessCache(ttl_seconds=60))
+    service.grant_owner(db_session, FILE_URL, test_user.id)
+    await db_session.commit()
+    assert await service.can_access(db_session, test_user.id, FILE_KEY)
+
+    await service.revoke(db_session, FILE_KEY)
+    await db_session.commit()
+    assert not await service.can_access(db_session, test_user.id, FILE_KEY)
+
+
+@pytest.mark.asyncio
+async def test_system_admin_can_access_unindexed_file(
+    db_session: AsyncSession, test_system_admin: User
+):
+    service = FileAccessService(cache=FileAccessCache(ttl_seconds=60))
+    assert await service.can_access(db_session, test_system_admin.id, FILE_KEY)
+
+
+@pytest.mark.asyncio
+async def test_granted_check_is_cached(
+    db_session: AsyncSession, test_user: User, test_admin_user: User
+):
+    service = FileAccessService(cache=FileAccessCache(ttl_seconds=60))
+    await _message_with_file(db_session, service, test_user, test_admin_user)
+
+    with count_queries() as statements:
+        assert await service.can_access(db_session, test_user.id, FILE_KEY)
+    assert len(statements) == 1
+
+    with count_queries() as statements:
+        assert await service.can_access(db_session, test_user.id, FILE_KEY)
+    assert statements == []
@@ -0,0 +1,150 @@
+"""Tests for Range/ETag streaming of local files and storage objects."""
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI, Request
+from httpx import AsyncClient
+
+from app.services.file_streaming import (
+    RangeNotSatisfiableError,
+    etag_matches,
+    local_file_response,
+    parse_range_header,
+    storage_object_response,
+)
+
+CONTENT = bytes(range(256)) * 4096  # 1 MiB, position-dependent bytes
+
+
+@pytest.fixture
+def media_file(tmp_path):
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(CONTENT)
+    return path
+
+
+@pytest.fixture
+def storage(blob_storage):
+    blob_storage.put_file_data("videos/clip.mp4", CONTENT, "video/mp4")
+    return blob_storage
+
+
+@pytest_asyncio.fixture
+async def stream_client(media_file, storage):
+    app = FastAPI()
+
+    @app.get("/local")
+    async def local(request: Request):
+        return await local_file_response(request, media_file)
+
+    @app.get("/object")
+    async def stored(request: Request):
+        return await storage_object_response(
+            request, "videos/clip.mp4", storage=storage, inline=False
+        )
+
+    async with AsyncClient(app=app, base_url="http://testserver") as client:
+        yield client
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, None),
+        ("bytes=0-99", (0, 99)),
+        ("bytes=100-", (100, 999)),
+        ("bytes=-10", (990, 999)),
+        ("bytes=-5000", (0, 999)),
+        ("bytes=900-5000", (900, 999)),
+        ("bytes=0-1,5-9", None),
+        ("items=0-10", None),
+        ("bytes=abc-", None),
+    ],
+)
+def test_parse_range_header(header, expected):
+    assert parse_range_header(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=50-10", "bytes=-0"])
+def test_parse_range_header_unsatisfiable(header):
+    with pytest.raises(RangeNotSatisfiableError):
+        parse_range_header(header, 1000)
+
+
+def test_etag_matches_lists_and_weak_tags():
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/local", "/object"])
+async def test_full_response_advertises_ranges(stream_client, path):
+    response = await stream_client.get(path)
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-length"] == str(len(CONTENT))
+    assert response.headers["etag"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/local", "/object"])
+async def test_range_request_returns_partial_content(stream_client, path):
+    response = await stream_client.get(path, headers={"Range": "bytes=1000-1999"})
+
+    assert response.status_code == 206
+    assert response.content == CONTENT[1000:2000]
+    assert response.headers["content-range"] == f"bytes 1000-1999/{len(CONTENT)}"
+    assert response.headers["content-length"] == "1000"
+
+
+@pytest.mark.asyncio
+async def test_object_range_reads_only_the_requested_bytes(stream_client, storage):
+    await stream_client.get("/object", headers={"Range": "bytes=-100"})
+
+    assert storage.reads == [(len(CONTENT) - 100, len(CONTENT))]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/local", "/object"])
+async def test_matching_etag_returns_not_modified(stream_client, path):
+    etag = (await stream_client.get(path)).headers["etag"]
+
+    response = await stream_client.get(path, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/local", "/object"])
+async def test_unsatisfiable_range_returns_416(stream_client, path):
+    response = await stream_client.get(
+        path, headers={"Range": f"bytes={len(CONTENT)}-"}
+    )
+
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+
+
+@pytest.mark.asyncio
+async def test_stale_if_range_serves_full_body(stream_client):
+    response = await stream_client.get(
+        "/local", headers={"Range": "bytes=0-9", "If-Range": '"stale"'}
+    )
+
+    assert response.status_code == 200
+    assert len(response.content) == len(CONTENT)
+
+
+@pytest.mark.asyncio
+async def test_disposition_follows_inline_flag(stream_client):
+    local = await stream_client.get("/local")
+    stored = await stream_client.get("/object")
+
+    assert local.headers["content-disposition"] == 'inline; filename="clip.mp4"'
+    assert stored.headers["content-disposition"] == 'attachment; filename="clip.mp4"'
+    assert local.headers["content-type"] == "video/mp4"
@@ -1,33 +1,33 @@
+import hashlib
 import io
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.attachment import Attachment
+from app.models.file_blob import FileBlob
 from app.models.user import User
+from app.services.blob_store import blob_key, blob_store
+from app.utils.constants import VirusStatus
+from app.utils.datetime_utils import get_utc_now
 
 
 class TestFiles:
     """Comprehensive tests for file management functionality."""
 
     @pytest.mark.asyncio
-    @patch("app.services.storage_service.get_storage_service")
     async def test_upload_file_success(
         self,
-        mock_get_storage_service,
         client: AsyncClient,
         auth_headers: dict,
-        test_user: User,
+        blob_storage,
+        queued_scans: list[int],
     ):
         """Test successful file upload."""
-        # Create test file first to get correct size
         file_content = b"Test file content"
-
-        # Don't mock storage service - let it use the actual local storage for this test
-        # This will test the real upload flow
-
-        # Create test file data
         file_data = {"file": ("test.txt", io.BytesIO(file_content), "text/plain")}
 
         response = await client.post(
@@ -50,16 +50,97 @@ class TestFiles:
         assert data["file_size"] == len(file_content)
         assert data["file_type"] == "text/plain"
         assert data["success"] is True
-        # Verify that the s3_key contains the expected pattern with UUID
-        assert "message-attachments" in data["s3_key"]
-        assert "test.txt" in data["s3_key"]
-        # Verify UUID pattern is present (UUID format: 8-4-4-4-12 characters)
-        import re
-
-        uuid_pattern = r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
-        assert re.search(uuid_pattern, data["s3_key"]), (
-            f"UUID pattern not found in {data['s3_key']}"
+        # Attachments are stored under their content hash
+        digest = hashlib.sha256(file_content).hexdigest()
+        assert data["s3_key"] == blob_key(digest)
+        assert blob_storage.objects[data["s3_key"]] == file_content
+        assert data["virus_status"] == VirusStatus.PENDING.value
+        assert queued_scans == [data["attachment_id"]]
+
+    @pytest.mark.asyncio
+    async def test_duplicate_uploads_share_blob(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        super_admin_auth_headers: dict,
+        db_session: AsyncSession,
+        blob_storage,
+        queued_scans: list[int],
+    ):
+        """Test identical uploads store, scan and delete one object."""
+
+        async def upload(filename: str) -> dict:
+            file_data = {"file": (filename, io.BytesIO(b"same bytes"), "text/plain")}
+            response = await client.post(
+                "/api/files/upload", files=file_data, headers=auth_headers
+            )
+            assert response.status_code == 200
+            return response.json()
+
+        first = await upload("a.txt")
+        second = await upload("b.txt")
+        assert first["s3_key"] == second["s3_key"]
+        assert first["attachment_id"] != second["attachment_id"]
+        assert blob_storage.client.puts == 1
+
+        attachment = await db_session.get(Attachment, first["attachment_id"])
+        blob = await db_session.get(FileBlob, attachment.blob_id)
+        assert blob.ref_count == 2
+
+        # Once the content has a verdict, new copies inherit it unscanned
+        attachment.virus_status = VirusStatus.CLEAN.value
+        attachment.scanned_at = get_utc_now()
+        await blob_store.record_verdict(db_session, attachment)
+        await db_session.commit()
+        third = await upload("c.txt")
+        assert third["virus_status"] == VirusStatus.CLEAN.value
+        assert queued_scans == [first["attachment_id"], second["attachment_id"]]
+        assert blob_storage.client.puts == 1
+
+        response = await client.delete(
+            f"/api/files/{first['s3_key']}", headers=super_admin_auth_headers
         )
+        assert response.status_code == 200
+        assert first["s3_key"] not in blob_storage.objects
+        db_session.expire_all()
+        remaining = await db_session.execute(
+            select(Attachment).where(Attachment.s3_key == first["s3_key"])
+        )
+        assert remaining.scalars().all() == []
+
+    @pytest.mark.asyncio
+    async def test_uploaded_attachment_downloads_from_file_url(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        blob_storage,
+        monkeypatch,
+    ):
+        """Test the returned file_url serves the attachment bytes."""
+        from app.services import storage_service
+
+        monkeypatch.setattr(
+            storage_service, "get_storage_service", lambda: blob_storage
+        )
+        file_content = b"%PDF-1.4 attachment body"
+        file_data = {
+            "file": ("report.pdf", io.BytesIO(file_content), "application/pdf")
+        }
+        upload = await client.post(
+            "/api/files/upload", files=file_data, headers=auth_headers
+        )
+        assert upload.status_code == 200
+
+        # The messages page fetches file_url with ?download=true and saves the body
+        response = await client.get(
+            upload.json()["file_url"],
+            params={"download": "true"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.content == file_content
+        assert response.headers["content-disposition"].startswith("attachment")
 
     @pytest.mark.asyncio
     async def test_upload_file_unauthorized(self, client: AsyncClient):
@@ -158,17 +239,11 @@ class TestFiles:
                 assert data["success"] is True
 
     @pytest.mark.asyncio
-    @patch("app.services.local_storage_service.get_local_storage_service")
     async def test_upload_file_storage_error(
-        self, mock_get_local_storage_service, client: AsyncClient, auth_headers: dict
+        self, client: AsyncClient, auth_headers: dict, blob_storage
     ):
         """Test file upload with storage service error."""
-        # Mock local storage service to raise exception
-        mock_storage = Mock()
-        mock_storage.upload_file_data = AsyncMock(
-            side_effect=Exception("Storage error")
-        )
-        mock_get_local_storage_service.return_value = mock_storage
+        blob_storage.client.put_object = Mock(side_effect=Exception("Storage error"))
 
         file_data = {"file": ("test.txt", io.BytesIO(b"content"), "text/plain")}
 
@@ -190,7 +265,7 @@ class TestFiles:
         client: AsyncClient,
         auth_headers: dict,
     ):
-        """Test successful file download URL generation."""
+        """Test presigned download URL generation on request."""
         # Mock permission check to return True
         mock_check_permission.return_value = True
 
@@ -205,7 +280,9 @@ class TestFiles:
         test_s3_key = "attachments/1/2024/01/uuid_test.txt"
 
         response = await client.get(
-            f"/api/files/download/{test_s3_key}", headers=auth_headers
+            f"/api/files/download/{test_s3_key}",
+            params={"presign": "true"},
+            headers=auth_headers,
         )
 
         assert response.status_code == 200
@@ -249,7 +326,7 @@ class TestFiles:
 
         # Mock storage service to return file not found
         mock_storage = Mock()
-        mock_storage.file_exists = Mock(return_value=False)
+        mock_storage.get_file_info = Mock(return_value=None)
         mock_get_storage_service.return_value = mock_storage
 
         response = await client.get(
@@ -278,7 +355,7 @@ class TestFiles:
 
         # Mock MinIO storage service to raise exception
         mock_storage = Mock()
-        mock_storage.file_exists = Mock(side_effect=Exception("Storage error"))
+        mock_storage.get_file_info = Mock(side_effect=Exception("Storage error"))
         mock_get_storage_service.return_value = mock_storage
 
         # Mock local storage service to also raise exception
@@ -389,7 +466,7 @@ class TestFiles:
         """Test file deletion with storage service error."""
         # Mock storage service to raise exception
         mock_storage = Mock()
-        mock_storage.file_exists = Mock(side_effect=Exception("Storage error"))
+        mock_storage.get_file_info = Mock(side_effect=Exception("Storage error"))
         mock_get_storage_service.return_value = mock_storage
 
         response = await client.delete(
@@ -497,7 +574,9 @@ class TestFiles:
         nested_s3_key = "attachments/user/123/2024/01/uuid_test.txt"
 
         response = await client.get(
-            f"/api/files/download/{nested_s3_key}", headers=auth_headers
+            f"/api/files/download/{nested_s3_key}",
+            params={"presign": "true"},
+            headers=auth_headers,
         )
 
         assert response.status_code == 200
@@ -591,7 +670,9 @@ class TestFiles:
         ):
             # Mock MinIO storage service to fail (no connection)
             mock_minio = Mock()
-            mock_minio.file_exists = Mock(side_effect=Exception("MinIO not available"))
+            mock_minio.get_file_info = Mock(
+                side_effect=Exception("MinIO not available")
+            )
             mock_storage_service.return_value = mock_minio
 
             # Mock local storage service with proper base_path
@@ -659,7 +740,9 @@ class TestFiles:
         ):
             # Mock MinIO storage service to fail (no connection)
             mock_minio = Mock()
-            mock_minio.file_exists = Mock(side_effect=Exception("MinIO not available"))
+            mock_minio.get_file_info = Mock(
+                side_effect=Exception("MinIO not available")
+            )
             mock_storage_service.return_value = mock_minio
 
             # Mock local storage service with proper base_path
@@ -733,7 +816,9 @@ class TestFiles:
         ):
             # Mock MinIO storage service to fail (no connection)
             mock_minio = Mock()
-            mock_minio.file_exists = Mock(side_effect=Exception("MinIO not available"))
+            mock_minio.get_file_info = Mock(
+                side_effect=Exception("MinIO not available")
+            )
             mock_storage_service.return_value = mock_minio
 
             # Mock local storage service with proper base_path
@@ -0,0 +1,159 @@
+"""Tests and a 2,000-node benchmark for workflow graph analysis."""
+
+import random
+import time
+
+import pytest
+
+from app.crud.workflow.workflow_node import workflow_node as workflow_node_crud
+from app.crud.workflow.workflow_node_connection import (
+    workflow_node_connection as connection_crud,
+)
+from app.models.workflow import Workflow
+from app.services.workflow.graph_analysis import (
+    analyze_graph,
+    flow_validation_result,
+    strongly_connected_components,
+    topological_order,
+)
+from app.services.workflow.workflow_engine import workflow_engine
+from app.tests.test_message_inbox import count_queries
+
+
+def generated_workflow(size: int, seed: int = 7) -> tuple[list[int], list[tuple]]:
+    """A forward-only workflow: a main path plus random skip-ahead branches."""
+    rng = random.Random(seed)
+    node_ids = list(range(1, size + 1))
+    edges = [(node_id, node_id + 1) for node_id in node_ids[:-1]]
+    for node_id in node_ids[:-2]:
+        edges.append((node_id, rng.randint(node_id + 2, min(node_id + 20, size))))
+    return node_ids, edges
+
+
+def test_acyclic_graph_is_ordered():
+    analysis = analyze_graph([1, 2, 3, 4], [(1, 2), (1, 3), (2, 4), (3, 4)])
+
+    assert analysis.topological_order == (1, 2, 3, 4)
+    assert analysis.start_node_ids == (1,)
+    assert analysis.end_node_ids == (4,)
+    assert not analysis.has_cycles
+    assert analysis.unreachable_node_ids == ()
+    assert analysis.dead_end_node_ids == ()
+
+
+def test_cycles_are_reported_with_their_paths():
+    # 2 -> 3 -> 4 -> 2 loops, 5 loops on itself, and 6 is only reached from 5
+    edges = [(1, 2), (2, 3), (3, 4), (4, 2), (4, 7), (5, 5), (5, 6)]
+    analysis = analyze_graph(range(1, 8), edges)
+
+    assert analysis.cycles == ((2, 3, 4, 2), (5, 5))
+    assert analysis.topological_order is None
+    assert analysis.start_node_ids == (1,)
+    assert analysis.unreachable_node_ids == (5, 6)
+    assert analysis.dead_end_node_ids == ()
+
+
+def test_closed_loop_is_a_dead_end():
+    analysis = analyze_graph([1, 2, 3, 4], [(1, 2), (2, 3), (3, 2), (1, 4)])
+
+    assert analysis.cycles == ((2, 3, 2),)
+    assert analysis.dead_end_node_ids == (2, 3)
+
+    result = flow_validation_result(analysis)
+    assert not result["is_valid"]
+    cycle_issue = next(i for i in result["issues"] if i["type"] == "cycle_detected")
+    assert cycle_issue["paths"] == [[2, 3, 2]]
+    assert {w["type"] for w in result["warnings"]} == {"dead_end_nodes"}
+
+
+def test_deep_chains_do_not_recurse():
+    node_ids = list(range(50_000))
+    edges = list(zip(node_ids, node_ids[1:], strict=False))
+    edges.append((node_ids[-1], node_ids[0]))
+
+    components = strongly_connected_components(node_ids, {s: [t] for s, t in edges})
+    assert len(components) == 1
+    assert topological_order(node_ids, {s: [t] for s, t in edges}) is None
+
+
+def test_analysis_of_2000_node_workflow():
+    node_ids, edges = generated_workflow(2000)
+
+    analysis = analyze_graph(node_ids, edges)
+
+    assert analysis.edge_count == len(edges)
+    assert analysis.start_node_ids == (1,)
+    assert analysis.end_node_ids == (2000,)
+    assert not analysis.has_cycles
+    assert analysis.unreachable_node_ids == ()
+    assert analysis.dead_end_node_ids == ()
+    position = {node_id: i for i, node_id in enumerate(analysis.topological_order)}
+    assert len(position) == len(node_ids)
+    assert all(position[source] < position[target] for source, target in edges)
+
+
+@pytest.mark.benchmark
+def test_analysis_benchmark_on_2000_nodes():
+    node_ids, edges = generated_workflow(2000)
+
+    # The previous validator's start/end detection rescanned every connection
+    # for every node
+    started = time.perf_counter()
+    [n for n in node_ids if not any(t == n for _, t in edges)]
+    [n for n in node_ids if not any(s == n for s, _ in edges)]
+    quadratic = time.perf_counter() - started
+
+    started = time.perf_counter()
+    analyze_graph(node_ids, edges)
+    linear = time.perf_counter() - started
+
+    print(
+        f"2000-node analysis: {linear * 1000:.1f}ms "
+        f"(start/end scan alone was {quadratic * 1000:.1f}ms)"
+    )
+
+
+@pytest.mark.asyncio
+async def test_validate_process_reports_cycle_paths(
+    db_session, test_company, test_employer_user
+):
+    workflow = Workflow(
+        name="Looping",
+        employer_company_id=test_company.id,
+        created_by=test_employer_user.id,
+    )
+    db_session.add(workflow)
+    await db_session.commit()
+    nodes = [
+        await workflow_node_crud.create(
+            db_session,
+            obj_in={
+                "workflow_id": workflow.id,
+                "node_type": "interview",
+                "title": f"Step {order}",
+                "sequence_order": order,
+                "config": {"interview_type": "video", "duration_minutes": 60},
+            },
+            created_by=test_employer_user.id,
+        )
+        for order in range(1, 4)
+    ]
+    first, second, third = (node.id for node in nodes)
+    for source, target in [(first, second), (second, third), (third, second)]:
+        await connection_crud.create_connection(
+            db_session,
+            workflow_id=workflow.id,
+            source_node_id=source,
+            target_node_id=target,
+        )
+
+    with count_queries() as statements:
+        result = await workflow_engine.validate_process(
+            db_session, workflow.id, nodes=nodes
+        )
+
+    # Only the connection pairs are loaded when the nodes are passed in
+    assert len(statements) == 1
+    assert not result["is_valid"]
+    assert "Process contains cycles which may cause infinite loops" in result["issues"]
+    assert result["topological_order"] is None
@@ -0,0 +1,231 @@
+"""Tests for the conversation inbox and its query count."""
+
+import contextlib
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.conversation import conversation as conversation_crud
+from app.crud.messages import get_unread_message_count
+from app.models.message import Message
+from app.models.user import User
+from app.schemas.message import MessageCreate
+from app.services.message_service import message_service
+from app.utils.datetime_utils import get_utc_now
+
+
+@contextlib.contextmanager
+def count_queries():
+    """Count SQL statements executed against the test engine."""
+    from app.tests.conftest import test_engine
+
+    statements: list[str] = []
+
+    def _before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(
+        test_engine.sync_engine, "before_cursor_execute", _before_cursor_execute
+    )
+    try:
+        yield statements
+    finally:
+        event.remove(
+            test_engine.sync_engine, "before_cursor_execute", _before_cursor_execute
+        )
+
+
+async def seed_conversations(
+    db_session: AsyncSession, owner: User, count: int, prefix: str
+) -> list[User]:
+    """Create ``count`` partners, each with a short thread with ``owner``."""
+    partners = [
+        User(
+            email=f"{prefix}-{idx}@test.com",
+            first_name=f"{prefix.title()}{idx}",
+            last_name="Partner",
+            company_id=owner.company_id,
+            hashed_password="not-used",
+            is_active=True,
+        )
+        for idx in range(count)
+    ]
+    db_session.add_all(partners)
+    await db_session.flush()
+
+    base_time = get_utc_now() - timedelta(days=1)
+    for idx, partner in enumerate(partners):
+        sent_at = base_time + timedelta(minutes=idx)
+        db_session.add_all(
+            [
+                Message(
+                    sender_id=owner.id,
+                    recipient_id=partner.id,
+                    content=f"Hello {idx}",
+                    created_at=sent_at,
+                ),
+                Message(
+                    sender_id=partner.id,
+                    recipient_id=owner.id,
+                    content=f"Reply {idx}",
+                    created_at=sent_at + timedelta(seconds=30),
+                ),
+            ]
+        )
+    await db_session.commit()
+    # Messages were inserted directly, so backfill the summary table
+    await conversation_crud.rebuild(db_session)
+    return partners
+
+
+@pytest.mark.asyncio
+async def test_inbox_query_count_does_not_grow_with_conversations(
+    db_session: AsyncSession, test_employer_user: User
+):
+    await seed_conversations(db_session, test_employer_user, 5, "small")
+    with count_queries() as small_statements:
+        small = await message_service.get_conversations(
+            db_session, test_employer_user.id
+        )
+    assert len(small) == 5
+
+    await seed_conversations(db_session, test_employer_user, 60, "large")
+    db_session.expire_all()
+    with count_queries() as large_statements:
+        large = await message_service.get_conversations(
+            db_session, test_employer_user.id
+        )
+
+    assert len(large) == 65
+    assert len(large_statements) == len(small_statements)
+
+
+@pytest.mark.asyncio
+async def test_inbox_returns_latest_message_and_unread_count(
+    db_session: AsyncSession, test_employer_user: User
+):
+    partners = await seed_conversations(db_session, test_employer_user, 3, "latest")
+
+    conversations = await message_service.get_conversations(
+        db_session, test_employer_user.id
+    )
+
+    # Most recent partner first
+    assert [c.other_user_id for c in conversations] == [p.id for p in partners[::-1]]
+    for conversation in conversations:
+        assert conversation.last_message is not None
+        assert conversation.last_message.content.startswith("Reply")
+        assert conversation.unread_count == 1
+
+
+@pytest.mark.asyncio
+async def test_inbox_cursor_pagination_walks_all_conversations(
+    db_session: AsyncSession, test_employer_user: User
+):
+    partners = await seed_conversations(db_session, test_employer_user, 7, "paged")
+
+    seen: list[int] = []
+    cursor = None
+    while True:
+        page, cursor = await message_service.get_conversation_page(
+            db_session, test_employer_user.id, limit=3, cursor=cursor
+        )
+        assert len(page) <= 3
+        seen.extend(c.other_user_id for c in page)
+        if cursor is None:
+            break
+
+    assert seen == [p.id for p in partners[::-1]]
+
+
+@pytest.mark.asyncio
+async def test_inbox_search_filters_in_sql(
+    db_session: AsyncSession, test_employer_user: User
+):
+    await seed_conversations(db_session, test_employer_user, 3, "alpha")
+    betas = await seed_conversations(db_session, test_employer_user, 2, "beta")
+
+    conversations = await message_service.get_conversations(
+        db_session, test_employer_user.id, search_query="beta"
+    )
+
+    assert {c.other_user_id for c in conversations} == {p.id for p in betas}
+
+
+@pytest.mark.asyncio
+async def test_summary_maintained_on_send_and_read(
+    db_session: AsyncSession, test_employer_user: User
+):
+    partner = (await seed_conversations(db_session, test_employer_user, 1, "live"))[0]
+    assert await get_unread_message_count(db_session, test_employer_user.id) == 1
+
+    sent = [
+        await message_service.send_message(
+            db_session,
+            sender_id=partner.id,
+            message_data=MessageCreate(
+                recipient_id=test_employer_user.id, content=f"New {idx}"
+            ),
+        )
+        for idx in range(2)
+    ]
+    assert await get_unread_message_count(db_session, test_employer_user.id) == 3
+    assert await get_unread_message_count(db_session, partner.id) == 0
+
+    conversations = await message_service.get_conversations(
+        db_session, test_employer_user.id
+    )
+    assert conversations[0].last_message.id == sent[-1].id
+    assert conversations[0].unread_count == 3
+
+    await message_service.mark_messages_as_read(
+        db_session, test_employer_user.id, [sent[0].id]
+    )
+    assert await get_unread_message_count(db_session, test_employer_user.id) == 2
+
+    await message_service.mark_conversation_as_read(
+        db_session, test_employer_user.id, partner.id
+    )
+    assert await get_unread_message_count(db_session, test_employer_user.id) == 0
+
+
+@pytest.mark.asyncio
+async def test_inbox_shows_latest_message_visible_to_each_side(
+    db_session: AsyncSession, test_employer_user: User
+):
+    partner = (await seed_conversations(db_session, test_employer_user, 1, "hid"))[0]
+    reply = await db_session.scalar(
+        select(Message).where(Message.sender_id == partner.id)
+    )
+    reply.is_deleted_by_recipient = True
+    await db_session.commit()
+    await conversation_crud.rebuild(db_session)
+
+    owner_view = await message_service.get_conversations(
+        db_session, test_employer_user.id
+    )
+    partner_view = await message_service.get_conversations(db_session, partner.id)
+
+    assert owner_view[0].last_message.content == "Hello 0"
+    assert partner_view[0].last_message.content == "Reply 0"
+    assert owner_view[0].last_activity == partner_view[0].last_activity
+
+
+@pytest.mark.asyncio
+async def test_summary_activity_uses_message_timestamp(
+    db_session: AsyncSession, test_employer_user: User
+):
+    partner = (await seed_conversations(db_session, test_employer_user, 1, "ts"))[0]
+
+    sent = await message_service.send_message(
+        db_session,
+        sender_id=partner.id,
+        message_data=MessageCreate(recipient_id=test_employer_user.id, content="Hi"),
+    )
+
+    conversations = await message_service.get_conversations(
+        db_session, test_employer_user.id
+    )
+    assert conversations[0].last_activity == sent.created_at
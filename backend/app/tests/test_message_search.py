@@ -0,0 +1,217 @@
+"""Tests and ILIKE-vs-index benchmark for message search."""
+
+import base64
+import time
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.message import Message
+from app.models.user import User
+from app.schemas.message import MessageSearchRequest
+from app.services.message_search_service import (
+    FulltextSearchBackend,
+    InMemorySearchBackend,
+    LikeSearchBackend,
+    MessageSearchService,
+    decode_search_cursor,
+    encode_search_cursor,
+    tokenize,
+)
+
+
+async def seed_messages(
+    db_session: AsyncSession, owner: User, contents: list[str]
+) -> tuple[User, list[Message]]:
+    partner = User(
+        email="search-partner@test.com",
+        first_name="Search",
+        last_name="Partner",
+        company_id=owner.company_id,
+        hashed_password="not-used",
+        is_active=True,
+    )
+    db_session.add(partner)
+    await db_session.flush()
+
+    messages = [
+        Message(
+            sender_id=partner.id if idx % 2 else owner.id,
+            recipient_id=owner.id if idx % 2 else partner.id,
+            content=content,
+        )
+        for idx, content in enumerate(contents)
+    ]
+    db_session.add_all(messages)
+    await db_session.commit()
+    return partner, messages
+
+
+def test_tokenize_splits_latin_words_and_cjk_bigrams():
+    assert tokenize("Interview Schedule") == ["interview", "schedule"]
+    assert tokenize("面接日程") == ["面接", "接日", "日程"]
+    assert tokenize("ＡＢＣ面接") == ["abc", "面接"]
+
+
+def test_search_cursor_round_trips_integer_scores():
+    cursor = encode_search_cursor(1_234_567, 42)
+    assert decode_search_cursor(cursor) == (1_234_567, 42)
+
+    # Cursors carrying a raw float relevance are no longer accepted
+    with pytest.raises(HTTPException):
+        decode_search_cursor(base64.urlsafe_b64encode(b"0.1234|42").decode())
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_ranks_and_paginates(
+    db_session: AsyncSession, test_employer_user: User
+):
+    contents = [f"interview round {idx}" for idx in range(5)] + [
+        "interview interview follow-up",
+        "面接日程の調整をお願いします",
+        "unrelated",
+    ]
+    _, messages = await seed_messages(db_session, test_employer_user, contents)
+    backend = InMemorySearchBackend()
+    assert await backend.reindex(db_session) == len(messages)
+    service = MessageSearchService(backend)
+
+    first_page, cursor = await service.search_messages(
+        db_session,
+        test_employer_user.id,
+        MessageSearchRequest(query="interview", limit=4),
+    )
+    assert first_page[0].content == "interview interview follow-up"
+    assert cursor is not None
+
+    second_page, cursor = await service.search_messages(
+        db_session,
+        test_employer_user.id,
+        MessageSearchRequest(query="interview", limit=4, cursor=cursor),
+    )
+    assert cursor is None
+    assert len(first_page) + len(second_page) == 6
+    # The total counts every match, not just the page
+    assert (
+        await service.count_messages(
+            db_session,
+            test_employer_user.id,
+            MessageSearchRequest(query="interview", limit=4, cursor=cursor),
+        )
+        == 6
+    )
+    assert not {m.id for m in first_page} & {m.id for m in second_page}
+
+    japanese, _ = await service.search_messages(
+        db_session, test_employer_user.id, MessageSearchRequest(query="日程")
+    )
+    assert [m.content for m in japanese] == ["面接日程の調整をお願いします"]
+
+
+@pytest.mark.asyncio
+async def test_search_rejects_offset_paging(
+    db_session: AsyncSession, test_employer_user: User
+):
+    service = MessageSearchService(InMemorySearchBackend())
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.search_messages(
+            db_session,
+            test_employer_user.id,
+            MessageSearchRequest(query="interview", offset=50),
+        )
+
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_indexes_incrementally(
+    db_session: AsyncSession, test_employer_user: User
+):
+    backend = InMemorySearchBackend()
+    _, messages = await seed_messages(
+        db_session, test_employer_user, ["offer letter attached"]
+    )
+    service = MessageSearchService(backend)
+
+    found, _ = await service.search_messages(
+        db_session, test_employer_user.id, MessageSearchRequest(query="offer")
+    )
+    assert found == []
+
+    await service.index_message(messages[0])
+    found, _ = await service.search_messages(
+        db_session, test_employer_user.id, MessageSearchRequest(query="offer")
+    )
+    assert [m.id for m in found] == [messages[0].id]
+
+
+@pytest.mark.asyncio
+async def test_fulltext_backend_matches_english_and_japanese(
+    db_session: AsyncSession, test_employer_user: User
+):
+    await seed_messages(
+        db_session,
+        test_employer_user,
+        ["Meeting notes summary", "面接日程の調整", "Lunch plans"],
+    )
+    service = MessageSearchService(FulltextSearchBackend())
+
+    english, _ = await service.search_messages(
+        db_session, test_employer_user.id, MessageSearchRequest(query="summary")
+    )
+    assert [m.content for m in english] == ["Meeting notes summary"]
+
+    japanese, _ = await service.search_messages(
+        db_session, test_employer_user.id, MessageSearchRequest(query="日程")
+    )
+    assert [m.content for m in japanese] == ["面接日程の調整"]
+
+
+async def seed_benchmark_messages(
+    db_session: AsyncSession, owner: User
+) -> MessageSearchRequest:
+    contents = [
+        f"Candidate {idx} status update for position {idx % 40}" for idx in range(2000)
+    ] + ["Final offer summary for the hiring committee"]
+    await seed_messages(db_session, owner, contents)
+    return MessageSearchRequest(query="committee", limit=20)
+
+
+@pytest.mark.asyncio
+async def test_fulltext_backend_agrees_with_ilike(
+    db_session: AsyncSession, test_employer_user: User
+):
+    request = await seed_benchmark_messages(db_session, test_employer_user)
+
+    results = {}
+    for backend in (LikeSearchBackend(), FulltextSearchBackend()):
+        found, _ = await MessageSearchService(backend).search_messages(
+            db_session, test_employer_user.id, request
+        )
+        results[backend.name] = [m.id for m in found]
+
+    assert results["fulltext"] == results["like"]
+    assert len(results["fulltext"]) == 1
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_search_benchmark_against_ilike(
+    db_session: AsyncSession, test_employer_user: User
+):
+    request = await seed_benchmark_messages(db_session, test_employer_user)
+
+    timings = {}
+    for backend in (LikeSearchBackend(), FulltextSearchBackend()):
+        service = MessageSearchService(backend)
+        started = time.perf_counter()
+        for _ in range(5):
+            await service.search_messages(db_session, test_employer_user.id, request)
+        timings[backend.name] = (time.perf_counter() - started) / 5
+
+    print(
+        "message search: "
+        + ", ".join(f"{name}={t * 1000:.1f} ms" for name, t in timings.items())
+    )
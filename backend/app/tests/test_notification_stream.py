@@ -0,0 +1,176 @@
+"""Tests for the SSE notification push channel and its polling fallback."""
+
+import asyncio
+import json
+
+import pytest
+
+from app.services.notification_service import NotificationService
+from app.services.notification_stream import (
+    NotificationStreamManager,
+    StreamLimitExceeded,
+    format_sse,
+)
+from app.services.pubsub_service import InMemoryPresenceRegistry, InMemoryPubSub
+
+
+def event(event_id: int) -> dict:
+    return {"id": event_id, "event": "notification", "data": {"unread_count": 1}}
+
+
+def test_format_sse():
+    assert format_sse({"a": 1}, "message", 7) == (
+        'id: 7\nevent: message\ndata: {"a": 1}\n\n'
+    )
+    assert format_sse({}, "resync") == "event: resync\ndata: {}\n\n"
+
+
+@pytest.mark.asyncio
+async def test_publish_reaches_streams_on_every_worker(make_workers):
+    worker_a, worker_b = make_workers(NotificationStreamManager)
+    stream_a = await worker_a.open(1)
+    stream_b = await worker_b.open(1)
+    other_user = await worker_b.open(2)
+
+    await worker_a.publish(1, event(10))
+
+    assert (await stream_a.next_event(0.1))["id"] == 10
+    assert (await stream_b.next_event(0.1))["id"] == 10
+    assert await other_user.next_event(0.01) is None
+
+
+@pytest.mark.asyncio
+async def test_connection_limit_spans_workers(make_workers):
+    worker_a, worker_b = make_workers(
+        NotificationStreamManager, max_connections_per_user=2
+    )
+    first = await worker_a.open(1)
+    await worker_b.open(1)
+
+    with pytest.raises(StreamLimitExceeded):
+        await worker_a.open(1)
+
+    await worker_a.close(first)
+    await worker_a.open(1)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_opens_respect_the_limit(make_workers):
+    workers = make_workers(NotificationStreamManager, 3, max_connections_per_user=2)
+
+    results = await asyncio.gather(
+        *(worker.open(1) for worker in workers), return_exceptions=True
+    )
+
+    assert sum(isinstance(r, StreamLimitExceeded) for r in results) == 1
+    assert len(await workers[0].presence.members("notifications:user:1")) == 2
+
+
+class UnreachablePubSub(InMemoryPubSub):
+    async def _subscribe_channel(self, channel: str) -> None:
+        raise ConnectionError("backplane down")
+
+
+@pytest.mark.asyncio
+async def test_failed_open_leaves_nothing_registered():
+    presence = InMemoryPresenceRegistry()
+    pubsub = UnreachablePubSub()
+    worker = NotificationStreamManager(pubsub=pubsub, presence=presence)
+
+    with pytest.raises(ConnectionError):
+        await worker.open(1)
+
+    assert not worker.streams
+    assert not pubsub._handlers.get("notifications:user:1")
+    assert not await worker.is_online(1)
+
+
+@pytest.mark.asyncio
+async def test_is_online_follows_open_streams(make_workers):
+    worker_a, worker_b = make_workers(NotificationStreamManager)
+    assert not await worker_b.is_online(1)
+
+    stream = await worker_a.open(1)
+    assert await worker_b.is_online(1)
+
+    await worker_a.close(stream)
+    assert not await worker_b.is_online(1)
+    assert 1 not in worker_a.streams
+
+
+@pytest.mark.asyncio
+async def test_slow_stream_overflows_instead_of_growing(make_workers):
+    (worker,) = make_workers(NotificationStreamManager, 1)
+    worker.queue_size = 2
+    stream = await worker.open(1)
+
+    for event_id in range(1, 5):
+        await worker.publish(1, event(event_id))
+
+    assert stream.overflowed
+    assert stream.queue.qsize() == 2
+
+
+@pytest.mark.asyncio
+async def test_create_notification_pushes_to_open_stream(
+    db_session, test_user, make_workers
+):
+    (worker,) = make_workers(NotificationStreamManager, 1)
+    service = NotificationService(stream_manager=worker)
+    stream = await worker.open(test_user.id)
+
+    notification = await service.create_notification(
+        db_session, test_user.id, "new_message", "New message", "Hi"
+    )
+
+    pushed = await stream.next_event(0.1)
+    assert pushed["id"] == notification.id
+    assert pushed["event"] == "message"
+    assert pushed["data"]["unread_count"] == 1
+    assert pushed["data"]["notification"]["title"] == "New message"
+    # Serialized for the wire, so it survives the pub/sub round trip
+    json.dumps(pushed)
+
+
+@pytest.mark.asyncio
+async def test_replay_returns_only_missed_notifications(
+    db_session, test_user, make_workers
+):
+    (worker,) = make_workers(NotificationStreamManager, 1)
+    service = NotificationService(stream_manager=worker)
+    created = [
+        await service.create_notification(
+            db_session, test_user.id, "system", f"Notice {idx}", "Body"
+        )
+        for idx in range(3)
+    ]
+
+    missed = await service.get_notifications_after(
+        db_session, test_user.id, created[0].id, limit=10
+    )
+    assert [n.id for n in missed] == [created[1].id, created[2].id]
+
+
+@pytest.mark.asyncio
+async def test_updates_endpoint_is_a_single_poll(
+    client, auth_headers, db_session, test_employer_user, make_workers
+):
+    service = NotificationService(
+        stream_manager=make_workers(NotificationStreamManager, 1)[0]
+    )
+    first = await service.create_notification(
+        db_session, test_employer_user.id, "system", "First", "Body"
+    )
+    second = await service.create_notification(
+        db_session, test_employer_user.id, "system", "Second", "Body"
+    )
+
+    response = await client.get(
+        f"/api/notifications/updates?after_id={first.id}", headers=auth_headers
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert [n["id"] for n in body["notifications"]] == [second.id]
+    assert body["unread_count"] == 2
+    assert body["last_event_id"] == second.id
+    assert body["poll_interval_seconds"] > 0
@@ -0,0 +1,90 @@
+"""Tests for the content-addressed resume PDF cache."""
+
+from datetime import timedelta
+
+import pytest
+
+from app.services.pdf_cache_service import PDFCacheService
+from app.services.pdf_renderer import FakePDFRenderer
+from app.services.pdf_service import PDFService
+from app.tests.conftest import FakeStorage
+from app.utils.datetime_utils import get_utc_now
+
+
+def make_service(storage: FakeStorage) -> tuple[PDFService, FakePDFRenderer]:
+    renderer = FakePDFRenderer()
+    service = PDFService(renderer=renderer, pdf_cache=PDFCacheService(storage))
+    return service, renderer
+
+
+@pytest.mark.asyncio
+async def test_unchanged_resume_reuses_stored_pdf(blob_storage, make_resume):
+    service, renderer = make_service(blob_storage)
+    resume = make_resume()
+
+    first = await service.generate_pdf(resume)
+    second = await service.generate_pdf(resume)
+
+    assert renderer.render_count == 1
+    assert not first["cached"] and second["cached"]
+    assert second["file_path"] == first["file_path"]
+    assert second["file_size"] == first["file_size"]
+    assert len(blob_storage.objects) == 1
+
+
+@pytest.mark.asyncio
+async def test_content_and_options_change_the_cache_key(blob_storage, make_resume):
+    service, renderer = make_service(blob_storage)
+    resume = make_resume()
+
+    base = await service.generate_pdf(resume)
+    letter = await service.generate_pdf(resume, format="Letter")
+    watermarked = await service.generate_pdf(resume, watermark="DRAFT")
+    no_contact = await service.generate_pdf(resume, include_contact_info=False)
+    styled = await service.generate_pdf(resume, custom_css="h1 { color: red; }")
+    resume.font_family = "Roboto"
+    refont = await service.generate_pdf(resume)
+    resume.professional_summary = "Ten years of Python"
+    edited = await service.generate_pdf(resume)
+
+    paths = {
+        r["file_path"]
+        for r in (base, letter, watermarked, no_contact, styled, refont, edited)
+    }
+    assert len(paths) == 7
+    assert renderer.render_count == 7
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_only_that_resume(blob_storage, make_resume):
+    service, _ = make_service(blob_storage)
+    await service.generate_pdf(make_resume(id=1))
+    await service.generate_pdf(make_resume(id=2))
+
+    assert await service.pdf_cache.invalidate(1) == 1
+    assert [key.split("/")[2] for key in blob_storage.objects] == ["2"]
+
+
+@pytest.mark.asyncio
+async def test_evict_removes_expired_and_surplus_variants(blob_storage, make_resume):
+    service, _ = make_service(blob_storage)
+    resume = make_resume()
+    for idx in range(4):
+        await service.generate_pdf(resume, watermark=f"v{idx}")
+    await service.generate_pdf(make_resume(id=2))
+
+    now = get_utc_now()
+    for age, key in enumerate(
+        sorted(k for k in blob_storage.objects if k.startswith("resumes/pdfs/1/"))
+    ):
+        blob_storage.last_modified[key] = now - timedelta(hours=age)
+    stale = next(k for k in blob_storage.objects if k.startswith("resumes/pdfs/2/"))
+    blob_storage.last_modified[stale] = now - timedelta(days=60)
+
+    evicted = await service.cleanup_old_pdfs(
+        older_than_days=30, max_variants_per_resume=2
+    )
+
+    assert evicted == 3
+    assert len(blob_storage.objects) == 2
+    assert all(k.startswith("resumes/pdfs/1/") for k in blob_storage.objects)
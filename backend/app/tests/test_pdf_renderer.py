@@ -0,0 +1,134 @@
+"""Tests and throughput benchmark for the pooled PDF renderer."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.services.pdf_renderer import BrowserPoolRenderer, FakePDFRenderer
+from app.services.pdf_service import PDFService
+
+
+class FakePage:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.closed = False
+
+    async def set_content(self, html_content: str, wait_until: str):
+        if self.fail:
+            raise RuntimeError("page crashed")
+
+    async def pdf(self, **options) -> bytes:
+        return b"%PDF-1.4 fake"
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.pages_opened = 0
+
+    def is_connected(self) -> bool:
+        return True
+
+    async def new_page(self) -> FakePage:
+        self.pages_opened += 1
+        return FakePage()
+
+
+def started_pool(pool_size: int, recycle_after: int = 100) -> BrowserPoolRenderer:
+    """A browser pool wired to a fake browser instead of Chromium."""
+    renderer = BrowserPoolRenderer(pool_size=pool_size, recycle_after=recycle_after)
+    renderer._browser = FakeBrowser()
+    renderer._pages = asyncio.Queue()
+    for _ in range(pool_size):
+        renderer._pages.put_nowait(_pooled(FakePage()))
+    return renderer
+
+
+def _pooled(page: FakePage):
+    from app.services.pdf_renderer import _PooledPage
+
+    return _PooledPage(page)
+
+
+@pytest.mark.asyncio
+async def test_pool_recycles_pages_after_limit():
+    renderer = started_pool(pool_size=1, recycle_after=3)
+
+    for _ in range(7):
+        assert await renderer.render("<html></html>") == b"%PDF-1.4 fake"
+
+    assert renderer._browser.pages_opened == 2
+
+
+@pytest.mark.asyncio
+async def test_pool_replaces_page_after_render_error():
+    renderer = started_pool(pool_size=1)
+    broken = (await renderer._pages.get()).page
+    broken.fail = True
+    renderer._pages.put_nowait(_pooled(broken))
+
+    with pytest.raises(RuntimeError):
+        await renderer.render("<html></html>")
+
+    assert broken.closed
+    assert await renderer.render("<html></html>") == b"%PDF-1.4 fake"
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_pages_across_concurrent_renders():
+    renderer = started_pool(pool_size=2)
+
+    results = await asyncio.gather(
+        *(renderer.render(f"<html>{idx}</html>") for idx in range(10))
+    )
+
+    assert results == [b"%PDF-1.4 fake"] * 10
+    # Both pages were opened up front and served every render
+    assert renderer._browser.pages_opened == 0
+    assert renderer._pages.qsize() == 2
+
+
+@pytest.mark.asyncio
+async def test_pdf_service_renders_in_parallel_within_pool_bound():
+    renderer = FakePDFRenderer(max_concurrency=4, render_delay=0.01)
+    pdf_service = PDFService(renderer=renderer)
+    documents = [f"<html><body>Resume {idx}</body></html>" for idx in range(20)]
+
+    for html in documents:
+        await pdf_service._convert_html_to_pdf(html)
+    assert renderer.max_active == 1
+
+    results = await asyncio.gather(
+        *(pdf_service._convert_html_to_pdf(html) for html in documents)
+    )
+
+    assert len(set(results)) == len(documents)
+    assert renderer.max_active == 4
+    assert renderer.render_count == 2 * len(documents)
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_pdf_throughput_benchmark():
+    renderer = FakePDFRenderer(max_concurrency=4, render_delay=0.05)
+    pdf_service = PDFService(renderer=renderer)
+    documents = [f"<html><body>Resume {idx}</body></html>" for idx in range(20)]
+
+    started = time.perf_counter()
+    for html in documents:
+        await pdf_service._convert_html_to_pdf(html)
+    serial = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(pdf_service._convert_html_to_pdf(html) for html in documents)
+    )
+    pooled = time.perf_counter() - started
+
+    print(
+        f"pdf throughput: serial={len(documents) / serial:.1f}/s "
+        f"pooled={len(documents) / pooled:.1f}/s"
+    )
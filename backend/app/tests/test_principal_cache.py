@@ -0,0 +1,115 @@
+"""Tests for the cached auth principal behind permission helpers."""
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.crud.user import user as user_crud
+from app.dependencies import get_current_user
+from app.services.auth_service import auth_service
+from app.services.principal_cache import (
+    Principal,
+    PrincipalCache,
+    principal_cache,
+)
+from app.services.pubsub_service import InMemoryPubSub
+from app.services.todo_permissions import TodoPermissionService
+from app.tests.test_message_inbox import count_queries
+from app.utils.constants import UserRole as UserRoleEnum
+
+
+def bearer(user_id: int) -> HTTPAuthorizationCredentials:
+    token = auth_service.create_access_token({"sub": str(user_id)})
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+@pytest.mark.asyncio
+async def test_current_user_is_one_statement_and_primes_roles(db_session, test_user):
+    with count_queries() as statements:
+        user = await get_current_user(bearer(test_user.id), db_session)
+    assert len(statements) == 1
+    assert user.company is not None
+    assert [ur.role.name for ur in user.user_roles] == [UserRoleEnum.CANDIDATE.value]
+
+    # Role helpers later in the request are served from the snapshot
+    with count_queries() as statements:
+        assert await TodoPermissionService.is_candidate(db_session, test_user.id)
+        assert not await TodoPermissionService.is_employer(db_session, test_user.id)
+    assert statements == []
+
+
+@pytest.mark.asyncio
+async def test_role_change_invalidates(db_session, test_user):
+    await get_current_user(bearer(test_user.id), db_session)
+
+    await user_crud.assign_roles(db_session, test_user.id, [UserRoleEnum.MEMBER])
+
+    roles = await TodoPermissionService.get_user_roles(db_session, test_user.id)
+    assert roles == [UserRoleEnum.MEMBER.value]
+
+
+@pytest.mark.asyncio
+async def test_suspension_and_token_revocation_invalidate(db_session, test_user):
+    await get_current_user(bearer(test_user.id), db_session)
+
+    await user_crud.suspend_user(db_session, test_user.id, suspended_by=test_user.id)
+    assert principal_cache.peek(test_user.id) is None
+    assert (await principal_cache.get(db_session, test_user.id)).is_suspended
+
+    await auth_service.revoke_user_tokens(db_session, test_user.id)
+    assert principal_cache.peek(test_user.id) is None
+
+
+@pytest.mark.asyncio
+async def test_invalidation_reaches_other_workers(db_session, test_user):
+    pubsub = InMemoryPubSub()
+    worker_a = PrincipalCache(pubsub=pubsub)
+    worker_b = PrincipalCache(pubsub=pubsub)
+    await worker_a.get(db_session, test_user.id)
+    await worker_b.get(db_session, test_user.id)
+
+    await worker_a.invalidate_user(test_user.id)
+
+    assert worker_b.peek(test_user.id) is None
+    await worker_b.get(db_session, test_user.id)
+    assert worker_b.load_count == 2
+
+
+@pytest.mark.asyncio
+async def test_load_racing_an_invalidation_is_not_cached(db_session, test_user):
+    cache = PrincipalCache(pubsub=InMemoryPubSub())
+    generation = cache.generation
+    stale = await cache._load(db_session, test_user.id)
+
+    await cache.invalidate_user(test_user.id)
+    await cache.put(stale, generation)
+
+    assert cache.peek(test_user.id) is None
+
+
+@pytest.mark.asyncio
+async def test_cache_is_bounded():
+    cache = PrincipalCache(pubsub=InMemoryPubSub(), max_entries=2)
+    for user_id in range(1, 4):
+        await cache.put(Principal(user_id=user_id, company_id=None))
+
+    assert cache.peek(1) is None
+    assert cache.peek(3) is not None
+
+
+class UnavailablePubSub(InMemoryPubSub):
+    async def subscribe(self, channel, handler):
+        raise ConnectionError("backplane down")
+
+    async def publish(self, channel, message):
+        raise ConnectionError("backplane down")
+
+
+@pytest.mark.asyncio
+async def test_invalidation_applies_locally_without_backplane():
+    cache = PrincipalCache(pubsub=UnavailablePubSub())
+    await cache.put(Principal(user_id=1, company_id=None))
+
+    await cache.invalidate_user(1)
+
+    assert cache.peek(1) is None
+    assert cache.generation == 1
@@ -0,0 +1,161 @@
+"""Tests for background batch PDF export and zip streaming."""
+
+import io
+import zipfile
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.resume import Resume
+from app.models.resume_export_job import ResumeExportJob
+from app.models.user import User
+from app.services.pdf_cache_service import PDFCacheService
+from app.services.pdf_renderer import FakePDFRenderer
+from app.services.resume_export_service import (
+    ERRORS_FILENAME,
+    EXPORT_FOLDER,
+    ResumeExportService,
+)
+from app.tests.conftest import TestingSessionLocal
+from app.utils.constants import ResumeExportStatus
+
+
+async def create_export_job(
+    db_session: AsyncSession, owner: User, resume_count: int, extra_ids=()
+) -> tuple[ResumeExportJob, list[Resume]]:
+    resumes = [
+        Resume(user_id=owner.id, title=f"Resume {idx}", full_name=f"Candidate {idx}")
+        for idx in range(resume_count)
+    ]
+    db_session.add_all(resumes)
+    await db_session.flush()
+
+    resume_ids = [r.id for r in resumes] + list(extra_ids)
+    job = ResumeExportJob(
+        user_id=owner.id,
+        resume_ids=resume_ids,
+        total_count=len(resume_ids),
+        results=[],
+        errors=[],
+    )
+    db_session.add(job)
+    await db_session.commit()
+    return job, resumes
+
+
+@pytest.mark.asyncio
+async def test_export_renders_with_bounded_parallelism(
+    db_session: AsyncSession, test_employer_user: User, blob_storage
+):
+    job, resumes = await create_export_job(db_session, test_employer_user, 12)
+    renderer = FakePDFRenderer(max_concurrency=50, render_delay=0.02)
+    service = ResumeExportService(TestingSessionLocal, blob_storage)
+
+    finished = await service.run_job(job.id, renderer=renderer)
+
+    assert finished.status == ResumeExportStatus.COMPLETED.value
+    assert finished.completed_count == 12
+    assert finished.failed_count == 0
+    assert renderer.render_count == 12
+    assert 1 < renderer.max_active <= settings.resume_export_concurrency
+    assert {r["resume_id"] for r in finished.results} == {r.id for r in resumes}
+
+
+@pytest.mark.asyncio
+async def test_export_reports_partial_failures(
+    db_session: AsyncSession, test_employer_user: User, blob_storage
+):
+    job, _ = await create_export_job(
+        db_session, test_employer_user, 3, extra_ids=[999999]
+    )
+    service = ResumeExportService(TestingSessionLocal, blob_storage)
+
+    finished = await service.run_job(job.id, renderer=FakePDFRenderer())
+
+    assert finished.status == ResumeExportStatus.COMPLETED_WITH_ERRORS.value
+    assert (finished.completed_count, finished.failed_count) == (3, 1)
+    assert finished.errors == [{"resume_id": 999999, "error": "Resume not found"}]
+
+    async with TestingSessionLocal() as db:
+        stored = await service.get_job(db, job.id, test_employer_user.id)
+        assert stored is not None
+        assert stored.processed_count == stored.total_count == 4
+        assert stored.finished_at is not None
+
+
+@pytest.mark.asyncio
+async def test_zip_is_streamed_from_storage_in_chunks(
+    db_session: AsyncSession, test_employer_user: User, blob_storage
+):
+    job, resumes = await create_export_job(
+        db_session, test_employer_user, 3, extra_ids=[999999]
+    )
+    # Serve stored PDFs in small chunks so the archive is built from many reads
+    blob_storage.chunk_size = 16
+    service = ResumeExportService(TestingSessionLocal, blob_storage)
+    finished = await service.run_job(job.id, renderer=FakePDFRenderer())
+
+    parts = list(service.iter_zip(finished))
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(parts)))
+
+    names = archive.namelist()
+    assert sorted(names) == sorted(
+        [f"Candidate_{idx}_{resume.id}.pdf" for idx, resume in enumerate(resumes)]
+        + [ERRORS_FILENAME]
+    )
+    for result in finished.results:
+        assert (
+            archive.read(result["filename"])
+            == blob_storage.objects[result["file_path"]]
+        )
+    assert b"999999" in archive.read(ERRORS_FILENAME)
+    # Output is produced incrementally rather than as one buffered archive
+    assert len(parts) >= blob_storage.chunks_served
+
+
+@pytest.mark.asyncio
+async def test_outputs_survive_pdf_cache_invalidation(
+    db_session: AsyncSession, test_employer_user: User, blob_storage
+):
+    job, resumes = await create_export_job(db_session, test_employer_user, 2)
+    service = ResumeExportService(TestingSessionLocal, blob_storage)
+    finished = await service.run_job(job.id, renderer=FakePDFRenderer())
+
+    # Editing a resume drops its cached PDFs
+    cache = PDFCacheService(blob_storage)
+    for resume in resumes:
+        await cache.invalidate(resume.id)
+
+    results, errors = await service.check_outputs(finished)
+    assert len(results) == 2
+    assert errors == []
+    assert all(r["file_path"].startswith(f"{EXPORT_FOLDER}/") for r in results)
+    archive = zipfile.ZipFile(
+        io.BytesIO(b"".join(service.iter_zip(finished, results, errors)))
+    )
+    assert len(archive.namelist()) == 2
+
+
+@pytest.mark.asyncio
+async def test_missing_outputs_are_reported_before_streaming(
+    db_session: AsyncSession, test_employer_user: User, blob_storage
+):
+    job, resumes = await create_export_job(db_session, test_employer_user, 2)
+    service = ResumeExportService(TestingSessionLocal, blob_storage)
+    finished = await service.run_job(job.id, renderer=FakePDFRenderer())
+    gone = next(r for r in finished.results if r["resume_id"] == resumes[0].id)
+    blob_storage.delete_file(gone["file_path"])
+
+    results, errors = await service.check_outputs(finished)
+    archive = zipfile.ZipFile(
+        io.BytesIO(b"".join(service.iter_zip(finished, results, errors)))
+    )
+
+    assert [r["resume_id"] for r in results] == [resumes[1].id]
+    assert sorted(archive.namelist()) == sorted(
+        [f"Candidate_1_{resumes[1].id}.pdf", ERRORS_FILENAME]
+    )
+    assert f"Resume {resumes[0].id}: Exported PDF expired".encode() in archive.read(
+        ERRORS_FILENAME
+    )
@@ -0,0 +1,118 @@
+"""Tests and renders-per-second benchmark for compiled resume templates."""
+
+import time
+
+import pytest
+from jinja2 import Template
+
+from app.services.pdf_service import PDFService
+from app.services.template_service import TemplateService, _apply_theme
+from app.utils.constants import ResumeFormat
+
+
+@pytest.mark.asyncio
+async def test_templates_are_compiled_once_across_instances(make_resume):
+    resume = make_resume()
+    first = TemplateService()
+    await first.render_resume(resume)
+    compiled = first.get_compiled_template(
+        "resume/modern", first.default_templates["modern"]["html_template"]
+    )
+
+    second = TemplateService()
+    html = await second.render_resume(resume)
+
+    assert "Test Candidate" in html
+    assert (
+        second.get_compiled_template(
+            "resume/modern", second.default_templates["modern"]["html_template"]
+        )
+        is compiled
+    )
+
+
+def test_changed_source_is_recompiled():
+    service = TemplateService()
+    original = service.get_compiled_template("test/greeting", "Hello {{ name }}")
+    assert service.get_compiled_template("test/greeting", "Hello {{ name }}") is (
+        original
+    )
+
+    updated = service.get_compiled_template("test/greeting", "Hi {{ name }}")
+    assert updated is not original
+    assert updated.render(name="Ann") == "Hi Ann"
+
+
+def test_theme_css_is_memoized_per_template_color_and_font():
+    service = TemplateService()
+    template_css = service.default_templates["classic"]["css_styles"]
+    _apply_theme.cache_clear()
+
+    for _ in range(3):
+        css = service._combine_css(template_css, None, "p {}", "#111111", "Lora")
+        assert "{{theme_color}}" not in css
+        assert css.endswith("p {}")
+    service._combine_css(template_css, None, None, "#222222", "Lora")
+
+    info = _apply_theme.cache_info()
+    assert (info.hits, info.misses) == (2, 2)
+
+
+@pytest.mark.asyncio
+async def test_japanese_formats_use_compiled_templates(make_resume):
+    pdf_service = PDFService()
+    rirekisho = make_resume(resume_format=ResumeFormat.RIREKISHO)
+    shokumu = make_resume(resume_format=ResumeFormat.SHOKUMU_KEIREKISHO)
+
+    assert "Test Candidate" in await pdf_service.get_resume_as_html(rirekisho)
+    assert "Test Candidate" in await pdf_service.get_resume_as_html(shokumu)
+    assert {"pdf/rirekisho", "pdf/shokumu"} <= set(TemplateService._compiled_templates)
+
+
+@pytest.mark.asyncio
+async def test_repeated_renders_compile_once(monkeypatch, make_resume):
+    compiled = []
+    from_string = TemplateService.jinja_env.from_string
+
+    def counting_from_string(source, *args, **kwargs):
+        compiled.append(source)
+        return from_string(source, *args, **kwargs)
+
+    monkeypatch.setattr(TemplateService.jinja_env, "from_string", counting_from_string)
+    monkeypatch.delitem(
+        TemplateService._compiled_templates, "resume/modern", raising=False
+    )
+    resume = make_resume()
+
+    for _ in range(20):
+        assert "Test Candidate" in await TemplateService().render_resume(resume)
+
+    assert compiled == [TemplateService().default_templates["modern"]["html_template"]]
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_render_throughput_benchmark(make_resume):
+    resume = make_resume()
+    service = TemplateService()
+    config = service.default_templates["modern"]
+    context = {
+        "resume": service._prepare_resume_data(resume),
+        "template_config": config,
+        "theme_color": "#2563eb",
+        "font_family": "Inter",
+    }
+    renders = 200
+
+    started = time.perf_counter()
+    for _ in range(renders):
+        Template(config["html_template"]).render(**context)
+    uncached = renders / (time.perf_counter() - started)
+
+    await service.render_resume(resume)
+    started = time.perf_counter()
+    for _ in range(renders):
+        await TemplateService().render_resume(resume)
+    cached = renders / (time.perf_counter() - started)
+
+    print(f"resume renders/sec: uncached={uncached:.0f} compiled={cached:.0f}")
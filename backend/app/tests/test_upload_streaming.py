@@ -0,0 +1,147 @@
+"""Tests and peak-memory benchmark for chunked upload streaming."""
+
+import hashlib
+import os
+import tempfile
+import tracemalloc
+
+import pytest
+from fastapi import UploadFile
+
+from app.services.local_storage_service import LocalStorageService
+from app.services.upload_stream import (
+    FileTooLargeError,
+    stream_upload_to_minio,
+    stream_upload_to_path,
+)
+
+MB = 1024 * 1024
+
+
+def make_upload(size: int, filename: str = "report.pdf") -> UploadFile:
+    """An UploadFile spooled to disk, as Starlette does for large bodies."""
+    spool = tempfile.SpooledTemporaryFile(max_size=MB)  # noqa: SIM115
+    block = os.urandom(MB)
+    for offset in range(0, size, MB):
+        spool.write(block[: min(MB, size - offset)])
+    spool.seek(0)
+    return UploadFile(file=spool, filename=filename)
+
+
+def sha256_of(upload: UploadFile) -> str:
+    upload.file.seek(0)
+    digest = hashlib.sha256()
+    while chunk := upload.file.read(MB):
+        digest.update(chunk)
+    upload.file.seek(0)
+    return digest.hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_stream_to_path_hashes_and_counts_incrementally(tmp_path):
+    upload = make_upload(5 * MB + 123)
+    expected = sha256_of(upload)
+
+    result = await stream_upload_to_path(upload, tmp_path / "a" / "file.bin")
+
+    assert result.size == 5 * MB + 123
+    assert result.sha256 == expected
+    assert (tmp_path / "a" / "file.bin").stat().st_size == result.size
+
+
+@pytest.mark.asyncio
+async def test_oversized_upload_is_rejected_and_partial_file_removed(tmp_path):
+    upload = make_upload(3 * MB)
+    destination = tmp_path / "big.bin"
+
+    with pytest.raises(FileTooLargeError):
+        await stream_upload_to_path(upload, destination, max_size=2 * MB)
+
+    assert not destination.exists()
+
+
+@pytest.mark.asyncio
+async def test_local_storage_upload_returns_sha256(tmp_path):
+    storage = LocalStorageService(base_path=str(tmp_path))
+    upload = make_upload(2 * MB, filename="notes.txt")
+    expected = sha256_of(upload)
+
+    file_path, file_hash, file_size = await storage.upload_file(
+        upload, user_id=7, folder="message-attachments"
+    )
+
+    assert file_hash == expected
+    assert file_size == 2 * MB
+    assert file_path.endswith("_notes.txt")
+
+
+@pytest.mark.asyncio
+async def test_minio_multipart_upload_streams_parts(blob_storage):
+    upload = make_upload(20 * MB)
+    expected = sha256_of(upload)
+    client = blob_storage.client
+
+    result = await stream_upload_to_minio(
+        client, "bucket", "key", upload, "application/pdf", part_size=8 * MB
+    )
+
+    assert client.parts == [8 * MB, 8 * MB, 4 * MB]
+    assert len(blob_storage.objects["key"]) == 20 * MB
+    assert (result.size, result.sha256) == (20 * MB, expected)
+
+
+@pytest.mark.asyncio
+async def test_minio_upload_aborts_when_limit_exceeded(blob_storage):
+    client = blob_storage.client
+
+    with pytest.raises(FileTooLargeError):
+        await stream_upload_to_minio(
+            client,
+            "bucket",
+            "key",
+            make_upload(12 * MB),
+            "application/pdf",
+            max_size=10 * MB,
+            part_size=5 * MB,
+        )
+
+    assert client.aborted
+    assert "key" not in blob_storage.objects
+
+
+async def streamed_peak(upload: UploadFile, path) -> int:
+    tracemalloc.start()
+    try:
+        await stream_upload_to_path(upload, path)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.asyncio
+async def test_streamed_50mb_upload_peaks_under_4mb(tmp_path):
+    peak = await streamed_peak(make_upload(50 * MB), tmp_path / "streamed.bin")
+
+    assert peak < 4 * MB
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_peak_memory_benchmark(tmp_path):
+    size = 50 * MB
+
+    upload = make_upload(size)
+    tracemalloc.start()
+    content = await upload.read()
+    with open(tmp_path / "buffered.bin", "wb") as out:
+        out.write(content)
+    _, buffered_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del content
+
+    peak = await streamed_peak(make_upload(size), tmp_path / "streamed.bin")
+
+    print(
+        f"50 MB upload peak memory: buffered={buffered_peak / MB:.1f} MB "
+        f"streamed={peak / MB:.1f} MB"
+    )
@@ -0,0 +1,249 @@
+"""Tests for video call signaling fan-out and the cross-worker backplane."""
+
+import asyncio
+import json
+
+import pytest
+
+from app.endpoints.websocket_video import VideoCallConnectionManager
+from app.services.pubsub_service import InMemoryPresenceRegistry
+from app.services.websocket_fanout import BackpressurePolicy
+
+
+class FakeWebSocket:
+    """Records frames sent to a client.
+
+    A ``gate`` holds every write until it is set, like a stalled network.
+    """
+
+    def __init__(self, delay: float = 0.0, gate: asyncio.Event | None = None):
+        self.delay = delay
+        self.gate = gate
+        self.frames: list[str] = []
+        self.closed_with: int | None = None
+
+    @property
+    def sent(self) -> list[dict]:
+        return [json.loads(frame) for frame in self.frames]
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data: str):
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.frames.append(data)
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        self.closed_with = code
+
+
+async def settle(*workers: VideoCallConnectionManager):
+    """Wait for every queued frame to be written."""
+    for worker in workers:
+        for sender in list(worker.senders.values()):
+            await sender.drain()
+
+
+@pytest.mark.asyncio
+async def test_join_is_announced_across_workers(make_workers):
+    worker_a, worker_b = make_workers(VideoCallConnectionManager)
+    interviewer, candidate = FakeWebSocket(), FakeWebSocket()
+
+    await worker_a.connect(interviewer, "room-1", 1)
+    await worker_b.connect(candidate, "room-1", 2)
+    await settle(worker_a, worker_b)
+
+    assert {"type": "user_joined", "user_id": 2, "room_id": "room-1"} in (
+        interviewer.sent
+    )
+    assert await worker_a.get_room_participants("room-1") == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_targeted_signaling_reaches_other_worker_once(make_workers):
+    worker_a, worker_b = make_workers(VideoCallConnectionManager)
+    interviewer, candidate = FakeWebSocket(), FakeWebSocket()
+    await worker_a.connect(interviewer, "room-1", 1)
+    await worker_b.connect(candidate, "room-1", 2)
+
+    await worker_a.forward_signaling_message(
+        "room-1", 1, {"type": "offer", "sdp": "v=0", "target_user_id": 2}
+    )
+    await settle(worker_a, worker_b)
+
+    offers = [m for m in candidate.sent if m["type"] == "offer"]
+    assert offers == [
+        {"type": "offer", "sdp": "v=0", "target_user_id": 2, "sender_id": 1}
+    ]
+    assert not [m for m in interviewer.sent if m["type"] == "offer"]
+
+
+@pytest.mark.asyncio
+async def test_broadcast_excludes_sender_on_every_worker(make_workers):
+    worker_a, worker_b, worker_c = make_workers(VideoCallConnectionManager, 3)
+    sockets = {user_id: FakeWebSocket() for user_id in (1, 2, 3)}
+    await worker_a.connect(sockets[1], "room-1", 1)
+    await worker_b.connect(sockets[2], "room-1", 2)
+    await worker_c.connect(sockets[3], "room-1", 3)
+
+    await worker_b.forward_signaling_message(
+        "room-1", 2, {"type": "ice_candidate", "candidate": "c1"}
+    )
+    await settle(worker_a, worker_b, worker_c)
+
+    for user_id, socket in sockets.items():
+        candidates = [m for m in socket.sent if m["type"] == "ice_candidate"]
+        assert len(candidates) == (0 if user_id == 2 else 1)
+
+
+@pytest.mark.asyncio
+async def test_leave_is_announced_and_presence_cleared(make_workers):
+    worker_a, worker_b = make_workers(VideoCallConnectionManager)
+    interviewer, candidate = FakeWebSocket(), FakeWebSocket()
+    await worker_a.connect(interviewer, "room-1", 1)
+    await worker_b.connect(candidate, "room-1", 2)
+
+    await worker_b.disconnect(2, candidate)
+    await settle(worker_a, worker_b)
+
+    assert {"type": "user_left", "user_id": 2, "room_id": "room-1"} in (
+        interviewer.sent
+    )
+    assert await worker_a.get_room_participants("room-1") == [1]
+
+
+@pytest.mark.asyncio
+async def test_presence_entries_expire_without_heartbeat():
+    presence = InMemoryPresenceRegistry()
+    await presence.add("video:room:r", "7", ttl_seconds=1)
+    assert await presence.members("video:room:r") == ["7"]
+
+    await asyncio.sleep(1.1)
+    assert await presence.members("video:room:r") == []
+
+
+@pytest.mark.asyncio
+async def test_slow_client_does_not_delay_the_rest_of_the_room(make_workers):
+    (worker,) = make_workers(VideoCallConnectionManager, 1)
+    stalled = asyncio.Event()
+    slow = FakeWebSocket(gate=stalled)
+    fast = [FakeWebSocket() for _ in range(3)]
+    await worker.connect(slow, "room-1", 1)
+    for offset, socket in enumerate(fast, start=2):
+        await worker.connect(socket, "room-1", offset)
+
+    await worker.broadcast_to_room("room-1", {"type": "chat_message"})
+    for user_id in (2, 3, 4):
+        await worker.senders[user_id].drain()
+
+    # Every fast socket has the frame while the slow one's is still queued
+    assert all(s.sent[-1] == {"type": "chat_message"} for s in fast)
+    assert slow.frames == []
+    assert worker.senders[1].queue_depth > 0
+    # Serialized once and shared by every recipient
+    assert len({id(s.frames[-1]) for s in fast}) == 1
+
+    stalled.set()
+    await worker.senders[1].drain()
+    assert slow.sent[-1] == {"type": "chat_message"}
+
+
+@pytest.mark.asyncio
+async def test_reconnect_closes_the_previous_sender(make_workers):
+    (worker,) = make_workers(VideoCallConnectionManager, 1)
+    await worker.connect(FakeWebSocket(), "room-1", 1)
+    previous = worker.senders[1]
+
+    await worker.connect(FakeWebSocket(), "room-1", 1)
+
+    assert previous.closed
+    assert worker.senders[1] is not previous
+    assert worker.metrics.room_snapshot("room-1")["connections"] == 1
+
+
+@pytest.mark.asyncio
+async def test_old_socket_closing_after_reconnect_keeps_the_new_one(make_workers):
+    (worker,) = make_workers(VideoCallConnectionManager, 1)
+    interviewer, old_socket, new_socket = (FakeWebSocket() for _ in range(3))
+    await worker.connect(interviewer, "room-1", 1)
+    await worker.connect(old_socket, "room-1", 2)
+    await worker.connect(new_socket, "room-1", 2)
+
+    # The old socket's handler runs its cleanup once that connection drops
+    await worker.disconnect(2, old_socket)
+    await worker.broadcast_to_room("room-1", {"type": "chat_message"}, exclude_user=1)
+    await settle(worker)
+
+    assert worker.active_connections["room-1"][2] is new_socket
+    assert await worker.get_room_participants("room-1") == [1, 2]
+    assert not [m for m in interviewer.sent if m["type"] == "user_left"]
+    assert new_socket.sent[-1] == {"type": "chat_message"}
+
+
+@pytest.mark.asyncio
+async def test_reconnect_into_another_room_leaves_the_first(make_workers):
+    (worker,) = make_workers(VideoCallConnectionManager, 1)
+    interviewer, first, second = (FakeWebSocket() for _ in range(3))
+    await worker.connect(interviewer, "room-1", 1)
+    await worker.connect(first, "room-1", 2)
+
+    await worker.connect(second, "room-2", 2)
+    await settle(worker)
+
+    assert 2 not in worker.active_connections["room-1"]
+    assert await worker.get_room_participants("room-1") == [1]
+    assert {"type": "user_left", "user_id": 2, "room_id": "room-1"} in (
+        interviewer.sent
+    )
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_policy_keeps_latest_frames(make_workers):
+    (worker,) = make_workers(VideoCallConnectionManager, 1)
+    worker.send_queue_size = 2
+    slow = FakeWebSocket(delay=0.05)
+    await worker.connect(slow, "room-1", 1)
+
+    for idx in range(5):
+        await worker.broadcast_to_room("room-1", {"type": "tick", "n": idx})
+    await settle(worker)
+
+    ticks = [m["n"] for m in slow.sent if m["type"] == "tick"]
+    assert ticks[-2:] == [3, 4]
+    assert len(ticks) < 5
+    assert worker.metrics.room_snapshot("room-1")["frames_dropped"] > 0
+
+
+@pytest.mark.asyncio
+async def test_disconnect_policy_drops_slow_consumer(make_workers):
+    (worker,) = make_workers(VideoCallConnectionManager, 1)
+    worker.send_queue_size = 1
+    worker.backpressure_policy = BackpressurePolicy.DISCONNECT
+    slow = FakeWebSocket(delay=0.2)
+    await worker.connect(slow, "room-1", 1)
+
+    for idx in range(4):
+        await worker.broadcast_to_room("room-1", {"type": "tick", "n": idx})
+    await asyncio.sleep(0.05)
+
+    assert slow.closed_with == 1013
+    assert 1 not in worker.user_rooms
+
+
+@pytest.mark.asyncio
+async def test_room_metrics_report_latency_and_queue_depth(make_workers):
+    (worker,) = make_workers(VideoCallConnectionManager, 1)
+    await worker.connect(FakeWebSocket(), "room-1", 1)
+    await worker.connect(FakeWebSocket(), "room-1", 2)
+
+    await worker.broadcast_to_room("room-1", {"type": "ping"})
+    await settle(worker)
+
+    snapshot = worker.metrics.room_snapshot("room-1")
+    assert snapshot["connections"] == 2
+    assert snapshot["queue_depth_total"] == 0
+    assert snapshot["frames_sent"] >= 2
+    assert snapshot["latency_ms_p50"] is not None
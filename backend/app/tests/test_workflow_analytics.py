@@ -0,0 +1,216 @@
+"""Tests and a 30-node benchmark for single-pass workflow analytics."""
+
+import time
+from collections import namedtuple
+from datetime import timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import and_, func, literal_column, select
+
+from app.models.candidate_workflow import CandidateWorkflow
+from app.models.user import User
+from app.models.workflow import Workflow
+from app.models.workflow_node import WorkflowNode
+from app.models.workflow_node_execution import WorkflowNodeExecution
+from app.services.workflow.workflow_analytics import bottleneck_nodes, node_statistics
+from app.services.workflow.workflow_engine import workflow_engine
+from app.services.workflow.workflow_graph import workflow_graphs
+from app.tests.test_message_inbox import count_queries
+from app.utils.datetime_utils import get_utc_now
+
+Aggregate = namedtuple(
+    "Aggregate",
+    "node_id status result executions duration_seconds timed score_total scored",
+)
+
+
+def test_groups_combine_into_exact_node_averages():
+    nodes = [
+        WorkflowNode(id=1, title="Screening", node_type="interview"),
+        WorkflowNode(id=2, title="Offer", node_type="todo"),
+    ]
+    aggregates = [
+        Aggregate(1, "completed", "pass", 3, 600, 3, 240, 3),
+        Aggregate(1, "completed", "fail", 1, 1200, 1, 40, 1),
+        Aggregate(1, "pending", None, 4, None, 0, None, 0),
+        # Executions of nodes outside the graph are ignored
+        Aggregate(9, "pending", None, 1, None, 0, None, 0),
+    ]
+
+    screening, offer = node_statistics(nodes, aggregates)
+
+    assert screening.total_executions == 8
+    assert screening.by_status == {"completed": 4, "pending": 4}
+    assert screening.by_result == {"pass": 3, "fail": 1}
+    assert screening.completion_rate == 50
+    assert screening.average_duration_minutes == 7.5
+    assert screening.average_score == 70
+    assert offer.total_executions == 0
+    assert offer.average_score is None
+    assert [b["node_id"] for b in bottleneck_nodes([screening, offer])] == [1]
+
+
+@pytest_asyncio.fixture
+async def busy_workflow(db_session, test_company, test_employer_user):
+    """30 nodes, 20 candidates, and an execution of every node for each."""
+    workflow = Workflow(
+        name="Graduate hiring",
+        employer_company_id=test_company.id,
+        created_by=test_employer_user.id,
+        status="active",
+    )
+    db_session.add(workflow)
+    await db_session.commit()
+
+    nodes = [
+        WorkflowNode(
+            workflow_id=workflow.id,
+            node_type="interview",
+            title=f"Step {order}",
+            sequence_order=order,
+            status="active",
+            created_by=test_employer_user.id,
+        )
+        for order in range(1, 31)
+    ]
+    candidates = [
+        User(
+            email=f"graduate{i}@example.com",
+            first_name="Graduate",
+            last_name=str(i),
+            company_id=test_company.id,
+            hashed_password="not-a-real-hash",
+            is_active=True,
+        )
+        for i in range(20)
+    ]
+    db_session.add_all(nodes + candidates)
+    await db_session.commit()
+
+    now = get_utc_now()
+    candidate_workflows = [
+        CandidateWorkflow(
+            candidate_id=candidate.id,
+            workflow_id=workflow.id,
+            status="in_progress",
+            started_at=now - timedelta(days=10),
+        )
+        for candidate in candidates
+    ]
+    db_session.add_all(candidate_workflows)
+    await db_session.commit()
+
+    executions = []
+    for i, candidate_workflow in enumerate(candidate_workflows):
+        for order, node in enumerate(nodes):
+            done = (i + order) % 3 != 0
+            started = now - timedelta(days=5, minutes=order)
+            executions.append(
+                WorkflowNodeExecution(
+                    candidate_workflow_id=candidate_workflow.id,
+                    node_id=node.id,
+                    status="completed" if done else "pending",
+                    result=("pass" if i % 4 else "fail") if done else None,
+                    score=50 + i if done else None,
+                    started_at=started,
+                    completed_at=started + timedelta(minutes=30 + order)
+                    if done
+                    else None,
+                    assigned_to=test_employer_user.id,
+                    # The first five candidates went through last year
+                    created_at=now - timedelta(days=400 if i < 5 else 5),
+                )
+            )
+    db_session.add_all(executions)
+    await db_session.commit()
+    return workflow, nodes
+
+
+async def per_node_queries(db_session, nodes):
+    """The previous shape: four aggregate queries for every node."""
+    execution = WorkflowNodeExecution
+    for node in nodes:
+        await db_session.execute(
+            select(execution.status, func.count(execution.id))
+            .where(execution.node_id == node.id)
+            .group_by(execution.status)
+        )
+        await db_session.execute(
+            select(execution.result, func.count(execution.id))
+            .where(and_(execution.node_id == node.id, execution.result.isnot(None)))
+            .group_by(execution.result)
+        )
+        await db_session.execute(
+            select(
+                func.avg(
+                    func.timestampdiff(
+                        literal_column("SECOND"),
+                        execution.started_at,
+                        execution.completed_at,
+                    )
+                )
+            ).where(execution.node_id == node.id)
+        )
+        await db_session.execute(
+            select(func.avg(execution.score)).where(execution.node_id == node.id)
+        )
+
+
+@pytest.mark.asyncio
+async def test_analytics_on_30_nodes_in_three_statements(db_session, busy_workflow):
+    workflow, nodes = busy_workflow
+    await workflow_graphs.get(db_session, workflow.id)
+
+    with count_queries() as statements:
+        analytics = await workflow_engine.get_process_analytics(db_session, workflow.id)
+
+    # Candidates, per-node aggregates and workload
+    assert len(statements) == 3
+    node_stats = analytics["node_statistics"]
+    assert [s["node_id"] for s in node_stats] == [node.id for node in nodes]
+    assert sum(s["total_executions"] for s in node_stats) == 20 * 30
+    assert node_stats[0]["average_duration_minutes"] == 30
+    assert analytics["recruiter_workload"][0]["total_assigned"] == 20 * 30
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_analytics_benchmark_on_30_nodes(db_session, busy_workflow):
+    workflow, nodes = busy_workflow
+    await workflow_graphs.get(db_session, workflow.id)
+
+    with count_queries() as baseline_statements:
+        started = time.perf_counter()
+        await per_node_queries(db_session, nodes)
+        per_node = time.perf_counter() - started
+
+    with count_queries() as statements:
+        started = time.perf_counter()
+        await workflow_engine.get_process_analytics(db_session, workflow.id)
+        single_pass = time.perf_counter() - started
+
+    print(
+        f"30-node analytics: {len(statements)} queries in "
+        f"{single_pass * 1000:.1f}ms (per-node statistics alone: "
+        f"{len(baseline_statements)} queries in {per_node * 1000:.1f}ms)"
+    )
+
+
+@pytest.mark.asyncio
+async def test_time_window_filters_executions(db_session, busy_workflow):
+    workflow, nodes = busy_workflow
+    now = get_utc_now()
+
+    recent = await workflow_engine.get_process_analytics(
+        db_session, workflow.id, since=now - timedelta(days=30)
+    )
+    older = await workflow_engine.get_process_analytics(
+        db_session, workflow.id, until=now - timedelta(days=30)
+    )
+
+    assert sum(s["total_executions"] for s in recent["node_statistics"]) == 15 * 30
+    assert sum(s["total_executions"] for s in older["node_statistics"]) == 5 * 30
+    # Candidates were all assigned just now
+    assert recent["total_candidates"] == 20
+    assert older["total_candidates"] == 0
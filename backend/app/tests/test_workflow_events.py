@@ -0,0 +1,158 @@
+"""Tests for the workflow event log and keyset-paginated timelines."""
+
+import pytest
+import pytest_asyncio
+
+from app.crud.workflow.workflow_event import workflow_event
+from app.crud.workflow.workflow_node import workflow_node as workflow_node_crud
+from app.crud.workflow.workflow_node_connection import (
+    workflow_node_connection as connection_crud,
+)
+from app.models.candidate_workflow import CandidateWorkflow
+from app.models.workflow import Workflow
+from app.services.workflow.workflow_engine import workflow_engine
+from app.tests.test_message_inbox import count_queries
+
+
+@pytest_asyncio.fixture
+async def two_step_process(db_session, test_company, test_employer_user, test_user):
+    """A candidate assigned to an active workflow of two todo steps."""
+    workflow = Workflow(
+        name="Internship",
+        employer_company_id=test_company.id,
+        created_by=test_employer_user.id,
+        status="active",
+    )
+    db_session.add(workflow)
+    await db_session.commit()
+
+    nodes = []
+    for order, title in enumerate(["Application form", "Portfolio"], start=1):
+        nodes.append(
+            await workflow_node_crud.create(
+                db_session,
+                obj_in={
+                    "workflow_id": workflow.id,
+                    "node_type": "todo",
+                    "title": title,
+                    "sequence_order": order,
+                    "status": "active",
+                },
+                created_by=test_employer_user.id,
+            )
+        )
+    await connection_crud.create_connection(
+        db_session,
+        workflow_id=workflow.id,
+        source_node_id=nodes[0].id,
+        target_node_id=nodes[1].id,
+    )
+
+    candidate_wf = CandidateWorkflow(
+        candidate_id=test_user.id,
+        workflow_id=workflow.id,
+        status="not_started",
+        assigned_recruiter_id=test_employer_user.id,
+    )
+    db_session.add(candidate_wf)
+    await db_session.commit()
+    return candidate_wf
+
+
+async def run_to_completion(db_session, candidate_wf, completed_by):
+    """Start the process and pass both steps."""
+    await workflow_engine.start_candidate_process(db_session, candidate_wf.id)
+    for score in (80, 90):
+        events = await workflow_event.get_page(
+            db_session, candidate_workflow_id=candidate_wf.id
+        )
+        execution_id = events[-1].execution_id
+        await workflow_engine.complete_node_execution(
+            db_session,
+            execution_id,
+            result="pass",
+            completed_by=completed_by,
+            score=score,
+            feedback="Well done",
+        )
+
+
+@pytest.mark.asyncio
+async def test_engine_appends_every_state_change(
+    db_session, two_step_process, test_employer_user
+):
+    await run_to_completion(db_session, two_step_process, test_employer_user.id)
+
+    events = await workflow_event.get_page(
+        db_session, candidate_workflow_id=two_step_process.id
+    )
+
+    assert [event.event_type for event in events] == [
+        "process_started",
+        "node_started",
+        "node_completed",
+        "advanced",
+        "node_started",
+        "node_completed",
+        "process_completed",
+    ]
+    completed = events[2]
+    assert completed.actor_id == test_employer_user.id
+    assert completed.result == "pass"
+    assert completed.data["node_title"] == "Application form"
+    assert completed.data["feedback"] == "Well done"
+    assert events[3].data["node_title"] == "Portfolio"
+    assert events[-1].result == "hired"
+    assert float(events[-1].score) == 85
+
+
+@pytest.mark.asyncio
+async def test_timeline_pages_and_polls_by_cursor(
+    db_session, two_step_process, test_employer_user
+):
+    await workflow_engine.start_candidate_process(db_session, two_step_process.id)
+
+    items, cursor, has_more = await workflow_engine.get_candidate_timeline(
+        db_session, two_step_process.id, limit=1, workflow_name="Internship"
+    )
+    assert [item["title"] for item in items] == ["Process Started"]
+    assert items[0]["description"] == "Started workflow: Internship"
+    assert has_more
+
+    items, cursor, has_more = await workflow_engine.get_candidate_timeline(
+        db_session, two_step_process.id, after=cursor, limit=1
+    )
+    assert [item["title"] for item in items] == ["Started: Application form"]
+    assert not has_more
+
+    # Nothing new: the cursor stays put so the portal can keep polling
+    items, polled_cursor, has_more = await workflow_engine.get_candidate_timeline(
+        db_session, two_step_process.id, after=cursor
+    )
+    assert items == []
+    assert polled_cursor == cursor
+    assert not has_more
+
+    execution_id = (
+        await workflow_event.get_page(
+            db_session, candidate_workflow_id=two_step_process.id, after=cursor - 1
+        )
+    )[0].execution_id
+    await workflow_engine.complete_node_execution(
+        db_session, execution_id, result="pass", completed_by=test_employer_user.id
+    )
+
+    with count_queries() as statements:
+        items, _, _ = await workflow_engine.get_candidate_timeline(
+            db_session, two_step_process.id, after=cursor
+        )
+
+    # Only the events since the last poll, in a single indexed read
+    assert len(statements) == 1
+    assert [item["event_type"] for item in items] == [
+        "node_completed",
+        "advanced",
+        "node_started",
+    ]
+    assert items[0]["icon"] == "check-circle"
+    assert items[1]["title"] == "Moved to: Portfolio"
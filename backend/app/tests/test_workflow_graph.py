@@ -0,0 +1,167 @@
+"""Tests for compiled workflow graphs used by the workflow engine."""
+
+import pytest
+import pytest_asyncio
+
+from app.crud.workflow.workflow_node import workflow_node as workflow_node_crud
+from app.crud.workflow.workflow_node_connection import (
+    workflow_node_connection as connection_crud,
+)
+from app.models.workflow import Workflow
+from app.models.workflow_node import WorkflowNode
+from app.models.workflow_node_connection import WorkflowNodeConnection
+from app.services.pubsub_service import InMemoryPubSub
+from app.services.workflow.workflow_graph import (
+    WorkflowGraphCache,
+    compile_graph,
+    workflow_graphs,
+)
+from app.tests.test_message_inbox import count_queries
+
+
+def node(node_id: int, sequence_order: int, status: str = "active") -> WorkflowNode:
+    return WorkflowNode(
+        id=node_id,
+        workflow_id=1,
+        node_type="interview",
+        title=f"Step {node_id}",
+        sequence_order=sequence_order,
+        status=status,
+    )
+
+
+def connection(
+    connection_id: int, source: int, target: int, condition_type: str, config=None
+) -> WorkflowNodeConnection:
+    return WorkflowNodeConnection(
+        id=connection_id,
+        workflow_id=1,
+        source_node_id=source,
+        target_node_id=target,
+        condition_type=condition_type,
+        condition_config=config,
+    )
+
+
+def test_compiled_routes_match_connection_conditions():
+    nodes = [node(1, 1), node(2, 2), node(3, 3), node(4, 4), node(5, 5, "inactive")]
+    connections = [
+        connection(1, 1, 2, "success"),
+        connection(2, 1, 3, "failure"),
+        connection(3, 2, 4, "conditional", {"min_score": 80}),
+        connection(4, 2, 5, "always"),
+    ]
+
+    graph = compile_graph(1, 1, nodes, connections)
+
+    assert [n.id for n in graph.next_nodes(1, "pass")] == [2]
+    assert [n.id for n in graph.next_nodes(1, "rejected")] == [3]
+    assert [n.id for n in graph.next_nodes(2, "pass", {"score": 85})] == [4]
+    # Edges into inactive nodes are never taken
+    assert graph.next_nodes(2, "pass", {"score": 70}) == []
+    assert graph.start_node_ids == (1,)
+    assert graph.end_node_ids == {3, 4}
+
+
+def test_start_nodes_fall_back_to_nodes_without_incoming_edges():
+    nodes = [node(1, 2), node(2, 3), node(3, 4)]
+    graph = compile_graph(1, 1, nodes, [connection(1, 1, 2, "always")])
+
+    assert graph.start_node_ids == (1, 3)
+
+
+@pytest_asyncio.fixture
+async def linear_workflow(db_session, test_company, test_employer_user):
+    """An active workflow: screening -> interview, plus a rejection step."""
+    workflow = Workflow(
+        name="Hiring",
+        employer_company_id=test_company.id,
+        created_by=test_employer_user.id,
+        status="active",
+    )
+    db_session.add(workflow)
+    await db_session.commit()
+
+    nodes = []
+    for order, title in enumerate(["Screening", "Interview", "Rejected"], start=1):
+        nodes.append(
+            await workflow_node_crud.create(
+                db_session,
+                obj_in={
+                    "workflow_id": workflow.id,
+                    "node_type": "interview",
+                    "title": title,
+                    "sequence_order": order,
+                    "status": "active",
+                },
+                created_by=test_employer_user.id,
+            )
+        )
+    screening, interview, rejected = nodes
+    await connection_crud.create_connection(
+        db_session,
+        workflow_id=workflow.id,
+        source_node_id=screening.id,
+        target_node_id=interview.id,
+    )
+    await connection_crud.create_connection(
+        db_session,
+        workflow_id=workflow.id,
+        source_node_id=screening.id,
+        target_node_id=rejected.id,
+        condition_type="failure",
+    )
+    return workflow, nodes
+
+
+@pytest.mark.asyncio
+async def test_transitions_do_no_definition_queries(db_session, linear_workflow):
+    workflow, (screening, interview, _) = linear_workflow
+    await workflow_graphs.get(db_session, workflow.id)
+
+    with count_queries() as statements:
+        for _ in range(100):
+            graph = await workflow_graphs.get_for_node(db_session, screening.id)
+            assert [n.id for n in graph.next_nodes(screening.id, "pass")] == [
+                interview.id
+            ]
+
+    assert statements == []
+
+
+@pytest.mark.asyncio
+async def test_connection_edit_recompiles(db_session, linear_workflow):
+    workflow, (screening, interview, rejected) = linear_workflow
+    before = await workflow_graphs.get(db_session, workflow.id)
+
+    edge = await connection_crud.get_connection(
+        db_session, source_node_id=screening.id, target_node_id=interview.id
+    )
+    await connection_crud.update_connection(
+        db_session, connection=edge, condition_type="always"
+    )
+
+    after = await workflow_graphs.get(db_session, workflow.id)
+    assert after.version > before.version
+    assert [n.id for n in after.next_nodes(screening.id, "rejected")] == [
+        interview.id,
+        rejected.id,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_node_deactivation_reaches_other_workers(db_session, linear_workflow):
+    workflow, (screening, interview, _) = linear_workflow
+    pubsub = InMemoryPubSub()
+    worker_a = WorkflowGraphCache(pubsub=pubsub)
+    worker_b = WorkflowGraphCache(pubsub=pubsub)
+    await worker_a.get(db_session, workflow.id)
+    await worker_b.get(db_session, workflow.id)
+
+    interview.status = "inactive"
+    await db_session.commit()
+    await worker_a.invalidate(workflow.id)
+
+    graph = await worker_b.get(db_session, workflow.id)
+    assert graph.next_nodes(screening.id, "pass") == []
+    assert worker_b.compile_count == 2
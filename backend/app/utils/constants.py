@@ -67,6 +67,21 @@ class ResumeFormat(str, Enum):
     CREATIVE = "creative"  # Creative format
 
 
+class ResumeExportStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    COMPLETED_WITH_ERRORS = "completed_with_errors"
+    FAILED = "failed"
+
+
+class OutboundEmailStatus(str, Enum):
+    QUEUED = "queued"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
 class ResumeLanguage(str, Enum):
     JAPANESE = "ja"
     ENGLISH = "en"
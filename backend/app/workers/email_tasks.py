@@ -0,0 +1,85 @@
+import asyncio
+import logging
+
+from app.services.email_digest_service import email_digest_service
+from app.services.email_queue_service import email_queue_service
+from app.workers.queue import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task
+def deliver_outbound_emails():
+    """
+    Deliver due messages from the outbound email queue.
+    """
+    try:
+        sent = asyncio.run(_deliver_async())
+        return {"status": "completed", "attempted": sent}
+
+    except Exception as exc:
+        logger.error(f"Outbound email delivery failed: {exc}")
+        raise
+
+
+async def _deliver_async() -> int:
+    try:
+        return await email_queue_service.drain()
+    finally:
+        await email_queue_service.close()
+
+
+@celery_app.task
+def purge_outbound_emails():
+    """
+    Delete sent and failed messages once they leave the rate window.
+    """
+    try:
+        deleted = asyncio.run(email_queue_service.purge_finished())
+        return {"status": "completed", "deleted": deleted}
+
+    except Exception as exc:
+        logger.error(f"Outbound email purge failed: {exc}")
+        raise
+
+
+@celery_app.task
+def flush_email_digests():
+    """
+    Send notification digests whose debounce window has ended.
+    """
+    try:
+        sent = asyncio.run(_flush_digests_async())
+        return {"status": "completed", "digests": sent}
+
+    except Exception as exc:
+        logger.error(f"Email digest flush failed: {exc}")
+        raise
+
+
+async def _flush_digests_async() -> int:
+    try:
+        return await email_digest_service.flush_due()
+    finally:
+        await email_digest_service.close()
+
+
+@celery_app.on_after_configure.connect  # type: ignore[union-attr]
+def setup_periodic_tasks(sender, **kwargs):
+    """Sweep the queue for retries and missed dispatches, purge finished
+    messages, and flush digests."""
+    sender.add_periodic_task(
+        30.0,
+        deliver_outbound_emails.s(),  # type: ignore[attr-defined]
+        name="deliver queued emails",
+    )
+    sender.add_periodic_task(
+        600.0,
+        purge_outbound_emails.s(),  # type: ignore[attr-defined]
+        name="purge finished emails",
+    )
+    sender.add_periodic_task(
+        60.0,
+        flush_email_digests.s(),  # type: ignore[attr-defined]
+        name="flush email digests",
+    )
@@ -1,6 +1,7 @@
 import asyncio
 import logging
 
+from app.config import settings
 from app.database import AsyncSessionLocal
 from app.services.antivirus_service import antivirus_service
 from app.utils.datetime_utils import get_utc_now
@@ -41,8 +42,11 @@ def scan_uploaded_file(self, attachment_id: int):
 
 async def _scan_file_async(attachment_id: int) -> bool:
     """Async helper for file scanning."""
-    async with AsyncSessionLocal() as db:
-        return await antivirus_service.scan_attachment(db, attachment_id)
+    try:
+        async with AsyncSessionLocal() as db:
+            return await antivirus_service.scan_attachment(db, attachment_id)
+    finally:
+        await antivirus_service.close()
 
 
 async def _mark_scan_failed(attachment_id: int):
@@ -84,8 +88,13 @@ def bulk_scan_pending_files():
 
 async def _bulk_scan_async() -> int:
     """Async helper for bulk scanning."""
-    async with AsyncSessionLocal() as db:
-        return await antivirus_service.bulk_scan_pending_files(db, limit=20)
+    try:
+        async with AsyncSessionLocal() as db:
+            return await antivirus_service.bulk_scan_pending_files(
+                db, limit=settings.clamav_bulk_scan_limit
+            )
+    finally:
+        await antivirus_service.close()
 
 
 @celery_app.task
@@ -110,6 +119,7 @@ async def _cleanup_attachments_async() -> int:
     from sqlalchemy import delete, select
 
     from app.models.attachment import Attachment
+    from app.services.blob_store import blob_store
     from app.services.storage_service import get_storage_service
 
     storage_service = get_storage_service()
@@ -130,8 +140,15 @@ async def _cleanup_attachments_async() -> int:
 
         for attachment in attachments:
             try:
+                if attachment.blob_id is not None:
+                    # Shared content: the object goes with its last reference
+                    await blob_store.release(db, attachment.blob_id)
+                    await db.execute(
+                        delete(Attachment).where(Attachment.id == attachment.id)
+                    )
+                    cleaned_count += 1
                 # Delete from S3
-                if storage_service.delete_file(attachment.s3_key):
+                elif storage_service.delete_file(attachment.s3_key):
                     # Delete from database
                     await db.execute(
                         delete(Attachment).where(Attachment.id == attachment.id)
@@ -0,0 +1,29 @@
+import asyncio
+import logging
+
+from app.database import AsyncSessionLocal
+from app.services.message_search_service import message_search_service
+from app.workers.queue import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task
+def reindex_messages():
+    """
+    Rebuild the message search index from the messages table.
+    """
+    try:
+        message_count = asyncio.run(_reindex_messages_async())
+        logger.info(f"Message search reindex completed: {message_count} messages")
+        return {"status": "completed", "message_count": message_count}
+
+    except Exception as exc:
+        logger.error(f"Message search reindex failed: {exc}")
+        raise
+
+
+async def _reindex_messages_async() -> int:
+    """Async helper for message reindexing."""
+    async with AsyncSessionLocal() as db:
+        return await message_search_service.reindex(db)
@@ -10,6 +10,9 @@ celery_app = Celery(
     include=[
         "app.workers.jobs_files",
         "app.workers.calendar_tasks",
+        "app.workers.message_tasks",
+        "app.workers.resume_tasks",
+        "app.workers.email_tasks",
     ],
 )
 
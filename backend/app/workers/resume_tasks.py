@@ -0,0 +1,72 @@
+import asyncio
+import logging
+
+from app.services.pdf_cache_service import pdf_cache_service
+from app.services.resume_export_service import resume_export_service
+from app.workers.queue import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task
+def evict_pdf_cache():
+    """
+    Evict expired and surplus cached resume PDFs from storage.
+    """
+    try:
+        evicted = asyncio.run(pdf_cache_service.evict())
+        logger.info(f"PDF cache eviction completed: {evicted} files removed")
+        return {"status": "completed", "evicted": evicted}
+
+    except Exception as exc:
+        logger.error(f"PDF cache eviction failed: {exc}")
+        raise
+
+
+@celery_app.task
+def purge_resume_exports():
+    """
+    Delete exported resume PDFs past their retention period.
+    """
+    try:
+        purged = asyncio.run(resume_export_service.purge_expired_outputs())
+        logger.info(f"Resume export purge completed: {purged} files removed")
+        return {"status": "completed", "purged": purged}
+
+    except Exception as exc:
+        logger.error(f"Resume export purge failed: {exc}")
+        raise
+
+
+@celery_app.task
+def export_resume_pdfs(job_id: int):
+    """
+    Render a batch of resumes to PDF for a ResumeExportJob.
+    """
+    try:
+        job = asyncio.run(resume_export_service.run_job(job_id))
+        return {
+            "status": job.status,
+            "job_id": job_id,
+            "completed": job.completed_count,
+            "failed": job.failed_count,
+        }
+
+    except Exception as exc:
+        logger.error(f"Resume export job {job_id} failed: {exc}")
+        raise
+
+
+@celery_app.on_after_configure.connect  # type: ignore[union-attr]
+def setup_periodic_tasks(sender, **kwargs):
+    """Schedule PDF cache eviction and export purging."""
+    sender.add_periodic_task(
+        86400.0,  # Daily
+        evict_pdf_cache.s(),  # type: ignore[attr-defined]
+        name="evict cached resume PDFs",
+    )
+    sender.add_periodic_task(
+        86400.0,  # Daily
+        purge_resume_exports.s(),  # type: ignore[attr-defined]
+        name="purge exported resume PDFs",
+    )
@@ -0,0 +1,30 @@
+"""
+Rebuild the conversation_summaries table from the messages table.
+Run after bulk-loading messages (seeds, imports) or to repair drifted counters.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.crud.conversation import conversation
+from app.database import AsyncSessionLocal
+
+
+async def backfill_conversation_summaries():
+    """Rebuild every conversation summary."""
+    async with AsyncSessionLocal() as db:
+        try:
+            count = await conversation.rebuild(db)
+            print(f"[OK] Rebuilt {count} conversation summaries")
+        except Exception as e:
+            await db.rollback()
+            print(f"[ERROR] Failed to rebuild conversation summaries: {e}")
+            raise
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill_conversation_summaries())